@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ProjectConfig(AppConfig):
+    name = "TK_PBP"
+    verbose_name = "RagaSpace"
+
+    def ready(self):
+        from . import sqlite
@@ -12,6 +12,11 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "venuebooking.settings")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "TK_PBP.settings")
 
 application = get_asgi_application()
+
+# Periodic booking transitions, when DJANGO_BOOKING_LIFECYCLE_INTERVAL is set.
+from rent.lifecycle import start_scheduler  # noqa: E402
+
+start_scheduler()
@@ -0,0 +1,141 @@
+"""Namespaced, versioned cache keys shared by every app.
+
+Each feature owns a :class:`CacheNamespace` and builds keys from plain parts::
+
+    venue_cache = CacheNamespace("venue")
+    venue_cache.get_or_set(("detail", venue.pk), build, timeout=60)
+    venue_cache.invalidate()  # every "venue" key is stale from now on
+
+Keys look like ``venue:detail:42`` and are stored with the namespace's
+current version, which lives in the cache itself under ``venue:__version__``.
+:meth:`CacheNamespace.invalidate` bumps that version, so a whole namespace is
+dropped in one write on every backend (the old entries simply expire). The
+backend comes from ``CACHES`` (see ``CACHE_BACKEND`` in the settings).
+Async views use the ``a``-prefixed methods such as
+:meth:`CacheNamespace.aget`, which go through Django's async cache API.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Callable, Iterable, Union
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+KeyParts = Union[str, int, tuple]
+
+# Longer keys are hashed so they stay within memcached-style limits.
+MAX_KEY_LENGTH = 200
+
+
+def make_key(namespace: str, parts: KeyParts) -> str:
+    """Join ``parts`` under ``namespace``; ``None`` parts become empty strings."""
+
+    if not isinstance(parts, tuple):
+        parts = (parts,)
+    key = ":".join((namespace, *("" if part is None else str(part) for part in parts)))
+    if len(key) > MAX_KEY_LENGTH or any(char.isspace() for char in key):
+        key = f"{namespace}:#{hashlib.sha1(key.encode()).hexdigest()}"
+    return key
+
+
+class CacheNamespace:
+    """A group of cache keys that can be invalidated together."""
+
+    def __init__(self, name: str, *, alias: str = "default", timeout: float | None = DEFAULT_TIMEOUT) -> None:
+        if ":" in name:
+            raise ValueError("Cache namespace names cannot contain ':'.")
+        self.name = name
+        self.alias = alias
+        self.timeout = timeout
+        self.version_key = f"{name}:__version__"
+
+    def __repr__(self) -> str:
+        return f"<CacheNamespace {self.name!r}>"
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, parts: KeyParts) -> str:
+        return make_key(self.name, parts)
+
+    def version(self) -> int:
+        cache = self.cache
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, 1, timeout=None)
+            version = cache.get(self.version_key, 1)
+        return version
+
+    def invalidate(self) -> int:
+        """Make every key of the namespace stale and return the new version."""
+
+        cache = self.cache
+        try:
+            return cache.incr(self.version_key)
+        except ValueError:
+            cache.add(self.version_key, 1, timeout=None)
+            return cache.incr(self.version_key)
+
+    def _timeout(self, timeout: float | None) -> float | None:
+        return self.timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def get(self, parts: KeyParts, default: Any = None) -> Any:
+        return self.cache.get(self.key(parts), default, version=self.version())
+
+    def set(self, parts: KeyParts, value: Any, timeout: float | None = DEFAULT_TIMEOUT) -> None:
+        self.cache.set(self.key(parts), value, self._timeout(timeout), version=self.version())
+
+    def add(self, parts: KeyParts, value: Any, timeout: float | None = DEFAULT_TIMEOUT) -> bool:
+        return self.cache.add(self.key(parts), value, self._timeout(timeout), version=self.version())
+
+    def delete(self, parts: KeyParts) -> bool:
+        return self.cache.delete(self.key(parts), version=self.version())
+
+    def get_or_set(
+        self,
+        parts: KeyParts,
+        default: Callable[[], Any] | Any,
+        timeout: float | None = DEFAULT_TIMEOUT,
+    ) -> Any:
+        return self.cache.get_or_set(self.key(parts), default, self._timeout(timeout), version=self.version())
+
+    def get_many(self, keys: Iterable[KeyParts]) -> dict[KeyParts, Any]:
+        """Fetch several keys in one round trip; the result is keyed by the given parts."""
+
+        built = {self.key(parts): parts for parts in keys}
+        found = self.cache.get_many(built, version=self.version())
+        return {built[key]: value for key, value in found.items()}
+
+    def set_many(self, values: dict[KeyParts, Any], timeout: float | None = DEFAULT_TIMEOUT) -> None:
+        self.cache.set_many(
+            {self.key(parts): value for parts, value in values.items()},
+            self._timeout(timeout),
+            version=self.version(),
+        )
+
+    async def aversion(self) -> int:
+        cache = self.cache
+        version = await cache.aget(self.version_key)
+        if version is None:
+            await cache.aadd(self.version_key, 1, timeout=None)
+            version = await cache.aget(self.version_key, 1)
+        return version
+
+    async def ainvalidate(self) -> int:
+        cache = self.cache
+        try:
+            return await cache.aincr(self.version_key)
+        except ValueError:
+            await cache.aadd(self.version_key, 1, timeout=None)
+            return await cache.aincr(self.version_key)
+
+    async def aget(self, parts: KeyParts, default: Any = None) -> Any:
+        return await self.cache.aget(self.key(parts), default, version=await self.aversion())
+
+    async def aset(self, parts: KeyParts, value: Any, timeout: float | None = DEFAULT_TIMEOUT) -> None:
+        await self.cache.aset(self.key(parts), value, self._timeout(timeout), version=await self.aversion())
+
+    async def adelete(self, parts: KeyParts) -> bool:
+        return await self.cache.adelete(self.key(parts), version=await self.aversion())
@@ -0,0 +1,64 @@
+"""Routine maintenance for the SQLite database."""
+from __future__ import annotations
+
+from pathlib import Path
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh planner statistics (ANALYZE), checkpoint and truncate the WAL file and, "
+        "with --vacuum, rebuild the database file to reclaim free pages."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--vacuum", action="store_true", help="Also run VACUUM (rewrites the whole file).")
+        parser.add_argument("--skip-analyze", action="store_true")
+        parser.add_argument("--skip-checkpoint", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["database"] not in connections:
+            raise CommandError(f"Unknown database alias {options['database']!r}.")
+        connection = connections[options["database"]]
+        if connection.vendor != "sqlite":
+            raise CommandError(f"{options['database']!r} is a {connection.vendor} database, not SQLite.")
+        if not connection.get_autocommit():
+            raise CommandError("sqlite_maintenance cannot run inside a transaction.")
+
+        steps = []
+        if not options["skip_analyze"]:
+            steps.append(("ANALYZE", "ANALYZE"))
+            steps.append(("optimize", "PRAGMA optimize"))
+        if options["vacuum"]:
+            steps.append(("VACUUM", "VACUUM"))
+        if not options["skip_checkpoint"]:
+            steps.append(("WAL checkpoint", "PRAGMA wal_checkpoint(TRUNCATE)"))
+
+        size_before = self._file_size(connection)
+        with connection.cursor() as cursor:
+            for label, sql in steps:
+                started = perf_counter()
+                cursor.execute(sql)
+                row = cursor.fetchone()
+                elapsed = (perf_counter() - started) * 1000
+                if label == "WAL checkpoint" and row is not None:
+                    busy, log_frames, checkpointed = row
+                    detail = f" ({checkpointed}/{log_frames} frames{', busy' if busy else ''})"
+                else:
+                    detail = ""
+                self.stdout.write(f"{label}: {elapsed:.1f}ms{detail}")
+
+        size_after = self._file_size(connection)
+        if size_before is not None and size_after is not None:
+            self.stdout.write(f"Database file: {size_before / 1024:.0f} KiB -> {size_after / 1024:.0f} KiB")
+        self.stdout.write(self.style.SUCCESS("SQLite maintenance completed."))
+
+    def _file_size(self, connection) -> int | None:
+        if connection.is_in_memory_db():
+            return None
+        path = Path(connection.settings_dict["NAME"])
+        return path.stat().st_size if path.exists() else None
@@ -0,0 +1,121 @@
+"""In-memory request metrics rendered in the Prometheus text format.
+
+:class:`TK_PBP.middleware.RequestMetricsMiddleware` feeds one observation per
+request into the module level :data:`registry`; the admin-only
+``/workspace/metrics/`` endpoint renders it for scraping. Histograms are kept
+per resolved URL name and per process, so every gunicorn worker exposes its
+own counters.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from threading import Lock
+
+METRIC_PREFIX = "ragaspace"
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# (name, help text, buckets) for every histogram recorded per request.
+REQUEST_METRICS = (
+    ("request_duration_seconds", "Wall time spent handling the request.", DURATION_BUCKETS),
+    ("db_queries", "Database queries issued while handling the request.", QUERY_BUCKETS),
+    ("db_duration_seconds", "Time spent executing database queries.", DURATION_BUCKETS),
+    ("template_render_seconds", "Time spent rendering template responses.", DURATION_BUCKETS),
+    ("response_size_bytes", "Size of the response body.", SIZE_BUCKETS),
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``counts`` are per bucket, not cumulative."""
+
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        running = 0
+        rows = []
+        for bound, count in zip((*self.buckets, None), self.counts):
+            running += count
+            rows.append(("+Inf" if bound is None else _format_number(bound), running))
+        return rows
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """Thread-safe store of the request histograms, keyed by view name."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._views: dict[str, tuple[Histogram, ...]] = {}
+
+    def observe_request(
+        self,
+        view: str,
+        duration: float,
+        queries: int,
+        db_duration: float,
+        render_duration: float,
+        size: int,
+    ) -> None:
+        with self._lock:
+            histograms = self._views.get(view)
+            if histograms is None:
+                histograms = tuple(Histogram(buckets) for _, _, buckets in REQUEST_METRICS)
+                self._views[view] = histograms
+            histograms[0].observe(duration)
+            histograms[1].observe(queries)
+            histograms[2].observe(db_duration)
+            histograms[3].observe(render_duration)
+            histograms[4].observe(size)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._views.clear()
+
+    def snapshot(self) -> dict[str, dict[str, Histogram]]:
+        with self._lock:
+            return {
+                view: {name: histogram for (name, _, _), histogram in zip(REQUEST_METRICS, histograms)}
+                for view, histograms in self._views.items()
+            }
+
+    def render(self) -> str:
+        """Return all histograms in the Prometheus text exposition format."""
+
+        with self._lock:
+            views = sorted(self._views.items())
+            lines: list[str] = []
+            for index, (name, help_text, _) in enumerate(REQUEST_METRICS):
+                metric = f"{METRIC_PREFIX}_{name}"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for view, histograms in views:
+                    histogram = histograms[index]
+                    label = f'view="{_escape_label(view)}"'
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {count}')
+                    lines.append(f"{metric}_sum{{{label}}} {_format_number(histogram.total)}")
+                    lines.append(f"{metric}_count{{{label}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,220 @@
+"""Project wide middleware.
+
+Every middleware here supports both the WSGI and the ASGI stack, so async
+views are not pushed onto a worker thread just to pass through them. Under
+ASGI the ORM runs on a per-request worker thread with its own connections,
+which is why the async paths install their execute wrappers through
+``sync_to_async``.
+"""
+from __future__ import annotations
+
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from .metrics import registry
+from .routers import (
+    PIN_COOKIE_NAME,
+    activate_replica_reads,
+    deactivate_replica_reads,
+    is_read_only_view,
+    replica_alias,
+)
+from .slow_queries import SlowQueryRecorder
+
+
+class QueryTimer:
+    """Database execute wrapper counting queries and the time spent in them."""
+
+    __slots__ = ("count", "duration")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - started
+            self.count += 1
+
+
+def install_execute_wrapper(wrapper) -> list:
+    """Add ``wrapper`` to this thread's connections and return them."""
+
+    wrapped = []
+    for connection in connections.all():
+        connection.execute_wrappers.append(wrapper)
+        wrapped.append(connection)
+    return wrapped
+
+
+def remove_execute_wrapper(wrapped: list, wrapper) -> None:
+    for connection in wrapped:
+        connection.execute_wrappers.remove(wrapper)
+
+
+class HybridMiddleware:
+    """Base for middleware usable from both the sync and the async handler."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.call(request)
+
+    def call(self, request):
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+
+class RequestMetricsMiddleware(HybridMiddleware):
+    """Record wall time, DB usage, template render time and size per URL name.
+
+    Observations go to :data:`TK_PBP.metrics.registry`. Template render time
+    covers ``TemplateResponse`` objects, which is what the class based views
+    return; templates rendered eagerly inside a view count as view time.
+    Disable with ``REQUEST_METRICS_ENABLED = False``.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.enabled = getattr(settings, "REQUEST_METRICS_ENABLED", True)
+
+    def call(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        wrapped = install_execute_wrapper(timer)
+        request._metrics_render_time = 0.0
+        started = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            remove_execute_wrapper(wrapped, timer)
+        self.observe(request, response, perf_counter() - started, timer)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        timer = QueryTimer()
+        wrapped = await sync_to_async(install_execute_wrapper)(timer)
+        request._metrics_render_time = 0.0
+        started = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(remove_execute_wrapper)(wrapped, timer)
+        self.observe(request, response, perf_counter() - started, timer)
+        return response
+
+    def observe(self, request, response, duration: float, timer: QueryTimer) -> None:
+        match = request.resolver_match
+        view = match.view_name if match is not None else "<unresolved>"
+        size = 0 if response.streaming else len(response.content)
+        registry.observe_request(view, duration, timer.count, timer.duration, request._metrics_render_time, size)
+
+    def process_template_response(self, request, response):
+        if self.enabled:
+            started = perf_counter()
+
+            def _record_render(rendered):
+                request._metrics_render_time += perf_counter() - started
+
+            response.add_post_render_callback(_record_render)
+        return response
+
+
+class SlowQueryLogMiddleware(HybridMiddleware):
+    """Feed queries slower than ``SLOW_QUERY_THRESHOLD_MS`` into the slow query log.
+
+    See :mod:`TK_PBP.slow_queries`. Disable with ``SLOW_QUERY_LOG_ENABLED = False``.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.enabled = getattr(settings, "SLOW_QUERY_LOG_ENABLED", True)
+
+    def call(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        recorder = SlowQueryRecorder(request)
+        wrapped = install_execute_wrapper(recorder)
+        try:
+            return self.get_response(request)
+        finally:
+            remove_execute_wrapper(wrapped, recorder)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        recorder = SlowQueryRecorder(request)
+        wrapped = await sync_to_async(install_execute_wrapper)(recorder)
+        try:
+            return await self.get_response(request)
+        finally:
+            await sync_to_async(remove_execute_wrapper)(wrapped, recorder)
+
+
+class ReadReplicaMiddleware(HybridMiddleware):
+    """Serve ``GET``/``HEAD`` requests to read-only views from the replica.
+
+    See :mod:`TK_PBP.routers`. Replica routing stays active until the view's
+    template response has been rendered. Clients that recently completed a
+    write request carry a pin cookie and keep reading from the primary.
+    """
+
+    safe_methods = frozenset({"GET", "HEAD"})
+
+    def call(self, request):
+        request._replica_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request._replica_token is not None:
+                deactivate_replica_reads(request._replica_token)
+        return self.pin_after_write(request, response)
+
+    async def __acall__(self, request):
+        # The async handler runs process_view() through sync_to_async, which
+        # copies the flag back into this context rather than the token.
+        request._replica_token = None
+        try:
+            response = await self.get_response(request)
+        finally:
+            deactivate_replica_reads()
+        return self.pin_after_write(request, response)
+
+    def pin_after_write(self, request, response):
+        if request.method not in self.safe_methods and response.status_code < 400 and replica_alias():
+            pin_seconds = getattr(settings, "REPLICA_PIN_SECONDS", 5)
+            response.set_cookie(PIN_COOKIE_NAME, "1", max_age=pin_seconds, httponly=True, samesite="Lax")
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in self.safe_methods
+            and PIN_COOKIE_NAME not in request.COOKIES
+            and is_read_only_view(view_func)
+            and replica_alias()
+        ):
+            request._replica_token = activate_replica_reads()
+        return None
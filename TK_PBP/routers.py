@@ -0,0 +1,92 @@
+"""Send reads of read-only views to a replica database.
+
+Views opt in with :class:`authentication.mixins.ReadOnlyMixin` or the
+:func:`read_only` decorator. For ``GET``/``HEAD`` requests to those views
+:class:`TK_PBP.middleware.ReadReplicaMiddleware` enables :func:`replica_reads`
+until the response has been rendered, and :class:`ReadReplicaRouter` then
+routes ORM reads to the ``DATABASE_REPLICA_ALIAS`` connection. Writes, every
+other view and session lookups keep using ``default``.
+
+Replication lag could hide a booking or review the user has just submitted,
+so a successful write request sets a short-lived cookie
+(``REPLICA_PIN_SECONDS``) that keeps that browser on the primary. Without a
+replica alias in ``DATABASES`` the router is a no-op.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE_NAME = "db_primary_pin"
+
+# Apps whose reads must never lag behind their writes.
+PRIMARY_ONLY_APPS = frozenset({"sessions"})
+
+_use_replica: ContextVar[bool] = ContextVar("use_replica", default=False)
+
+
+def replica_alias() -> str | None:
+    """Return the configured replica alias, or ``None`` when there is none."""
+
+    alias = getattr(settings, "DATABASE_REPLICA_ALIAS", "replica")
+    return alias if alias in connections.settings else None
+
+
+def activate_replica_reads() -> Token:
+    """Route ORM reads to the replica until the returned token is reset."""
+
+    return _use_replica.set(True)
+
+
+def deactivate_replica_reads(token: Token | None = None) -> None:
+    """Restore the routing in effect before ``token``, or simply stop using the replica."""
+
+    if token is None:
+        _use_replica.set(False)
+    else:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def replica_reads():
+    """Route ORM reads issued inside the block to the replica."""
+
+    token = activate_replica_reads()
+    try:
+        yield
+    finally:
+        deactivate_replica_reads(token)
+
+
+def read_only(view_func):
+    """Mark a function based view as safe to serve from the replica."""
+
+    view_func.read_only = True
+    return view_func
+
+
+def is_read_only_view(view) -> bool:
+    view_class = getattr(view, "view_class", view)
+    return bool(getattr(view_class, "read_only", False))
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _use_replica.get() or model._meta.app_label in PRIMARY_ONLY_APPS:
+            return None
+        return replica_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
@@ -0,0 +1,202 @@
+"""Declarative serializers for the JSON endpoints and a compact JSON response.
+
+A serializer lists its output keys as :class:`Field` class attributes. Each
+field reads one or more ``.values()`` columns (``category__name`` style) and
+may pass them through ``convert``::
+
+    class VenueCardSerializer(Serializer):
+        __slots__ = ()
+
+        id = Field()
+        category = Field("category__name")
+        price = Field("price_per_hour", convert=str)
+        url = UrlField("venue-detail", "slug", kwarg="slug")
+
+    cards = VenueCardSerializer().rows(Venue.objects.filter(...))
+
+:meth:`Serializer.rows` selects only :meth:`Serializer.columns` with
+``.values()`` and builds the dicts straight from the row mappings, so no
+model instance is created. :meth:`Serializer.serialize_instance` gives the
+same output for an object already loaded (after a create or update),
+following ``__`` through relations. The field plan is compiled once per
+serializer instance, and :class:`UrlField` reverses its URL pattern there
+rather than once per row. Serializers and fields use ``__slots__``;
+subclasses declare ``__slots__ = ()`` to keep it that way.
+
+:class:`CompactJsonResponse` encodes without whitespace, with orjson when
+it is installed (``pip install orjson``) and with the standard library
+otherwise. Values JSON cannot represent natively (``Decimal``, dates and
+times, lazy strings) are encoded as ``DjangoJSONEncoder`` does, so both
+encoders produce the same data.
+"""
+from __future__ import annotations
+
+import json
+from operator import itemgetter
+from typing import Any, AsyncIterator, Callable, ClassVar, Iterable, Mapping
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import HttpResponse
+from django.urls import reverse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+ENCODER = "orjson" if orjson is not None else "json"
+
+# Passed to reverse() as the URL argument and replaced by each row's value.
+_URL_SAMPLE = "0000000000"
+
+_django_default = DjangoJSONEncoder().default
+
+
+def dumps(data: Any) -> bytes:
+    """Encode ``data`` as compact UTF-8 JSON."""
+
+    if orjson is not None:
+        return orjson.dumps(
+            data, default=_django_default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class CompactJsonResponse(HttpResponse):
+    """Like :class:`django.http.JsonResponse`, encoded with :func:`dumps`."""
+
+    def __init__(self, data: Any, safe: bool = True, **kwargs: Any) -> None:
+        if safe and not isinstance(data, dict):
+            raise TypeError("In order to allow non-dict objects to be serialized set the safe parameter to False.")
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
+
+
+def _attribute_getter(source: str) -> Callable[[Any], Any]:
+    path = source.split("__")
+
+    def get(obj: Any) -> Any:
+        for name in path:
+            try:
+                obj = getattr(obj, name)
+            except ObjectDoesNotExist:  # A missing reverse one-to-one.
+                return None
+            if obj is None:
+                return None
+        return obj
+
+    return get
+
+
+class Field:
+    """One output key read from ``sources`` (default: the attribute name).
+
+    With several sources, ``convert`` receives their values as positional
+    arguments.
+    """
+
+    __slots__ = ("name", "sources", "convert")
+
+    def __init__(self, *sources: str, convert: Callable[..., Any] | None = None) -> None:
+        if len(sources) > 1 and convert is None:
+            raise TypeError("A field with several sources needs convert.")
+        self.name = ""
+        self.sources = sources
+        self.convert = convert
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.sources = self.sources or (name,)
+
+    def bind(self) -> Callable[..., Any] | None:
+        """The converter used for one serializer instance."""
+
+        return self.convert
+
+
+class UrlField(Field):
+    """A URL built from one column, reversed once per serializer instance."""
+
+    __slots__ = ("viewname", "kwarg")
+
+    def __init__(self, viewname: str, source: str, *, kwarg: str | None = None) -> None:
+        super().__init__(source)
+        self.viewname = viewname
+        self.kwarg = kwarg
+
+    def _reverse(self, value: Any) -> str:
+        if self.kwarg:
+            return reverse(self.viewname, kwargs={self.kwarg: value})
+        return reverse(self.viewname, args=[value])
+
+    def bind(self) -> Callable[[Any], str]:
+        prefix, sample, suffix = self._reverse(_URL_SAMPLE).rpartition(_URL_SAMPLE)
+        if not sample:  # The converter changed the value; reverse every row.
+            return self._reverse
+        return lambda value: f"{prefix}{value}{suffix}"
+
+
+class Serializer:
+    """Builds JSON-ready dicts from ``.values()`` rows or model instances."""
+
+    __slots__ = ("_row_plan", "_instance_plan")
+
+    fields: ClassVar[tuple[Field, ...]] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        declared = {field.name: field for field in cls.fields}
+        declared.update((name, value) for name, value in vars(cls).items() if isinstance(value, Field))
+        cls.fields = tuple(declared.values())
+
+    def __init__(self) -> None:
+        self._row_plan = []
+        self._instance_plan = []
+        for field in self.fields:
+            convert = field.bind()
+            spread = len(field.sources) > 1
+            self._row_plan.append((field.name, itemgetter(*field.sources), convert, spread))
+            getters = [_attribute_getter(source) for source in field.sources]
+            if spread:
+                get = lambda obj, getters=getters: tuple(getter(obj) for getter in getters)  # noqa: E731
+            else:
+                get = getters[0]
+            self._instance_plan.append((field.name, get, convert, spread))
+
+    @classmethod
+    def columns(cls) -> list[str]:
+        """The ``.values()`` columns the fields read."""
+
+        return list(dict.fromkeys(source for field in cls.fields for source in field.sources))
+
+    @staticmethod
+    def _build(plan: list[tuple], item: Any) -> dict[str, Any]:
+        data = {}
+        for name, get, convert, spread in plan:
+            value = get(item)
+            if convert is not None:
+                value = convert(*value) if spread else convert(value)
+            data[name] = value
+        return data
+
+    def serialize(self, row: Mapping[str, Any]) -> dict[str, Any]:
+        return self._build(self._row_plan, row)
+
+    def serialize_instance(self, obj: Any) -> dict[str, Any]:
+        return self._build(self._instance_plan, obj)
+
+    def many(self, rows: Iterable[Mapping[str, Any]]) -> list[dict[str, Any]]:
+        plan = self._row_plan
+        return [self._build(plan, row) for row in rows]
+
+    def rows(self, queryset: QuerySet) -> list[dict[str, Any]]:
+        """Serialize ``queryset`` without creating model instances."""
+
+        return self.many(queryset.values(*self.columns()))
+
+    async def arows(self, queryset: QuerySet) -> list[dict[str, Any]]:
+        plan = self._row_plan
+        rows: AsyncIterator[Mapping[str, Any]] = queryset.values(*self.columns()).aiterator()
+        return [self._build(plan, row) async for row in rows]
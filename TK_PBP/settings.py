@@ -11,6 +11,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+from importlib.util import find_spec
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
@@ -50,15 +52,21 @@ INSTALLED_APPS = [
     "katalog",
     "rent",
     "interaksi",
+    "benchmarks",
+    "tasks",
+    "TK_PBP",
 ]
 CSRF_COOKIE_SECURE = True
 MIDDLEWARE = [
+    'TK_PBP.middleware.RequestMetricsMiddleware',
+    'TK_PBP.middleware.SlowQueryLogMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'TK_PBP.middleware.ReadReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -89,7 +97,20 @@ ASGI_APPLICATION = "TK_PBP.asgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+
+# SQLite tuning (see TK_PBP/sqlite.py): WAL journaling, synchronous=NORMAL, a
+# bigger page cache, mmap reads and a busy timeout for every connection.
+SQLITE_TUNING = os.getenv('DJANGO_SQLITE_TUNING', '1') == '1'
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -int(os.getenv('DJANGO_SQLITE_CACHE_KB', '65536')),
+    'mmap_size': int(os.getenv('DJANGO_SQLITE_MMAP_BYTES', str(256 * 1024 * 1024))),
+    'busy_timeout': int(os.getenv('DJANGO_SQLITE_BUSY_TIMEOUT_MS', '5000')),
+    'temp_store': 'MEMORY',
+}
 if PRODUCTION:
+    DB_CONN_MAX_AGE = os.getenv('DB_CONN_MAX_AGE', '60')
     # Production: gunakan PostgreSQL dengan kredensial dari environment variables
     DATABASES = {
         'default': {
@@ -99,11 +120,34 @@ if PRODUCTION:
             'PASSWORD': os.getenv('DB_PASSWORD'),
             'HOST': os.getenv('DB_HOST'),
             'PORT': os.getenv('DB_PORT'),
+            # search_path is a startup parameter, so it is sent once when a
+            # connection is opened; keeping connections open keeps it set.
             'OPTIONS': {
                 'options': f"-c search_path={os.getenv('SCHEMA', 'public')}"
-            }
+            },
+            # Seconds a connection is reused across requests (0 closes it after
+            # every request, empty keeps it open indefinitely). Health checks
+            # ping reused connections before a request touches them.
+            'CONN_MAX_AGE': int(DB_CONN_MAX_AGE) if DB_CONN_MAX_AGE else None,
+            'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true',
         }
     }
+    # DB_POOL=True switches to psycopg 3's connection pool (pip install
+    # "psycopg[binary,pool]"). Pooled connections are returned to the pool
+    # after each request, so CONN_MAX_AGE has to be 0.
+    if os.getenv('DB_POOL', 'False').lower() == 'true':
+        # requirements.txt installs psycopg2, which has no pool; fail here
+        # rather than when the first connection is opened.
+        if find_spec('psycopg') is None or find_spec('psycopg_pool') is None:
+            raise ImproperlyConfigured(
+                'DB_POOL=True needs psycopg 3 with its pool: pip install "psycopg[binary,pool]".'
+            )
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+        }
 else:
     # Development: gunakan SQLite
     DATABASES = {
@@ -112,6 +156,64 @@ else:
             'NAME': BASE_DIR / 'db.sqlite3',
         }
     }
+    if SQLITE_TUNING:
+        # Take the write lock when a transaction starts instead of failing
+        # when a read inside it later tries to write.
+        DATABASES['default']['OPTIONS'] = {'transaction_mode': 'IMMEDIATE'}
+
+# Read replica: GET requests to views marked read-only (TK_PBP/routers.py)
+# read from DB_REPLICA_HOST (PostgreSQL) or the DB_REPLICA_NAME file (SQLite).
+# After a successful write a browser stays on the primary for
+# DB_REPLICA_PIN_SECONDS so it sees its own booking or review.
+DATABASE_REPLICA_ALIAS = 'replica'
+if PRODUCTION and os.getenv('DB_REPLICA_HOST'):
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        'TEST': {'MIRROR': 'default'},
+    }
+elif not PRODUCTION and os.getenv('DB_REPLICA_NAME'):
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / os.getenv('DB_REPLICA_NAME'),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['TK_PBP.routers.ReadReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.getenv('DB_REPLICA_PIN_SECONDS', '5'))
+
+# Cache
+# CACHE_BACKEND selects "locmem" (default, per process), "file" (shared by the
+# workers of one host, stored in CACHE_LOCATION) or "redis" (any server that
+# speaks the Redis protocol at CACHE_URL, requires the ``redis`` package).
+# Apps build their keys with TK_PBP.cache.CacheNamespace.
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem').lower()
+CACHE_OPTIONS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ragaspace',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('CACHE_URL', 'redis://127.0.0.1:6379/0'),
+    },
+}
+if CACHE_BACKEND not in CACHE_OPTIONS:
+    raise ImproperlyConfigured(
+        f"CACHE_BACKEND must be one of {', '.join(CACHE_OPTIONS)}, not {CACHE_BACKEND!r}."
+    )
+CACHES = {
+    'default': {
+        **CACHE_OPTIONS[CACHE_BACKEND],
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', '300')),
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', 'ragaspace'),
+    }
+}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -169,3 +271,60 @@ SESSION_COOKIE_SECURE = os.getenv("DJANGO_SESSION_COOKIE_SECURE", "0") == "1"
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
 SECURE_REFERRER_POLICY = "strict-origin"
+
+# Views declaring a ``query_budget`` are checked while this is enabled (see
+# authentication/query_budget.py). Violations are logged with their stack
+# traces, or raised when DJANGO_QUERY_BUDGET_RAISE=1.
+QUERY_BUDGET_ENABLED = os.getenv("DJANGO_QUERY_BUDGET", "1" if DEBUG else "0") == "1"
+QUERY_BUDGET_RAISE = os.getenv("DJANGO_QUERY_BUDGET_RAISE", "0") == "1"
+
+# Per-view request histograms exposed at /workspace/metrics/ (staff only, or
+# with "Authorization: Bearer $DJANGO_METRICS_TOKEN" for scrapers).
+REQUEST_METRICS_ENABLED = os.getenv("DJANGO_REQUEST_METRICS", "1") == "1"
+METRICS_TOKEN = os.getenv("DJANGO_METRICS_TOKEN", "")
+
+# Queries slower than the threshold are logged with their view and calling
+# frame and kept, deduplicated by fingerprint, for /workspace/slow-queries/.
+# A fraction of them (DJANGO_SLOW_QUERY_EXPLAIN_RATE) also get an EXPLAIN plan.
+SLOW_QUERY_LOG_ENABLED = os.getenv("DJANGO_SLOW_QUERY_LOG", "1") == "1"
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("DJANGO_SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_EXPLAIN_RATE = float(os.getenv("DJANGO_SLOW_QUERY_EXPLAIN_RATE", "0.1"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("DJANGO_SLOW_QUERY_LOG_SIZE", "200"))
+
+# Booking lifecycle (rent/lifecycle.py): pending bookings expire after
+# BOOKING_PENDING_TTL_HOURS, approved but unpaid ones after
+# BOOKING_UNPAID_TTL_HOURS, and paid ones complete once they end. Run
+# "manage.py run_booking_lifecycle" from cron, or set
+# DJANGO_BOOKING_LIFECYCLE_INTERVAL (seconds) to run it inside each web worker.
+BOOKING_PENDING_TTL_HOURS = int(os.getenv("DJANGO_BOOKING_PENDING_TTL_HOURS", "48"))
+BOOKING_UNPAID_TTL_HOURS = int(os.getenv("DJANGO_BOOKING_UNPAID_TTL_HOURS", "24"))
+BOOKING_LIFECYCLE_BATCH_SIZE = int(os.getenv("DJANGO_BOOKING_LIFECYCLE_BATCH_SIZE", "500"))
+BOOKING_LIFECYCLE_INTERVAL = int(os.getenv("DJANGO_BOOKING_LIFECYCLE_INTERVAL", "0"))
+
+# Background tasks (tasks/queue.py), run by "manage.py run_task_worker".
+# Outside production tasks run inline when enqueued unless DJANGO_TASKS_EAGER=0.
+TASKS_EAGER = os.getenv("DJANGO_TASKS_EAGER", "0" if PRODUCTION else "1") == "1"
+TASKS_MAX_ATTEMPTS = int(os.getenv("DJANGO_TASKS_MAX_ATTEMPTS", "5"))
+TASKS_RETRY_BACKOFF = float(os.getenv("DJANGO_TASKS_RETRY_BACKOFF", "10"))
+TASKS_RETRY_BACKOFF_MAX = float(os.getenv("DJANGO_TASKS_RETRY_BACKOFF_MAX", "3600"))
+TASKS_LOCK_TIMEOUT = int(os.getenv("DJANGO_TASKS_LOCK_TIMEOUT", "600"))
+
+# Rendered invoices (rent/invoices.py) are stored here, named by content hash.
+INVOICE_ROOT = Path(os.getenv("DJANGO_INVOICE_ROOT", str(BASE_DIR / "var" / "invoices")))
+
+# Idempotency keys (rent/idempotency.py): the outcome of a booking or payment
+# POST sent with an "Idempotency-Key" header or "idempotency_key" form field is
+# replayed for retries within IDEMPOTENCY_KEY_TTL_HOURS. A request that has not
+# finished after IDEMPOTENCY_LOCK_TIMEOUT seconds no longer holds its key.
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("DJANGO_IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv("DJANGO_IDEMPOTENCY_LOCK_TIMEOUT", "60"))
+
+# Payment provider (rent/gateway.py): "instant" confirms payments on the spot,
+# "simulator" uses the gateway simulator ("manage.py run_payment_simulator")
+# at PAYMENT_SIMULATOR_URL, which confirms them with signed webhooks. Webhook
+# signatures older than PAYMENT_WEBHOOK_TOLERANCE seconds are rejected.
+PAYMENT_PROVIDER = os.getenv("DJANGO_PAYMENT_PROVIDER", "instant")
+PAYMENT_SIMULATOR_URL = os.getenv("DJANGO_PAYMENT_SIMULATOR_URL", "http://127.0.0.1:8700")
+PAYMENT_WEBHOOK_SECRET = os.getenv("DJANGO_PAYMENT_WEBHOOK_SECRET", "" if PRODUCTION else "dev-webhook-secret")
+PAYMENT_WEBHOOK_TOLERANCE = int(os.getenv("DJANGO_PAYMENT_WEBHOOK_TOLERANCE", "300"))
+PAYMENT_PROVIDER_TIMEOUT = float(os.getenv("DJANGO_PAYMENT_PROVIDER_TIMEOUT", "5"))
@@ -0,0 +1,215 @@
+"""Slow query log with sampled ``EXPLAIN`` capture.
+
+:class:`TK_PBP.middleware.SlowQueryLogMiddleware` installs a
+:class:`SlowQueryRecorder` on every database connection for the duration of a
+request. Queries slower than ``SLOW_QUERY_THRESHOLD_MS`` are logged together
+with the resolved view and the first application frame that issued them, and
+are folded into the module level :data:`slow_query_log` by SQL fingerprint.
+A sample of them (``SLOW_QUERY_EXPLAIN_RATE``) is re-run through the
+backend's ``EXPLAIN`` so the plan can be read from the workspace page at
+``/workspace/slow-queries/``. The log is a per-process ring buffer holding at
+most ``SLOW_QUERY_LOG_SIZE`` fingerprints.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import random
+import re
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_PROJECT_ROOT = str(Path(settings.BASE_DIR).resolve())
+# Instrumentation modules whose frames never explain where a query came from.
+_IGNORED_PATHS = tuple(
+    str(Path(settings.BASE_DIR).resolve() / path)
+    for path in ("TK_PBP/slow_queries.py", "TK_PBP/middleware.py", "authentication/query_budget.py")
+)
+
+# Set while the recorder runs EXPLAIN so that query does not re-enter the log.
+_explaining = threading.local()
+
+
+def normalize_sql(sql: str) -> str:
+    """Replace literals and placeholder lists so equivalent queries compare equal."""
+
+    normalized = sql.replace("%s", "?")
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint(sql: str) -> str:
+    return hashlib.sha1(normalize_sql(sql).encode()).hexdigest()[:16]
+
+
+def calling_frame() -> str:
+    """Return ``path:line in function`` for the innermost project frame."""
+
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(_PROJECT_ROOT)
+            and "site-packages" not in filename
+            and not filename.startswith(_IGNORED_PATHS)
+        ):
+            relative = filename[len(_PROJECT_ROOT) :].lstrip("/\\")
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+@dataclass
+class SlowQuery:
+    """A slow query fingerprint and the statistics gathered for it."""
+
+    fingerprint: str
+    sql: str
+    normalized_sql: str
+    view: str
+    frame: str
+    count: int
+    total_ms: float
+    max_ms: float
+    first_seen: datetime
+    last_seen: datetime
+    explain: str = ""
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class SlowQueryLog:
+    """Thread-safe ring buffer of slow queries keyed by SQL fingerprint.
+
+    Recording a known fingerprint updates its counters and moves it to the
+    end; once ``size`` fingerprints are held the least recently seen one is
+    dropped.
+    """
+
+    def __init__(self, size: int = 200) -> None:
+        self.size = size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, SlowQuery] = OrderedDict()
+
+    def record(self, sql: str, duration_ms: float, *, view: str, frame: str) -> SlowQuery:
+        key = fingerprint(sql)
+        now = timezone.now()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = SlowQuery(
+                    fingerprint=key,
+                    sql=sql,
+                    normalized_sql=normalize_sql(sql),
+                    view=view,
+                    frame=frame,
+                    count=0,
+                    total_ms=0.0,
+                    max_ms=0.0,
+                    first_seen=now,
+                    last_seen=now,
+                )
+                self._entries[key] = entry
+                while len(self._entries) > self.size:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            entry.count += 1
+            entry.total_ms += duration_ms
+            entry.last_seen = now
+            if duration_ms >= entry.max_ms:
+                entry.max_ms = duration_ms
+                entry.sql = sql
+                entry.view = view
+                entry.frame = frame
+        return entry
+
+    def entries(self) -> list[SlowQuery]:
+        """Return the logged queries, most expensive in total first."""
+
+        with self._lock:
+            entries = list(self._entries.values())
+        return sorted(entries, key=lambda entry: entry.total_ms, reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+slow_query_log = SlowQueryLog(getattr(settings, "SLOW_QUERY_LOG_SIZE", 200))
+
+
+def explain_query(connection, sql: str, params) -> str:
+    """Return the backend's plan for ``sql``; only ``SELECT`` statements are explained."""
+
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return ""
+    prefix = connection.ops.explain_query_prefix()
+    _explaining.active = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}", params)
+            rows = cursor.fetchall()
+    except Exception as exc:  # pragma: no cover - depends on the backend
+        return f"EXPLAIN failed: {exc}"
+    finally:
+        _explaining.active = False
+    return "\n".join(" | ".join(str(value) for value in row) for row in rows)
+
+
+class SlowQueryRecorder:
+    """Database execute wrapper feeding slow queries of one request into the log."""
+
+    __slots__ = ("request", "threshold", "explain_rate", "log")
+
+    def __init__(self, request=None, *, threshold_ms=None, explain_rate=None, log=None) -> None:
+        self.request = request
+        self.threshold = (
+            threshold_ms if threshold_ms is not None else getattr(settings, "SLOW_QUERY_THRESHOLD_MS", 200)
+        ) / 1000
+        self.explain_rate = (
+            explain_rate if explain_rate is not None else getattr(settings, "SLOW_QUERY_EXPLAIN_RATE", 0.1)
+        )
+        self.log = log if log is not None else slow_query_log
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_explaining, "active", False):
+            return execute(sql, params, many, context)
+        started = perf_counter()
+        result = execute(sql, params, many, context)
+        duration = perf_counter() - started
+        if duration >= self.threshold:
+            self.record(sql, params, many, duration, context["connection"])
+        return result
+
+    def record(self, sql, params, many, duration, connection) -> None:
+        match = getattr(self.request, "resolver_match", None)
+        view = match.view_name if match is not None else "<unresolved>"
+        frame = calling_frame()
+        duration_ms = duration * 1000
+        entry = self.log.record(sql, duration_ms, view=view, frame=frame)
+        logger.warning("Slow query (%.1f ms) in %s at %s: %s", duration_ms, view, frame, sql)
+        if not entry.explain and not many and random.random() < self.explain_rate:
+            entry.explain = explain_query(connection, sql, params)
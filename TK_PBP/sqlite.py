@@ -0,0 +1,32 @@
+"""SQLite tuning applied to every new connection.
+
+While ``SQLITE_TUNING`` is enabled each SQLite connection runs the PRAGMAs in
+``SQLITE_PRAGMAS`` (built from the ``DJANGO_SQLITE_*`` variables in the
+settings) as soon as it is opened: WAL journaling so readers never
+block the writer, ``synchronous=NORMAL`` (safe with WAL, no fsync per commit),
+a larger page cache, memory-mapped reads and a ``busy_timeout`` so writers
+queue instead of failing with "database is locked". The settings also open
+transactions with ``BEGIN IMMEDIATE`` so a transaction that reads before it
+writes cannot deadlock on the lock upgrade.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def apply_pragmas(raw_connection, pragmas: dict[str, Any]) -> None:
+    """Run ``PRAGMA name = value`` for each entry on a DB-API connection."""
+
+    for name, value in pragmas.items():
+        raw_connection.execute(f"PRAGMA {name} = {value}")
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs) -> None:
+    if connection.vendor != "sqlite" or not getattr(settings, "SQLITE_TUNING", False):
+        return
+    apply_pragmas(connection.connection, settings.SQLITE_PRAGMAS)
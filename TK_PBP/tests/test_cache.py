@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from ..cache import MAX_KEY_LENGTH, CacheNamespace, make_key
+
+
+class MakeKeyTests(SimpleTestCase):
+    def test_parts_are_joined_under_the_namespace(self):
+        self.assertEqual(make_key("venue", ("detail", 42)), "venue:detail:42")
+        self.assertEqual(make_key("venue", 42), "venue:42")
+        self.assertEqual(make_key("venue", ("list", None)), "venue:list:")
+
+    def test_long_or_spaced_keys_are_hashed(self):
+        self.assertLessEqual(len(make_key("venue", "x" * 500)), MAX_KEY_LENGTH)
+        key = make_key("catalog", ("q", "futsal depok"))
+        self.assertTrue(key.startswith("catalog:#"))
+        self.assertNotIn(" ", key)
+
+    def test_namespace_names_cannot_contain_separators(self):
+        with self.assertRaises(ValueError):
+            CacheNamespace("a:b")
+
+
+class CacheNamespaceBehaviour:
+    """Shared assertions, run once per configured backend."""
+
+    def setUp(self):
+        super().setUp()
+        caches["default"].clear()
+        self.venues = CacheNamespace("venue")
+        self.reviews = CacheNamespace("review")
+
+    def test_get_set_and_delete(self):
+        self.assertIsNone(self.venues.get(("detail", 1)))
+        self.venues.set(("detail", 1), {"name": "Arena"})
+        self.assertEqual(self.venues.get(("detail", 1)), {"name": "Arena"})
+        self.assertTrue(self.venues.delete(("detail", 1)))
+        self.assertEqual(self.venues.get(("detail", 1), "missing"), "missing")
+
+    def test_get_or_set_only_builds_once(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return "payload"
+
+        self.assertEqual(self.venues.get_or_set("list", build), "payload")
+        self.assertEqual(self.venues.get_or_set("list", build), "payload")
+        self.assertEqual(len(calls), 1)
+
+    def test_invalidate_drops_only_its_namespace(self):
+        self.venues.set(("detail", 1), "venue")
+        self.reviews.set(("detail", 1), "review")
+        version = self.venues.version()
+
+        self.assertEqual(self.venues.invalidate(), version + 1)
+
+        self.assertIsNone(self.venues.get(("detail", 1)))
+        self.assertEqual(self.reviews.get(("detail", 1)), "review")
+        self.venues.set(("detail", 1), "fresh")
+        self.assertEqual(self.venues.get(("detail", 1)), "fresh")
+
+    def test_many_operations_round_trip_parts(self):
+        self.venues.set_many({("card", 1): "a", ("card", 2): "b"})
+        found = self.venues.get_many([("card", 1), ("card", 2), ("card", 3)])
+        self.assertEqual(found, {("card", 1): "a", ("card", 2): "b"})
+
+    def test_add_does_not_overwrite(self):
+        self.assertTrue(self.venues.add("lock", "first"))
+        self.assertFalse(self.venues.add("lock", "second"))
+        self.assertEqual(self.venues.get("lock"), "first")
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "cache-tests"}}
+)
+class LocMemCacheNamespaceTests(CacheNamespaceBehaviour, SimpleTestCase):
+    pass
+
+
+class FileCacheNamespaceTests(CacheNamespaceBehaviour, SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.enterClassContext(
+            override_settings(
+                CACHES={
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                        "LOCATION": cls.cache_dir,
+                    }
+                }
+            )
+        )
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.cache_dir, ignore_errors=True)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve, reverse
+
+from ..metrics import MetricsRegistry, registry
+from ..middleware import RequestMetricsMiddleware
+
+
+class MetricsRegistryTests(TestCase):
+    def test_render_outputs_cumulative_prometheus_histograms(self):
+        metrics = MetricsRegistry()
+        metrics.observe_request("catalog", 0.004, 3, 0.001, 0.002, 2000)
+        metrics.observe_request("catalog", 0.2, 12, 0.05, 0.1, 300)
+
+        output = metrics.render()
+
+        self.assertIn("# TYPE ragaspace_request_duration_seconds histogram", output)
+        self.assertIn('ragaspace_request_duration_seconds_bucket{view="catalog",le="0.005"} 1', output)
+        self.assertIn('ragaspace_request_duration_seconds_bucket{view="catalog",le="0.25"} 2', output)
+        self.assertIn('ragaspace_request_duration_seconds_bucket{view="catalog",le="+Inf"} 2', output)
+        self.assertIn('ragaspace_request_duration_seconds_count{view="catalog"} 2', output)
+        self.assertIn('ragaspace_db_queries_bucket{view="catalog",le="5"} 1', output)
+        self.assertIn('ragaspace_response_size_bytes_sum{view="catalog"} 2300', output)
+
+    def test_label_values_are_escaped(self):
+        metrics = MetricsRegistry()
+        metrics.observe_request('we"ird\\view', 0.1, 0, 0.0, 0.0, 0)
+        self.assertIn('view="we\\"ird\\\\view"', metrics.render())
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.user = get_user_model().objects.create_user(username="member", password="pass")
+        self.admin = get_user_model().objects.create_user(username="boss", password="pass", is_staff=True)
+
+    def test_requests_are_recorded_per_url_name(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse("catalog"))
+
+        histograms = registry.snapshot()["catalog"]
+        self.assertEqual(histograms["request_duration_seconds"].count, 1)
+        self.assertGreater(histograms["db_queries"].total, 0)
+        self.assertGreater(histograms["template_render_seconds"].total, 0)
+        self.assertGreater(histograms["response_size_bytes"].total, 0)
+
+    def test_metrics_endpoint_is_admin_only(self):
+        self.client.force_login(self.user)
+        self.assertRedirects(self.client.get(reverse("admin-metrics")), reverse("home"), fetch_redirect_response=False)
+
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("admin-metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn("ragaspace_request_duration_seconds_bucket", response.content.decode())
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_metrics_endpoint_accepts_bearer_token(self):
+        response = self.client.get(reverse("admin-metrics"), HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(reverse("admin-metrics"), HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 302)
+
+    def test_middleware_records_one_sample_per_request(self):
+        request = RequestFactory().get("/catalog/")
+        request.resolver_match = resolve("/catalog/")
+        middleware = RequestMetricsMiddleware(lambda req: HttpResponse(b"x" * 512))
+
+        middleware(request)
+        middleware(request)
+
+        histograms = registry.snapshot()["catalog"]
+        self.assertEqual(histograms["request_duration_seconds"].count, 2)
+        self.assertEqual(histograms["db_queries"].total, 0)
+        self.assertEqual(histograms["response_size_bytes"].total, 1024)
+        output = registry.render()
+        self.assertIn('ragaspace_request_duration_seconds_count{view="catalog"} 2', output)
+        self.assertIn('ragaspace_response_size_bytes_bucket{view="catalog",le="+Inf"} 2', output)
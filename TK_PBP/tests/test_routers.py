@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.db import connections
+from django.test import TestCase
+from django.urls import reverse
+
+from manajemen_lapangan.models import Category, Venue
+
+from ..routers import PIN_COOKIE_NAME, ReadReplicaRouter, replica_alias, replica_reads
+
+REPLICA = "replica"
+
+
+class ReplicaDatabaseMixin:
+    """Attach a second SQLite file as the ``replica`` alias for the test class.
+
+    The alias is added after the class-wide setup, so rows created in
+    :meth:`setUpReplica` are committed and only per-test writes are rolled
+    back. Nothing replicates
+    between the two databases, which makes it easy to see which one served a
+    read.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.replica_dir = tempfile.mkdtemp()
+        settings_dict = dict(connections["default"].settings_dict)
+        settings_dict["NAME"] = str(Path(cls.replica_dir) / "replica.sqlite3")
+        connections.settings[REPLICA] = settings_dict
+        cls.databases = cls.databases | {REPLICA}
+        # Build the schema directly: the data migrations only write to default.
+        with connections[REPLICA].schema_editor() as editor:
+            for model in apps.get_models():
+                editor.create_model(model)
+        cls.setUpReplica()
+
+    @classmethod
+    def setUpReplica(cls):
+        pass
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.databases = cls.databases - {REPLICA}
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        shutil.rmtree(cls.replica_dir, ignore_errors=True)
+        super().tearDownClass()
+
+
+def create_venue(alias: str, name: str) -> Venue:
+    category, _ = Category.objects.using(alias).get_or_create(slug="futsal", defaults={"name": "Futsal"})
+    return Venue.objects.using(alias).create(
+        category=category,
+        name=name,
+        slug=name.lower().replace(" ", "-"),
+        description="Indoor pitch",
+        location="Depok",
+        city="Depok",
+        price_per_hour=100000,
+        facilities="Parking",
+    )
+
+
+class ReadReplicaRouterTests(ReplicaDatabaseMixin, TestCase):
+    def test_reads_go_to_the_replica_only_inside_replica_reads(self):
+        router = ReadReplicaRouter()
+        self.assertEqual(replica_alias(), REPLICA)
+        self.assertIsNone(router.db_for_read(Venue))
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Venue), REPLICA)
+            self.assertIsNone(router.db_for_read(Session))
+            self.assertEqual(router.db_for_write(Venue), "default")
+        self.assertIsNone(router.db_for_read(Venue))
+
+
+class ReadReplicaViewTests(ReplicaDatabaseMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="reader", password="pass")
+        cls.primary_venue = create_venue("default", "Primary Arena")
+
+    @classmethod
+    def setUpReplica(cls):
+        # The replica would have received the account through replication.
+        get_user_model().objects.using(REPLICA).create(pk=cls.user.pk, username="reader", password=cls.user.password)
+        create_venue(REPLICA, "Replica Arena")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_read_only_views_are_served_from_the_replica(self):
+        response = self.client.get(reverse("catalog"))
+        self.assertContains(response, "Replica Arena")
+        self.assertNotContains(response, "Primary Arena")
+
+        payload = self.client.get(reverse("catalog-filter")).json()
+        self.assertEqual([venue["name"] for venue in payload["venues"]], ["Replica Arena"])
+
+        self.assertEqual(self.client.get(reverse("venue-detail", args=["replica-arena"])).status_code, 200)
+        self.assertEqual(self.client.get(reverse("venue-detail", args=["primary-arena"])).status_code, 404)
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        response = self.client.post(reverse("wishlist-toggle-api", args=[self.primary_venue.pk]))
+        self.assertLess(response.status_code, 400)
+        self.assertIn(PIN_COOKIE_NAME, response.cookies)
+
+        response = self.client.get(reverse("catalog"))
+        self.assertContains(response, "Primary Arena")
+        self.assertNotContains(response, "Replica Arena")
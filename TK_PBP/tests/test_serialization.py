@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import lazy
+
+from add_on.models import AddOn
+from manajemen_lapangan.models import Category, Venue
+from manajemen_lapangan.serializers import VenueSerializer, serialize_venues
+from rent.models import Booking
+from rent.serializers import BookingSerializer
+
+from .. import serialization
+from ..serialization import CompactJsonResponse, Field, Serializer, UrlField, dumps
+
+
+class PriceSerializer(Serializer):
+    __slots__ = ()
+
+    id = Field()
+    label = Field("name", "price_per_hour", convert=lambda name, price: f"{name} @ {price}")
+    category = Field("category__name")
+    url = UrlField("venue-detail", "slug", kwarg="slug")
+
+
+class EncoderTests(SimpleTestCase):
+    data = {
+        "price": Decimal("150000.00"),
+        "at": datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+        "opens": time(7, 30),
+        "label": lazy(lambda: "Padel", str)(),
+        "ids": [1, 2],
+        3: "non-string key",
+        "name": "Lapangan Café",
+    }
+
+    def test_encoders_agree_with_the_django_encoder(self):
+        expected = json.loads(json.dumps(self.data, cls=DjangoJSONEncoder))
+        self.assertEqual(json.loads(dumps(self.data)), expected)
+        with mock.patch.object(serialization, "orjson", None):
+            fallback = dumps(self.data)
+        self.assertEqual(json.loads(fallback), expected)
+        self.assertNotIn(b", ", fallback)
+
+    def test_response_rejects_non_dicts_unless_unsafe(self):
+        with self.assertRaises(TypeError):
+            CompactJsonResponse([1])
+        response = CompactJsonResponse([1], safe=False, status=201)
+        self.assertEqual(
+            (response.status_code, response["Content-Type"], response.content), (201, "application/json", b"[1]")
+        )
+
+
+class SerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.venue = Venue.objects.create(
+            category=Category.objects.get(slug="padel"),
+            name="Slotted Court",
+            slug="slotted-court",
+            description="Padel court",
+            location="Jakarta",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Locker",
+            available_start_time=time(8),
+        )
+        AddOn.objects.create(venue=cls.venue, name="Balls", description="", price=Decimal("15000.00"))
+
+    def test_fields_and_columns_follow_the_declaration(self):
+        self.assertEqual([field.name for field in PriceSerializer.fields], ["id", "label", "category", "url"])
+        self.assertEqual(PriceSerializer.columns(), ["id", "name", "price_per_hour", "category__name", "slug"])
+        self.assertFalse(hasattr(PriceSerializer(), "__dict__"))
+        with self.assertRaises(TypeError):
+            Field("a", "b")
+
+    def test_rows_match_instances_without_creating_models(self):
+        serializer = PriceSerializer()
+        queryset = Venue.objects.filter(pk=self.venue.pk)
+        with mock.patch.object(Venue, "__init__", side_effect=AssertionError), self.assertNumQueries(1):
+            (row,) = serializer.rows(queryset)
+        self.assertEqual(row, serializer.serialize_instance(self.venue))
+        self.assertEqual(
+            row,
+            {
+                "id": self.venue.pk,
+                "label": "Slotted Court @ 100000.00",
+                "category": "Padel",
+                "url": reverse("venue-detail", kwargs={"slug": "slotted-court"}),
+            },
+        )
+
+    def test_url_field_matches_reverse(self):
+        plain = UrlField("wishlist-toggle-api", "id").bind()
+        keyword = UrlField("admin-venue-edit", "id", kwarg="pk").bind()
+        self.assertEqual(plain(42), reverse("wishlist-toggle-api", args=[42]))
+        self.assertEqual(keyword(1000), reverse("admin-venue-edit", kwargs={"pk": 1000}))
+
+    def test_venue_rows_include_add_ons_in_two_queries(self):
+        with self.assertNumQueries(2):
+            (payload,) = serialize_venues(Venue.objects.filter(pk=self.venue.pk))
+        self.assertEqual(payload["available_start_time"], "08:00")
+        self.assertEqual(payload["category"], {"id": self.venue.category_id, "name": "Padel"})
+        self.assertEqual([addon["price"] for addon in payload["addons"]], ["15000.00"])
+        self.assertEqual({**VenueSerializer().serialize_instance(self.venue), "addons": payload["addons"]}, payload)
+
+    def test_booking_rows_match_the_model_totals(self):
+        user = get_user_model().objects.create_user(username="serial", password="pass")
+        start = timezone.now() + timedelta(days=1)
+        booking = Booking.objects.create(
+            user=user, venue=self.venue, start_datetime=start, end_datetime=start + timedelta(hours=3)
+        )
+        booking.addons.set(self.venue.addons.all())
+        booking.ensure_payment()
+
+        (row,) = BookingSerializer().rows(BookingSerializer.annotate(Booking.objects.filter(pk=booking.pk)))
+        booking = Booking.objects.select_related("venue", "payment").get(pk=booking.pk)
+        self.assertEqual(row, BookingSerializer().serialize_instance(booking))
+        self.assertEqual((row["total_cost"], row["addons_total"]), ("315000.00", "15000.00"))
+        self.assertEqual(row["payment"]["reference_code"], booking.payment.reference_code)
+
+        booking.payment.delete()
+        (row,) = BookingSerializer().rows(BookingSerializer.annotate(Booking.objects.filter(pk=booking.pk)))
+        self.assertIsNone(row["payment"])
+        booking.addons.clear()
+        (row,) = BookingSerializer().rows(BookingSerializer.annotate(Booking.objects.filter(pk=booking.pk)))
+        self.assertEqual((row["total_cost"], row["addons_total"]), ("300000.00", "0.00"))
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..slow_queries import SlowQueryLog, SlowQueryRecorder, fingerprint, normalize_sql, slow_query_log
+
+
+class FingerprintTests(TestCase):
+    def test_literals_and_placeholder_lists_are_normalised(self):
+        first = 'SELECT "id" FROM "venue" WHERE "city" = \'Depok\' AND "id" IN (%s, %s, %s) LIMIT 21'
+        second = 'SELECT  "id" FROM "venue"\nWHERE "city" = \'Bogor\' AND "id" IN (%s) LIMIT 5'
+
+        self.assertEqual(normalize_sql(first), 'SELECT "id" FROM "venue" WHERE "city" = ? AND "id" IN (...) LIMIT ?')
+        self.assertEqual(fingerprint(first), fingerprint(second))
+        self.assertNotEqual(fingerprint(first), fingerprint('SELECT "name" FROM "venue"'))
+
+
+class SlowQueryLogTests(TestCase):
+    def test_entries_are_deduplicated_and_bounded(self):
+        log = SlowQueryLog(size=2)
+        log.record("SELECT 1 FROM a WHERE id = 1", 300.0, view="catalog", frame="katalog/views.py:1 in get")
+        log.record("SELECT 1 FROM a WHERE id = 2", 500.0, view="catalog", frame="katalog/views.py:1 in get")
+        log.record("SELECT 1 FROM b", 250.0, view="home", frame="katalog/views.py:9 in get")
+
+        entries = log.entries()
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[0].count, 2)
+        self.assertEqual(entries[0].total_ms, 800.0)
+        self.assertEqual(entries[0].max_ms, 500.0)
+        self.assertTrue(entries[0].sql.endswith("id = 2"))
+
+        log.record("SELECT 1 FROM c", 250.0, view="home", frame="katalog/views.py:9 in get")
+        fingerprints = {entry.fingerprint for entry in log.entries()}
+        self.assertNotIn(fingerprint("SELECT 1 FROM a"), fingerprints)
+
+
+class SlowQueryRecorderTests(TestCase):
+    def test_slow_selects_are_logged_with_frame_and_plan(self):
+        log = SlowQueryLog()
+        recorder = SlowQueryRecorder(threshold_ms=0, explain_rate=1.0, log=log)
+
+        with self.assertLogs("TK_PBP.slow_queries", "WARNING"):
+            with connection.execute_wrapper(recorder):
+                get_user_model().objects.filter(username="nobody").exists()
+
+        (entry,) = log.entries()
+        self.assertEqual(entry.view, "<unresolved>")
+        self.assertIn("TK_PBP/tests/test_slow_queries.py", entry.frame)
+        self.assertTrue(entry.explain)
+
+    def test_fast_queries_are_ignored(self):
+        log = SlowQueryLog()
+        with connection.execute_wrapper(SlowQueryRecorder(threshold_ms=10_000, log=log)):
+            get_user_model().objects.count()
+        self.assertEqual(len(log), 0)
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_EXPLAIN_RATE=0)
+class SlowQueryWorkspaceTests(TestCase):
+    def setUp(self):
+        slow_query_log.clear()
+        self.admin = get_user_model().objects.create_user(username="boss", password="pass", is_staff=True)
+
+    def test_requests_feed_the_log_and_admins_can_browse_it(self):
+        self.client.force_login(self.admin)
+        with self.assertLogs("TK_PBP.slow_queries", "WARNING"):
+            self.client.get(reverse("catalog"))
+            self.assertTrue(any(entry.view == "catalog" for entry in slow_query_log.entries()))
+
+            response = self.client.get(reverse("admin-slow-queries"))
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, "catalog")
+
+            response = self.client.post(reverse("admin-slow-queries"))
+            self.assertRedirects(response, reverse("admin-slow-queries"), fetch_redirect_response=False)
+
+    def test_members_cannot_browse_the_log(self):
+        member = get_user_model().objects.create_user(username="member", password="pass")
+        self.client.force_login(member)
+        with self.assertLogs("TK_PBP.slow_queries", "WARNING"):
+            response = self.client.get(reverse("admin-slow-queries"))
+        self.assertRedirects(response, reverse("home"), fetch_redirect_response=False)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+
+class SQLiteTuningTests(TestCase):
+    def test_new_connections_get_the_tuning_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], settings.SQLITE_PRAGMAS["busy_timeout"])
+            cursor.execute("PRAGMA cache_size")
+            self.assertEqual(cursor.fetchone()[0], settings.SQLITE_PRAGMAS["cache_size"])
+
+    def test_transactions_take_the_write_lock_immediately(self):
+        self.assertEqual(connection.settings_dict["OPTIONS"].get("transaction_mode"), "IMMEDIATE")
+
+    def test_maintenance_refuses_to_run_inside_a_transaction(self):
+        with self.assertRaisesMessage(CommandError, "inside a transaction"):
+            call_command("sqlite_maintenance", stdout=StringIO())
+
+
+class SQLiteMaintenanceTests(TransactionTestCase):
+    def test_runs_analyze_vacuum_and_checkpoint(self):
+        output = StringIO()
+        call_command("sqlite_maintenance", "--vacuum", stdout=output)
+        for step in ("ANALYZE", "VACUUM", "WAL checkpoint", "completed"):
+            self.assertIn(step, output.getvalue())
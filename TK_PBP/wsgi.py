@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'TK_PBP.settings')
 
 application = get_wsgi_application()
+
+# Periodic booking transitions, when DJANGO_BOOKING_LIFECYCLE_INTERVAL is set.
+from rent.lifecycle import start_scheduler  # noqa: E402
+
+start_scheduler()
@@ -5,6 +5,8 @@ from django.contrib.auth.mixins import UserPassesTestMixin
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import ensure_csrf_cookie
 
+from .query_budget import call_with_budget
+
 
 class AdminRequiredMixin(UserPassesTestMixin):
     """Mixin ensuring the current user is an administrator."""
@@ -26,3 +28,28 @@ class EnsureCsrfCookieMixin:
     @method_decorator(ensure_csrf_cookie)
     def dispatch(self, request, *args, **kwargs):  # type: ignore[override]
         return super().dispatch(request, *args, **kwargs)
+
+
+class QueryBudgetMixin:
+    """Check the number of database queries a view issues against ``query_budget``.
+
+    The budget covers safe methods only; ``POST`` and other writes are not checked.
+
+    Place the mixin first in the bases so authentication and session queries
+    are part of the count. See :mod:`authentication.query_budget`.
+    """
+
+    query_budget: int | None = None
+
+    def dispatch(self, request, *args, **kwargs):  # type: ignore[override]
+        label = f"{type(self).__module__}.{type(self).__qualname__}"
+        return call_with_budget(label, self.query_budget, super().dispatch, request, *args, **kwargs)
+
+
+class ReadOnlyMixin:
+    """Mark a view as safe to serve ``GET`` requests from the read replica.
+
+    Only reads are routed; see :mod:`TK_PBP.routers`.
+    """
+
+    read_only = True
@@ -0,0 +1,124 @@
+"""Per-view database query budgets.
+
+Views declare the maximum number of queries they are expected to issue, either
+with :class:`authentication.mixins.QueryBudgetMixin` (``query_budget = 6``) or
+with the :func:`query_budget` decorator for function based views. Budgets are
+sized for reads and only apply to safe methods (``GET``, ``HEAD``, ``OPTIONS``,
+``TRACE``); writes such as a booking ``POST`` are not checked. While
+``QUERY_BUDGET_ENABLED`` is true (it defaults to ``DEBUG``) every query issued
+during the request, including those triggered while a ``TemplateResponse`` is
+rendered, is counted. Exceeding the budget logs a warning listing each query
+with the Python stack that issued it; with ``QUERY_BUDGET_RAISE`` enabled a
+:class:`QueryBudgetExceeded` error is raised instead, which is what the tests
+rely on.
+"""
+from __future__ import annotations
+
+import logging
+import traceback
+from functools import wraps
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a view goes over its declared query budget."""
+
+
+def budget_enabled() -> bool:
+    return getattr(settings, "QUERY_BUDGET_ENABLED", settings.DEBUG)
+
+
+class QueryBudgetTracker:
+    """Database execute wrapper counting the queries issued for one request."""
+
+    def __init__(self, label: str, budget: int) -> None:
+        self.label = label
+        self.budget = budget
+        self.queries: list[tuple[str, str]] = []
+        self._connections: list = []
+
+    def __call__(self, execute, sql, params, many, context):
+        stack = "".join(traceback.format_stack(limit=12)[:-1])
+        self.queries.append((sql, stack))
+        return execute(sql, params, many, context)
+
+    def start(self) -> None:
+        for connection in connections.all():
+            connection.execute_wrappers.append(self)
+            self._connections.append(connection)
+
+    def stop(self) -> None:
+        for connection in self._connections:
+            try:
+                connection.execute_wrappers.remove(self)
+            except ValueError:  # pragma: no cover - wrapper already removed
+                pass
+        self._connections = []
+        if len(self.queries) > self.budget:
+            self.report()
+
+    def report(self) -> None:
+        details = "\n".join(
+            f"--- query {index}: {sql}\n{stack}" for index, (sql, stack) in enumerate(self.queries, start=1)
+        )
+        message = f"{self.label} issued {len(self.queries)} queries, over its budget of {self.budget}."
+        logger.warning("%s\n%s", message, details)
+        if getattr(settings, "QUERY_BUDGET_RAISE", False):
+            raise QueryBudgetExceeded(message)
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+
+def call_with_budget(
+    label: str, budget: int | None, view: Callable[..., Any], request: HttpRequest, *args: Any, **kwargs: Any
+):
+    """Call ``view`` and check its queries against ``budget`` for safe methods.
+
+    Unrendered template responses are checked once rendering has finished so
+    lazily evaluated querysets in templates are included in the count.
+    """
+
+    if budget is None or request.method not in SAFE_METHODS or not budget_enabled():
+        return view(request, *args, **kwargs)
+    tracker = QueryBudgetTracker(label, budget)
+    tracker.start()
+    try:
+        response = view(request, *args, **kwargs)
+    except BaseException:
+        tracker.stop()
+        raise
+    if getattr(response, "is_rendered", True) is False:
+        response.add_post_render_callback(lambda rendered: tracker.stop())
+    else:
+        tracker.stop()
+    return response
+
+
+def query_budget(budget: int):
+    """Declare the query budget of a function based view."""
+
+    def decorator(view_func):
+        label = f"{view_func.__module__}.{view_func.__qualname__}"
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            return call_with_budget(label, budget, view_func, request, *args, **kwargs)
+
+        _wrapped_view.query_budget = budget
+        return _wrapped_view
+
+    return decorator
+
+
+def view_query_budget(view) -> int | None:
+    """Return the budget declared by a view function, class or ``as_view()`` result."""
+
+    view_class = getattr(view, "view_class", view)
+    return getattr(view_class, "query_budget", None)
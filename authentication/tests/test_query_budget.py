@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.template import engines
+from django.template.response import TemplateResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.views import View
+
+from ..mixins import QueryBudgetMixin
+from ..query_budget import QueryBudgetExceeded, query_budget, view_query_budget
+
+
+def _count_users() -> int:
+    return get_user_model().objects.count()
+
+
+class TwoQueryView(QueryBudgetMixin, View):
+    query_budget = 1
+
+    def get(self, request):
+        _count_users()
+        _count_users()
+        return HttpResponse("ok")
+
+    post = get
+
+
+class LazyTemplateView(QueryBudgetMixin, View):
+    query_budget = 1
+
+    def get(self, request):
+        template = engines["django"].from_string("{{ users.count }}{{ users.exists }}")
+        return TemplateResponse(request, template, {"users": get_user_model().objects.all()})
+
+
+@query_budget(2)
+def function_view(request):
+    _count_users()
+    return HttpResponse("ok")
+
+
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get("/")
+
+    @override_settings(QUERY_BUDGET_ENABLED=True)
+    def test_violation_is_logged_with_stack(self):
+        with self.assertLogs("authentication.query_budget", level="WARNING") as logs:
+            response = TwoQueryView.as_view()(self.request)
+        self.assertEqual(response.status_code, 200)
+        output = "\n".join(logs.output)
+        self.assertIn("issued 2 queries, over its budget of 1", output)
+        self.assertIn("_count_users", output)
+
+    @override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_RAISE=True)
+    def test_template_rendering_counts_towards_budget(self):
+        response = LazyTemplateView.as_view()(self.request)
+        with self.assertLogs("authentication.query_budget", level="WARNING"):
+            with self.assertRaises(QueryBudgetExceeded):
+                response.render()
+
+    @override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_RAISE=True)
+    def test_function_view_within_budget(self):
+        self.assertEqual(function_view(self.request).status_code, 200)
+        self.assertEqual(view_query_budget(function_view), 2)
+        self.assertEqual(view_query_budget(TwoQueryView.as_view()), 1)
+
+    @override_settings(QUERY_BUDGET_ENABLED=False, QUERY_BUDGET_RAISE=True)
+    def test_disabled_budget_is_not_checked(self):
+        self.assertEqual(TwoQueryView.as_view()(self.request).status_code, 200)
+
+    @override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_RAISE=True)
+    def test_writes_are_not_checked(self):
+        with self.assertNoLogs("authentication.query_budget", level="WARNING"):
+            response = TwoQueryView.as_view()(RequestFactory().post("/"))
+        self.assertEqual(response.status_code, 200)
@@ -8,7 +8,7 @@ from django.contrib.auth import logout
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LoginView
 from django.db.models import Count
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse, reverse_lazy
 from django.views import View
@@ -18,9 +18,10 @@ from interaksi.models import Wishlist
 from katalog.filters import VenueFilter
 from manajemen_lapangan.models import Venue
 from rent.models import Booking, Payment
+from TK_PBP.serialization import CompactJsonResponse
 
 from .forms import LoginForm, RegistrationForm
-from .mixins import AdminRequiredMixin, EnsureCsrfCookieMixin
+from .mixins import AdminRequiredMixin, EnsureCsrfCookieMixin, ReadOnlyMixin
 
 
 
@@ -38,7 +39,7 @@ class AuthLoginView(LoginView):
     def form_valid(self, form):
         response = super().form_valid(form)
         if self._wants_json():
-            return JsonResponse({"success": True, "redirect_url": response["Location"]})
+            return CompactJsonResponse({"success": True, "redirect_url": response["Location"]})
         return response
 
     def form_invalid(self, form):
@@ -52,7 +53,7 @@ class AuthLoginView(LoginView):
                 "non_field_errors": error_data.pop("__all__", []),
                 "errors": error_data,
             }
-            return JsonResponse(payload, status=400)
+            return CompactJsonResponse(payload, status=400)
         return super().form_invalid(form)
 
 
@@ -84,7 +85,7 @@ class RegisterView(FormView):
         return super().form_valid(form)
 
 
-class HomeView(EnsureCsrfCookieMixin, TemplateView):
+class HomeView(ReadOnlyMixin, EnsureCsrfCookieMixin, TemplateView):
     template_name = "authentication/home.html"
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
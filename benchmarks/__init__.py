@@ -0,0 +1,4 @@
+"""Performance benchmarks for the request hot paths.
+
+Run them with ``python manage.py run_benchmarks``; see :mod:`benchmarks.runner`.
+"""
@@ -0,0 +1,114 @@
+"""Time and memory of building the catalog filter cards.
+
+Three paths produce the same cards for the venues in the database:
+
+* ``instances``: the former ``_venue_card`` loop over model instances with
+  ``select_related("category")``, truncating each full description with
+  ``Truncator`` and calling ``reverse()`` twice per card.
+* ``values``: :class:`katalog.serializers.VenueCardSerializer` rows read
+  with ``.values()``, still selecting the whole description.
+* ``values+substr``: the catalog view's path, where
+  :meth:`~katalog.serializers.VenueCardSerializer.annotate` cuts the
+  description in the database.
+
+Each path runs ``repeat`` times and the fastest run is kept. Peak memory is
+traced with :mod:`tracemalloc` in a separate run, since tracing slows the
+timed code down. Both are reported per 1k cards.
+"""
+from __future__ import annotations
+
+import tracemalloc
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Any, Callable
+
+from django.urls import reverse
+from django.utils.text import Truncator
+
+from katalog.serializers import CARD_DESCRIPTION_LENGTH, VenueCardSerializer, card_description
+from manajemen_lapangan.models import Venue
+from TK_PBP.serialization import Field
+
+
+@dataclass
+class CardTiming:
+    path: str
+    cards: int
+    build_ms: float
+    peak_kib: float
+
+    @property
+    def ms_per_1k(self) -> float:
+        return self.build_ms * 1000 / self.cards if self.cards else 0.0
+
+    @property
+    def kib_per_1k(self) -> float:
+        return self.peak_kib * 1000 / self.cards if self.cards else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "ms_per_1k": round(self.ms_per_1k, 3), "kib_per_1k": round(self.kib_per_1k, 3)}
+
+
+class _FullDescriptionCardSerializer(VenueCardSerializer):
+    __slots__ = ()
+
+    description = Field(convert=card_description)
+
+
+def _instance_card(venue: Venue) -> dict[str, Any]:
+    return {
+        "id": venue.id,
+        "name": venue.name,
+        "city": venue.city,
+        "price": str(venue.price_per_hour),
+        "category": venue.category.name,
+        "image_url": venue.image_url,
+        "url": reverse("venue-detail", kwargs={"slug": venue.slug}),
+        "description": Truncator(venue.description).chars(CARD_DESCRIPTION_LENGTH),
+        "toggle_url": reverse("wishlist-toggle-api", args=[venue.id]),
+    }
+
+
+def _build_instances() -> list[dict[str, Any]]:
+    return [_instance_card(venue) for venue in Venue.objects.select_related("category").order_by("name")]
+
+
+def _build_values() -> list[dict[str, Any]]:
+    return _FullDescriptionCardSerializer().rows(Venue.objects.order_by("name"))
+
+
+def _build_substr() -> list[dict[str, Any]]:
+    return VenueCardSerializer().rows(VenueCardSerializer.annotate(Venue.objects.order_by("name")))
+
+
+PATHS: list[tuple[str, Callable[[], list[dict[str, Any]]]]] = [
+    ("instances", _build_instances),
+    ("values", _build_values),
+    ("values+substr", _build_substr),
+]
+
+
+def _peak_kib(build: Callable[[], list]) -> float:
+    tracemalloc.start()
+    try:
+        build()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def measure_cards(*, repeat: int = 3) -> list[CardTiming]:
+    """Time and trace every path over the venues currently in the database."""
+
+    results = []
+    for name, build in PATHS:
+        build()  # Warm the URL resolver and the query compiler.
+        best_ms = float("inf")
+        cards = 0
+        for _ in range(repeat):
+            started = perf_counter()
+            cards = len(build())
+            best_ms = min(best_ms, (perf_counter() - started) * 1000)
+        results.append(CardTiming(name, cards, best_ms, _peak_kib(build)))
+    return results
@@ -0,0 +1,177 @@
+"""Concurrent load against the WSGI and the ASGI request handler.
+
+:func:`run_wsgi_load` models a threaded WSGI server: ``concurrency`` threads
+each drive a :class:`django.test.Client`, so at most that many requests are in
+flight. :func:`run_asgi_load` drives :class:`django.test.AsyncClient` from
+``concurrency`` coroutines on one event loop, which is how an ASGI server such
+as uvicorn runs the app: async views yield to the loop while they wait on the
+cache or the database, and sync views and ORM calls still get a thread per
+request from ``sync_to_async``.
+
+Both return a :class:`LoadResult` for the same scenario and request count, so
+their throughput and tail latency can be compared directly. Every worker logs
+in as its own user so write scenarios do not contend on a single row.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import AsyncClient, Client
+
+from .runner import summarise
+from .scenarios import BenchmarkContext, Scenario
+
+
+@dataclass
+class LoadResult:
+    handler: str
+    scenario: str
+    requests: int
+    concurrency: int
+    failures: int
+    elapsed_s: float
+    latency_ms: dict[str, float]
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second."""
+
+        return self.requests / self.elapsed_s if self.elapsed_s else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "throughput": self.throughput}
+
+
+def worker_users(scenario: Scenario, context: BenchmarkContext, concurrency: int) -> list[Any]:
+    """Return the user each worker logs in as.
+
+    Member scenarios spread the workers over distinct regular users (reusing
+    them when there are fewer users than workers); other scenarios use the
+    context's user for every worker.
+    """
+
+    if scenario.user != "member":
+        return [getattr(context, scenario.user, None)] * concurrency
+    users = list(get_user_model().objects.filter(is_staff=False).order_by("pk")[:concurrency]) or [context.member]
+    return [users[index % len(users)] for index in range(concurrency)]
+
+
+def _asgi_kwargs(extra: dict[str, Any]) -> dict[str, Any]:
+    # The async client takes headers by name rather than as WSGI environ keys.
+    kwargs = {key: value for key, value in extra.items() if not key.startswith("HTTP_")}
+    headers = {key[5:].replace("_", "-"): value for key, value in extra.items() if key.startswith("HTTP_")}
+    if headers:
+        kwargs["headers"] = headers
+    return kwargs
+
+
+def run_wsgi_load(
+    scenario: Scenario,
+    context: BenchmarkContext,
+    *,
+    requests: int = 200,
+    concurrency: int = 8,
+) -> LoadResult:
+    clients = []
+    for user in worker_users(scenario, context, concurrency):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        clients.append(client)
+    latencies: list[float] = []
+    failures = 0
+    lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        nonlocal failures
+        client = clients[index]
+        try:
+            for iteration in range(index, requests, concurrency):
+                method, path, extra = scenario.build(context, iteration)
+                started = perf_counter()
+                response = getattr(client, method)(path, **extra)
+                elapsed = (perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    failures += not scenario.succeeded(response)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+    started = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed_s = perf_counter() - started
+    return LoadResult(
+        "wsgi",
+        scenario.name,
+        len(latencies),
+        concurrency,
+        failures,
+        elapsed_s,
+        summarise(latencies, [], 0)["latency_ms"],
+    )
+
+
+def run_asgi_load(
+    scenario: Scenario,
+    context: BenchmarkContext,
+    *,
+    requests: int = 200,
+    concurrency: int = 8,
+) -> LoadResult:
+    clients = []
+    for user in worker_users(scenario, context, concurrency):
+        client = AsyncClient()
+        if user is not None:
+            client.force_login(user)
+        clients.append(client)
+    latencies: list[float] = []
+    failures = 0
+
+    async def worker(index: int) -> None:
+        nonlocal failures
+        client = clients[index]
+        for iteration in range(index, requests, concurrency):
+            method, path, extra = scenario.build(context, iteration)
+            started = perf_counter()
+            response = await getattr(client, method)(path, **_asgi_kwargs(extra))
+            latencies.append((perf_counter() - started) * 1000)
+            failures += not scenario.succeeded(response)
+
+    async def main() -> float:
+        started = perf_counter()
+        await asyncio.gather(*(worker(index) for index in range(concurrency)))
+        return perf_counter() - started
+
+    elapsed_s = asyncio.run(main())
+    return LoadResult(
+        "asgi",
+        scenario.name,
+        len(latencies),
+        concurrency,
+        failures,
+        elapsed_s,
+        summarise(latencies, [], 0)["latency_ms"],
+    )
+
+
+def compare_handlers(
+    scenario: Scenario,
+    context: BenchmarkContext,
+    *,
+    requests: int = 200,
+    concurrency: int = 8,
+) -> list[LoadResult]:
+    return [
+        run_wsgi_load(scenario, context, requests=requests, concurrency=concurrency),
+        run_asgi_load(scenario, context, requests=requests, concurrency=concurrency),
+    ]
@@ -0,0 +1,90 @@
+"""Per-request cost of opening, reusing and health-checking DB connections.
+
+:func:`measure_connection_overhead` replays the connection handling Django
+performs around every request (``close_if_unusable_or_obsolete`` when the
+request starts and finishes) with one trivial query in between, under a
+given ``CONN_MAX_AGE``/``CONN_HEALTH_CHECKS`` combination. Comparing modes
+shows what persistent connections save per request; on PostgreSQL this
+includes the TCP/TLS handshake, authentication and the ``search_path``
+startup option.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from time import perf_counter
+
+from django.db.backends.signals import connection_created
+
+from .runner import summarise
+
+# (label, CONN_MAX_AGE, CONN_HEALTH_CHECKS) for every compared mode.
+CONNECTION_MODES = (
+    ("per_request", 0, False),
+    ("persistent", 600, False),
+    ("persistent_health_checks", 600, True),
+)
+
+
+@dataclass
+class ConnectionOverhead:
+    mode: str
+    requests: int
+    connections_opened: int
+    latency_ms: dict[str, float]
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def measure_connection_overhead(
+    connection,
+    *,
+    mode: str,
+    conn_max_age: int | None,
+    health_checks: bool,
+    requests: int = 200,
+) -> ConnectionOverhead:
+    """Time ``requests`` simulated request cycles on ``connection``.
+
+    The connection's settings are restored afterwards and it is closed, so
+    the next caller starts from a cold connection as well.
+    """
+
+    settings_dict = connection.settings_dict
+    previous = settings_dict["CONN_MAX_AGE"], settings_dict["CONN_HEALTH_CHECKS"]
+    opened = 0
+
+    def _count(sender, connection, **kwargs):
+        nonlocal opened
+        if connection is target:
+            opened += 1
+
+    target = connection
+    connection.close()
+    settings_dict["CONN_MAX_AGE"] = conn_max_age
+    settings_dict["CONN_HEALTH_CHECKS"] = health_checks
+    connection_created.connect(_count)
+    samples = []
+    try:
+        for _ in range(requests):
+            started = perf_counter()
+            connection.close_if_unusable_or_obsolete()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            connection.close_if_unusable_or_obsolete()
+            samples.append((perf_counter() - started) * 1000)
+    finally:
+        connection_created.disconnect(_count)
+        settings_dict["CONN_MAX_AGE"], settings_dict["CONN_HEALTH_CHECKS"] = previous
+        connection.close()
+    return ConnectionOverhead(mode, requests, opened, summarise(samples, [], 0)["latency_ms"])
+
+
+def compare_connection_modes(connection, *, requests: int = 200) -> list[ConnectionOverhead]:
+    return [
+        measure_connection_overhead(
+            connection, mode=mode, conn_max_age=max_age, health_checks=health_checks, requests=requests
+        )
+        for mode, max_age, health_checks in CONNECTION_MODES
+    ]
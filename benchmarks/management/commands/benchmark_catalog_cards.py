@@ -0,0 +1,50 @@
+"""Compare building catalog cards from model instances and from .values() rows."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from benchmarks.catalog_cards import measure_cards
+from benchmarks.serialization import create_venues
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the catalog filter cards for --venues venues with --description-length character "
+        "descriptions through the former model-instance path and the .values() serializer, with and "
+        "without cutting descriptions in the database. Reports time and peak memory per 1k cards on a "
+        "throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--venues", type=int, default=5000)
+        parser.add_argument("--description-length", type=int, default=2000)
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per path; the fastest is kept.")
+        parser.add_argument("--output", help="Write the JSON results to this file.")
+
+    def handle(self, *args, **options):
+        if options["venues"] < 1 or options["repeat"] < 1 or options["description_length"] < 0:
+            raise CommandError("--venues and --repeat must be positive and --description-length not negative.")
+        description = ("Lapangan indoor dengan ruang ganti, parkir dan kafe. " * 100)[: options["description_length"]]
+
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            create_venues(options["venues"], addons_per_venue=0, prefix="cards", description=description)
+            results = measure_cards(repeat=options["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(f"{'path':<14} {'cards':>7} {'build':>11} {'per 1k':>11} {'peak/1k':>12}")
+        for result in results:
+            self.stdout.write(
+                f"{result.path:<14} {result.cards:>7} {result.build_ms:>9.1f}ms {result.ms_per_1k:>9.1f}ms "
+                f"{result.kib_per_1k:>8.0f}KiB"
+            )
+        if options["output"]:
+            payload = {"description_length": len(description), "results": [result.as_dict() for result in results]}
+            Path(options["output"]).write_text(json.dumps(payload, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
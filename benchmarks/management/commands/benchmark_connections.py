@@ -0,0 +1,43 @@
+"""Compare the per-request cost of fresh, persistent and health-checked DB connections."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from benchmarks.connections import compare_connection_modes
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay Django's per-request connection handling against the configured database "
+        "with CONN_MAX_AGE=0, persistent connections and persistent connections with health checks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--output", help="Write the JSON results to this file.")
+
+    def handle(self, *args, **options):
+        if options["database"] not in connections:
+            raise CommandError(f"Unknown database alias {options['database']!r}.")
+        connection = connections[options["database"]]
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            raise CommandError("In-memory SQLite connections are never closed; point the benchmark at a file.")
+
+        results = compare_connection_modes(connection, requests=options["requests"])
+
+        self.stdout.write(f"{'mode':<26} {'opened':>7} {'p50':>9} {'p95':>9} {'mean':>9}")
+        for result in results:
+            latency = result.latency_ms
+            self.stdout.write(
+                f"{result.mode:<26} {result.connections_opened:>7} {latency['p50']:>7.3f}ms "
+                f"{latency['p95']:>7.3f}ms {latency['mean']:>7.3f}ms"
+            )
+        if options["output"]:
+            payload = {"vendor": connection.vendor, "modes": [result.as_dict() for result in results]}
+            Path(options["output"]).write_text(json.dumps(payload, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
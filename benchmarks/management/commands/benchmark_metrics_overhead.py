@@ -0,0 +1,29 @@
+"""Measure the per-request overhead of the request metrics middleware."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.metrics_overhead import measure_metrics_overhead
+
+
+class Command(BaseCommand):
+    help = (
+        "Time a resolved request through a bare handler and through RequestMetricsMiddleware, and fail "
+        "when the middleware adds more than --limit microseconds per request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rounds", type=int, default=5000, help="Requests per timed run.")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs; the smallest overhead is kept.")
+        parser.add_argument("--limit", type=float, default=50.0, help="Allowed overhead in microseconds.")
+
+    def handle(self, *args, **options):
+        if options["rounds"] < 1 or options["repeat"] < 1:
+            raise CommandError("--rounds and --repeat must be positive.")
+        result = measure_metrics_overhead(rounds=options["rounds"], repeat=options["repeat"])
+        self.stdout.write(
+            f"bare {result.bare_us:.2f}us, with metrics {result.wrapped_us:.2f}us, "
+            f"overhead {result.overhead_us:.2f}us per request"
+        )
+        if result.overhead_us > options["limit"]:
+            raise CommandError(f"Metrics overhead {result.overhead_us:.2f}us is over {options['limit']}us.")
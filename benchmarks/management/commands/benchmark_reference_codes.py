@@ -0,0 +1,22 @@
+"""Measure how fast payment reference codes are generated."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.reference_codes import measure_generation
+
+
+class Command(BaseCommand):
+    help = "Generate reference codes one at a time and in one batch, and report codes per second."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1_000_000, help="Codes generated per mode.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'mode':<8} {'codes':>10} {'seconds':>8} {'codes/s':>12}")
+        for result in measure_generation(options["count"]):
+            self.stdout.write(
+                f"{result.mode:<8} {result.codes:>10} {result.seconds:>8.3f} {result.codes_per_second:>12,.0f}"
+            )
+            if not result.ordered:
+                raise CommandError(f"{result.mode} generation produced duplicate or unordered codes.")
@@ -0,0 +1,52 @@
+"""Compare serialising the venue admin payload from model instances and from .values() rows."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from benchmarks.serialization import create_venues, measure_serialization
+from TK_PBP.serialization import ENCODER
+
+
+class Command(BaseCommand):
+    help = (
+        "Serialise 1k and 10k venues with their add-ons through the former model-instance path and the "
+        ".values() serializers, with the standard library and orjson encoders, on a throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000], help="Venue counts.")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per path; the fastest is kept.")
+        parser.add_argument("--output", help="Write the JSON results to this file.")
+
+    def handle(self, *args, **options):
+        sizes = sorted(options["sizes"])
+        if sizes[0] < 1 or options["repeat"] < 1:
+            raise CommandError("--sizes and --repeat must be positive.")
+        self.stdout.write(f"Fast encoder: {ENCODER}")
+        self.stdout.write(f"{'path':<14} {'venues':>7} {'build':>11} {'encode':>11} {'total':>11} {'bytes':>10}")
+
+        results = []
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            created = 0
+            for size in sizes:
+                create_venues(size - created, prefix=f"serial{size}")
+                created = size
+                for result in measure_serialization(repeat=options["repeat"]):
+                    results.append(result)
+                    self.stdout.write(
+                        f"{result.path:<14} {result.venues:>7} {result.build_ms:>9.1f}ms {result.encode_ms:>9.1f}ms "
+                        f"{result.total_ms:>9.1f}ms {result.bytes:>10}"
+                    )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options["output"]:
+            payload = {"encoder": ENCODER, "results": [result.as_dict() for result in results]}
+            Path(options["output"]).write_text(json.dumps(payload, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
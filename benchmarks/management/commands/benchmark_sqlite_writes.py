@@ -0,0 +1,35 @@
+"""Compare concurrent SQLite write throughput with and without the tuning mode."""
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.sqlite_writes import measure_write_throughput
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a read-then-insert workload from several threads against scratch SQLite files, "
+        "once with SQLite's defaults and once with the project's tuning PRAGMAs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--writes", type=int, default=200, help="Transactions per thread.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'mode':<8} {'committed':>10} {'locked':>7} {'writes/s':>10}")
+        with tempfile.TemporaryDirectory() as directory:
+            for tuned in (False, True):
+                result = measure_write_throughput(
+                    str(Path(directory) / f"writes-{int(tuned)}.sqlite3"),
+                    tuned=tuned,
+                    threads=options["threads"],
+                    writes_per_thread=options["writes"],
+                )
+                self.stdout.write(
+                    f"{result.mode:<8} {result.committed:>5}/{result.attempted:<4} {result.locked_errors:>7} "
+                    f"{result.writes_per_second:>10.0f}"
+                )
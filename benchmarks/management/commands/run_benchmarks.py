@@ -0,0 +1,118 @@
+"""Run the request benchmarks and optionally compare them with a baseline."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from benchmarks.runner import BenchmarkRunner, compare_results
+from benchmarks.scenarios import SCENARIO_MAP, SCENARIOS
+from manajemen_lapangan.load_data import LoadDataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the request hot paths with Django's test client. By default a "
+        "throwaway test database is created and filled by the load-data generator."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=sorted(SCENARIO_MAP),
+            help="Scenario to run (repeatable). Defaults to all scenarios.",
+        )
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--output", help="Write the JSON results to this file.")
+        parser.add_argument("--baseline", help="JSON results of a previous run to compare against.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Allowed latency growth over the baseline as a fraction (default 0.2 = 20%%).",
+        )
+        parser.add_argument(
+            "--metric",
+            default="p95",
+            choices=["p50", "p90", "p95", "p99", "mean"],
+            help="Latency statistic compared against the baseline.",
+        )
+        parser.add_argument(
+            "--use-current-db",
+            action="store_true",
+            help="Benchmark the configured database as-is instead of a generated test database. "
+            "Write scenarios will add rows to it.",
+        )
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--venues", type=int, default=100)
+        parser.add_argument("--history-days", type=int, default=60)
+        parser.add_argument("--bookings-per-day", type=float, default=3.0)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            try:
+                baseline = json.loads(Path(options["baseline"]).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Unable to read baseline: {exc}") from exc
+
+        scenarios = [SCENARIO_MAP[name] for name in options["scenario"]] if options["scenario"] else SCENARIOS
+        runner = BenchmarkRunner(scenarios, iterations=options["iterations"], warmup=options["warmup"])
+
+        if options["use_current_db"]:
+            results = runner.run()
+        else:
+            results = self._run_on_test_database(runner, options)
+
+        self._report(results)
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(results, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
+
+        problems = [
+            f"{name}: {result['failures']} of {result['iterations']} requests failed"
+            for name, result in results["scenarios"].items()
+            if result["failures"]
+        ]
+        if baseline is not None:
+            problems.extend(
+                compare_results(results, baseline, threshold=options["threshold"], metric=options["metric"])
+            )
+        if problems:
+            raise CommandError("Benchmark regressions detected:\n" + "\n".join(problems))
+        self.stdout.write(self.style.SUCCESS("Benchmarks completed."))
+
+    def _run_on_test_database(self, runner: BenchmarkRunner, options) -> dict:
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stdout.write("Generating benchmark dataset...")
+            summary = LoadDataGenerator(
+                users=options["users"],
+                venues=options["venues"],
+                history_days=options["history_days"],
+                future_days=14,
+                bookings_per_day=options["bookings_per_day"],
+                seed=options["seed"],
+                prefix="bench",
+            ).generate()
+            results = runner.run()
+            results["meta"]["dataset"] = {"seed": options["seed"], **summary.as_dict()}
+            return results
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def _report(self, results: dict) -> None:
+        header = f"{'scenario':<20} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8}"
+        self.stdout.write(header)
+        for name, result in results["scenarios"].items():
+            latency = result["latency_ms"]
+            self.stdout.write(
+                f"{name:<20} {latency['p50']:>8.2f}ms {latency['p95']:>7.2f}ms {latency['p99']:>7.2f}ms "
+                f"{result['queries']['max']:>8}"
+            )
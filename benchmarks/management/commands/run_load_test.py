@@ -0,0 +1,105 @@
+"""Compare throughput of the WSGI and ASGI handlers under concurrent load."""
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from benchmarks.concurrency import compare_handlers
+from benchmarks.scenarios import SCENARIO_MAP, BenchmarkContext
+from manajemen_lapangan.load_data import LoadDataGenerator
+
+DEFAULT_SCENARIOS = ["catalog_filter", "wishlist_toggle"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Send the same concurrent requests through the WSGI handler (one thread per worker) "
+        "and the ASGI handler (one coroutine per worker) and report throughput and latency. "
+        "By default a throwaway database file is created and filled by the load-data generator."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=sorted(SCENARIO_MAP),
+            help=f"Scenario to run (repeatable). Defaults to {', '.join(DEFAULT_SCENARIOS)}.",
+        )
+        parser.add_argument("--requests", type=int, default=400)
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--output", help="Write the JSON results to this file.")
+        parser.add_argument(
+            "--use-current-db",
+            action="store_true",
+            help="Load test the configured database as-is. Write scenarios will add rows to it.",
+        )
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--venues", type=int, default=100)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1 or options["requests"] < 1:
+            raise CommandError("--requests and --concurrency must be positive.")
+        names = options["scenario"] or DEFAULT_SCENARIOS
+        if options["use_current_db"]:
+            results = self._run(names, options)
+        else:
+            results = self._run_on_test_database(names, options)
+
+        self.stdout.write(
+            f"{'scenario':<20} {'handler':<8} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'failed':>7}"
+        )
+        for result in results:
+            latency = result.latency_ms
+            self.stdout.write(
+                f"{result.scenario:<20} {result.handler:<8} {result.throughput:>9.1f} {latency['p50']:>7.2f}ms "
+                f"{latency['p95']:>7.2f}ms {latency['p99']:>7.2f}ms {result.failures:>7}"
+            )
+        if options["output"]:
+            payload = {
+                "vendor": connection.vendor,
+                "concurrency": options["concurrency"],
+                "results": [result.as_dict() for result in results],
+            }
+            Path(options["output"]).write_text(json.dumps(payload, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def _run(self, names, options):
+        context = BenchmarkContext.from_database()
+        results = []
+        for name in names:
+            results.extend(
+                compare_handlers(
+                    SCENARIO_MAP[name],
+                    context,
+                    requests=options["requests"],
+                    concurrency=options["concurrency"],
+                )
+            )
+        return results
+
+    def _run_on_test_database(self, names, options):
+        old_name = connection.settings_dict["NAME"]
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == "sqlite":
+                # Worker threads need their own connections to a real file, not
+                # the shared in-memory test database.
+                connection.settings_dict["TEST"]["NAME"] = str(Path(directory) / "load_test.sqlite3")
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                self.stdout.write("Generating load test dataset...")
+                LoadDataGenerator(
+                    users=options["users"],
+                    venues=options["venues"],
+                    history_days=30,
+                    future_days=14,
+                    seed=options["seed"],
+                    prefix="load",
+                ).generate()
+                return self._run(names, options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
@@ -0,0 +1,79 @@
+"""Replay a burst of signed payment webhooks and drain the resulting queue."""
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from benchmarks.webhooks import replay_webhooks
+from manajemen_lapangan.load_data import LoadDataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Post --webhooks signed payment webhooks (with --duplicate-rate redeliveries) from --concurrency "
+        "threads, report the endpoint's throughput and latency, then drain the task queue and report the "
+        "apply rate. Runs on a throwaway database file filled by the load-data generator."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--webhooks", type=int, default=10_000)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--duplicate-rate", type=float, default=0.1)
+        parser.add_argument("--output", help="Write the JSON results to this file.")
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--venues", type=int, default=100)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1 or options["webhooks"] < 1:
+            raise CommandError("--webhooks and --concurrency must be positive.")
+        if not 0 <= options["duplicate_rate"] < 1:
+            raise CommandError("--duplicate-rate must be at least 0 and below 1.")
+        result = self._run_on_test_database(options)
+
+        latency = result.latency_ms
+        self.stdout.write(
+            f"ingest: {result.webhooks} webhooks in {result.ingest_s:.2f}s ({result.ingest_rate:.1f}/s), "
+            f"p50 {latency['p50']:.2f}ms, p95 {latency['p95']:.2f}ms, p99 {latency['p99']:.2f}ms; "
+            f"{result.accepted} queued, {result.duplicates} duplicates, {result.failures} failed"
+        )
+        self.stdout.write(
+            f"apply: {result.applied} webhooks ({result.tasks_run} tasks) in {result.apply_s:.2f}s "
+            f"({result.apply_rate:.1f}/s); "
+            + ", ".join(f"{status} {count}" for status, count in result.events.items())
+        )
+        if options["output"]:
+            payload = {"vendor": connection.vendor, **result.as_dict()}
+            Path(options["output"]).write_text(json.dumps(payload, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def _run_on_test_database(self, options):
+        old_name = connection.settings_dict["NAME"]
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == "sqlite":
+                # Worker threads need their own connections to a real file, not
+                # the shared in-memory test database.
+                connection.settings_dict["TEST"]["NAME"] = str(Path(directory) / "webhook_load_test.sqlite3")
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                self.stdout.write("Generating load test dataset...")
+                LoadDataGenerator(
+                    users=options["users"],
+                    venues=options["venues"],
+                    history_days=30,
+                    future_days=14,
+                    seed=options["seed"],
+                    prefix="load",
+                ).generate()
+                return replay_webhooks(
+                    webhooks=options["webhooks"],
+                    concurrency=options["concurrency"],
+                    duplicate_rate=options["duplicate_rate"],
+                    seed=options["seed"],
+                )
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
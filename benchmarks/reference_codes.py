@@ -0,0 +1,43 @@
+"""Throughput of the payment reference code generator.
+
+Generation sits on the booking path (one code per payment) and on the bulk
+paths (recurring series, the load-data generator), so both the per-call and
+the batch API are timed. Each run uses a fresh generator and checks that the
+codes it produced are unique and in ascending order.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from time import perf_counter
+
+from rent.reference_codes import ReferenceCodeGenerator
+
+
+@dataclass
+class GenerationRate:
+    mode: str
+    codes: int
+    seconds: float
+    ordered: bool
+
+    @property
+    def codes_per_second(self) -> float:
+        return self.codes / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "codes_per_second": round(self.codes_per_second)}
+
+
+def measure_generation(count: int = 1_000_000) -> list[GenerationRate]:
+    results = []
+    for mode in ("single", "batch"):
+        generator = ReferenceCodeGenerator()
+        started = perf_counter()
+        if mode == "single":
+            codes = [generator() for _ in range(count)]
+        else:
+            codes = generator.batch(count)
+        seconds = perf_counter() - started
+        ordered = len(set(codes)) == count and all(a < b for a, b in zip(codes, codes[1:]))
+        results.append(GenerationRate(mode, count, seconds, ordered))
+    return results
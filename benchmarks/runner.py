@@ -0,0 +1,154 @@
+"""Benchmark runner measuring latency percentiles and query counts.
+
+Each scenario is replayed through Django's test :class:`~django.test.Client`
+against whatever database is currently configured. Results are plain
+dictionaries so they can be dumped to JSON and compared between runs with
+:func:`compare_results`.
+"""
+from __future__ import annotations
+
+import math
+import platform
+import statistics
+from datetime import datetime, timezone as dt_timezone
+from time import perf_counter
+from typing import Any, Iterable
+
+import django
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .scenarios import SCENARIOS, BenchmarkContext, Scenario
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the ``pct`` percentile of ``samples`` using linear interpolation."""
+
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return ordered[int(rank)]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarise(latencies_ms: list[float], query_counts: list[int], failures: int) -> dict[str, Any]:
+    summary: dict[str, Any] = {
+        "iterations": len(latencies_ms),
+        "failures": failures,
+        "latency_ms": {
+            "min": round(min(latencies_ms), 3) if latencies_ms else 0.0,
+            "mean": round(statistics.fmean(latencies_ms), 3) if latencies_ms else 0.0,
+            "max": round(max(latencies_ms), 3) if latencies_ms else 0.0,
+        },
+        "queries": {
+            "min": min(query_counts, default=0),
+            "mean": round(statistics.fmean(query_counts), 2) if query_counts else 0.0,
+            "max": max(query_counts, default=0),
+        },
+    }
+    for pct in PERCENTILES:
+        summary["latency_ms"][f"p{pct}"] = round(percentile(latencies_ms, pct), 3)
+    return summary
+
+
+class BenchmarkRunner:
+    """Replay scenarios and collect latency and query statistics."""
+
+    def __init__(
+        self,
+        scenarios: Iterable[Scenario] = SCENARIOS,
+        *,
+        iterations: int = 50,
+        warmup: int = 5,
+        context: BenchmarkContext | None = None,
+    ) -> None:
+        self.scenarios = list(scenarios)
+        self.iterations = iterations
+        self.warmup = warmup
+        self.context = context
+
+    def _client_for(self, scenario: Scenario, context: BenchmarkContext) -> Client:
+        client = Client()
+        user = getattr(context, scenario.user, None)
+        if user is not None:
+            client.force_login(user)
+        return client
+
+    def run_scenario(self, scenario: Scenario, context: BenchmarkContext) -> dict[str, Any]:
+        client = self._client_for(scenario, context)
+        latencies: list[float] = []
+        queries: list[int] = []
+        failures = 0
+        for iteration in range(self.warmup + self.iterations):
+            method, path, extra = scenario.build(context, iteration)
+            with CaptureQueriesContext(connection) as captured:
+                started = perf_counter()
+                response = getattr(client, method)(path, **extra)
+                elapsed = (perf_counter() - started) * 1000
+            if iteration < self.warmup:
+                continue
+            latencies.append(elapsed)
+            queries.append(len(captured.captured_queries))
+            if not scenario.succeeded(response):
+                failures += 1
+        result = summarise(latencies, queries, failures)
+        result["view"] = scenario.view
+        return result
+
+    def run(self) -> dict[str, Any]:
+        context = self.context or BenchmarkContext.from_database()
+        return {
+            "meta": {
+                "created_at": datetime.now(dt_timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "iterations": self.iterations,
+                "warmup": self.warmup,
+            },
+            "scenarios": {
+                scenario.name: self.run_scenario(scenario, context) for scenario in self.scenarios
+            },
+        }
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    threshold: float = 0.2,
+    metric: str = "p95",
+) -> list[str]:
+    """Return human readable regressions of ``current`` against ``baseline``.
+
+    A scenario regresses when its ``metric`` latency grows by more than
+    ``threshold`` (a fraction, ``0.2`` meaning 20%) or when it issues more
+    queries in the worst case than the baseline did.
+    """
+
+    regressions: list[str] = []
+    for name, result in current.get("scenarios", {}).items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        now_latency = result["latency_ms"][metric]
+        old_latency = previous["latency_ms"][metric]
+        if old_latency and now_latency > old_latency * (1 + threshold):
+            regressions.append(
+                f"{name}: {metric} latency {now_latency:.2f}ms exceeds baseline "
+                f"{old_latency:.2f}ms by more than {threshold:.0%}"
+            )
+        if result["queries"]["max"] > previous["queries"]["max"]:
+            regressions.append(
+                f"{name}: {result['queries']['max']} queries, baseline was {previous['queries']['max']}"
+            )
+        if result["failures"] > previous.get("failures", 0):
+            regressions.append(f"{name}: {result['failures']} failed requests")
+    return regressions
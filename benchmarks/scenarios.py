@@ -0,0 +1,150 @@
+"""Request scenarios exercised by the benchmark runner."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Any, Callable
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.urls import reverse
+from django.utils import timezone
+
+from manajemen_lapangan.models import Venue
+from rent.models import Booking
+
+XHR = {"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"}
+
+
+@dataclass
+class BenchmarkContext:
+    """Objects from the benchmark dataset that scenarios send requests about."""
+
+    member: Any
+    admin: Any
+    venue: Venue
+    city: str
+    booking_day: datetime
+
+    @classmethod
+    def from_database(cls) -> "BenchmarkContext":
+        """Pick representative rows from an already populated database."""
+
+        user_model = get_user_model()
+        member = (
+            user_model.objects.filter(is_staff=False)
+            .annotate(booking_count=Count("bookings"))
+            .order_by("-booking_count", "pk")
+            .first()
+        )
+        if member is None:
+            raise LookupError("The benchmark dataset has no regular users.")
+        admin, _ = user_model.objects.get_or_create(
+            username="benchmark-admin",
+            defaults={"is_staff": True, "is_superuser": True},
+        )
+        venue = Venue.objects.annotate(review_count=Count("reviews")).order_by("-review_count", "pk").first()
+        if venue is None:
+            raise LookupError("The benchmark dataset has no venues.")
+        # Bookings are created far beyond any generated history so they never
+        # collide with existing rows.
+        last = Booking.objects.order_by("-end_datetime").values_list("end_datetime", flat=True).first()
+        first_day = max(timezone.localdate(last) if last else timezone.localdate(), timezone.localdate())
+        booking_day = datetime.combine(first_day + timedelta(days=30), time(0), tzinfo=timezone.get_current_timezone())
+        return cls(member=member, admin=admin, venue=venue, city=venue.city, booking_day=booking_day)
+
+
+RequestSpec = tuple[str, str, dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A single request type to benchmark.
+
+    ``build`` receives the context and the iteration number and returns the
+    HTTP method, path and extra keyword arguments for :class:`django.test.Client`.
+    ``check`` optionally validates a response beyond its status code.
+    """
+
+    name: str
+    view: str
+    build: Callable[[BenchmarkContext, int], RequestSpec]
+    user: str = "member"
+    expected_status: tuple[int, ...] = (200,)
+    check: Callable[[Any], bool] | None = None
+
+    def succeeded(self, response) -> bool:
+        if response.status_code not in self.expected_status:
+            return False
+        return self.check is None or self.check(response)
+
+
+def _catalog(ctx: BenchmarkContext, iteration: int) -> RequestSpec:
+    return "get", reverse("catalog"), {"data": {"city": ctx.city}}
+
+
+def _catalog_filter(ctx: BenchmarkContext, iteration: int) -> RequestSpec:
+    return "get", reverse("catalog-filter"), {"data": {"city": ctx.city}, **XHR}
+
+
+def _venue_detail(ctx: BenchmarkContext, iteration: int) -> RequestSpec:
+    return "get", reverse("venue-detail", kwargs={"slug": ctx.venue.slug}), {}
+
+
+def _home(ctx: BenchmarkContext, iteration: int) -> RequestSpec:
+    return "get", reverse("home"), {}
+
+
+def _venue_availability(ctx: BenchmarkContext, iteration: int) -> RequestSpec:
+    start = timezone.localdate(ctx.booking_day)
+    data = {"start": start.isoformat(), "end": (start + timedelta(days=6)).isoformat()}
+    return "get", reverse("venue-availability", kwargs={"slug": ctx.venue.slug}), {"data": data, **XHR}
+
+
+def _booked_places_json(ctx: BenchmarkContext, iteration: int) -> RequestSpec:
+    return "get", reverse("booked-places-json"), {}
+
+
+def _wishlist_toggle(ctx: BenchmarkContext, iteration: int) -> RequestSpec:
+    return "post", reverse("wishlist-toggle-api", kwargs={"pk": ctx.venue.pk}), {**XHR}
+
+
+def _booking_create(ctx: BenchmarkContext, iteration: int) -> RequestSpec:
+    # Two-hour slots laid out back to back, one per iteration.
+    start = ctx.booking_day + timedelta(hours=2 * iteration)
+    end = start + timedelta(hours=2)
+    payload = {
+        "start_datetime": timezone.localtime(start).strftime("%Y-%m-%dT%H:%M"),
+        "end_datetime": timezone.localtime(end).strftime("%Y-%m-%dT%H:%M"),
+        "notes": "Benchmark booking",
+    }
+    return "post", reverse("venue-detail", kwargs={"slug": ctx.venue.slug}), {"data": payload}
+
+
+def _booking_accepted(response) -> bool:
+    return response.get("Location", "").endswith(reverse("booked-places"))
+
+
+def _admin_venue_api(ctx: BenchmarkContext, iteration: int) -> RequestSpec:
+    return "get", reverse("admin-venues-api"), {**XHR}
+
+
+SCENARIOS: list[Scenario] = [
+    Scenario("catalog", "katalog.views.CatalogView", _catalog),
+    Scenario("catalog_filter", "katalog.views.catalog_filter", _catalog_filter),
+    Scenario("venue_detail", "katalog.views.VenueDetailView", _venue_detail),
+    Scenario("home", "authentication.views.HomeView", _home),
+    Scenario("venue_availability", "rent.views.VenueAvailabilityJSONView", _venue_availability),
+    Scenario("booked_places_json", "rent.views.BookedPlacesJSONView", _booked_places_json),
+    Scenario("wishlist_toggle", "interaksi.views.wishlist_toggle", _wishlist_toggle),
+    Scenario(
+        "booking_create",
+        "katalog.views.VenueDetailView.post",
+        _booking_create,
+        expected_status=(302,),
+        check=_booking_accepted,
+    ),
+    Scenario("admin_venue_api", "manajemen_lapangan.views.AdminVenueApiView.get", _admin_venue_api, user="admin"),
+]
+
+SCENARIO_MAP: dict[str, Scenario] = {scenario.name: scenario for scenario in SCENARIOS}
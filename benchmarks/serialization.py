@@ -0,0 +1,160 @@
+"""Cost of serialising the venue admin API payload.
+
+Three paths produce the same JSON for the venues in the database:
+
+* ``instances``: the former ``serialize_venue`` loop. Venues are loaded as
+  model instances with their category and add-ons, each dict is built by
+  hand with a ``reverse()`` per URL, and the payload is encoded like
+  ``JsonResponse`` (``DjangoJSONEncoder``).
+* ``values+json``: :func:`manajemen_lapangan.serializers.serialize_venues`
+  builds the dicts from ``.values()`` rows, encoded with the standard
+  library fallback of :func:`TK_PBP.serialization.dumps`.
+* ``values+orjson``: the same rows encoded with orjson, when installed.
+
+Building (queries included) and encoding are timed separately; each path
+runs ``repeat`` times and the fastest run is kept.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from time import perf_counter
+from typing import Any, Callable
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.urls import reverse
+
+from add_on.models import AddOn
+from manajemen_lapangan.models import Category, Venue
+from manajemen_lapangan.serializers import serialize_venues
+from TK_PBP import serialization
+
+
+@dataclass
+class SerializationTiming:
+    path: str
+    venues: int
+    build_ms: float
+    encode_ms: float
+    bytes: int
+
+    @property
+    def total_ms(self) -> float:
+        return self.build_ms + self.encode_ms
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "total_ms": round(self.total_ms, 3)}
+
+
+def _instance_payload(venue: Venue) -> dict[str, Any]:
+    return {
+        "id": venue.pk,
+        "name": venue.name,
+        "slug": venue.slug,
+        "description": venue.description,
+        "location": venue.location,
+        "city": venue.city,
+        "address": venue.address,
+        "price_per_hour": str(venue.price_per_hour),
+        "capacity": venue.capacity,
+        "facilities": venue.facilities,
+        "image_url": venue.image_url,
+        "available_start_time": venue.available_start_time.strftime("%H:%M"),
+        "available_end_time": venue.available_end_time.strftime("%H:%M"),
+        "category": {"id": venue.category_id, "name": venue.category.name},
+        "detail_url": reverse("venue-detail", kwargs={"slug": venue.slug}),
+        "edit_url": reverse("admin-venue-edit", kwargs={"pk": venue.pk}),
+        "delete_url": reverse("admin-venue-delete", kwargs={"pk": venue.pk}),
+        "addons": [
+            {"id": addon.pk, "name": addon.name, "description": addon.description, "price": str(addon.price)}
+            for addon in venue.addons.all()
+        ],
+    }
+
+
+def _build_instances() -> list[dict[str, Any]]:
+    venues = Venue.objects.select_related("category").prefetch_related("addons").order_by("name")
+    return [_instance_payload(venue) for venue in venues]
+
+
+def _build_values() -> list[dict[str, Any]]:
+    return serialize_venues(Venue.objects.order_by("name"))
+
+
+def _encode_django(payload: Any) -> bytes:
+    return json.dumps(payload, cls=DjangoJSONEncoder).encode()
+
+
+def _encode_stdlib(payload: Any) -> bytes:
+    orjson, serialization.orjson = serialization.orjson, None
+    try:
+        return serialization.dumps(payload)
+    finally:
+        serialization.orjson = orjson
+
+
+DESCRIPTION = "Indoor court with changing rooms, parking and a small café. " * 3
+
+
+def create_venues(
+    count: int, *, addons_per_venue: int = 2, prefix: str = "serial", description: str = DESCRIPTION
+) -> None:
+    """Add ``count`` venues with ``addons_per_venue`` add-ons each."""
+
+    category, _ = Category.objects.get_or_create(slug=f"{prefix}-sport", defaults={"name": f"{prefix} sport"})
+    Venue.objects.bulk_create(
+        [
+            Venue(
+                category=category,
+                name=f"{prefix} venue {index:05d}",
+                slug=f"{prefix}-venue-{index:05d}",
+                description=description,
+                location="Jakarta Selatan",
+                city="Jakarta",
+                address=f"Jl. Benchmark No. {index}",
+                price_per_hour=Decimal("150000.00") + index,
+                facilities="Parking, Locker, Shower",
+            )
+            for index in range(count)
+        ],
+        batch_size=500,
+    )
+    venues = Venue.objects.filter(category=category).values_list("pk", flat=True)
+    AddOn.objects.bulk_create(
+        [
+            AddOn(venue_id=venue_id, name=f"Add-on {number}", description="Rental", price=Decimal("25000.00"))
+            for venue_id in venues
+            for number in range(addons_per_venue)
+        ],
+        batch_size=500,
+    )
+
+
+def _time(function: Callable[..., Any], *args: Any) -> tuple[float, Any]:
+    started = perf_counter()
+    result = function(*args)
+    return (perf_counter() - started) * 1000, result
+
+
+def measure_serialization(*, repeat: int = 3) -> list[SerializationTiming]:
+    """Time every path over the venues currently in the database."""
+
+    paths: list[tuple[str, Callable[[], list], Callable[[Any], bytes]]] = [
+        ("instances", _build_instances, _encode_django),
+        ("values+json", _build_values, _encode_stdlib),
+    ]
+    if serialization.orjson is not None:
+        paths.append(("values+orjson", _build_values, serialization.dumps))
+
+    results = []
+    for name, build, encode in paths:
+        best: SerializationTiming | None = None
+        for _ in range(repeat):
+            build_ms, payload = _time(build)
+            encode_ms, content = _time(encode, {"success": True, "venues": payload})
+            timing = SerializationTiming(name, len(payload), build_ms, encode_ms, len(content))
+            if best is None or timing.total_ms < best.total_ms:
+                best = timing
+        results.append(best)
+    return results
@@ -0,0 +1,106 @@
+"""Concurrent write throughput of SQLite with and without the tuning mode.
+
+Each worker thread opens its own connection and repeatedly runs the shape of
+a booking request: a transaction that first checks for an overlapping slot
+and then inserts a row. With the default settings (rollback journal,
+``synchronous=FULL``, deferred transactions) two such transactions can both
+hold a read lock and deadlock on the upgrade, which SQLite reports at once as
+"database is locked". The tuned mode uses ``settings.SQLITE_PRAGMAS`` and
+``BEGIN IMMEDIATE``, like the application does (see :mod:`TK_PBP.sqlite`).
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import asdict, dataclass
+from time import perf_counter
+
+from django.conf import settings
+
+from TK_PBP.sqlite import apply_pragmas
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS slot (id INTEGER PRIMARY KEY, venue INTEGER NOT NULL, start INTEGER NOT NULL)"
+
+
+@dataclass
+class WriteThroughput:
+    mode: str
+    threads: int
+    attempted: int
+    committed: int
+    locked_errors: int
+    seconds: float
+
+    @property
+    def writes_per_second(self) -> float:
+        return self.committed / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "writes_per_second": round(self.writes_per_second, 1)}
+
+
+def measure_write_throughput(
+    path: str,
+    *,
+    tuned: bool,
+    threads: int = 8,
+    writes_per_thread: int = 50,
+    timeout: float = 5.0,
+) -> WriteThroughput:
+    """Run the write workload against the SQLite file at ``path``."""
+
+    with sqlite3.connect(path) as setup:
+        setup.execute(SCHEMA)
+        setup.execute("DELETE FROM slot")
+        setup.execute(f"PRAGMA journal_mode = {'WAL' if tuned else 'DELETE'}")
+
+    begin = "BEGIN IMMEDIATE" if tuned else "BEGIN"
+    committed = 0
+    locked = 0
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def worker(index: int) -> None:
+        nonlocal committed, locked
+        connection = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        if tuned:
+            apply_pragmas(connection, settings.SQLITE_PRAGMAS)
+        ok = errors = 0
+        barrier.wait()
+        try:
+            for offset in range(writes_per_thread):
+                start = index * writes_per_thread + offset
+                try:
+                    connection.execute(begin)
+                    connection.execute("SELECT COUNT(*) FROM slot WHERE venue = ? AND start = ?", (index, start))
+                    connection.execute("INSERT INTO slot (venue, start) VALUES (?, ?)", (index, start))
+                    connection.execute("COMMIT")
+                    ok += 1
+                except sqlite3.OperationalError as exc:
+                    if connection.in_transaction:
+                        connection.execute("ROLLBACK")
+                    if "locked" not in str(exc) and "busy" not in str(exc):
+                        raise
+                    errors += 1
+        finally:
+            connection.close()
+            with lock:
+                committed += ok
+                locked += errors
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    started = perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = perf_counter() - started
+
+    return WriteThroughput(
+        mode="tuned" if tuned else "default",
+        threads=threads,
+        attempted=threads * writes_per_thread,
+        committed=committed,
+        locked_errors=locked,
+        seconds=round(elapsed, 4),
+    )
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from django.test import TestCase
+
+from ..catalog_cards import PATHS, measure_cards
+from ..serialization import create_venues
+
+
+class CatalogCardBenchmarkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_venues(6, addons_per_venue=0, prefix="cards", description="Lapangan " * 40)
+        create_venues(3, addons_per_venue=0, prefix="short", description="Lapangan kecil")
+
+    def test_every_path_builds_the_same_cards(self):
+        (_, build_instances), *others = PATHS
+        expected = build_instances()
+        self.assertTrue(any(card["description"].endswith("…") for card in expected))
+        for name, build in others:
+            with self.subTest(path=name):
+                self.assertEqual(build(), expected)
+
+    def test_each_path_reports_time_and_memory(self):
+        results = measure_cards(repeat=1)
+
+        self.assertEqual([result.path for result in results], ["instances", "values", "values+substr"])
+        for result in results:
+            self.assertEqual(result.cards, 9)
+            self.assertGreater(result.build_ms, 0)
+            self.assertGreater(result.kib_per_1k, 0)
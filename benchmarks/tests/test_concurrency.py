@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.test import TransactionTestCase
+
+from manajemen_lapangan.load_data import LoadDataGenerator
+
+from ..concurrency import _asgi_kwargs, compare_handlers, worker_users
+from ..scenarios import SCENARIO_MAP, XHR, BenchmarkContext
+
+
+class ConcurrentLoadTests(TransactionTestCase):
+    # Worker threads open their own connections, so the dataset must be committed.
+
+    def setUp(self):
+        LoadDataGenerator(
+            users=3,
+            venues=2,
+            history_days=2,
+            future_days=1,
+            seed=5,
+            prefix="load",
+            today=date(2025, 1, 10),
+        ).generate()
+        self.context = BenchmarkContext.from_database()
+
+    def test_both_handlers_serve_every_request(self):
+        results = compare_handlers(SCENARIO_MAP["catalog_filter"], self.context, requests=6, concurrency=3)
+
+        self.assertEqual([result.handler for result in results], ["wsgi", "asgi"])
+        for result in results:
+            self.assertEqual(result.requests, 6)
+            self.assertEqual(result.failures, 0)
+            self.assertGreater(result.throughput, 0)
+            self.assertIn("p95", result.as_dict()["latency_ms"])
+
+    def test_workers_log_in_as_distinct_members(self):
+        users = worker_users(SCENARIO_MAP["wishlist_toggle"], self.context, 3)
+        self.assertEqual(len({user.pk for user in users}), 3)
+        admins = worker_users(SCENARIO_MAP["admin_venue_api"], self.context, 2)
+        self.assertEqual(admins, [self.context.admin, self.context.admin])
+
+    def test_environ_headers_are_passed_to_the_async_client_by_name(self):
+        kwargs = _asgi_kwargs({"data": {"city": "Depok"}, **XHR})
+        self.assertEqual(kwargs, {"data": {"city": "Depok"}, "headers": {"X-REQUESTED-WITH": "XMLHttpRequest"}})
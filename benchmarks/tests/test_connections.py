@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import SimpleTestCase
+
+from ..connections import compare_connection_modes, measure_connection_overhead
+
+
+class ConnectionOverheadTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        default = connections[DEFAULT_DB_ALIAS]
+        settings_dict = {**default.settings_dict, "NAME": str(Path(directory.name) / "bench.sqlite3")}
+        self.connection = default.__class__(settings_dict, alias="connection-benchmark")
+        self.addCleanup(self.connection.close)
+        self.original_max_age = settings_dict["CONN_MAX_AGE"]
+
+    def test_per_request_mode_opens_a_connection_for_every_request(self):
+        result = measure_connection_overhead(
+            self.connection, mode="per_request", conn_max_age=0, health_checks=False, requests=5
+        )
+        self.assertEqual(result.connections_opened, 5)
+        self.assertEqual(self.connection.settings_dict["CONN_MAX_AGE"], self.original_max_age)
+
+    def test_persistent_modes_reuse_one_connection(self):
+        results = {result.mode: result for result in compare_connection_modes(self.connection, requests=5)}
+        self.assertEqual(results["persistent"].connections_opened, 1)
+        self.assertEqual(results["persistent_health_checks"].connections_opened, 1)
+        self.assertEqual(results["per_request"].requests, 5)
+        self.assertIn("p95", results["persistent"].latency_ms)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from TK_PBP.metrics import registry
+
+from ..metrics_overhead import measure_metrics_overhead
+
+
+class MetricsOverheadBenchmarkTests(SimpleTestCase):
+    def test_both_handlers_are_timed_and_samples_discarded(self):
+        result = measure_metrics_overhead(rounds=50, repeat=1)
+
+        self.assertEqual(result.rounds, 50)
+        self.assertGreater(result.bare_us, 0)
+        self.assertGreater(result.wrapped_us, 0)
+        self.assertEqual(registry.snapshot(), {})
+
+    def test_command_reports_the_overhead(self):
+        output = StringIO()
+        call_command("benchmark_metrics_overhead", "--rounds", "50", "--limit", "1000000", stdout=output)
+        self.assertIn("overhead", output.getvalue())
@@ -0,0 +1,121 @@
+"""Query budgets of the main views must hold and stay flat as data grows."""
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from add_on.models import AddOn
+from authentication.query_budget import view_query_budget
+from interaksi.models import Review, Wishlist
+from manajemen_lapangan.models import Category, Venue
+from rent.models import Booking
+
+DATASET_SIZES = (1, 4, 12)
+
+
+@override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_RAISE=True)
+class ViewQueryBudgetTests(TestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.member = user_model.objects.create_user(username="member", password="pass")
+        self.admin = user_model.objects.create_user(username="boss", password="pass", is_staff=True)
+        self.category = Category.objects.get(slug="futsal")
+        self.venues: list[Venue] = []
+        self.next_start = timezone.now() + timedelta(days=1)
+
+    def _grow_to(self, size: int) -> None:
+        """Add venues, add-ons, bookings, wishlist entries and reviews up to ``size``."""
+
+        user_model = get_user_model()
+        while len(self.venues) < size:
+            index = len(self.venues)
+            venue = Venue.objects.create(
+                category=self.category,
+                name=f"Budget Arena {index}",
+                slug=f"budget-arena-{index}",
+                description="Arena used by the query budget tests.",
+                location="Jakarta",
+                city="Jakarta",
+                price_per_hour=Decimal("100000"),
+                facilities="Parking",
+            )
+            self.venues.append(venue)
+            addon = AddOn.objects.create(venue=venue, name=f"Ball {index}", price=Decimal("10000"))
+            AddOn.objects.create(venue=self.venues[0], name=f"Extra {index}", price=Decimal("5000"))
+            for status in (Booking.STATUS_ACTIVE, Booking.STATUS_CONFIRMED):
+                booking = Booking.objects.create(
+                    user=self.member,
+                    venue=venue,
+                    start_datetime=self.next_start,
+                    end_datetime=self.next_start + timedelta(hours=2),
+                    status=status,
+                )
+                booking.addons.add(addon)
+                self.next_start += timedelta(hours=3)
+            Wishlist.objects.create(user=self.member, venue=venue)
+            reviewer = user_model.objects.create(username=f"reviewer-{index}")
+            Review.objects.create(user=reviewer, venue=self.venues[0], rating=4, comment="Solid")
+
+    def _count_queries(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(captured.captured_queries)
+
+    def _assert_flat_within_budget(self, user, url_factory) -> None:
+        self.client.force_login(user)
+        counts = []
+        for size in DATASET_SIZES:
+            self._grow_to(size)
+            url = url_factory()
+            with self.subTest(size=size):
+                counts.append(self._count_queries(url))
+        self.assertEqual(len(set(counts)), 1, f"{url} query count grows with data: {counts}")
+        budget = view_query_budget(resolve(url).func)
+        self.assertIsNotNone(budget, f"{url}: {counts}")
+        self.assertLessEqual(counts[0], budget, f"{url}: {counts}")
+
+    def test_catalog_view(self):
+        self._assert_flat_within_budget(self.member, lambda: reverse("catalog"))
+
+    def test_venue_detail_view(self):
+        self._assert_flat_within_budget(
+            self.member, lambda: reverse("venue-detail", kwargs={"slug": self.venues[0].slug})
+        )
+
+    def test_booking_post_is_not_held_to_the_read_budget(self):
+        self._grow_to(1)
+        self.client.force_login(self.member)
+        start = (timezone.localtime() + timedelta(days=30)).replace(minute=0, second=0, microsecond=0)
+        url = reverse("venue-detail", kwargs={"slug": self.venues[0].slug})
+        with self.assertNoLogs("authentication.query_budget", level="WARNING"):
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.post(
+                    url,
+                    {
+                        "start_datetime": start.strftime("%Y-%m-%dT%H:%M"),
+                        "end_datetime": (start + timedelta(hours=2)).strftime("%Y-%m-%dT%H:%M"),
+                        "addons": [str(self.venues[0].addons.first().pk)],
+                    },
+                )
+        self.assertRedirects(response, reverse("booked-places"), fetch_redirect_response=False)
+        self.assertGreater(len(captured.captured_queries), view_query_budget(resolve(url).func))
+
+    def test_wishlist_view(self):
+        self._assert_flat_within_budget(self.member, lambda: reverse("wishlist"))
+
+    def test_booked_places_view(self):
+        self._assert_flat_within_budget(self.member, lambda: reverse("booked-places"))
+
+    def test_admin_venue_list_view(self):
+        self._assert_flat_within_budget(self.admin, lambda: reverse("admin-venues"))
+
+    def test_booked_places_json_view(self):
+        self._assert_flat_within_budget(self.member, lambda: reverse("booked-places-json"))
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from ..reference_codes import measure_generation
+
+
+class ReferenceCodeBenchmarkTests(SimpleTestCase):
+    def test_both_modes_produce_unique_ordered_codes(self):
+        results = measure_generation(50_000)
+
+        self.assertEqual([result.mode for result in results], ["single", "batch"])
+        for result in results:
+            self.assertTrue(result.ordered)
+            self.assertGreater(result.codes_per_second, 0)
+
+    def test_command_prints_a_row_per_mode(self):
+        output = StringIO()
+        call_command("benchmark_reference_codes", "--count", "1000", stdout=output)
+        self.assertEqual(len(output.getvalue().splitlines()), 3)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.test import TestCase
+
+from manajemen_lapangan.load_data import LoadDataGenerator
+
+from ..runner import BenchmarkRunner, compare_results, percentile
+from ..scenarios import SCENARIO_MAP, SCENARIOS, BenchmarkContext
+
+
+def _result(p95: float, queries: int, failures: int = 0) -> dict:
+    return {
+        "latency_ms": {"p50": p95, "p95": p95, "p99": p95, "mean": p95},
+        "queries": {"min": queries, "mean": queries, "max": queries},
+        "failures": failures,
+        "iterations": 10,
+    }
+
+
+class PercentileTests(TestCase):
+    def test_interpolates_between_samples(self):
+        samples = [1.0, 2.0, 3.0, 4.0]
+        self.assertEqual(percentile(samples, 0), 1.0)
+        self.assertEqual(percentile(samples, 100), 4.0)
+        self.assertAlmostEqual(percentile(samples, 50), 2.5)
+        self.assertEqual(percentile([], 95), 0.0)
+
+
+class CompareResultsTests(TestCase):
+    def test_flags_latency_and_query_regressions(self):
+        baseline = {"scenarios": {"catalog": _result(10.0, 5), "home": _result(10.0, 5)}}
+        current = {"scenarios": {"catalog": _result(13.0, 5), "home": _result(11.0, 7)}}
+
+        regressions = compare_results(current, baseline, threshold=0.2)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("catalog: p95 latency"))
+        self.assertTrue(regressions[1].startswith("home: 7 queries"))
+
+    def test_within_threshold_passes(self):
+        baseline = {"scenarios": {"catalog": _result(10.0, 5)}}
+        current = {"scenarios": {"catalog": _result(11.5, 5), "new": _result(99.0, 50)}}
+        self.assertEqual(compare_results(current, baseline, threshold=0.2), [])
+
+
+class BenchmarkRunnerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(
+            users=4,
+            venues=3,
+            history_days=3,
+            future_days=2,
+            seed=3,
+            prefix="bench",
+            today=date(2025, 1, 10),
+        ).generate()
+
+    def test_every_scenario_succeeds(self):
+        results = BenchmarkRunner(SCENARIOS, iterations=2, warmup=0, context=BenchmarkContext.from_database()).run()
+
+        self.assertEqual(set(results["scenarios"]), set(SCENARIO_MAP))
+        for name, result in results["scenarios"].items():
+            self.assertEqual(result["failures"], 0, name)
+            self.assertEqual(result["iterations"], 2)
+            self.assertGreater(result["queries"]["max"], 0)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import json
+
+from django.test import TestCase
+
+from TK_PBP.serialization import ENCODER, dumps
+
+from ..serialization import _build_instances, _build_values, _encode_django, create_venues, measure_serialization
+
+
+class SerializationBenchmarkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_venues(12, addons_per_venue=2)
+
+    def test_every_path_produces_the_same_payload(self):
+        self.assertEqual(json.loads(dumps(_build_values())), json.loads(_encode_django(_build_instances())))
+
+    def test_each_path_is_timed_over_every_venue(self):
+        results = measure_serialization(repeat=1)
+
+        expected = ["instances", "values+json"] + (["values+orjson"] if ENCODER == "orjson" else [])
+        self.assertEqual([result.path for result in results], expected)
+        for result in results:
+            self.assertEqual(result.venues, 12)
+            self.assertGreater(result.total_ms, 0)
+        # Compact output is smaller than JsonResponse's default separators.
+        self.assertLess(results[1].bytes, results[0].bytes)
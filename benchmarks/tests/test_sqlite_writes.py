@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from ..sqlite_writes import measure_write_throughput
+
+
+class SQLiteWriteThroughputTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_tuned_mode_commits_every_concurrent_write(self):
+        default = measure_write_throughput(str(self.directory / "default.sqlite3"), tuned=False)
+        tuned = measure_write_throughput(str(self.directory / "tuned.sqlite3"), tuned=True)
+
+        self.assertEqual(tuned.locked_errors, 0)
+        self.assertEqual(tuned.committed, tuned.attempted)
+        self.assertEqual(default.committed + default.locked_errors, default.attempted)
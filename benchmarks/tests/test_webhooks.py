@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.test import TransactionTestCase
+
+from manajemen_lapangan.load_data import LoadDataGenerator
+from rent.models import Payment, PaymentWebhookEvent
+from tasks.models import Task
+
+from ..webhooks import build_events, replay_webhooks
+
+
+class WebhookLoadTests(TransactionTestCase):
+    # Worker threads open their own connections, so the dataset must be committed.
+    # The shared in-memory test database has no busy timeout, so writers run one at a time.
+
+    def setUp(self):
+        LoadDataGenerator(
+            users=3,
+            venues=2,
+            history_days=2,
+            future_days=3,
+            seed=5,
+            prefix="load",
+            today=date.today(),
+        ).generate()
+
+    def test_duplicates_are_redeliveries_of_earlier_events(self):
+        bodies = build_events(50, duplicate_rate=0.3, seed=1)
+        self.assertEqual(len(bodies), 50)
+        self.assertLess(len(set(bodies)), 50)
+
+    def test_replayed_webhooks_are_queued_once_and_applied(self):
+        result = replay_webhooks(webhooks=40, concurrency=1, duplicate_rate=0.25, seed=2)
+
+        self.assertEqual(result.failures, 0)
+        self.assertEqual(result.accepted + result.duplicates, 40)
+        self.assertEqual(PaymentWebhookEvent.objects.count(), result.accepted)
+        self.assertEqual(result.applied, result.accepted)
+        self.assertGreaterEqual(result.tasks_run, result.applied)
+        self.assertEqual(sum(result.events.values()), result.accepted)
+        self.assertNotIn(PaymentWebhookEvent.STATUS_RECEIVED, result.events)
+        self.assertFalse(Task.objects.exclude(status=Task.STATUS_DONE).exists())
+        self.assertTrue(Payment.objects.filter(webhook_events__status=PaymentWebhookEvent.STATUS_APPLIED).exists())
+        self.assertGreater(result.as_dict()["ingest_rate"], 0)
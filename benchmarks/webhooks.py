@@ -0,0 +1,148 @@
+"""Replay a burst of signed payment webhooks through the webhook endpoint.
+
+:func:`replay_webhooks` posts ``webhooks`` signed ``payment.succeeded``
+events from ``concurrency`` threads, each with its own
+:class:`django.test.Client`, like a threaded WSGI server taking a burst from
+the payment provider. A ``duplicate_rate`` share of the posts are
+redeliveries of an event already sent. Events go to the waiting payments of
+open bookings in turn.
+
+Tasks are queued rather than run inline while the posts are timed, so the
+ingest numbers are the web worker's cost only. A :class:`~tasks.queue.Worker`
+then drains the queue, which also runs the invoice tasks that confirmed
+payments queue, and the apply rate is reported separately along with the
+final status of the recorded events.
+"""
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from rent.gateway import EVENT_SUCCEEDED, SIGNATURE_HEADER, sign
+from rent.models import Booking, Payment, PaymentWebhookEvent
+from tasks.queue import Worker
+
+from .runner import summarise
+
+
+@dataclass
+class WebhookLoadResult:
+    webhooks: int
+    concurrency: int
+    accepted: int
+    duplicates: int
+    failures: int
+    ingest_s: float
+    latency_ms: dict[str, float]
+    applied: int
+    tasks_run: int
+    apply_s: float
+    events: dict[str, int]
+
+    @property
+    def ingest_rate(self) -> float:
+        """Webhooks answered per second."""
+
+        return self.webhooks / self.ingest_s if self.ingest_s else 0.0
+
+    @property
+    def apply_rate(self) -> float:
+        """Webhooks applied per second by one worker, including the invoice tasks they queue."""
+
+        return self.applied / self.apply_s if self.apply_s else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "ingest_rate": self.ingest_rate, "apply_rate": self.apply_rate}
+
+
+def build_events(count: int, *, duplicate_rate: float = 0.1, seed: int = 0) -> list[bytes]:
+    """Webhook bodies for the waiting payments of open bookings, with redeliveries mixed in."""
+
+    payments = list(
+        Payment.objects.filter(status=Payment.STATUS_WAITING, booking__status__in=Booking.ACTIVE_STATUSES)
+        .order_by("pk")
+        .values_list("reference_code", "total_amount")
+    )
+    if not payments:
+        raise ValueError("There are no waiting payments to send webhooks for.")
+    rng = random.Random(seed)
+    run = uuid.uuid4().hex[:8]
+    bodies: list[bytes] = []
+    for index in range(count):
+        if bodies and rng.random() < duplicate_rate:
+            bodies.append(rng.choice(bodies))
+            continue
+        reference, amount = payments[index % len(payments)]
+        event = {
+            "id": f"evt_load_{run}_{index}",
+            "type": EVENT_SUCCEEDED,
+            "created": int(time.time()),
+            "data": {"reference": reference, "amount": str(amount)},
+        }
+        bodies.append(json.dumps(event).encode())
+    return bodies
+
+
+def replay_webhooks(
+    *, webhooks: int = 10_000, concurrency: int = 8, duplicate_rate: float = 0.1, seed: int = 0
+) -> WebhookLoadResult:
+    bodies = build_events(webhooks, duplicate_rate=duplicate_rate, seed=seed)
+    url = reverse("payment-webhook")
+    secret = settings.PAYMENT_WEBHOOK_SECRET
+    statuses: Counter[int] = Counter()
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        client = Client()
+        try:
+            for body in bodies[index::concurrency]:
+                headers = {SIGNATURE_HEADER: sign(body, secret, int(time.time()))}
+                started = perf_counter()
+                response = client.post(url, body, content_type="application/json", headers=headers)
+                elapsed = (perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[response.status_code] += 1
+        finally:
+            connections.close_all()
+
+    with override_settings(TASKS_EAGER=False):
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+        started = perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        ingest_s = perf_counter() - started
+
+        started = perf_counter()
+        tasks_run = Worker().run(burst=True)
+        apply_s = perf_counter() - started
+
+    events = dict(PaymentWebhookEvent.objects.values_list("status").annotate(count=Count("pk")).order_by("status"))
+    return WebhookLoadResult(
+        webhooks=len(bodies),
+        concurrency=concurrency,
+        accepted=statuses[202],
+        duplicates=statuses[200],
+        failures=len(bodies) - statuses[202] - statuses[200],
+        ingest_s=ingest_s,
+        latency_ms=summarise(latencies, [], 0)["latency_ms"],
+        applied=PaymentWebhookEvent.objects.filter(processed_at__isnull=False).count(),
+        tasks_run=tasks_run,
+        apply_s=apply_s,
+        events=events,
+    )
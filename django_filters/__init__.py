@@ -69,6 +69,14 @@ class NumberFilter(Filter):
         )
 
 
+class DateTimeFilter(Filter):
+    def build_field(self) -> forms.Field:
+        return forms.DateTimeField(
+            required=False,
+            widget=self.extra.get("widget"),
+        )
+
+
 class FilterSetMeta(type):
     def __new__(mcls, name, bases, attrs):
         filters: Dict[str, Filter] = {}
@@ -101,7 +109,8 @@ class FilterSet(metaclass=FilterSetMeta):
 
     def _build_form(self, *, prefix, data):
         fields = {name: flt.field for name, flt in self.filters.items()}
-        form_class = type("FilterForm", (forms.Form,), fields)
+        base_form = getattr(getattr(self, "Meta", None), "form", forms.Form)
+        form_class = type("FilterForm", (base_form,), fields)
         return form_class(data=data, prefix=prefix)
 
     def is_valid(self) -> bool:
@@ -142,4 +151,5 @@ __all__ = [
     "ChoiceFilter",
     "ModelChoiceFilter",
     "NumberFilter",
+    "DateTimeFilter",
 ]
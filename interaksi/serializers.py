@@ -0,0 +1,21 @@
+"""JSON shape of the wishlist toggle response (see :mod:`TK_PBP.serialization`)."""
+from __future__ import annotations
+
+from katalog.serializers import card_description
+from TK_PBP.serialization import Field, Serializer, UrlField
+
+
+class WishlistVenueSerializer(Serializer):
+    """The venue card the wishlist page inserts after a toggle."""
+
+    __slots__ = ()
+
+    id = Field(convert=str)
+    name = Field()
+    city = Field()
+    category = Field("category__name", convert=lambda name: name or "")
+    price = Field("price_per_hour", convert=str)
+    url = UrlField("venue-detail", "slug", kwarg="slug")
+    image = Field("image_url")
+    description = Field(convert=card_description)
+    toggle_url = UrlField("wishlist-toggle-api", "id", kwarg="pk")
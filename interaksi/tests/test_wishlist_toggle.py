@@ -88,3 +88,16 @@ class WishlistToggleAPITests(TestCase):
 
         self.assertRedirects(response, next_url, fetch_redirect_response=False)
         self.assertTrue(Wishlist.objects.filter(user=self.user, venue=self.venue).exists())
+
+    async def test_toggle_through_the_asgi_handler(self) -> None:
+        await self.async_client.aforce_login(self.user)
+        toggle_url = reverse("wishlist-toggle-api", args=[self.venue.pk])
+
+        response = await self.async_client.post(toggle_url, data={}, headers={"x-requested-with": "XMLHttpRequest"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["wishlisted"])
+        self.assertEqual(response.json()["wishlist_count"], 1)
+
+        response = await self.async_client.post(toggle_url, data={"next": reverse("catalog")})
+        self.assertRedirects(response, reverse("catalog"), fetch_redirect_response=False)
+        self.assertFalse(await Wishlist.objects.filter(user=self.user, venue=self.venue).aexists())
@@ -3,28 +3,31 @@ import json
 from json import JSONDecodeError
 from typing import Any
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpRequest, HttpResponse, JsonResponse
-from django.shortcuts import get_object_or_404, redirect
+from django.http import HttpRequest, HttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils.http import url_has_allowed_host_and_scheme
-from django.utils.text import Truncator
 from django.views import View
 from django.views.generic import ListView
 
-from authentication.mixins import EnsureCsrfCookieMixin
+from authentication.mixins import EnsureCsrfCookieMixin, QueryBudgetMixin
 from manajemen_lapangan.models import Venue
 from rent.models import Booking
+from TK_PBP.serialization import CompactJsonResponse
 
 from .models import Wishlist
+from .serializers import WishlistVenueSerializer
 
 
-class WishlistView(EnsureCsrfCookieMixin, LoginRequiredMixin, ListView):
+class WishlistView(QueryBudgetMixin, EnsureCsrfCookieMixin, LoginRequiredMixin, ListView):
     template_name = "interaksi/wishlist.html"
     context_object_name = "wishlists"
+    query_budget = 7
 
     def get_queryset(self):
         return (
@@ -52,10 +55,20 @@ class WishlistToggleView(LoginRequiredMixin, View):
 
 
 @login_required
-def wishlist_toggle(request: HttpRequest, pk: int) -> HttpResponse:
-    venue = get_object_or_404(Venue, pk=pk)
-    wishlisted = _toggle_wishlist_entry(request, venue)
-    return _wishlist_response(request, venue, wishlisted)
+async def wishlist_toggle(request: HttpRequest, pk: int) -> HttpResponse:
+    """Async toggle used by the wishlist buttons in ``app.js``."""
+
+    user = await request.auser()
+    venue = await aget_object_or_404(Venue.objects.select_related("category"), pk=pk)
+    wishlist, created = await Wishlist.objects.aget_or_create(user=user, venue=venue)
+    if not created:
+        await wishlist.adelete()
+    if _request_wants_json(request):
+        wishlist_count = await Wishlist.objects.filter(user=user).acount()
+        payload = await sync_to_async(_build_wishlist_response)(request, venue, created, wishlist_count)
+        return CompactJsonResponse(payload)
+    _add_wishlist_message(request, venue, created)
+    return redirect(_get_next_url(request))
 
 
 def _toggle_wishlist_entry(request: HttpRequest, venue: Venue) -> bool:
@@ -97,7 +110,8 @@ def _get_next_url(request: HttpRequest) -> str:
 
 def _wishlist_response(request: HttpRequest, venue: Venue, wishlisted: bool) -> HttpResponse:
     if _request_wants_json(request):
-        return JsonResponse(_build_wishlist_response(request, venue, wishlisted))
+        wishlist_count = Wishlist.objects.filter(user=request.user).count()
+        return CompactJsonResponse(_build_wishlist_response(request, venue, wishlisted, wishlist_count))
     _add_wishlist_message(request, venue, wishlisted)
     return redirect(_get_next_url(request))
 
@@ -109,22 +123,13 @@ def _add_wishlist_message(request: HttpRequest, venue: Venue, wishlisted: bool)
         messages.info(request, f"Removed {venue.name} from your wishlist.")
 
 
-def _build_wishlist_response(request: HttpRequest, venue: Venue, wishlisted: bool) -> dict[str, Any]:
-    description = Truncator(venue.description or "").chars(120)
-    venue_data = {
-        "id": str(venue.pk),
-        "name": venue.name,
-        "city": venue.city,
-        "category": venue.category.name if venue.category else "",
-        "price": str(venue.price_per_hour),
-        "url": reverse("venue-detail", kwargs={"slug": venue.slug}),
-        "image": venue.image_url,
-        "description": description,
-        "toggle_url": reverse("wishlist-toggle-api", kwargs={"pk": venue.pk}),
-    }
+def _build_wishlist_response(
+    request: HttpRequest, venue: Venue, wishlisted: bool, wishlist_count: int
+) -> dict[str, Any]:
+    venue_data = WishlistVenueSerializer().serialize_instance(venue)
     response: dict[str, Any] = {
         "wishlisted": wishlisted,
-        "wishlist_count": Wishlist.objects.filter(user=request.user).count(),
+        "wishlist_count": wishlist_count,
         "venue": venue_data,
         "wishlist_item_html": None,
     }
@@ -133,7 +138,7 @@ def _build_wishlist_response(request: HttpRequest, venue: Venue, wishlisted: boo
             "partials/wishlist_card.html",
             {
                 "venue": venue,
-                "wishlist_description": description,
+                "wishlist_description": venue_data["description"],
                 "wishlist_next_url": _get_next_url(request),
             },
             request=request,
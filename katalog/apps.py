@@ -5,3 +5,6 @@ class KatalogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "katalog"
     verbose_name = "Katalog Lapangan"
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,13 @@
+"""Cache namespace for the catalog filter API.
+
+Cached entries hold the venue cards for one set of filter parameters; they are
+shared by all users (the per-user wishlist flag is added afterwards) and the
+whole namespace is invalidated whenever a venue or category changes.
+"""
+from __future__ import annotations
+
+from django.conf import settings
+
+from TK_PBP.cache import CacheNamespace
+
+catalog_cache = CacheNamespace("catalog", timeout=getattr(settings, "CATALOG_CACHE_TIMEOUT", 60))
@@ -6,6 +6,40 @@ from manajemen_lapangan.constants import CATEGORY_SLUG_SEQUENCE
 from manajemen_lapangan.models import Category, Venue
 
 from katalog.constants import PREFERRED_CITY_ORDER
+from rent.availability import MAX_RANGE_DAYS, free_venue_ids
+
+AVAILABILITY_PARAMS = ("available_from", "available_to")
+
+_DATETIME_INPUT_CLASS = (
+    "w-full rounded-2xl border border-white/25 bg-slate-950/70 px-5 py-3 text-sm text-white/90 backdrop-blur"
+)
+
+
+class AvailabilityBoundFilter(django_filters.DateTimeFilter):
+    """One end of the availability window.
+
+    Both ends are applied together by :meth:`VenueFilter.filter_queryset`,
+    so the filter itself leaves the queryset untouched.
+    """
+
+    def filter(self, qs, value):
+        return qs
+
+
+class VenueFilterForm(forms.Form):
+    def clean(self):
+        cleaned_data = super().clean()
+        start = cleaned_data.get("available_from")
+        end = cleaned_data.get("available_to")
+        if (start is None) != (end is None):
+            if not self.has_error("available_from") and not self.has_error("available_to"):
+                raise forms.ValidationError("Choose both the start and the end of the time range.")
+        elif start is not None:
+            if end <= start:
+                raise forms.ValidationError("The end of the time range must be after its start.")
+            if (end - start).days >= MAX_RANGE_DAYS:
+                raise forms.ValidationError(f"The time range can span at most {MAX_RANGE_DAYS} days.")
+        return cleaned_data
 
 
 class VenueFilter(django_filters.FilterSet):
@@ -41,10 +75,17 @@ class VenueFilter(django_filters.FilterSet):
             }
         ),
     )
+    available_from = AvailabilityBoundFilter(
+        widget=forms.DateTimeInput(attrs={"type": "datetime-local", "class": _DATETIME_INPUT_CLASS}),
+    )
+    available_to = AvailabilityBoundFilter(
+        widget=forms.DateTimeInput(attrs={"type": "datetime-local", "class": _DATETIME_INPUT_CLASS}),
+    )
 
     class Meta:
         model = Venue
-        fields = ["city", "category", "max_price"]
+        fields = ["city", "category", "max_price", "available_from", "available_to"]
+        form = VenueFilterForm
 
     def __init__(self, data=None, queryset=None, *, request=None, prefix=None):
         if queryset is None:
@@ -83,3 +124,13 @@ class VenueFilter(django_filters.FilterSet):
             self.filters["category"].field.queryset = category_queryset
         if "category" in self.form.fields:
             self.form.fields["category"].queryset = category_queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        start = self.form.cleaned_data.get("available_from")
+        end = self.form.cleaned_data.get("available_to")
+        if queryset is None or start is None or end is None:
+            return queryset
+        # Candidates are the venues matching the other filters; their bookings
+        # are read in one query and swept in Python (see rent.availability).
+        return queryset.filter(pk__in=free_venue_ids(queryset, start, end))
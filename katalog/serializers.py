@@ -0,0 +1,40 @@
+"""JSON shapes of the catalog endpoints (see :mod:`TK_PBP.serialization`)."""
+from __future__ import annotations
+
+from django.db.models import QuerySet
+from django.db.models.functions import Substr
+from django.utils.text import Truncator
+
+from TK_PBP.serialization import Field, Serializer, UrlField
+
+CARD_DESCRIPTION_LENGTH = 120
+
+
+def card_description(description: str) -> str:
+    return Truncator(description).chars(CARD_DESCRIPTION_LENGTH)
+
+
+class VenueCardSerializer(Serializer):
+    """A venue card of the catalog filter results.
+
+    Rows need :meth:`annotate`, which cuts the description in the database:
+    one character past the card length is enough for :func:`card_description`
+    to tell whether to add an ellipsis, so long descriptions are never read
+    in full.
+    """
+
+    __slots__ = ()
+
+    id = Field()
+    name = Field()
+    city = Field()
+    price = Field("price_per_hour", convert=str)
+    category = Field("category__name")
+    image_url = Field()
+    url = UrlField("venue-detail", "slug", kwarg="slug")
+    description = Field("card_description", convert=card_description)
+    toggle_url = UrlField("wishlist-toggle-api", "id")
+
+    @staticmethod
+    def annotate(queryset: QuerySet) -> QuerySet:
+        return queryset.annotate(card_description=Substr("description", 1, CARD_DESCRIPTION_LENGTH + 1))
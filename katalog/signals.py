@@ -0,0 +1,19 @@
+"""Signals keeping the catalog cache in sync with venue changes."""
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from manajemen_lapangan.models import Category, Venue
+
+from .cache import catalog_cache
+
+
+@receiver(post_save, sender=Venue)
+@receiver(post_delete, sender=Venue)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_catalog_cache(sender, **kwargs):
+    """Drop every cached filter result when the catalogue changes."""
+
+    catalog_cache.invalidate()
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+from datetime import datetime, time, timedelta
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 
+from interaksi.models import Wishlist
+from katalog.cache import catalog_cache
 from manajemen_lapangan.models import Category, Venue
+from rent.models import Booking
 
 
 middleware_without_whitenoise = [
@@ -93,3 +99,70 @@ class CatalogFilterApiTests(TestCase):
         self.assertIn("max_price", payload["errors"])
         self.assertGreater(len(payload["errors"]["max_price"]), 0)
         self.assertEqual(payload["message"], "Invalid filter values submitted.")
+
+
+@override_settings(MIDDLEWARE=middleware_without_whitenoise)
+class AsyncCatalogFilterApiTests(TestCase):
+    """Exercise the endpoint through the ASGI handler."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="async-user", password="password123")
+        category = Category.objects.create(name="Async Futsal", slug="async-futsal")
+        cls.venue = Venue.objects.create(
+            category=category,
+            name="Async Arena",
+            description="Indoor futsal venue.",
+            location="Central City",
+            city="Jakarta",
+            price_per_hour="250000",
+            facilities="Locker",
+        )
+
+    def setUp(self) -> None:
+        catalog_cache.invalidate()
+
+    async def test_returns_cards_with_wishlist_flags(self) -> None:
+        await self.async_client.aforce_login(self.user)
+        await Wishlist.objects.acreate(user=self.user, venue=self.venue)
+
+        response = await self.async_client.get(reverse("catalog-filter"), {"city": "Jakarta"})
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual([venue["id"] for venue in payload["venues"]], [self.venue.id])
+        self.assertTrue(payload["venues"][0]["wishlisted"])
+
+    async def test_cards_are_cached_until_the_catalogue_changes(self) -> None:
+        await self.async_client.aforce_login(self.user)
+        url = reverse("catalog-filter")
+        await self.async_client.get(url, {"city": "Jakarta"})
+
+        # update() sends no signals, so the cached cards are still served.
+        await Venue.objects.filter(pk=self.venue.pk).aupdate(name="Renamed Arena")
+        payload = (await self.async_client.get(url, {"city": "Jakarta"})).json()
+        self.assertEqual(payload["venues"][0]["name"], "Async Arena")
+
+        venue = await Venue.objects.aget(pk=self.venue.pk)
+        await venue.asave()
+        payload = (await self.async_client.get(url, {"city": "Jakarta"})).json()
+        self.assertEqual(payload["venues"][0]["name"], "Renamed Arena")
+
+    async def test_availability_searches_are_not_cached(self) -> None:
+        await self.async_client.aforce_login(self.user)
+        day = timezone.localdate() + timedelta(days=1)
+        params = {"available_from": f"{day}T10:00", "available_to": f"{day}T11:00"}
+        url = reverse("catalog-filter")
+        self.assertEqual(len((await self.async_client.get(url, params)).json()["venues"]), 1)
+
+        start = timezone.make_aware(datetime.combine(day, time(10)))
+        await Booking.objects.acreate(
+            user=self.user, venue_id=self.venue.pk, start_datetime=start, end_datetime=start + timedelta(hours=1)
+        )
+        self.assertEqual((await self.async_client.get(url, params)).json()["venues"], [])
+
+    async def test_invalid_filters_are_not_cached(self) -> None:
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("catalog-filter"), {"max_price": "invalid"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIsNone(await catalog_cache.aget(("filter", "max_price=invalid")))
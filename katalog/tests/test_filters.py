@@ -1,10 +1,21 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
 
-from manajemen_lapangan.models import Category, Venue
+from manajemen_lapangan.models import Category, Venue, VenueAvailability
+from rent.availability import free_venue_ids
+from rent.models import Booking
 
 from ..filters import VenueFilter
 
 
+def _local(day, hour: int) -> str:
+    return datetime.combine(day, time(hour)).strftime("%Y-%m-%dT%H:%M")
+
+
 class VenueFilterTests(TestCase):
     def setUp(self):
         self.category = Category.objects.get(slug="padel")
@@ -60,3 +71,74 @@ class VenueFilterTests(TestCase):
         field = venue_filter.filters["max_price"].field
         self.assertEqual(field.widget.attrs.get("type"), None)
         self.assertFalse(field.required)
+
+
+class AvailabilityFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="searcher", password="pass")
+        category = Category.objects.get(slug="padel")
+        cls.venues = {
+            name: Venue.objects.create(
+                category=category,
+                name=f"{name.title()} Court",
+                slug=f"{name}-court",
+                description="Padel court",
+                location="Jakarta",
+                city="Jakarta",
+                price_per_hour=Decimal("100000.00"),
+                facilities="Locker",
+                available_start_time=time(8),
+                available_end_time=time(20),
+            )
+            for name in ("free", "booked", "cancelled", "late")
+        }
+        cls.day = timezone.localdate() + timedelta(days=2)
+        for name, status in (("booked", Booking.STATUS_CONFIRMED), ("cancelled", Booking.STATUS_CANCELLED)):
+            Booking.objects.create(
+                user=cls.user,
+                venue=cls.venues[name],
+                start_datetime=cls._at(17),
+                end_datetime=cls._at(19),
+                status=status,
+            )
+        VenueAvailability.objects.create(
+            venue=cls.venues["late"], start_datetime=cls._at(20), end_datetime=cls._at(23)
+        )
+
+    @classmethod
+    def _at(cls, hour: int) -> datetime:
+        return timezone.make_aware(datetime.combine(cls.day, time(hour)))
+
+    def _names(self, start: int, end: int, **params) -> set[str]:
+        venue_filter = VenueFilter(
+            {"available_from": _local(self.day, start), "available_to": _local(self.day, end), **params},
+            queryset=Venue.objects.filter(slug__endswith="-court"),
+        )
+        self.assertTrue(venue_filter.is_valid(), venue_filter.form.errors)
+        return {venue.slug.removesuffix("-court") for venue in venue_filter.qs}
+
+    def test_active_bookings_and_opening_hours_exclude_venues(self):
+        self.assertEqual(self._names(18, 20), {"free", "cancelled", "late"})
+        self.assertEqual(self._names(8, 17), {"free", "booked", "cancelled", "late"})
+        # Only the venue with an extra availability block stays open after 20:00.
+        self.assertEqual(self._names(19, 22), {"late"})
+        self.assertEqual(self._names(6, 9), set())
+
+    def test_candidates_are_checked_with_one_query_per_source(self):
+        with self.assertNumQueries(3):  # opening hours, availability blocks, bookings
+            free = free_venue_ids(Venue.objects.all(), self._at(18), self._at(19))
+        self.assertEqual(free, {self.venues["free"].pk, self.venues["cancelled"].pk, self.venues["late"].pk})
+
+    def test_window_combines_with_other_filters(self):
+        self.assertEqual(self._names(18, 20, max_price="50000"), set())
+
+    def test_window_must_be_complete_and_ordered(self):
+        for params in (
+            {"available_from": _local(self.day, 10)},
+            {"available_from": _local(self.day, 10), "available_to": _local(self.day, 9)},
+        ):
+            with self.subTest(params=params):
+                venue_filter = VenueFilter(params)
+                self.assertFalse(venue_filter.is_valid())
+                self.assertTrue(venue_filter.form.non_field_errors())
@@ -1,38 +1,49 @@
 """User facing catalog views."""
 from __future__ import annotations
 
+from functools import partial
 from typing import Any
+from uuid import uuid4
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
+from django.db.models import Prefetch
 from django.forms.forms import NON_FIELD_ERRORS
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect
-from django.urls import reverse
 from django.utils.formats import number_format
-from django.utils.text import Truncator
+from django.utils.http import urlencode
 from django.views.decorators.http import require_GET
 from django.views.generic import DetailView, ListView
 
-from authentication.mixins import EnsureCsrfCookieMixin
+from authentication.mixins import EnsureCsrfCookieMixin, QueryBudgetMixin, ReadOnlyMixin
 from interaksi.forms import ReviewForm
 from interaksi.models import Review, Wishlist
 from manajemen_lapangan.models import Venue
 from rent.forms import BookingForm
-from rent.models import Booking
+from rent.idempotency import IDEMPOTENCY_FIELD, REPLAYED_HEADER, IdempotencyConflict, run_idempotent
+from rent.models import Booking, BookingOverlap
+from TK_PBP.routers import read_only
+from TK_PBP.serialization import CompactJsonResponse
 
-from .filters import VenueFilter
+from .cache import catalog_cache
+from .filters import AVAILABILITY_PARAMS, VenueFilter
+from .serializers import VenueCardSerializer
 
 
-class CatalogView(EnsureCsrfCookieMixin, LoginRequiredMixin, ListView):
+class CatalogView(QueryBudgetMixin, ReadOnlyMixin, EnsureCsrfCookieMixin, LoginRequiredMixin, ListView):
     model = Venue
     template_name = "katalog/catalog.html"
     context_object_name = "venues"
     paginate_by = 9
+    # An availability window adds the opening hours, blocks and bookings queries.
+    query_budget = 11
 
     def get_queryset(self):
-        queryset = Venue.objects.select_related("category").prefetch_related("addons")
+        queryset = Venue.objects.select_related("category")
         self.filterset = VenueFilter(self.request.GET, queryset=queryset)
         return self.filterset.qs
 
@@ -64,43 +75,58 @@ def _serialise_filter_errors(filterset: VenueFilter) -> tuple[dict[str, list[str
     return field_errors, non_field_errors
 
 
-@login_required
-@require_GET
-def catalog_filter(request: HttpRequest) -> JsonResponse:
-    queryset = Venue.objects.select_related("category").prefetch_related("addons")
-    filterset = VenueFilter(request.GET, queryset=queryset)
+def _filter_cache_key(request: HttpRequest) -> tuple[str, str]:
+    params = sorted((key, value) for key, values in request.GET.lists() for value in values)
+    return ("filter", urlencode(params))
 
-    if not filterset.is_valid():
-        field_errors, non_field_errors = _serialise_filter_errors(filterset)
-        return JsonResponse(
-            {
-                "success": False,
-                "message": "Invalid filter values submitted.",
-                "errors": field_errors,
-                "non_field_errors": non_field_errors,
-            },
-            status=400,
-        )
 
-    wishlist_ids = set(
-        Wishlist.objects.filter(user=request.user).values_list("venue_id", flat=True)
-    )
-    rendered_cards = [
-        {
-            "id": venue.id,
-            "name": venue.name,
-            "city": venue.city,
-            "price": str(venue.price_per_hour),
-            "category": venue.category.name,
-            "image_url": venue.image_url,
-            "url": reverse("venue-detail", kwargs={"slug": venue.slug}),
-            "description": Truncator(venue.description).chars(120),
-            "wishlisted": venue.id in wishlist_ids,
-            "toggle_url": reverse("wishlist-toggle-api", args=[venue.id]),
-        }
-        for venue in filterset.qs
-    ]
-    return JsonResponse(
+def _build_filterset(params) -> VenueFilter:
+    # Cards are read with .values(), which joins the category itself.
+    filterset = VenueFilter(params, queryset=Venue.objects.all())
+    filterset.is_valid()
+    return filterset
+
+
+@read_only
+@login_required
+@require_GET
+async def catalog_filter(request: HttpRequest) -> CompactJsonResponse:
+    """Return the venue cards matching the catalog filters as JSON.
+
+    Cards are cached per filter combination in :data:`katalog.cache.catalog_cache`;
+    only the user's wishlist is looked up on every request. Searches with an
+    availability window skip the cache because bookings change the result.
+    """
+
+    user = await request.auser()
+    cache_key = _filter_cache_key(request)
+    # Availability windows depend on bookings, which do not invalidate the catalog cache.
+    cacheable = not any(request.GET.get(name) for name in AVAILABILITY_PARAMS)
+    cards = await catalog_cache.aget(cache_key) if cacheable else None
+    if cards is None:
+        # Building the filterset queries the city and category choices.
+        filterset = await sync_to_async(_build_filterset)(request.GET)
+        if not filterset.is_valid():
+            field_errors, non_field_errors = _serialise_filter_errors(filterset)
+            return CompactJsonResponse(
+                {
+                    "success": False,
+                    "message": "Invalid filter values submitted.",
+                    "errors": field_errors,
+                    "non_field_errors": non_field_errors,
+                },
+                status=400,
+            )
+        cards = await VenueCardSerializer().arows(VenueCardSerializer.annotate(filterset.qs))
+        if cacheable:
+            await catalog_cache.aset(cache_key, cards)
+
+    wishlist_ids = {
+        venue_id
+        async for venue_id in Wishlist.objects.filter(user=user).values_list("venue_id", flat=True).aiterator()
+    }
+    rendered_cards = [{**card, "wishlisted": card["id"] in wishlist_ids} for card in cards]
+    return CompactJsonResponse(
         {
             "success": True,
             "count": len(rendered_cards),
@@ -109,18 +135,19 @@ def catalog_filter(request: HttpRequest) -> JsonResponse:
     )
 
 
-class VenueDetailView(EnsureCsrfCookieMixin, LoginRequiredMixin, DetailView):
+class VenueDetailView(QueryBudgetMixin, ReadOnlyMixin, EnsureCsrfCookieMixin, LoginRequiredMixin, DetailView):
     model = Venue
     template_name = "katalog/venue_detail.html"
     slug_field = "slug"
     context_object_name = "venue"
+    query_budget = 8
 
     def get_queryset(self):
         return (
             super()
             .get_queryset()
             .select_related("category")
-            .prefetch_related("addons", "reviews__user")
+            .prefetch_related("addons", Prefetch("reviews", queryset=Review.objects.select_related("user")))
         )
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
@@ -148,12 +175,15 @@ class VenueDetailView(EnsureCsrfCookieMixin, LoginRequiredMixin, DetailView):
         context.update(
             {
                 "booking_form": booking_form,
+                # A fresh key per render: resubmitting this form replays the first outcome.
+                "idempotency_field": IDEMPOTENCY_FIELD,
+                "idempotency_key": uuid4().hex,
                 "review_form": review_form,
                 "can_book": can_book,
                 "wishlist_ids": set(
                     Wishlist.objects.filter(user=self.request.user).values_list("venue_id", flat=True)
                 ),
-                "reviews": venue.reviews.select_related("user"),
+                "reviews": venue.reviews.all(),
                 "available_addons": addons,
                 "addon_lookup": {addon["id"]: addon for addon in addons},
             }
@@ -166,6 +196,19 @@ class VenueDetailView(EnsureCsrfCookieMixin, LoginRequiredMixin, DetailView):
             return self.handle_review(request)
         return self.handle_booking(request)
 
+    def _create_booking(self, request: HttpRequest, form: BookingForm) -> HttpResponse:
+        booking: Booking = form.save(commit=False)
+        booking.user = request.user
+        booking.venue = self.object
+        with transaction.atomic():
+            booking.save()
+            form.save_m2m()
+        messages.success(
+            request,
+            "Your booking request was submitted and is awaiting admin approval.",
+        )
+        return redirect("booked-places")
+
     def handle_review(self, request: HttpRequest) -> HttpResponse:
         form = ReviewForm(request.POST)
         if form.is_valid():
@@ -188,15 +231,16 @@ class VenueDetailView(EnsureCsrfCookieMixin, LoginRequiredMixin, DetailView):
             return redirect("venue-detail", slug=self.object.slug)
         form = BookingForm(request.POST, venue=self.object)
         if form.is_valid():
-            booking: Booking = form.save(commit=False)
-            booking.user = request.user
-            booking.venue = self.object
-            booking.save()
-            form.save_m2m()
-            messages.success(
-                request,
-                "Your booking request was submitted and is awaiting admin approval.",
-            )
-            return redirect("booked-places")
+            try:
+                response = run_idempotent(request, partial(self._create_booking, request, form))
+            except BookingOverlap as exc:
+                messages.error(request, exc.message)
+                return redirect("venue-detail", slug=self.object.slug)
+            except IdempotencyConflict as exc:
+                messages.error(request, exc.message)
+                return redirect("booked-places")
+            if REPLAYED_HEADER in response:
+                messages.info(request, "This booking request was already submitted.")
+            return response
         messages.error(request, "Unable to create booking. Please check availability details.")
         return redirect("venue-detail", slug=self.object.slug)
@@ -193,9 +193,6 @@ class BookingDecisionForm(forms.Form):
             booking.approve(approver)
         elif decision == self.CANCEL:
             booking.cancel()
-            if hasattr(booking, "payment"):
-                booking.payment.status = "waiting"
-                booking.payment.save(update_fields=["status", "updated_at"])
         else:  # pragma: no cover - guarded by ChoiceField
             raise ValueError("Keputusan tidak valid.")
 
@@ -0,0 +1,368 @@
+"""Synthetic data generator used for performance testing.
+
+The generator produces users, venues, add-ons and a booking history whose
+arrivals follow a Poisson process per venue and opening day. Every random
+choice is drawn from a single seeded :class:`random.Random` instance, so the
+same parameters always produce the same dataset. Rows are written with chunked
+``bulk_create`` calls; model signals are intentionally bypassed, which means the
+payment rows that :func:`rent.signals.ensure_payment_for_booking` would create
+are generated explicitly alongside the bookings.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Callable, Iterator
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from add_on.models import AddOn
+from interaksi.models import Review, Wishlist
+from katalog.constants import PREFERRED_CITY_ORDER
+from rent.models import Booking, Payment
+from rent.reference_codes import new_reference_codes
+
+from .constants import CATEGORY_DEFINITIONS
+from .models import Category, Venue
+from .seeding import CatalogSeeder, addons_for_category
+
+VENUE_ADJECTIVES = [
+    "Arena",
+    "Prime",
+    "Galaxy",
+    "Nusantara",
+    "Garuda",
+    "Sunrise",
+    "Harmoni",
+    "Skyline",
+    "Merdeka",
+    "Aurora",
+]
+VENUE_SUFFIXES = ["Court", "Hall", "Center", "Dome", "Club", "Park", "Hub", "Stadium"]
+FACILITY_POOL = [
+    "Locker room",
+    "Shower",
+    "Parking",
+    "Cafeteria",
+    "Wi-Fi",
+    "Musholla",
+    "Equipment rental",
+    "Tribune",
+]
+REVIEW_COMMENTS = [
+    "Lapangan bersih dan nyaman.",
+    "Pencahayaan bagus untuk main malam.",
+    "Parkir agak sempit tapi pelayanan ramah.",
+    "Harga sesuai kualitas.",
+    "Akan booking lagi bersama tim.",
+]
+BOOKING_DURATIONS = (1, 1, 2, 2, 2, 3)
+
+
+@dataclass
+class LoadDataSummary:
+    """Number of rows written per model."""
+
+    users: int = 0
+    venues: int = 0
+    addons: int = 0
+    bookings: int = 0
+    payments: int = 0
+    booking_addons: int = 0
+    reviews: int = 0
+    wishlists: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class LoadDataGenerator:
+    """Generate a reproducible dataset with chunked bulk inserts.
+
+    ``bookings_per_day`` is the Poisson rate of booking arrivals per venue and
+    opening day. The history spans ``history_days`` before today and
+    ``future_days`` after it; past bookings end up completed (or cancelled) and
+    future ones are spread over the pending/active/confirmed states.
+    """
+
+    def __init__(
+        self,
+        *,
+        users: int = 100,
+        venues: int = 50,
+        history_days: int = 90,
+        future_days: int = 14,
+        bookings_per_day: float = 3.0,
+        reviews_per_user: int = 2,
+        wishlists_per_user: int = 3,
+        seed: int = 42,
+        chunk_size: int = 5000,
+        prefix: str = "load",
+        password: str = "Load123!",
+        today: date | None = None,
+        progress: Callable[[str], None] | None = None,
+    ) -> None:
+        self.user_count = users
+        self.venue_count = venues
+        self.history_days = history_days
+        self.future_days = future_days
+        self.bookings_per_day = bookings_per_day
+        self.reviews_per_user = reviews_per_user
+        self.wishlists_per_user = wishlists_per_user
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.prefix = prefix
+        self.password = password
+        self.today = today or timezone.localdate()
+        self.progress = progress or (lambda message: None)
+        self.rng = random.Random(seed)
+
+    # ------------------------------------------------------------------ helpers
+    @property
+    def user_prefix(self) -> str:
+        return f"{self.prefix}-user-"
+
+    @property
+    def venue_prefix(self) -> str:
+        return f"{self.prefix}-venue-"
+
+    def existing_data(self) -> bool:
+        user_model = get_user_model()
+        return (
+            user_model.objects.filter(username__startswith=self.user_prefix).exists()
+            or Venue.objects.filter(slug__startswith=self.venue_prefix).exists()
+        )
+
+    def reset(self) -> None:
+        """Delete every row previously generated with the same prefix."""
+
+        with transaction.atomic():
+            Venue.objects.filter(slug__startswith=self.venue_prefix).delete()
+            get_user_model().objects.filter(username__startswith=self.user_prefix).delete()
+
+    def _chunks(self, rows: list) -> Iterator[list]:
+        for index in range(0, len(rows), self.chunk_size):
+            yield rows[index : index + self.chunk_size]
+
+    # --------------------------------------------------------------- generation
+    def generate(self) -> LoadDataSummary:
+        summary = LoadDataSummary()
+        with transaction.atomic():
+            users = self._create_users(summary)
+            venues = self._create_venues(summary)
+            addons = self._create_addons(venues, summary)
+            self._create_bookings(users, venues, addons, summary)
+            self._create_reviews_and_wishlists(users, venues, summary)
+        return summary
+
+    def _create_users(self, summary: LoadDataSummary) -> list:
+        user_model = get_user_model()
+        password_hash = make_password(self.password)
+        users = [
+            user_model(
+                username=f"{self.user_prefix}{index:07d}",
+                email=f"{self.user_prefix}{index:07d}@example.com",
+                password=password_hash,
+            )
+            for index in range(self.user_count)
+        ]
+        for chunk in self._chunks(users):
+            user_model.objects.bulk_create(chunk)
+        summary.users = len(users)
+        self.progress(f"Created {len(users)} users.")
+        return users
+
+    def _create_venues(self, summary: LoadDataSummary) -> list[Venue]:
+        categories = CatalogSeeder(venue_specs=[]).sync_categories()
+        slugs = [slug for slug, _ in CATEGORY_DEFINITIONS]
+        venues: list[Venue] = []
+        for index in range(self.venue_count):
+            category = categories[slugs[index % len(slugs)]]
+            city = PREFERRED_CITY_ORDER[self.rng.randrange(len(PREFERRED_CITY_ORDER))]
+            name = (
+                f"{self.rng.choice(VENUE_ADJECTIVES)} {category.name} "
+                f"{self.rng.choice(VENUE_SUFFIXES)} {index:06d}"
+            )
+            opening_hour = self.rng.choice((6, 7, 8))
+            venues.append(
+                Venue(
+                    category=category,
+                    name=name,
+                    slug=f"{self.venue_prefix}{index:06d}",
+                    description=f"{category.name} venue in {city} generated for load testing.",
+                    location=city,
+                    city=city,
+                    address=f"Jl. Uji Beban No. {index + 1}, {city}",
+                    price_per_hour=Decimal(self.rng.randrange(8, 60) * 10000),
+                    capacity=self.rng.randrange(2, 30),
+                    facilities=",".join(self.rng.sample(FACILITY_POOL, 3)),
+                    available_start_time=time(opening_hour, 0),
+                    available_end_time=time(self.rng.choice((21, 22, 23)), 0),
+                )
+            )
+        for chunk in self._chunks(venues):
+            Venue.objects.bulk_create(chunk)
+        summary.venues = len(venues)
+        self.progress(f"Created {len(venues)} venues.")
+        return venues
+
+    def _create_addons(self, venues: list[Venue], summary: LoadDataSummary) -> dict[int, list[AddOn]]:
+        slugs_by_category = {category_id: slug for slug, category_id in Category.objects.values_list("slug", "pk")}
+        rows: list[AddOn] = []
+        per_venue: dict[int, list[AddOn]] = {}
+        for venue in venues:
+            catalogue = addons_for_category(slugs_by_category.get(venue.category_id, ""))
+            picked = self.rng.sample(catalogue, self.rng.randint(min(2, len(catalogue)), len(catalogue)))
+            per_venue[venue.pk] = [
+                AddOn(venue=venue, name=name, description=description, price=price)
+                for name, description, price in picked
+            ]
+            rows.extend(per_venue[venue.pk])
+        for chunk in self._chunks(rows):
+            AddOn.objects.bulk_create(chunk)
+        summary.addons = len(rows)
+        self.progress(f"Created {len(rows)} add-ons.")
+        return per_venue
+
+    def _booking_windows(self, venue: Venue) -> Iterator[tuple[datetime, datetime, date]]:
+        """Yield non-overlapping ``(start, end, day)`` tuples for ``venue``.
+
+        Arrivals within a day follow a Poisson process with rate
+        ``bookings_per_day`` spread over the opening hours: the gaps between
+        requested start times are exponentially distributed. A request that
+        would overlap the previous booking is pushed to the previous end time,
+        and requests that no longer fit before closing are dropped.
+        """
+
+        open_hour = venue.available_start_time.hour
+        close_hour = venue.available_end_time.hour
+        open_hours = close_hour - open_hour
+        if open_hours <= 0 or self.bookings_per_day <= 0:
+            return
+        rate_per_hour = self.bookings_per_day / open_hours
+        current_tz = timezone.get_current_timezone()
+        first_day = self.today - timedelta(days=self.history_days)
+        for offset in range(self.history_days + self.future_days + 1):
+            day = first_day + timedelta(days=offset)
+            day_start = datetime.combine(day, time(open_hour), tzinfo=current_tz)
+            cursor = 0.0
+            free_from = 0
+            while True:
+                cursor += self.rng.expovariate(rate_per_hour)
+                start_hour = max(int(cursor), free_from)
+                duration = self.rng.choice(BOOKING_DURATIONS)
+                if start_hour + duration > open_hours:
+                    break
+                free_from = start_hour + duration
+                yield (
+                    day_start + timedelta(hours=start_hour),
+                    day_start + timedelta(hours=free_from),
+                    day,
+                )
+
+    def _status_for(self, day: date) -> tuple[str, str]:
+        roll = self.rng.random()
+        if day < self.today:
+            if roll < 0.08:
+                return Booking.STATUS_CANCELLED, "waiting"
+            return Booking.STATUS_COMPLETED, "completed"
+        if roll < 0.3:
+            return Booking.STATUS_PENDING, "waiting"
+        if roll < 0.6:
+            return Booking.STATUS_ACTIVE, "waiting"
+        return Booking.STATUS_CONFIRMED, "confirmed"
+
+    def _create_bookings(
+        self,
+        users: list,
+        venues: list[Venue],
+        addons: dict[int, list[AddOn]],
+        summary: LoadDataSummary,
+    ) -> None:
+        through = Booking.addons.through
+        pending: list[tuple[Booking, str, list[AddOn]]] = []
+
+        def flush() -> None:
+            if not pending:
+                return
+            bookings = Booking.objects.bulk_create([booking for booking, _, _ in pending])
+            payments: list[Payment] = []
+            links: list = []
+            codes = new_reference_codes(len(pending))
+            for (booking, payment_status, chosen), code in zip(pending, codes):
+                total = booking.venue.hourly_total(booking.duration_hours)
+                total += sum((addon.price for addon in chosen), Decimal("0"))
+                payments.append(
+                    Payment(
+                        booking=booking,
+                        method="qris" if booking.pk % 2 else "gopay",
+                        status=payment_status,
+                        total_amount=total,
+                        reference_code=code,
+                    )
+                )
+                links.extend(through(booking_id=booking.pk, addon_id=addon.pk) for addon in chosen)
+            Payment.objects.bulk_create(payments)
+            if links:
+                through.objects.bulk_create(links)
+            summary.bookings += len(bookings)
+            summary.payments += len(payments)
+            summary.booking_addons += len(links)
+            pending.clear()
+            self.progress(f"Created {summary.bookings} bookings so far.")
+
+        for venue in venues:
+            venue_addons = addons.get(venue.pk, [])
+            for start, end, day in self._booking_windows(venue):
+                status, payment_status = self._status_for(day)
+                chosen = (
+                    self.rng.sample(venue_addons, self.rng.randint(0, min(2, len(venue_addons))))
+                    if venue_addons
+                    else []
+                )
+                pending.append(
+                    (
+                        Booking(
+                            user=users[self.rng.randrange(len(users))],
+                            venue=venue,
+                            start_datetime=start,
+                            end_datetime=end,
+                            status=status,
+                        ),
+                        payment_status,
+                        chosen,
+                    )
+                )
+                if len(pending) >= self.chunk_size:
+                    flush()
+        flush()
+
+    def _create_reviews_and_wishlists(self, users: list, venues: list[Venue], summary: LoadDataSummary) -> None:
+        reviews: list[Review] = []
+        wishlists: list[Wishlist] = []
+        review_count = min(self.reviews_per_user, len(venues))
+        wishlist_count = min(self.wishlists_per_user, len(venues))
+        for user in users:
+            for venue in self.rng.sample(venues, review_count):
+                reviews.append(
+                    Review(
+                        user=user,
+                        venue=venue,
+                        rating=self.rng.randint(1, 5),
+                        comment=self.rng.choice(REVIEW_COMMENTS),
+                    )
+                )
+            for venue in self.rng.sample(venues, wishlist_count):
+                wishlists.append(Wishlist(user=user, venue=venue))
+        for chunk in self._chunks(reviews):
+            Review.objects.bulk_create(chunk)
+        for chunk in self._chunks(wishlists):
+            Wishlist.objects.bulk_create(chunk)
+        summary.reviews = len(reviews)
+        summary.wishlists = len(wishlists)
+        self.progress(f"Created {len(reviews)} reviews and {len(wishlists)} wishlist entries.")
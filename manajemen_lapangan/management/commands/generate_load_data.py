@@ -0,0 +1,73 @@
+"""Generate a large synthetic dataset for performance testing."""
+from __future__ import annotations
+
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from manajemen_lapangan.load_data import LoadDataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users, venues, add-ons, bookings, payments, reviews and "
+        "wishlists for benchmarking. Output is reproducible for a given --seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Number of users to create.")
+        parser.add_argument("--venues", type=int, default=200, help="Number of venues to create.")
+        parser.add_argument("--history-days", type=int, default=180, help="Days of booking history before today.")
+        parser.add_argument("--future-days", type=int, default=30, help="Days of upcoming bookings after today.")
+        parser.add_argument(
+            "--bookings-per-day",
+            type=float,
+            default=3.0,
+            help="Poisson arrival rate of bookings per venue and day.",
+        )
+        parser.add_argument("--reviews-per-user", type=int, default=2)
+        parser.add_argument("--wishlists-per-user", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42, help="Seed for the random number generator.")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per bulk insert.")
+        parser.add_argument(
+            "--prefix",
+            default="load",
+            help="Prefix used for generated usernames and venue slugs.",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Delete data previously generated with the same prefix before generating.",
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["venues"] < 1:
+            raise CommandError("--users and --venues must be at least 1.")
+
+        generator = LoadDataGenerator(
+            users=options["users"],
+            venues=options["venues"],
+            history_days=options["history_days"],
+            future_days=options["future_days"],
+            bookings_per_day=options["bookings_per_day"],
+            reviews_per_user=options["reviews_per_user"],
+            wishlists_per_user=options["wishlists_per_user"],
+            seed=options["seed"],
+            chunk_size=options["chunk_size"],
+            prefix=options["prefix"],
+            progress=self.stdout.write,
+        )
+
+        if generator.existing_data():
+            if not options["reset"]:
+                raise CommandError(
+                    f"Data with prefix '{options['prefix']}' already exists. Use --reset to regenerate it."
+                )
+            self.stdout.write("Removing previously generated data...")
+            generator.reset()
+
+        started = perf_counter()
+        summary = generator.generate()
+        elapsed = perf_counter() - started
+        counts = ", ".join(f"{name}={count}" for name, count in summary.as_dict().items())
+        self.stdout.write(self.style.SUCCESS(f"Generated load data in {elapsed:.1f}s: {counts}"))
@@ -0,0 +1,553 @@
+"""Bulk seeding engine for the demo catalogue.
+
+The engine builds every category, venue, add-on and availability window in
+memory, diffs it against what is already stored and only writes the rows that
+changed using ``bulk_create``/``bulk_update``. Re-running it against an already
+seeded database therefore costs a handful of ``SELECT`` statements.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Iterable
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from add_on.models import AddOn
+
+from .constants import CATEGORY_DEFINITIONS
+from .models import Category, Venue, VenueAvailability
+
+
+CATEGORY_ADDONS: dict[str, list[tuple[str, str, Decimal]]] = {
+    "badminton": [
+        (
+            "Shuttlecock premium (Tube)",
+            "Satu tube berisi 12 shuttlecock bulu angsa turnamen.",
+            Decimal("55000"),
+        ),
+        (
+            "Sewa raket badminton",
+            "Paket dua raket karbon siap pakai dengan tas pelindung.",
+            Decimal("40000"),
+        ),
+        (
+            "Sewa net turnamen",
+            "Pemasangan net standar BWF untuk satu lapangan.",
+            Decimal("30000"),
+        ),
+        (
+            "Grip pengganti",
+            "Set grip anti-slip baru untuk dua raket.",
+            Decimal("15000"),
+        ),
+        (
+            "Jasa fotografer",
+            "Fotografer profesional untuk mendokumentasikan permainan Anda.",
+            Decimal("400000"),
+        ),
+        (
+            "Wasit badminton",
+            "Wasit berlisensi untuk pertandingan kompetitif.",
+            Decimal("200000"),
+        ),
+    ],
+    "basket": [
+        (
+            "Bola basket (sewa)",
+            "Satu bola indoor komposit siap bertanding.",
+            Decimal("50000"),
+        ),
+        (
+            "Rompi tim (2 set)",
+            "Rompi dua warna untuk membedakan tim selama scrimmage.",
+            Decimal("50000"),
+        ),
+        (
+            "Papan skor & operator",
+            "Operator profesional berikut papan skor dan shot clock digital.",
+            Decimal("150000"),
+        ),
+        (
+            "Wasit basket (2 orang)",
+            "Dua wasit berlisensi untuk mengawal jalannya pertandingan.",
+            Decimal("500000"),
+        ),
+        (
+            "Sepatu basket (sewa)",
+            "Sewa sepasang sepatu basket premium.",
+            Decimal("50000"),
+        ),
+        (
+            "Fotografer/Videografer",
+            "Dokumentasi foto dan video profesional pertandingan.",
+            Decimal("500000"),
+        ),
+    ],
+    "billiard": [
+        (
+            "Stik premium (sewa)",
+            "Sewa stik berkualitas turnamen dengan perawatan rutin.",
+            Decimal("50000"),
+        ),
+        (
+            "Kapur cue",
+            "Satu kotak kapur cue profesional.",
+            Decimal("15000"),
+        ),
+        (
+            "Sarung tangan billiard",
+            "Sarung tangan microfiber anti-slip.",
+            Decimal("25000"),
+        ),
+        (
+            "Jasa wasit/marker",
+            "Pengawas pertandingan untuk menjaga jalannya game.",
+            Decimal("50000"),
+        ),
+        (
+            "Pelatih billiard",
+            "Sesi pelatih profesional per jam.",
+            Decimal("150000"),
+        ),
+    ],
+    "futsal": [
+        (
+            "Bola futsal (sewa)",
+            "Sewa bola futsal standar pertandingan.",
+            Decimal("50000"),
+        ),
+        (
+            "Rompi tim (2 set)",
+            "Rompi latihan dua warna untuk dua tim.",
+            Decimal("50000"),
+        ),
+        (
+            "Sarung tangan kiper",
+            "Sewa sarung tangan kiper profesional.",
+            Decimal("30000"),
+        ),
+        (
+            "Sepatu futsal (sewa)",
+            "Pilihan ukuran lengkap sepatu futsal premium.",
+            Decimal("40000"),
+        ),
+        (
+            "Papan skor digital",
+            "Papan skor digital portabel untuk menghitung skor real-time.",
+            Decimal("75000"),
+        ),
+        (
+            "Wasit futsal",
+            "Wasit profesional untuk memimpin pertandingan.",
+            Decimal("200000"),
+        ),
+        (
+            "Fotografer",
+            "Fotografer olahraga untuk dokumentasi pertandingan.",
+            Decimal("400000"),
+        ),
+    ],
+    "mini-soccer": [
+        (
+            "Bola mini soccer (sewa)",
+            "Sewa bola mini soccer berkualitas match day.",
+            Decimal("60000"),
+        ),
+        (
+            "Rompi tim (2 set)",
+            "Rompi latihan dua warna untuk membedakan tim.",
+            Decimal("60000"),
+        ),
+        (
+            "Sarung tangan kiper",
+            "Sewa sarung tangan kiper profesional.",
+            Decimal("30000"),
+        ),
+        (
+            "Sepatu mini soccer (sewa)",
+            "Sewa sepatu turf untuk permukaan rumput sintetis.",
+            Decimal("40000"),
+        ),
+        (
+            "Papan skor",
+            "Papan skor portabel untuk pertandingan Anda.",
+            Decimal("100000"),
+        ),
+        (
+            "Wasit mini soccer",
+            "Wasit profesional untuk memimpin pertandingan.",
+            Decimal("250000"),
+        ),
+        (
+            "Fotografer/Videografer",
+            "Dokumentasi foto dan video profesional.",
+            Decimal("500000"),
+        ),
+    ],
+    "padel": [
+        (
+            "Bola padel (kaleng)",
+            "Satu kaleng berisi tiga bola padel premium.",
+            Decimal("90000"),
+        ),
+        (
+            "Raket padel (sewa)",
+            "Sewa raket padel grafit dengan grip baru.",
+            Decimal("60000"),
+        ),
+        (
+            "Pelatih padel",
+            "Pelatih/partner tanding profesional per jam.",
+            Decimal("200000"),
+        ),
+        (
+            "Fotografer",
+            "Fotografer olahraga untuk dokumentasi pertandingan.",
+            Decimal("400000"),
+        ),
+    ],
+    "sepak-bola": [
+        (
+            "Bola sepak (sewa)",
+            "Sewa bola pertandingan standar FIFA.",
+            Decimal("75000"),
+        ),
+        (
+            "Rompi latihan (2 set)",
+            "Rompi latihan dua warna untuk sesi drill.",
+            Decimal("75000"),
+        ),
+        (
+            "Sarung tangan kiper",
+            "Sewa sarung tangan kiper profesional.",
+            Decimal("40000"),
+        ),
+        (
+            "Cone & marker latihan",
+            "Satu set cone dan marker untuk latihan taktik.",
+            Decimal("50000"),
+        ),
+        (
+            "Wasit sepak bola (3 orang)",
+            "Tim wasit lengkap (referee + 2 asisten).",
+            Decimal("1000000"),
+        ),
+        (
+            "Tim medis/P3K",
+            "Tim medis profesional berikut peralatan P3K.",
+            Decimal("300000"),
+        ),
+        (
+            "Fotografer/Videografer",
+            "Paket dokumentasi profesional foto dan video.",
+            Decimal("700000"),
+        ),
+    ],
+    "tenis-meja": [
+        (
+            "Bola pingpong (kotak)",
+            "Satu kotak bola seluloid turnamen.",
+            Decimal("30000"),
+        ),
+        (
+            "Bet tenis meja (sewa)",
+            "Sewa dua bet karet profesional.",
+            Decimal("20000"),
+        ),
+        (
+            "Robot pelontar bola",
+            "Sewa robot pelontar bola per jam.",
+            Decimal("75000"),
+        ),
+        (
+            "Wasit/Penghitung skor",
+            "Wasit sekaligus penghitungan skor per jam.",
+            Decimal("50000"),
+        ),
+        (
+            "Pelatih tenis meja",
+            "Pelatih atau sparring partner profesional per jam.",
+            Decimal("150000"),
+        ),
+    ],
+    "tennis": [
+        (
+            "Bola tenis (kaleng)",
+            "Kaleng isi tiga bola tenis premium.",
+            Decimal("80000"),
+        ),
+        (
+            "Raket tenis (sewa)",
+            "Sewa raket grafit siap tanding.",
+            Decimal("50000"),
+        ),
+        (
+            "Mesin pelontar bola",
+            "Mesin pelontar otomatis per jam.",
+            Decimal("100000"),
+        ),
+        (
+            "Pemungut bola",
+            "Ball boy/girl per jam untuk membantu latihan.",
+            Decimal("50000"),
+        ),
+        (
+            "Pelatih tenis",
+            "Pelatih atau partner tanding profesional per jam.",
+            Decimal("200000"),
+        ),
+        (
+            "Fotografer",
+            "Fotografer olahraga untuk mendokumentasikan sesi Anda.",
+            Decimal("400000"),
+        ),
+    ],
+    "volley-ball": [
+        (
+            "Bola voli (sewa)",
+            "Sewa bola voli standar turnamen.",
+            Decimal("40000"),
+        ),
+        (
+            "Net turnamen (sewa)",
+            "Sewa net voli standar turnamen lengkap dengan tiang.",
+            Decimal("50000"),
+        ),
+        (
+            "Papan skor digital",
+            "Papan skor digital dengan operator.",
+            Decimal("75000"),
+        ),
+        (
+            "Wasit voli",
+            "Wasit profesional untuk pertandingan resmi.",
+            Decimal("250000"),
+        ),
+        (
+            "Pelindung lutut & lengan",
+            "Sewa pelindung lutut dan lengan untuk dua pemain.",
+            Decimal("25000"),
+        ),
+        (
+            "Fotografer",
+            "Fotografer profesional untuk dokumentasi laga.",
+            Decimal("400000"),
+        ),
+    ],
+}
+
+DEFAULT_ADDONS: list[tuple[str, str, Decimal]] = [
+    (
+        "Premium lighting",
+        "Enhanced lighting package for night matches",
+        Decimal("50000"),
+    ),
+    (
+        "Professional referee",
+        "Certified referee service for competitive games",
+        Decimal("150000"),
+    ),
+]
+
+DEMO_VENUES: list[dict[str, Any]] = [
+    {
+        "name": "Skyline Futsal Dome",
+        "category": "futsal",
+        "description": "Premium futsal court with climate control, smart lighting, and professional-grade turf.",
+        "location": "Central Jakarta",
+        "city": "Jakarta",
+        "address": "Jl. Merdeka No. 123, Jakarta",
+        "price_per_hour": Decimal("350000"),
+        "capacity": 12,
+        "facilities": "Locker room,Shower,Lounge,Parking",
+        "image_url": "https://images.unsplash.com/photo-1517649763962-0c623066013b?auto=format&fit=crop&w=800&q=80",
+    },
+    {
+        "name": "Aurora Hoops Pavilion",
+        "category": "basket",
+        "description": "Glass-roofed basketball court with viewing gallery and digital scoreboard.",
+        "location": "Bandung",
+        "city": "Bandung",
+        "address": "Jl. Braga No. 88, Bandung",
+        "price_per_hour": Decimal("420000"),
+        "capacity": 20,
+        "facilities": "Changing rooms,Café,Parking,Equipment rental",
+        "image_url": "https://images.unsplash.com/photo-1582719478250-c89cae4dc85b?auto=format&fit=crop&w=800&q=80",
+    },
+    {
+        "name": "Featherlite Badminton Hub",
+        "category": "badminton",
+        "description": "Tournament-ready badminton complex with cushioned floors and LED panel lighting.",
+        "location": "Yogyakarta",
+        "city": "Yogyakarta",
+        "address": "Jl. Malioboro No. 17, Yogyakarta",
+        "price_per_hour": Decimal("250000"),
+        "capacity": 8,
+        "facilities": "Locker room,Equipment store,Cafeteria,Wi-Fi",
+        "image_url": "https://images.unsplash.com/photo-1601288496920-b6154fe362d7?auto=format&fit=crop&w=800&q=80",
+    },
+]
+
+VENUE_FIELDS: tuple[str, ...] = (
+    "category",
+    "name",
+    "description",
+    "location",
+    "city",
+    "address",
+    "price_per_hour",
+    "capacity",
+    "facilities",
+    "image_url",
+)
+
+
+def addons_for_category(slug: str) -> list[tuple[str, str, Decimal]]:
+    """Return the curated add-on list for ``slug``, falling back to the defaults."""
+
+    return CATEGORY_ADDONS.get(slug, DEFAULT_ADDONS)
+
+
+class CatalogSeeder:
+    """Synchronise the demo catalogue with the database using bulk writes.
+
+    ``venue_specs`` follow the shape of :data:`DEMO_VENUES`: the ``category``
+    key holds a category slug instead of a model instance so the whole plan can
+    be built before anything is read from the database.
+    """
+
+    def __init__(
+        self,
+        venue_specs: Iterable[dict[str, Any]] = DEMO_VENUES,
+        *,
+        availability_days: int = 3,
+        availability_hours: int = 3,
+        now: datetime | None = None,
+    ) -> None:
+        self.venue_specs = [dict(spec) for spec in venue_specs]
+        self.availability_days = availability_days
+        self.availability_hours = availability_hours
+        self.now = now or timezone.now()
+
+    def seed(self) -> list[Venue]:
+        """Write the catalogue in a single transaction and return the venues."""
+
+        with transaction.atomic():
+            categories = self.sync_categories()
+            venues = self.sync_venues(categories)
+            self.sync_addons(venues, categories)
+            self.sync_availability(venues)
+        return venues
+
+    def sync_categories(self) -> dict[str, Category]:
+        existing = {category.slug: category for category in Category.objects.all()}
+        to_create: list[Category] = []
+        to_update: list[Category] = []
+        for slug, name in CATEGORY_DEFINITIONS:
+            category = existing.get(slug)
+            if category is None:
+                to_create.append(Category(slug=slug, name=name))
+            elif category.name != name:
+                category.name = name
+                category.updated_at = self.now
+                to_update.append(category)
+        if to_create:
+            Category.objects.bulk_create(to_create)
+            existing.update({category.slug: category for category in to_create})
+        if to_update:
+            Category.objects.bulk_update(to_update, ["name", "updated_at"])
+        return existing
+
+    def sync_venues(self, categories: dict[str, Category]) -> list[Venue]:
+        planned: dict[str, dict[str, Any]] = {}
+        for spec in self.venue_specs:
+            values = {**spec, "category": categories[spec["category"]]}
+            planned[slugify(values["name"])] = values
+
+        existing = {venue.slug: venue for venue in Venue.objects.filter(slug__in=planned)}
+        to_create: list[Venue] = []
+        to_update: list[Venue] = []
+        for slug, values in planned.items():
+            venue = existing.get(slug)
+            if venue is None:
+                to_create.append(Venue(slug=slug, **values))
+                continue
+            changed = False
+            for field in VENUE_FIELDS:
+                current = venue.category_id if field == "category" else getattr(venue, field)
+                target = values[field].pk if field == "category" else values[field]
+                if current != target:
+                    setattr(venue, field, values[field])
+                    changed = True
+            if changed:
+                venue.updated_at = self.now
+                to_update.append(venue)
+
+        if to_create:
+            Venue.objects.bulk_create(to_create)
+            if any(venue.pk is None for venue in to_create):
+                # Backends without RETURNING support leave primary keys unset.
+                to_create = list(Venue.objects.filter(slug__in=[venue.slug for venue in to_create]))
+            existing.update({venue.slug: venue for venue in to_create})
+        if to_update:
+            Venue.objects.bulk_update(to_update, [*VENUE_FIELDS, "updated_at"])
+        return [existing[slug] for slug in planned]
+
+    def sync_addons(self, venues: list[Venue], categories: dict[str, Category]) -> None:
+        current: dict[int, dict[str, AddOn]] = defaultdict(dict)
+        for addon in AddOn.objects.filter(venue__in=venues):
+            current[addon.venue_id][addon.name] = addon
+
+        category_slugs = {category.pk: slug for slug, category in categories.items()}
+        stale_ids: list[int] = []
+        to_create: list[AddOn] = []
+        to_update: list[AddOn] = []
+        for venue in venues:
+            wanted = addons_for_category(category_slugs.get(venue.category_id, ""))
+            keep_names = {name for name, *_ in wanted}
+            stale_ids.extend(
+                addon.pk for name, addon in current[venue.pk].items() if name not in keep_names
+            )
+            for name, description, price in wanted:
+                addon = current[venue.pk].get(name)
+                if addon is None:
+                    to_create.append(AddOn(venue=venue, name=name, description=description, price=price))
+                elif addon.description != description or addon.price != price:
+                    addon.description = description
+                    addon.price = price
+                    addon.updated_at = self.now
+                    to_update.append(addon)
+
+        if stale_ids:
+            AddOn.objects.filter(pk__in=stale_ids).delete()
+        if to_create:
+            AddOn.objects.bulk_create(to_create)
+        if to_update:
+            AddOn.objects.bulk_update(to_update, ["description", "price", "updated_at"])
+
+    def sync_availability(self, venues: list[Venue]) -> None:
+        base = self.now.replace(hour=9, minute=0, second=0, microsecond=0)
+        windows = [
+            (base + timedelta(days=offset), base + timedelta(days=offset, hours=self.availability_hours))
+            for offset in range(self.availability_days)
+        ]
+
+        current: dict[int, list[tuple[datetime, datetime]]] = defaultdict(list)
+        for venue_id, start, end in VenueAvailability.objects.filter(venue__in=venues).values_list(
+            "venue_id", "start_datetime", "end_datetime"
+        ):
+            current[venue_id].append((start, end))
+
+        outdated = [venue for venue in venues if sorted(current[venue.pk]) != windows]
+        if not outdated:
+            return
+        VenueAvailability.objects.filter(venue__in=outdated).delete()
+        VenueAvailability.objects.bulk_create(
+            VenueAvailability(venue=venue, start_datetime=start, end_datetime=end)
+            for venue in outdated
+            for start, end in windows
+        )
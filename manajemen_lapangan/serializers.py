@@ -0,0 +1,66 @@
+"""JSON shapes of the venue admin API (see :mod:`TK_PBP.serialization`)."""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import time
+from typing import Any
+
+from django.db.models import QuerySet
+
+from add_on.models import AddOn
+from TK_PBP.serialization import Field, Serializer, UrlField
+
+
+def _clock(value: time) -> str:
+    return value.strftime("%H:%M")
+
+
+def _category(category_id: int, name: str) -> dict[str, Any]:
+    return {"id": category_id, "name": name}
+
+
+class AddOnSerializer(Serializer):
+    __slots__ = ()
+
+    id = Field()
+    name = Field()
+    description = Field()
+    price = Field(convert=str)
+
+
+class VenueSerializer(Serializer):
+    """A venue as the admin dashboard edits it, without its add-ons."""
+
+    __slots__ = ()
+
+    id = Field()
+    name = Field()
+    slug = Field()
+    description = Field()
+    location = Field()
+    city = Field()
+    address = Field()
+    price_per_hour = Field(convert=str)
+    capacity = Field()
+    facilities = Field()
+    image_url = Field()
+    available_start_time = Field(convert=_clock)
+    available_end_time = Field(convert=_clock)
+    category = Field("category_id", "category__name", convert=_category)
+    detail_url = UrlField("venue-detail", "slug", kwarg="slug")
+    edit_url = UrlField("admin-venue-edit", "id", kwarg="pk")
+    delete_url = UrlField("admin-venue-delete", "id", kwarg="pk")
+
+
+def serialize_venues(queryset: QuerySet) -> list[dict[str, Any]]:
+    """Serialize venues with their add-ons in two queries, without model instances."""
+
+    venues = VenueSerializer().rows(queryset)
+    addons: defaultdict[int, list[dict[str, Any]]] = defaultdict(list)
+    serializer = AddOnSerializer()
+    rows = AddOn.objects.filter(venue__in=[venue["id"] for venue in venues])
+    for row in rows.values("venue_id", *AddOnSerializer.columns()):
+        addons[row["venue_id"]].append(serializer.serialize(row))
+    for venue in venues:
+        venue["addons"] = addons[venue["id"]]
+    return venues
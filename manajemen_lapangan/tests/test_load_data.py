@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from interaksi.models import Review, Wishlist
+from rent.models import Booking, Payment
+
+from ..load_data import LoadDataGenerator
+from ..models import Venue
+
+
+class LoadDataGeneratorTests(TestCase):
+    def _generator(self, **kwargs) -> LoadDataGenerator:
+        options = {
+            "users": 6,
+            "venues": 4,
+            "history_days": 10,
+            "future_days": 3,
+            "bookings_per_day": 4.0,
+            "seed": 7,
+            "chunk_size": 10,
+            "today": date(2025, 3, 1),
+        }
+        options.update(kwargs)
+        return LoadDataGenerator(**options)
+
+    def _booking_rows(self):
+        return list(
+            Booking.objects.order_by("venue__slug", "start_datetime").values_list(
+                "venue__slug", "user__username", "start_datetime", "end_datetime", "status"
+            )
+        )
+
+    def test_generates_consistent_rows(self):
+        summary = self._generator().generate()
+
+        self.assertEqual(summary.users, 6)
+        self.assertEqual(summary.venues, 4)
+        self.assertGreater(summary.bookings, 0)
+        self.assertEqual(Booking.objects.count(), summary.bookings)
+        self.assertEqual(Payment.objects.count(), summary.bookings)
+        self.assertEqual(Review.objects.count(), summary.reviews)
+        self.assertEqual(Wishlist.objects.count(), summary.wishlists)
+        for booking in Booking.objects.select_related("venue", "payment").prefetch_related("addons"):
+            self.assertEqual(booking.payment.total_amount, booking.total_cost)
+
+    def test_bookings_never_overlap_within_a_venue(self):
+        self._generator().generate()
+
+        by_venue = defaultdict(list)
+        for venue_id, start, end in Booking.objects.values_list("venue_id", "start_datetime", "end_datetime"):
+            by_venue[venue_id].append((start, end))
+        for windows in by_venue.values():
+            windows.sort()
+            for (_, previous_end), (next_start, _) in zip(windows, windows[1:]):
+                self.assertLessEqual(previous_end, next_start)
+
+    def test_same_seed_reproduces_dataset(self):
+        self._generator().generate()
+        first = self._booking_rows()
+        self._generator().reset()
+        self.assertFalse(Venue.objects.filter(slug__startswith="load-venue-").exists())
+
+        self._generator().generate()
+        self.assertEqual(self._booking_rows(), first)
+
+    def test_command_refuses_to_overwrite_without_reset(self):
+        arguments = ["--users", "2", "--venues", "2", "--history-days", "2", "--future-days", "1"]
+        call_command("generate_load_data", *arguments, stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command("generate_load_data", *arguments, stdout=StringIO())
+        call_command("generate_load_data", *arguments, "--reset", stdout=StringIO())
+        self.assertEqual(Venue.objects.filter(slug__startswith="load-venue-").count(), 2)
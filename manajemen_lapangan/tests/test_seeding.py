@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from add_on.models import AddOn
+from rent.models import Booking, Payment
+
+from ..constants import CATEGORY_DEFINITIONS
+from ..models import Category, Venue, VenueAvailability
+from ..seeding import DEMO_VENUES, CatalogSeeder, addons_for_category
+
+
+class CatalogSeederTests(TestCase):
+    def test_seed_creates_full_catalogue(self):
+        venues = CatalogSeeder().seed()
+
+        self.assertEqual(len(venues), len(DEMO_VENUES))
+        self.assertTrue(all(venue.pk for venue in venues))
+        self.assertTrue(
+            {slug for slug, _ in CATEGORY_DEFINITIONS} <= set(Category.objects.values_list("slug", flat=True))
+        )
+        for venue in venues:
+            expected = {name for name, *_ in addons_for_category(venue.category.slug)}
+            self.assertEqual(set(venue.addons.values_list("name", flat=True)), expected)
+            self.assertEqual(venue.availabilities.count(), 3)
+
+    def test_reseeding_is_idempotent_and_read_only(self):
+        seeder = CatalogSeeder()
+        seeder.seed()
+        snapshot = (Venue.objects.count(), AddOn.objects.count(), VenueAvailability.objects.count())
+
+        with CaptureQueriesContext(connection) as ctx:
+            seeder.seed()
+
+        writes = [
+            query["sql"]
+            for query in ctx.captured_queries
+            if query["sql"].lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+        self.assertEqual(writes, [])
+        self.assertLessEqual(len(ctx.captured_queries), 8)
+        self.assertEqual(
+            snapshot,
+            (Venue.objects.count(), AddOn.objects.count(), VenueAvailability.objects.count()),
+        )
+
+    def test_reseeding_repairs_drifted_rows(self):
+        venues = CatalogSeeder().seed()
+        venue = venues[0]
+        Venue.objects.filter(pk=venue.pk).update(price_per_hour="1.00")
+        AddOn.objects.create(venue=venue, name="Obsolete extra", price="1.00")
+        VenueAvailability.objects.filter(venue=venue).delete()
+
+        CatalogSeeder().seed()
+
+        venue.refresh_from_db()
+        self.assertEqual(venue.price_per_hour, DEMO_VENUES[0]["price_per_hour"])
+        self.assertFalse(venue.addons.filter(name="Obsolete extra").exists())
+        self.assertEqual(venue.availabilities.count(), 3)
+
+
+class SeedDemoCommandTests(TestCase):
+    def test_command_can_run_twice(self):
+        call_command("seeddemo", stdout=StringIO())
+        call_command("seeddemo", stdout=StringIO())
+
+        self.assertEqual(Venue.objects.count(), len(DEMO_VENUES))
+        self.assertEqual(Booking.objects.count(), 1)
+        payment = Payment.objects.get()
+        self.assertEqual(payment.status, "confirmed")
+        self.assertEqual(payment.total_amount, payment.booking.total_cost)
@@ -6,6 +6,8 @@ from add_on.views import AdminVenueAddOnManageView
 from .views import (
     AdminBookingApprovalView,
     AdminDashboardView,
+    AdminMetricsView,
+    AdminSlowQueryView,
     AdminVenueApiView,
     AdminVenueCreateView,
     AdminVenueDeleteView,
@@ -17,6 +19,8 @@ from .views import (
 urlpatterns = [
     path("", AdminDashboardView.as_view(), name="admin-dashboard"),
     path("bookings/", AdminBookingApprovalView.as_view(), name="admin-bookings"),
+    path("metrics/", AdminMetricsView.as_view(), name="admin-metrics"),
+    path("slow-queries/", AdminSlowQueryView.as_view(), name="admin-slow-queries"),
     path("venues/", AdminVenueListView.as_view(), name="admin-venues"),
     path("venues/add/", AdminVenueCreateView.as_view(), name="admin-venue-create"),
     path("venues/<int:pk>/edit/", AdminVenueUpdateView.as_view(), name="admin-venue-edit"),
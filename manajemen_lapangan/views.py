@@ -5,26 +5,32 @@ import json
 import logging
 from typing import Any
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db import IntegrityError
 from django.forms import BaseInlineFormSet
-from django.http import HttpRequest, HttpResponse, JsonResponse, QueryDict
+from django.http import HttpRequest, HttpResponse, QueryDict
 from django.shortcuts import get_object_or_404, redirect, render
-from django.urls import reverse, reverse_lazy
+from django.urls import reverse_lazy
+from django.utils.crypto import constant_time_compare
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.generic import ListView, TemplateView
 
 from authentication.forms import AdminCreationForm
-from authentication.mixins import AdminRequiredMixin
+from authentication.mixins import AdminRequiredMixin, QueryBudgetMixin
 from add_on.formsets import build_addon_formset
 from rent.models import Booking, Payment
+from TK_PBP.metrics import registry as metrics_registry
+from TK_PBP.serialization import CompactJsonResponse
+from TK_PBP.slow_queries import slow_query_log
 
 from .forms import BookingDecisionForm, VenueForm
 from .models import Venue
+from .serializers import AddOnSerializer, VenueSerializer, serialize_venues
 
 logger = logging.getLogger(__name__)
 
@@ -60,13 +66,17 @@ class AdminDashboardView(AdminRequiredMixin, LoginRequiredMixin, TemplateView):
         return self.render_to_response(self.get_context_data(admin_form=form))
 
 
-class AdminVenueListView(AdminRequiredMixin, LoginRequiredMixin, ListView):
+class AdminVenueListView(QueryBudgetMixin, AdminRequiredMixin, LoginRequiredMixin, ListView):
     model = Venue
     template_name = "manajemen_lapangan/venue_list.html"
     context_object_name = "venues"
     paginate_by = 10
     ordering = ["name"]
     form_class = VenueForm
+    query_budget = 6
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("category")
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
@@ -226,39 +236,56 @@ class AdminBookingApprovalView(AdminRequiredMixin, LoginRequiredMixin, TemplateV
         return redirect("admin-bookings")
 
 
+class AdminMetricsView(AdminRequiredMixin, LoginRequiredMixin, View):
+    """Expose the in-memory request metrics in the Prometheus text format.
+
+    Staff sessions can open the endpoint directly; scrapers authenticate with
+    ``Authorization: Bearer <METRICS_TOKEN>`` when that setting is configured.
+    """
+
+    http_method_names = ["get"]
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        token = getattr(settings, "METRICS_TOKEN", "")
+        if token and constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return View.dispatch(self, request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        return HttpResponse(metrics_registry.render(), content_type=self.content_type)
+
+
+class AdminSlowQueryView(AdminRequiredMixin, LoginRequiredMixin, TemplateView):
+    """Browse the slow query log of the current process."""
+
+    template_name = "manajemen_lapangan/slow_queries.html"
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context.update(
+            {
+                "slow_queries": slow_query_log.entries(),
+                "threshold_ms": getattr(settings, "SLOW_QUERY_THRESHOLD_MS", 200),
+                "explain_rate": getattr(settings, "SLOW_QUERY_EXPLAIN_RATE", 0.1),
+                "log_size": slow_query_log.size,
+            }
+        )
+        return context
+
+    def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        slow_query_log.clear()
+        messages.success(request, "Slow query log cleared.")
+        return redirect("admin-slow-queries")
+
+
 def serialize_venue(venue: Venue) -> dict[str, Any]:
     """Return a JSON-serialisable representation of a venue."""
 
+    addon_serializer = AddOnSerializer()
     return {
-        "id": venue.pk,
-        "name": venue.name,
-        "slug": venue.slug,
-        "description": venue.description,
-        "location": venue.location,
-        "city": venue.city,
-        "address": venue.address,
-        "price_per_hour": str(venue.price_per_hour),
-        "capacity": venue.capacity,
-        "facilities": venue.facilities,
-        "image_url": venue.image_url,
-        "available_start_time": venue.available_start_time.strftime("%H:%M"),
-        "available_end_time": venue.available_end_time.strftime("%H:%M"),
-        "category": {
-            "id": venue.category_id,
-            "name": venue.category.name,
-        },
-        "detail_url": reverse("venue-detail", kwargs={"slug": venue.slug}),
-        "edit_url": reverse("admin-venue-edit", kwargs={"pk": venue.pk}),
-        "delete_url": reverse("admin-venue-delete", kwargs={"pk": venue.pk}),
-        "addons": [
-            {
-                "id": addon.pk,
-                "name": addon.name,
-                "description": addon.description,
-                "price": str(addon.price),
-            }
-            for addon in venue.addons.all()
-        ],
+        **VenueSerializer().serialize_instance(venue),
+        "addons": [addon_serializer.serialize_instance(addon) for addon in venue.addons.all()],
     }
 
 
@@ -320,24 +347,19 @@ class AdminVenueApiView(AdminRequiredMixin, LoginRequiredMixin, View):
     def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
         return super().dispatch(request, *args, **kwargs)
 
-    def get(self, request: HttpRequest) -> JsonResponse:
+    def get(self, request: HttpRequest) -> CompactJsonResponse:
         if not is_ajax(request):
-            return JsonResponse({"success": False, "error": "AJAX request required."}, status=400)
+            return CompactJsonResponse({"success": False, "error": "AJAX request required."}, status=400)
 
-        venues = (
-            Venue.objects.select_related("category")
-            .prefetch_related("addons")
-            .order_by("name")
-        )
-        payload = [serialize_venue(venue) for venue in venues]
-        return JsonResponse({"success": True, "venues": payload})
+        payload = serialize_venues(Venue.objects.order_by("name"))
+        return CompactJsonResponse({"success": True, "venues": payload})
 
-    def post(self, request: HttpRequest) -> JsonResponse:
+    def post(self, request: HttpRequest) -> CompactJsonResponse:
         if not is_ajax(request):
-            return JsonResponse({"success": False, "error": "AJAX request required."}, status=400)
+            return CompactJsonResponse({"success": False, "error": "AJAX request required."}, status=400)
 
         if not request.user.has_perm("manajemen_lapangan.add_venue"):
-            return JsonResponse({"success": False, "error": "Permission denied."}, status=403)
+            return CompactJsonResponse({"success": False, "error": "Permission denied."}, status=403)
 
         data = self._extract_payload(request)
         form = VenueForm(data)
@@ -355,11 +377,11 @@ class AdminVenueApiView(AdminRequiredMixin, LoginRequiredMixin, View):
                 .prefetch_related("addons")
                 .get(pk=venue.pk)
             )
-            return JsonResponse({"success": True, "venue": serialize_venue(venue)})
+            return CompactJsonResponse({"success": True, "venue": serialize_venue(venue)})
         errors = build_form_errors(form) if not form_valid else {}
         if not formset_valid:
             errors.update(build_addon_formset_errors(addon_formset))
-        return JsonResponse({"success": False, "errors": errors}, status=400)
+        return CompactJsonResponse({"success": False, "errors": errors}, status=400)
 
     def _extract_payload(self, request: HttpRequest) -> dict[str, Any]:
         if request.content_type and "application/json" in request.content_type:
@@ -385,36 +407,36 @@ class AdminVenueDetailApiView(AdminRequiredMixin, LoginRequiredMixin, View):
             Venue.objects.select_related("category").prefetch_related("addons"), pk=pk
         )
 
-    def get(self, request: HttpRequest, pk: int) -> JsonResponse:
+    def get(self, request: HttpRequest, pk: int) -> CompactJsonResponse:
         if not is_ajax(request):
-            return JsonResponse({"success": False, "error": "AJAX request required."}, status=400)
+            return CompactJsonResponse({"success": False, "error": "AJAX request required."}, status=400)
 
         venue = self.get_object(pk)
-        return JsonResponse({"success": True, "venue": serialize_venue(venue)})
+        return CompactJsonResponse({"success": True, "venue": serialize_venue(venue)})
 
-    def put(self, request: HttpRequest, pk: int) -> JsonResponse:
+    def put(self, request: HttpRequest, pk: int) -> CompactJsonResponse:
         return self._update(request, pk)
 
-    def patch(self, request: HttpRequest, pk: int) -> JsonResponse:
+    def patch(self, request: HttpRequest, pk: int) -> CompactJsonResponse:
         return self._update(request, pk)
 
-    def delete(self, request: HttpRequest, pk: int) -> JsonResponse:
+    def delete(self, request: HttpRequest, pk: int) -> CompactJsonResponse:
         if not is_ajax(request):
-            return JsonResponse({"success": False, "error": "AJAX request required."}, status=400)
+            return CompactJsonResponse({"success": False, "error": "AJAX request required."}, status=400)
 
         if not request.user.has_perm("manajemen_lapangan.delete_venue"):
-            return JsonResponse({"success": False, "error": "Permission denied."}, status=403)
+            return CompactJsonResponse({"success": False, "error": "Permission denied."}, status=403)
 
         venue = self.get_object(pk)
         venue.delete()
-        return JsonResponse({"success": True})
+        return CompactJsonResponse({"success": True})
 
-    def _update(self, request: HttpRequest, pk: int) -> JsonResponse:
+    def _update(self, request: HttpRequest, pk: int) -> CompactJsonResponse:
         if not is_ajax(request):
-            return JsonResponse({"success": False, "error": "AJAX request required."}, status=400)
+            return CompactJsonResponse({"success": False, "error": "AJAX request required."}, status=400)
 
         if not request.user.has_perm("manajemen_lapangan.change_venue"):
-            return JsonResponse({"success": False, "error": "Permission denied."}, status=403)
+            return CompactJsonResponse({"success": False, "error": "Permission denied."}, status=403)
 
         venue = self.get_object(pk)
         data = self._extract_payload(request)
@@ -432,11 +454,11 @@ class AdminVenueDetailApiView(AdminRequiredMixin, LoginRequiredMixin, View):
                 .prefetch_related("addons")
                 .get(pk=venue.pk)
             )
-            return JsonResponse({"success": True, "venue": serialize_venue(venue)})
+            return CompactJsonResponse({"success": True, "venue": serialize_venue(venue)})
         errors = build_form_errors(form) if not form_valid else {}
         if not formset_valid:
             errors.update(build_addon_formset_errors(addon_formset))
-        return JsonResponse({"success": False, "errors": errors}, status=400)
+        return CompactJsonResponse({"success": False, "errors": errors}, status=400)
 
     def _extract_payload(self, request: HttpRequest) -> dict[str, Any]:
         if request.content_type and "application/json" in request.content_type:
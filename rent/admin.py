@@ -1,6 +1,30 @@
+from django import forms
 from django.contrib import admin
 
-from .models import Booking, Payment
+from .models import Booking, BookingOverlap, BookingSeries, Payment, PaymentWebhookEvent
+
+
+class BookingAdminForm(forms.ModelForm):
+    """Reports overlapping bookings as a form error.
+
+    Admin edits are rare, so a read is enough here; the database constraint
+    behind :meth:`Booking.save` stays the real guard against races.
+    """
+
+    def clean(self):
+        cleaned_data = super().clean()
+        venue = cleaned_data.get("venue")
+        start = cleaned_data.get("start_datetime")
+        end = cleaned_data.get("end_datetime")
+        status = cleaned_data.get("status", self.instance.status)
+        if venue is None or not start or not end or status not in Booking.ACTIVE_STATUSES:
+            return cleaned_data
+        overlapping = Booking.objects.filter(
+            venue=venue, status__in=Booking.ACTIVE_STATUSES, start_datetime__lt=end, end_datetime__gt=start
+        ).exclude(pk=self.instance.pk)
+        if overlapping.exists():
+            self.add_error(None, BookingOverlap())
+        return cleaned_data
 
 
 class PaymentInline(admin.StackedInline):
@@ -15,10 +39,25 @@ class BookingAdmin(admin.ModelAdmin):
     list_filter = ("venue", "user")
     search_fields = ("venue__name", "user__username")
     inlines = [PaymentInline]
+    form = BookingAdminForm
+
+
+@admin.register(BookingSeries)
+class BookingSeriesAdmin(admin.ModelAdmin):
+    list_display = ("venue", "user", "rule", "start_datetime", "created_at")
+    list_filter = ("venue",)
+    search_fields = ("venue__name", "user__username")
 
 
 @admin.register(Payment)
 class PaymentAdmin(admin.ModelAdmin):
     list_display = ("booking", "method", "status", "total_amount", "updated_at")
     list_filter = ("status", "method")
-    search_fields = ("reference_code",)
+    search_fields = ("reference_code", "gateway_reference")
+
+
+@admin.register(PaymentWebhookEvent)
+class PaymentWebhookEventAdmin(admin.ModelAdmin):
+    list_display = ("event_id", "provider", "event_type", "payment_reference", "status", "received_at")
+    list_filter = ("status", "provider", "event_type")
+    search_fields = ("event_id", "payment_reference")
@@ -0,0 +1,256 @@
+"""Free and taken booking slots for a venue, day by day.
+
+A venue is open every day between ``available_start_time`` and
+``available_end_time`` (local time) plus any :class:`VenueAvailability`
+blocks that overlap the day. Active bookings are subtracted from those
+windows and the remaining time is cut into ``SLOT_MINUTES`` slots for the
+booking form.
+
+:func:`venue_availability` serves each (venue, day) from the cache and
+computes the missing days with one query for bookings and one for
+availability blocks across the whole missing range, placing every booking
+and block on the days it touches in one pass. Cached days hold no
+notion of "now"; slots that have already started are marked unavailable when
+the response is built.
+
+:func:`free_venue_ids` answers the reverse question for the catalog: which
+of many venues are open and unbooked for a whole window. It reads the
+opening hours, availability blocks and active bookings of every candidate
+with one query each and sweeps the resulting open/close events per venue.
+
+Booking writes delete the cached days they touch after the transaction
+commits (see :mod:`rent.signals`), and venue or availability edits drop the
+venue's whole namespace.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from manajemen_lapangan.models import Venue, VenueAvailability
+from TK_PBP.cache import CacheNamespace
+
+from .models import Booking
+
+SLOT_MINUTES = 60
+MAX_RANGE_DAYS = 31
+
+Interval = tuple[datetime, datetime]
+
+
+def availability_cache(venue_id: int) -> CacheNamespace:
+    return CacheNamespace(
+        f"availability.{venue_id}", timeout=getattr(settings, "AVAILABILITY_CACHE_TIMEOUT", 300)
+    )
+
+
+def day_bounds(day: date) -> Interval:
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(day, datetime.min.time()), tz)
+    return start, timezone.make_aware(datetime.combine(day + timedelta(days=1), datetime.min.time()), tz)
+
+
+def days_between(start: datetime, end: datetime) -> list[date]:
+    """Local days touched by the half-open interval ``[start, end)``."""
+
+    # Unsaved instances may still hold the naive values they were built with.
+    if timezone.is_naive(start):
+        start = timezone.make_aware(start)
+    if timezone.is_naive(end):
+        end = timezone.make_aware(end)
+    first = timezone.localdate(start)
+    last = timezone.localdate(end - timedelta(microseconds=1))
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+def merge(intervals: Iterable[Interval]) -> list[Interval]:
+    """Merge overlapping or touching intervals."""
+
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract(windows: list[Interval], taken: list[Interval]) -> list[Interval]:
+    """Remove the merged ``taken`` intervals from the merged ``windows``."""
+
+    free: list[Interval] = []
+    index = 0
+    for start, end in windows:
+        cursor = start
+        while index < len(taken) and taken[index][1] <= cursor:
+            index += 1
+        probe = index
+        while probe < len(taken) and taken[probe][0] < end:
+            if taken[probe][0] > cursor:
+                free.append((cursor, taken[probe][0]))
+            cursor = max(cursor, taken[probe][1])
+            probe += 1
+        if cursor < end:
+            free.append((cursor, end))
+    return free
+
+
+def opening_hours(venue: Venue, day: date) -> Interval | None:
+    return _daily_window(day, venue.available_start_time, venue.available_end_time)
+
+
+def _daily_window(day: date, opens: time, closes: time) -> Interval | None:
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(day, opens), tz)
+    end = timezone.make_aware(datetime.combine(day, closes), tz)
+    return (start, end) if end > start else None
+
+
+def _iso(value: datetime) -> str:
+    return timezone.localtime(value).isoformat()
+
+
+def build_day(day: date, windows: list[Interval], taken: list[Interval]) -> dict:
+    open_ = merge(windows)
+    taken = merge(taken)
+    slots = []
+    step = timedelta(minutes=SLOT_MINUTES)
+    index = 0
+    for start, end in open_:
+        cursor = start
+        while cursor + step <= end:
+            slot_end = cursor + step
+            while index < len(taken) and taken[index][1] <= cursor:
+                index += 1
+            busy = index < len(taken) and taken[index][0] < slot_end
+            slots.append({"start": _iso(cursor), "end": _iso(slot_end), "available": not busy})
+            cursor = slot_end
+    return {
+        "date": day.isoformat(),
+        "open": [{"start": _iso(start), "end": _iso(end)} for start, end in open_],
+        "taken": [{"start": _iso(start), "end": _iso(end)} for start, end in taken],
+        "free": [{"start": _iso(start), "end": _iso(end)} for start, end in subtract(open_, taken)],
+        "slots": slots,
+    }
+
+
+def compute_days(venue: Venue, days: list[date]) -> dict[date, dict]:
+    """Build the availability of ``days`` (sorted) from the database."""
+
+    if not days:
+        return {}
+    range_start, _ = day_bounds(days[0])
+    _, range_end = day_bounds(days[-1])
+    wanted = set(days)
+    windows: dict[date, list[Interval]] = defaultdict(list)
+    taken: dict[date, list[Interval]] = defaultdict(list)
+    for day in days:
+        hours = opening_hours(venue, day)
+        if hours is not None:
+            windows[day].append(hours)
+
+    blocks = VenueAvailability.objects.filter(
+        venue=venue, start_datetime__lt=range_end, end_datetime__gt=range_start
+    ).values_list("start_datetime", "end_datetime")
+    bookings = Booking.objects.filter(
+        venue=venue,
+        status__in=Booking.ACTIVE_STATUSES,
+        start_datetime__lt=range_end,
+        end_datetime__gt=range_start,
+    ).values_list("start_datetime", "end_datetime")
+    for target, intervals in ((windows, blocks), (taken, bookings)):
+        for start, end in intervals:
+            for day in days_between(start, end):
+                if day in wanted:
+                    day_start, day_end = day_bounds(day)
+                    target[day].append((max(start, day_start), min(end, day_end)))
+    return {day: build_day(day, windows[day], taken[day]) for day in days}
+
+
+def _window_is_free(events: Iterable[tuple[int, datetime, int, int]], start: datetime, end: datetime) -> bool:
+    """Sweep ``(venue, at, open delta, busy delta)`` events sorted by time over ``[start, end)``."""
+
+    open_count = busy_count = 0
+    cursor = start
+    for _, at, opened, booked in events:
+        if at > cursor:
+            # The state since ``cursor`` held up to ``at``; it must be open and unbooked.
+            if cursor >= end:
+                break
+            if open_count <= 0 or busy_count > 0:
+                return False
+            cursor = at
+        open_count += opened
+        busy_count += booked
+    return cursor >= end or (open_count > 0 and busy_count == 0)
+
+
+def free_venue_ids(venues: QuerySet[Venue], start: datetime, end: datetime) -> set[int]:
+    """Ids of the venues in ``venues`` that are open and unbooked for all of ``[start, end)``."""
+
+    days = days_between(start, end)
+    events: list[tuple[int, datetime, int, int]] = []
+    for venue_id, opens, closes in venues.values_list("pk", "available_start_time", "available_end_time"):
+        for day in days:
+            hours = _daily_window(day, opens, closes)
+            if hours is not None:
+                events += [(venue_id, hours[0], 1, 0), (venue_id, hours[1], -1, 0)]
+    overlapping = {"venue__in": venues.values("pk"), "start_datetime__lt": end, "end_datetime__gt": start}
+    blocks = VenueAvailability.objects.filter(**overlapping).values_list("venue_id", "start_datetime", "end_datetime")
+    for venue_id, block_start, block_end in blocks:
+        events += [(venue_id, block_start, 1, 0), (venue_id, block_end, -1, 0)]
+    bookings = Booking.objects.filter(status__in=Booking.ACTIVE_STATUSES, **overlapping).values_list(
+        "venue_id", "start_datetime", "end_datetime"
+    )
+    for venue_id, booking_start, booking_end in bookings:
+        events += [(venue_id, booking_start, 0, 1), (venue_id, booking_end, 0, -1)]
+
+    events.sort(key=itemgetter(0, 1))
+    return {
+        venue_id
+        for venue_id, venue_events in groupby(events, key=itemgetter(0))
+        if _window_is_free(venue_events, start, end)
+    }
+
+
+def venue_availability(venue: Venue, start: date, end: date) -> list[dict]:
+    """Return the availability of ``venue`` for every day from ``start`` to ``end`` inclusive."""
+
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    cache = availability_cache(venue.pk)
+    cached = cache.get_many([("day", day.isoformat()) for day in days])
+    found = {date.fromisoformat(parts[1]): value for parts, value in cached.items()}
+    missing = [day for day in days if day not in found]
+    if missing:
+        computed = compute_days(venue, missing)
+        cache.set_many({("day", day.isoformat()): value for day, value in computed.items()})
+        found.update(computed)
+
+    now = timezone.now()
+    result = []
+    for day in days:
+        entry = found[day]
+        slots = [
+            slot if datetime.fromisoformat(slot["start"]) > now else {**slot, "available": False}
+            for slot in entry["slots"]
+        ]
+        result.append({**entry, "slots": slots})
+    return result
+
+
+def invalidate_days(venue_id: int, days: Iterable[date]) -> None:
+    cache = availability_cache(venue_id)
+    for day in days:
+        cache.delete(("day", day.isoformat()))
+
+
+def invalidate_venue(venue_id: int) -> None:
+    availability_cache(venue_id).invalidate()
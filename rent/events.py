@@ -0,0 +1,159 @@
+"""In-process publish/subscribe for booking status changes.
+
+:meth:`Booking.approve`, :meth:`Booking.cancel` and
+:meth:`Booking.confirm_payment` call :func:`publish_booking_status`, which
+hands a :class:`BookingEvent` to :data:`broker` once the surrounding
+transaction commits. :func:`rent.views.booking_events` subscribes the signed
+in user and streams their events as server-sent events.
+
+Subscriptions live in the memory of one process. Publishing is safe from any
+thread (sync views run outside the event loop), but a change made in one
+worker process only reaches streams served by that same process, so the
+stream is meant for a single ASGI worker or a deployment that replaces
+:data:`broker` with a shared transport.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import threading
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
+
+from django.db import transaction
+from django.dispatch import Signal
+
+if TYPE_CHECKING:
+    from .models import Booking
+
+EVENT_NAME = "booking-status"
+
+
+@dataclass(frozen=True)
+class BookingEvent:
+    id: int
+    user_id: int
+    booking_id: int
+    venue: str
+    status: str
+    status_display: str
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        del data["user_id"]
+        return data
+
+    def encode(self) -> str:
+        """Return the event as a server-sent events frame."""
+
+        return f"id: {self.id}\nevent: {EVENT_NAME}\ndata: {json.dumps(self.as_dict())}\n\n"
+
+
+class Subscription:
+    """A bounded queue of events for one stream, bound to the stream's event loop."""
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop, maxsize: int) -> None:
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: asyncio.Queue[BookingEvent] = asyncio.Queue(maxsize)
+
+    def deliver(self, event: BookingEvent) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The stream's loop has already closed; it unsubscribes on its way out.
+            pass
+
+    def _put(self, event: BookingEvent) -> None:
+        # A stalled client loses its oldest events rather than growing the queue.
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float | None = None) -> BookingEvent | None:
+        """Wait for the next event; ``None`` when ``timeout`` seconds pass first."""
+
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class BookingEventBroker:
+    """Fan booking events out to the subscriptions of their owner."""
+
+    def __init__(self, *, history: int = 500, queue_size: int = 100) -> None:
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._subscriptions: dict[int, set[Subscription]] = defaultdict(set)
+        # Recent events, replayed to clients reconnecting with Last-Event-ID.
+        self._history: deque[BookingEvent] = deque(maxlen=history)
+
+    def publish(
+        self,
+        *,
+        user_id: int,
+        booking_id: int,
+        venue: str,
+        status: str,
+        status_display: str,
+    ) -> BookingEvent:
+        with self._lock:
+            event = BookingEvent(next(self._ids), user_id, booking_id, venue, status, status_display)
+            self._history.append(event)
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.deliver(event)
+        return event
+
+    def subscribe(self, user_id: int, *, last_event_id: int | None = None) -> Subscription:
+        """Register a stream for ``user_id``; must be called from the stream's event loop."""
+
+        subscription = Subscription(user_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+            missed = (
+                []
+                if last_event_id is None
+                else [event for event in self._history if event.user_id == user_id and event.id > last_event_id]
+            )
+        for event in missed[-self.queue_size:]:
+            subscription.queue.put_nowait(event)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def subscriber_count(self, user_id: int) -> int:
+        with self._lock:
+            return len(self._subscriptions.get(user_id, ()))
+
+
+broker = BookingEventBroker()
+
+
+def publish_booking_status(booking: "Booking") -> None:
+    """Announce ``booking``'s current status to its owner after the transaction commits."""
+
+    fields = {
+        "user_id": booking.user_id,
+        "booking_id": booking.pk,
+        "venue": booking.venue.name,
+        "status": booking.status,
+        "status_display": booking.get_status_display(),
+    }
+    transaction.on_commit(lambda: broker.publish(**fields))
+
+
+# Sent by :meth:`Payment.transition` with ``instance`` (the payment, already
+# in its new status) and ``previous`` (the status it left). Bulk transitions
+# through ``Payment.objects.transition()`` send nothing, like ``update()``.
+payment_status_changed = Signal()
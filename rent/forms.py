@@ -4,6 +4,12 @@ from __future__ import annotations
 from django import forms
 
 from .models import Booking, Payment
+from .recurrence import MAX_OCCURRENCES, RecurrenceError, RecurrenceRule
+from .series import SeriesConflict, create_series, find_conflicts
+
+_INPUT_CLASS = (
+    "w-full rounded-xl border border-white/40 bg-white/10 px-4 py-3 text-white placeholder-white/60 backdrop-blur"
+)
 
 
 class BookingForm(forms.ModelForm):
@@ -61,24 +67,13 @@ class BookingForm(forms.ModelForm):
         }
 
     def clean(self):
+        # Overlaps with other bookings are rejected by the database when the
+        # booking is saved (see ``Booking.save``), not with a read here.
         cleaned_data = super().clean()
         start = cleaned_data.get("start_datetime")
         end = cleaned_data.get("end_datetime")
         if start and end and start >= end:
             raise forms.ValidationError("End time must be after the start time.")
-        if start and end and self.venue is not None:
-            overlapping = (
-                Booking.objects.filter(
-                    venue=self.venue,
-                    status__in=Booking.ACTIVE_STATUSES,
-                )
-                .filter(start_datetime__lt=end, end_datetime__gt=start)
-                .exclude(pk=self.instance.pk)
-            )
-            if overlapping.exists():
-                raise forms.ValidationError(
-                    "This venue is already booked for the selected time range."
-                )
         return cleaned_data
 
 
@@ -95,3 +90,103 @@ class PaymentForm(forms.ModelForm):
                 }
             )
         }
+
+
+class BookingSeriesForm(forms.Form):
+    """Book the same slot repeatedly, weekly or with a custom RRULE."""
+
+    WEEKDAY_CHOICES = [
+        (str(index), label) for index, label in enumerate(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"))
+    ]
+
+    start_datetime = forms.DateTimeField(
+        label="First session starts",
+        widget=forms.DateTimeInput(attrs={"type": "datetime-local", "class": _INPUT_CLASS}),
+    )
+    end_datetime = forms.DateTimeField(
+        label="First session ends",
+        widget=forms.DateTimeInput(attrs={"type": "datetime-local", "class": _INPUT_CLASS}),
+    )
+    weekdays = forms.MultipleChoiceField(
+        label="Repeat on",
+        choices=WEEKDAY_CHOICES,
+        required=False,
+        widget=forms.CheckboxSelectMultiple(),
+        help_text="Defaults to the weekday of the first session.",
+    )
+    interval = forms.IntegerField(
+        label="Every N weeks",
+        min_value=1,
+        max_value=4,
+        initial=1,
+        widget=forms.NumberInput(attrs={"class": _INPUT_CLASS}),
+    )
+    weeks = forms.IntegerField(
+        label="For N weeks",
+        min_value=1,
+        max_value=MAX_OCCURRENCES,
+        initial=8,
+        widget=forms.NumberInput(attrs={"class": _INPUT_CLASS}),
+    )
+    rule = forms.CharField(
+        label="Custom rule",
+        required=False,
+        help_text="Optional RRULE such as FREQ=WEEKLY;BYDAY=MO,TH;COUNT=10. Overrides the weekly fields.",
+        widget=forms.TextInput(attrs={"class": _INPUT_CLASS, "placeholder": "FREQ=WEEKLY;BYDAY=MO;COUNT=8"}),
+    )
+    notes = forms.CharField(required=False, widget=forms.Textarea(attrs={"class": _INPUT_CLASS, "rows": 3}))
+    addons = forms.ModelMultipleChoiceField(
+        queryset=None,
+        required=False,
+        widget=forms.CheckboxSelectMultiple(attrs={"class": "addon-option__input", "data-addon-input": "true"}),
+    )
+
+    def __init__(self, *args, venue, **kwargs):
+        self.venue = venue
+        super().__init__(*args, **kwargs)
+        self.fields["addons"].queryset = venue.addons.all()
+        self.fields["addons"].label_from_instance = lambda addon: f"{addon.name} • Rp {addon.price}"
+        self.occurrences = []
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start = cleaned_data.get("start_datetime")
+        end = cleaned_data.get("end_datetime")
+        if not start or not end:
+            return cleaned_data
+        if start >= end:
+            raise forms.ValidationError("End time must be after the start time.")
+        try:
+            if cleaned_data.get("rule"):
+                rule = RecurrenceRule.parse(cleaned_data["rule"])
+            elif cleaned_data.get("weeks"):
+                rule = RecurrenceRule.weekly(
+                    start.date(),
+                    weeks=cleaned_data["weeks"],
+                    weekdays=tuple(int(day) for day in cleaned_data.get("weekdays") or ()),
+                    interval=cleaned_data.get("interval") or 1,
+                )
+            else:
+                return cleaned_data
+            self.occurrences = rule.occurrences(start, end)
+        except RecurrenceError as exc:
+            raise forms.ValidationError(str(exc)) from exc
+        if not self.occurrences:
+            raise forms.ValidationError("The rule does not produce any sessions.")
+        conflicts = find_conflicts(self.venue, self.occurrences)
+        if conflicts:
+            raise SeriesConflict(conflicts)
+        cleaned_data["recurrence"] = rule
+        return cleaned_data
+
+    def save(self, user):
+        data = self.cleaned_data
+        return create_series(
+            user,
+            self.venue,
+            start=data["start_datetime"],
+            end=data["end_datetime"],
+            rule=data["recurrence"],
+            notes=data["notes"],
+            addons=data["addons"],
+        )
@@ -0,0 +1,190 @@
+"""Payment providers and their signed webhooks.
+
+A provider starts a charge for a :class:`~rent.models.Payment`. Providers
+that settle asynchronously, like QRIS and GoPay, report the outcome later
+with a webhook to ``/payments/webhook/``, which :mod:`rent.webhooks`
+records and applies in the background. ``PAYMENT_PROVIDER`` picks the
+provider:
+
+* ``instant`` (the default): the charge is captured while the customer
+  waits and the payment is confirmed straight away, as before.
+* ``simulator``: charges are created at the local gateway simulator
+  (``manage.py run_payment_simulator``, see :mod:`rent.simulator`), which
+  posts the webhook a few seconds later.
+
+A dotted path to a :class:`PaymentProvider` subclass works too.
+
+Webhooks carry a ``Payment-Signature: t=<unix time>,v1=<hex digest>``
+header, where the digest is the HMAC-SHA256 of ``"<t>.<body>"`` keyed with
+``PAYMENT_WEBHOOK_SECRET``. Signatures more than
+``PAYMENT_WEBHOOK_TOLERANCE`` seconds away from the current time are
+rejected, so a captured request cannot be replayed later.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Mapping
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Booking, Payment
+
+SIGNATURE_HEADER = "Payment-Signature"
+EVENT_SUCCEEDED = "payment.succeeded"
+EVENT_FAILED = "payment.failed"
+
+
+class GatewayError(Exception):
+    """The provider could not start the charge."""
+
+
+class InvalidWebhook(Exception):
+    """A webhook whose signature or body cannot be trusted."""
+
+
+@dataclass(frozen=True)
+class Charge:
+    reference: str
+    confirmed: bool
+    # What the customer needs to pay, e.g. a QRIS payload.
+    instructions: str = ""
+
+
+@dataclass(frozen=True)
+class WebhookEvent:
+    id: str
+    type: str
+    payment_reference: str
+    amount: Decimal
+    charge: str = ""
+    payload: dict[str, Any] = field(default_factory=dict)
+
+
+def sign(body: bytes, secret: str, timestamp: int) -> str:
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify_signature(body: bytes, header: str, secret: str, *, tolerance: int, now: float | None = None) -> None:
+    """Raise :class:`InvalidWebhook` unless ``header`` is a fresh signature of ``body``."""
+
+    if not secret:
+        raise InvalidWebhook("PAYMENT_WEBHOOK_SECRET is not configured.")
+    parts = dict(item.split("=", 1) for item in header.split(",") if "=" in item)
+    try:
+        timestamp = int(parts["t"])
+        received = parts["v1"]
+    except (KeyError, ValueError):
+        raise InvalidWebhook("Malformed signature header.") from None
+    if abs((time.time() if now is None else now) - timestamp) > tolerance:
+        raise InvalidWebhook("Signature timestamp is outside the tolerance.")
+    if not hmac.compare_digest(sign(body, secret, timestamp), f"t={timestamp},v1={received}"):
+        raise InvalidWebhook("Signature mismatch.")
+
+
+def parse_event(body: bytes) -> WebhookEvent:
+    try:
+        payload = json.loads(body)
+        data = payload["data"]
+        return WebhookEvent(
+            id=str(payload["id"]),
+            type=str(payload["type"]),
+            payment_reference=str(data["reference"]),
+            amount=Decimal(str(data["amount"])),
+            charge=str(data.get("charge", "")),
+            payload=payload,
+        )
+    except (ValueError, KeyError, TypeError, ArithmeticError):
+        raise InvalidWebhook("Malformed webhook body.") from None
+
+
+class PaymentProvider(ABC):
+    """Starts charges and verifies the provider's webhooks."""
+
+    name = ""
+
+    @abstractmethod
+    def start(self, payment: Payment) -> Charge:
+        """Create a charge for ``payment`` at the provider."""
+
+    def verify(self, body: bytes, headers: Mapping[str, str]) -> WebhookEvent:
+        verify_signature(
+            body,
+            headers.get(SIGNATURE_HEADER, ""),
+            settings.PAYMENT_WEBHOOK_SECRET,
+            tolerance=settings.PAYMENT_WEBHOOK_TOLERANCE,
+        )
+        return parse_event(body)
+
+
+class InstantProvider(PaymentProvider):
+    """Captures the payment on the spot; no webhook follows."""
+
+    name = "instant"
+
+    def start(self, payment: Payment) -> Charge:
+        return Charge(reference="", confirmed=True)
+
+
+class SimulatorProvider(PaymentProvider):
+    """Creates charges at the local gateway simulator."""
+
+    name = "simulator"
+
+    def start(self, payment: Payment) -> Charge:
+        body = json.dumps(
+            {"reference": payment.reference_code, "amount": str(payment.total_amount), "method": payment.method}
+        ).encode()
+        request = urllib.request.Request(
+            f"{settings.PAYMENT_SIMULATOR_URL.rstrip('/')}/charges",
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=settings.PAYMENT_PROVIDER_TIMEOUT) as response:
+                data = json.load(response)
+            return Charge(reference=str(data["id"]), confirmed=False, instructions=data.get("qr_string", ""))
+        except (OSError, ValueError, KeyError) as exc:
+            raise GatewayError("The payment gateway is unavailable. Please try again in a moment.") from exc
+
+
+PROVIDERS: dict[str, type[PaymentProvider]] = {
+    InstantProvider.name: InstantProvider,
+    SimulatorProvider.name: SimulatorProvider,
+}
+
+
+def get_provider() -> PaymentProvider:
+    name = settings.PAYMENT_PROVIDER
+    provider_class = PROVIDERS.get(name) or import_string(name)
+    return provider_class()
+
+
+def start_payment(booking: Booking, payment: Payment) -> Charge:
+    """Start ``payment`` with the configured provider.
+
+    A charge the provider already captured confirms the booking now;
+    otherwise the charge is recorded on the payment, which stays waiting
+    until the provider's webhook arrives. Raises :class:`GatewayError` and
+    :class:`~rent.models.PaymentTransitionError`.
+    """
+
+    charge = get_provider().start(payment)
+    if charge.confirmed:
+        booking.confirm_payment(payment)
+    else:
+        Payment.objects.filter(pk=payment.pk).update(
+            method=payment.method, gateway_reference=charge.reference, updated_at=timezone.now()
+        )
+        payment.gateway_reference = charge.reference
+    return charge
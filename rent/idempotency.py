@@ -0,0 +1,163 @@
+"""Replay the outcome of retried booking and payment POSTs.
+
+Clients send a unique key with a write, either as an ``Idempotency-Key``
+header (API clients) or as an ``idempotency_key`` form field (the booking
+form renders a fresh one). :func:`run_idempotent` claims the key by inserting
+an :class:`~rent.models.IdempotencyKey` row before running the view's write
+path, then stores the response's status, body, content type and redirect
+target on that row. A retry with the same key gets the stored response back,
+marked with an ``Idempotent-Replayed`` header, without running the write
+again.
+
+Keys are scoped to the user. A retry is matched by a fingerprint of the
+method, path and submitted data (without the CSRF token), so reusing a key
+for a different request is rejected rather than answered with someone
+else's result. While the first request is still running, retries get a
+conflict. Server errors and exceptions release the key so the client can
+try again. Outcomes are kept for ``IDEMPOTENCY_KEY_TTL_HOURS``, and a claim
+whose request never finished is dropped after ``IDEMPOTENCY_LOCK_TIMEOUT``
+seconds. The booking lifecycle run deletes expired rows.
+
+Requests without a key behave exactly as before.
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_FIELD = "idempotency_key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+_FORM_TYPES = ("application/x-www-form-urlencoded", "multipart/form-data")
+_UNFINGERPRINTED_FIELDS = {"csrfmiddlewaretoken", IDEMPOTENCY_FIELD}
+
+
+class IdempotencyConflict(Exception):
+    """The key cannot be used for this request; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, message: str, status: int) -> None:
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def _is_form(request: HttpRequest) -> bool:
+    return request.content_type in _FORM_TYPES
+
+
+def request_key(request: HttpRequest) -> str:
+    key = request.headers.get(IDEMPOTENCY_HEADER, "")
+    if not key and _is_form(request):
+        key = request.POST.get(IDEMPOTENCY_FIELD, "")
+    return key.strip()
+
+
+def fingerprint(request: HttpRequest) -> str:
+    digest = hashlib.sha256(f"{request.method} {request.path}\n".encode())
+    if _is_form(request):
+        for name, values in sorted(request.POST.lists()):
+            if name not in _UNFINGERPRINTED_FIELDS:
+                digest.update(repr((name, values)).encode())
+    else:
+        digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _claim(user, key: str, digest: str) -> tuple[IdempotencyKey, bool]:
+    now = timezone.now()
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=user,
+                    key=key,
+                    fingerprint=digest,
+                    expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+                )
+            return record, True
+        except IntegrityError:
+            pass
+        stale = now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+        # An expired outcome or an abandoned claim no longer holds the key.
+        released, _ = (
+            IdempotencyKey.objects.filter(user=user, key=key)
+            .filter(Q(expires_at__lte=now) | Q(status_code__isnull=True, created_at__lt=stale))
+            .delete()
+        )
+        if not released:
+            break
+    record = IdempotencyKey.objects.filter(user=user, key=key).first()
+    if record is None:
+        # The first request failed and released the key a moment ago.
+        raise IdempotencyConflict("A request with this idempotency key is still being processed.", 409)
+    return record, False
+
+
+def _store(record: IdempotencyKey, response: HttpResponse) -> None:
+    IdempotencyKey.objects.filter(pk=record.pk).update(
+        status_code=response.status_code,
+        content=response.content,
+        content_type=response.get("Content-Type", ""),
+        location=response.get("Location", ""),
+    )
+
+
+def _replay(record: IdempotencyKey) -> HttpResponse:
+    if record.location:
+        response = HttpResponseRedirect(record.location, status=record.status_code)
+    else:
+        response = HttpResponse(
+            bytes(record.content), status=record.status_code, content_type=record.content_type or None
+        )
+    response[REPLAYED_HEADER] = "true"
+    return response
+
+
+def run_idempotent(request: HttpRequest, handler: Callable[[], HttpResponse]) -> HttpResponse:
+    """Run ``handler`` once per idempotency key and replay its response for retries.
+
+    Raises :class:`IdempotencyConflict` when the key is too long, belongs to
+    a different request, or is held by a request that is still running.
+    """
+
+    key = request_key(request)
+    if not key:
+        return handler()
+    if len(key) > MAX_KEY_LENGTH:
+        raise IdempotencyConflict(f"Idempotency keys are at most {MAX_KEY_LENGTH} characters.", 400)
+
+    digest = fingerprint(request)
+    record, created = _claim(request.user, key, digest)
+    if not created:
+        if record.fingerprint != digest:
+            raise IdempotencyConflict("This idempotency key was already used for a different request.", 422)
+        if record.status_code is None:
+            raise IdempotencyConflict("A request with this idempotency key is still being processed.", 409)
+        return _replay(record)
+
+    try:
+        response = handler()
+    except BaseException:
+        IdempotencyKey.objects.filter(pk=record.pk).delete()
+        raise
+    if response.status_code >= 500 or response.streaming:
+        IdempotencyKey.objects.filter(pk=record.pk).delete()
+    else:
+        _store(record, response)
+    return response
+
+
+def purge_expired(now: datetime | None = None) -> int:
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=now or timezone.now()).delete()
+    return deleted
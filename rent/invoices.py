@@ -0,0 +1,112 @@
+"""Receipts for confirmed payments.
+
+:func:`generate_invoice` renders ``rent/invoice.html`` with one line for the
+venue hours and one per add-on and writes the bytes to ``INVOICE_ROOT``
+under their SHA-256 (``ab/abcdef....html``). Identical content maps to
+the same file, writes are atomic (temporary file plus ``os.replace``), and
+a file that already exists is not written again. The :class:`Invoice` row
+records the hash, so downloads stream the stored file instead of rendering
+again; the hash doubles as the download's ``ETag``.
+
+Invoices are rendered by the ``rent.tasks.render_invoice`` background task
+queued when a payment is confirmed.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Booking, Invoice, Payment
+
+
+@dataclass(frozen=True)
+class InvoiceLine:
+    description: str
+    quantity: int
+    unit_price: Decimal
+    amount: Decimal
+
+
+def invoice_lines(booking: Booking) -> list[InvoiceLine]:
+    venue = booking.venue
+    start = timezone.localtime(booking.start_datetime)
+    end = timezone.localtime(booking.end_datetime)
+    lines = [
+        InvoiceLine(
+            description=f"{venue.name}, {start:%d %b %Y %H:%M} to {end:%d %b %Y %H:%M}",
+            quantity=booking.duration_hours,
+            unit_price=venue.price_per_hour,
+            amount=booking.base_cost,
+        )
+    ]
+    lines.extend(
+        InvoiceLine(description=addon.name, quantity=1, unit_price=addon.price, amount=addon.price)
+        for addon in booking.addons.all()
+    )
+    return lines
+
+
+def invoice_number(payment: Payment) -> str:
+    return f"INV-{timezone.localtime(payment.created_at):%Y%m}-{payment.pk:06d}"
+
+
+def invoice_path(sha256: str) -> Path:
+    return Path(settings.INVOICE_ROOT) / sha256[:2] / f"{sha256}.html"
+
+
+def store(content: bytes) -> str:
+    """Write ``content`` under its hash unless it is already there; return the hash."""
+
+    sha256 = hashlib.sha256(content).hexdigest()
+    path = invoice_path(sha256)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(content)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    return sha256
+
+
+def render_invoice(payment: Payment, *, number: str, issued_at) -> bytes:
+    booking = payment.booking
+    lines = invoice_lines(booking)
+    return render_to_string(
+        "rent/invoice.html",
+        {
+            "number": number,
+            "issued_at": issued_at,
+            "payment": payment,
+            "booking": booking,
+            "customer": booking.user,
+            "lines": lines,
+            "subtotal": sum((line.amount for line in lines), Decimal("0")),
+        },
+    ).encode()
+
+
+def generate_invoice(payment: Payment) -> Invoice:
+    """Render and store the invoice of a confirmed ``payment``; return its record."""
+
+    existing = Invoice.objects.filter(payment=payment).first()
+    number = existing.number if existing else invoice_number(payment)
+    issued_at = existing.issued_at if existing else timezone.now()
+    content = render_invoice(payment, number=number, issued_at=issued_at)
+    sha256 = store(content)
+    invoice, _ = Invoice.objects.update_or_create(
+        payment=payment,
+        defaults={"number": number, "sha256": sha256, "size": len(content), "issued_at": issued_at},
+    )
+    return invoice
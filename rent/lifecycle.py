@@ -0,0 +1,161 @@
+"""Move bookings through their lifecycle once time has passed.
+
+* Confirmed bookings whose end has passed become ``completed``.
+* Pending bookings expire once ``BOOKING_PENDING_TTL_HOURS`` have passed
+  since they were requested, or once their start has passed.
+* Approved but unpaid (``active``) bookings expire once
+  ``BOOKING_UNPAID_TTL_HOURS`` have passed since approval, or once their start
+  has passed.
+
+Expired bookings leave ``ACTIVE_STATUSES``, so their slots stop counting
+against the overlap guard and the availability views.
+
+Each transition is a series of ``UPDATE ... WHERE pk IN (batch)`` statements
+of at most ``BOOKING_LIFECYCLE_BATCH_SIZE`` rows, each in its own
+transaction, so a large backlog never holds long write locks. The update
+repeats the transition's conditions, so a booking that was paid or
+cancelled after the batch was read is left alone and concurrent runs are
+harmless. ``update()`` sends no signals: the availability cache is
+invalidated here, and no booking events are published.
+
+The same run deletes expired idempotency keys (see :mod:`rent.idempotency`).
+
+Run it from cron with ``manage.py run_booking_lifecycle``, or set
+``BOOKING_LIFECYCLE_INTERVAL`` to run it in a background thread of every
+web worker (see :func:`start_scheduler`).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from .availability import days_between, invalidate_days
+from .idempotency import purge_expired
+from .models import Booking
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LifecycleResult:
+    completed: int = 0
+    expired_pending: int = 0
+    expired_unpaid: int = 0
+    purged_idempotency_keys: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+def transitions(now: datetime) -> dict[str, tuple[QuerySet, str]]:
+    """The bookings due for each transition at ``now`` and their new status."""
+
+    pending_cutoff = now - timedelta(hours=settings.BOOKING_PENDING_TTL_HOURS)
+    unpaid_cutoff = now - timedelta(hours=settings.BOOKING_UNPAID_TTL_HOURS)
+    return {
+        "completed": (
+            Booking.objects.filter(status=Booking.STATUS_CONFIRMED, end_datetime__lte=now),
+            Booking.STATUS_COMPLETED,
+        ),
+        "expired_pending": (
+            Booking.objects.filter(status=Booking.STATUS_PENDING).filter(
+                Q(created_at__lte=pending_cutoff) | Q(start_datetime__lte=now)
+            ),
+            Booking.STATUS_EXPIRED,
+        ),
+        "expired_unpaid": (
+            Booking.objects.filter(status=Booking.STATUS_ACTIVE).filter(
+                Q(approved_at__lte=unpaid_cutoff) | Q(start_datetime__lte=now)
+            ),
+            Booking.STATUS_EXPIRED,
+        ),
+    }
+
+
+def _invalidate(days: dict[int, set[date]]) -> None:
+    for venue_id, venue_days in days.items():
+        invalidate_days(venue_id, venue_days)
+
+
+def _apply(due: QuerySet, status: str, now: datetime, batch_size: int) -> int:
+    updated = 0
+    while True:
+        batch = list(due.order_by("pk").values_list("pk", "venue_id", "start_datetime", "end_datetime")[:batch_size])
+        if not batch:
+            return updated
+        days: dict[int, set[date]] = defaultdict(set)
+        for _, venue_id, start, end in batch:
+            days[venue_id].update(days_between(start, end))
+        with transaction.atomic():
+            updated += due.filter(pk__in=[row[0] for row in batch]).update(status=status, updated_at=now)
+            transaction.on_commit(partial(_invalidate, days))
+        if len(batch) < batch_size:
+            return updated
+
+
+def run_lifecycle(now: datetime | None = None, batch_size: int | None = None) -> LifecycleResult:
+    """Apply every due transition and purge expired idempotency keys; return the counts."""
+
+    now = now or timezone.now()
+    batch_size = batch_size or settings.BOOKING_LIFECYCLE_BATCH_SIZE
+    result = LifecycleResult()
+    for name, (due, status) in transitions(now).items():
+        setattr(result, name, _apply(due, status, now, batch_size))
+    result.purged_idempotency_keys = purge_expired(now)
+    return result
+
+
+class LifecycleScheduler:
+    """Call :func:`run_lifecycle` every ``interval`` seconds in a daemon thread."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, name="booking-lifecycle", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                result = run_lifecycle()
+                if any(result.as_dict().values()):
+                    logger.info("Booking lifecycle: %s", result.as_dict())
+            except Exception:
+                logger.exception("Booking lifecycle run failed")
+            finally:
+                close_old_connections()
+
+
+_scheduler: LifecycleScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def start_scheduler() -> LifecycleScheduler | None:
+    """Start the process-wide scheduler when ``BOOKING_LIFECYCLE_INTERVAL`` is set."""
+
+    global _scheduler
+    interval = settings.BOOKING_LIFECYCLE_INTERVAL
+    if interval <= 0:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LifecycleScheduler(interval)
+            _scheduler.start()
+    return _scheduler
@@ -0,0 +1,41 @@
+"""Repair bookings and payments whose statuses disagree."""
+from __future__ import annotations
+
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rent.reconcile import mismatches, reconcile, unpaid_bookings
+
+
+class Command(BaseCommand):
+    help = (
+        "Find bookings and payments in mismatched states (for example a completed booking with a "
+        "confirmed payment) and fix them in batched UPDATE statements. Suitable for cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows per UPDATE statement.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the mismatched rows.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] is not None and options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        if options["dry_run"]:
+            for name, (due, _) in mismatches().items():
+                self.stdout.write(f"{name}: {due.count()} mismatched")
+            self.stdout.write(f"unpaid_bookings: {unpaid_bookings().count()} to check by hand")
+            return
+
+        started = perf_counter()
+        result = reconcile(batch_size=options["batch_size"])
+        elapsed = (perf_counter() - started) * 1000
+        summary = ", ".join(f"{name} {count}" for name, count in result.as_dict().items())
+        self.stdout.write(self.style.SUCCESS(f"Payment reconciliation: {summary} ({elapsed:.1f}ms)"))
+        if result.unpaid_bookings:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{result.unpaid_bookings} confirmed or completed bookings have a waiting payment; "
+                    "check them with the payment provider."
+                )
+            )
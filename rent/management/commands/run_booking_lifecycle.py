@@ -0,0 +1,49 @@
+"""Complete past bookings and expire stale pending or unpaid ones."""
+from __future__ import annotations
+
+from time import perf_counter, sleep
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from rent.lifecycle import run_lifecycle, transitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark confirmed bookings that have ended as completed and expire pending or unpaid "
+        "bookings past their TTL, in batched UPDATE statements. Suitable for cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows per UPDATE statement.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the bookings that are due.")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep running, once every INTERVAL seconds, until interrupted.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] is not None and options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        if options["dry_run"]:
+            for name, (due, status) in transitions(timezone.now()).items():
+                self.stdout.write(f"{name}: {due.count()} due -> {status}")
+            return
+
+        while True:
+            started = perf_counter()
+            result = run_lifecycle(batch_size=options["batch_size"])
+            elapsed = (perf_counter() - started) * 1000
+            summary = ", ".join(f"{name} {count}" for name, count in result.as_dict().items())
+            self.stdout.write(self.style.SUCCESS(f"Booking lifecycle: {summary} ({elapsed:.1f}ms)"))
+            if options["interval"] <= 0:
+                return
+            close_old_connections()
+            try:
+                sleep(options["interval"])
+            except KeyboardInterrupt:
+                return
@@ -0,0 +1,58 @@
+"""Run the local payment gateway simulator."""
+from __future__ import annotations
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from rent.simulator import GatewaySimulator, make_server
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve a fake QRIS/GoPay gateway for DJANGO_PAYMENT_PROVIDER=simulator: charges created by the app "
+        "are settled after --delay seconds with a signed webhook posted back to --webhook-url."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8700)
+        parser.add_argument(
+            "--webhook-url",
+            default=f"http://127.0.0.1:8000{reverse('payment-webhook')}",
+            help="Where the app receives webhooks.",
+        )
+        parser.add_argument("--delay", type=float, default=2.0, help="Seconds until a charge settles.")
+        parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of charges that fail (0-1).")
+
+    def handle(self, *args, **options):
+        if not 0 <= options["fail_rate"] <= 1:
+            raise CommandError("--fail-rate must be between 0 and 1.")
+        if not settings.PAYMENT_WEBHOOK_SECRET:
+            raise CommandError("Set DJANGO_PAYMENT_WEBHOOK_SECRET to sign webhooks.")
+        simulator = GatewaySimulator(
+            options["webhook_url"],
+            settings.PAYMENT_WEBHOOK_SECRET,
+            delay=options["delay"],
+            fail_rate=options["fail_rate"],
+        )
+        server = make_server(simulator, options["host"], options["port"])
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Payment simulator listening on http://{options['host']}:{options['port']}/charges, "
+                f"posting webhooks to {options['webhook_url']}"
+            )
+        )
+        try:
+            while True:
+                simulator.flush()
+                time.sleep(0.1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,74 @@
+"""Reject overlapping active bookings of a venue in the database.
+
+PostgreSQL gets an exclusion constraint over ``tstzrange(start, end)``
+(``btree_gist`` provides the ``=`` operator class for ``venue_id``); SQLite
+gets ``BEFORE INSERT``/``BEFORE UPDATE`` triggers that abort with the
+constraint name. Other backends have no guard.
+
+SQLite drops triggers when Django rebuilds a table, so a later migration
+that alters ``rent_booking`` must recreate them.
+"""
+
+from django.db import migrations
+
+CONSTRAINT = "rent_booking_no_overlap"
+ACTIVE = "('pending', 'active', 'confirmed')"
+
+POSTGRESQL_FORWARDS = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    f"""
+    ALTER TABLE rent_booking ADD CONSTRAINT {CONSTRAINT}
+    EXCLUDE USING gist (venue_id WITH =, tstzrange(start_datetime, end_datetime, '[)') WITH &&)
+    WHERE (status IN {ACTIVE})
+    """,
+]
+POSTGRESQL_BACKWARDS = [f"ALTER TABLE rent_booking DROP CONSTRAINT IF EXISTS {CONSTRAINT}"]
+
+_SQLITE_GUARD = f"""
+    WHEN NEW.status IN {ACTIVE}
+    BEGIN
+        SELECT RAISE(ABORT, '{CONSTRAINT}')
+        WHERE EXISTS (
+            SELECT 1 FROM rent_booking
+            WHERE venue_id = NEW.venue_id
+              AND id IS NOT NEW.id
+              AND status IN {ACTIVE}
+              AND start_datetime < NEW.end_datetime
+              AND end_datetime > NEW.start_datetime
+        );
+    END
+"""
+SQLITE_FORWARDS = [
+    f"CREATE TRIGGER {CONSTRAINT}_insert BEFORE INSERT ON rent_booking FOR EACH ROW {_SQLITE_GUARD}",
+    f"""
+    CREATE TRIGGER {CONSTRAINT}_update
+    BEFORE UPDATE OF venue_id, start_datetime, end_datetime, status ON rent_booking
+    FOR EACH ROW {_SQLITE_GUARD}
+    """,
+]
+SQLITE_BACKWARDS = [
+    f"DROP TRIGGER IF EXISTS {CONSTRAINT}_insert",
+    f"DROP TRIGGER IF EXISTS {CONSTRAINT}_update",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rent', '0003_booking_series'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRESQL_FORWARDS, "sqlite": SQLITE_FORWARDS}),
+            _run({"postgresql": POSTGRESQL_BACKWARDS, "sqlite": SQLITE_BACKWARDS}),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rent', '0005_booking_status_expired'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Invoice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.CharField(max_length=40, unique=True)),
+                ('sha256', models.CharField(max_length=64)),
+                ('content_type', models.CharField(default='text/html; charset=utf-8', max_length=100)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('issued_at', models.DateTimeField()),
+                ('rendered_at', models.DateTimeField(auto_now=True)),
+                ('payment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='invoice', to='rent.payment')),
+            ],
+            options={
+                'ordering': ['-issued_at'],
+            },
+        ),
+    ]
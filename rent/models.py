@@ -5,11 +5,64 @@ from decimal import Decimal
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 
 from manajemen_lapangan.models import Venue
 
+from .events import payment_status_changed, publish_booking_status
+
+
+# Enforced by migration 0004: an exclusion constraint on PostgreSQL and
+# triggers on SQLite reject overlapping active bookings of the same venue.
+BOOKING_OVERLAP_CONSTRAINT = "rent_booking_no_overlap"
+BOOKING_OVERLAP_MESSAGE = "This venue is already booked for the selected time range."
+
+
+def is_booking_overlap(error: IntegrityError) -> bool:
+    return BOOKING_OVERLAP_CONSTRAINT in str(error)
+
+
+class BookingOverlap(ValidationError):
+    """Raised by :meth:`Booking.save` when the database rejects an overlapping booking.
+
+    On PostgreSQL the surrounding transaction is aborted; callers that need to
+    continue should save inside their own ``transaction.atomic()`` block.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(BOOKING_OVERLAP_MESSAGE, code="booking_overlap")
+
+
+class PaymentTransitionError(ValidationError):
+    """Raised when a payment cannot move to the requested status.
+
+    Either :attr:`Payment.TRANSITIONS` does not allow the move, or another
+    request changed the payment or its booking first.
+    """
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message, code="payment_transition")
+
+
+class BookingSeries(models.Model):
+    """A recurring booking; each occurrence is a regular :class:`Booking`."""
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="booking_series")
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name="booking_series")
+    rule = models.CharField(max_length=200, help_text="RRULE-style recurrence, e.g. FREQ=WEEKLY;BYDAY=MO;COUNT=8.")
+    start_datetime = models.DateTimeField(help_text="Start of the first occurrence.")
+    end_datetime = models.DateTimeField(help_text="End of the first occurrence.")
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name_plural = "Booking series"
+
+    def __str__(self) -> str:
+        return f"{self.venue} ({self.rule})"
+
 
 class Booking(models.Model):
     """Captures a user's booking details."""
@@ -20,6 +73,7 @@ class Booking(models.Model):
     STATUS_COMPLETED = "completed"
     STATUS_CANCELLED = "cancelled"
     STATUS_REJECTED = "rejected"
+    STATUS_EXPIRED = "expired"
 
     STATUS_CHOICES = [
         (STATUS_PENDING, "Pending approval"),
@@ -28,9 +82,11 @@ class Booking(models.Model):
         (STATUS_COMPLETED, "Completed"),
         (STATUS_CANCELLED, "Cancelled"),
         (STATUS_REJECTED, "Rejected"),
+        (STATUS_EXPIRED, "Expired"),
     ]
 
     ACTIVE_STATUSES = (STATUS_PENDING, STATUS_ACTIVE, STATUS_CONFIRMED)
+    CLOSED_STATUSES = (STATUS_COMPLETED, STATUS_CANCELLED, STATUS_REJECTED, STATUS_EXPIRED)
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="bookings")
     venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name="bookings")
@@ -38,6 +94,13 @@ class Booking(models.Model):
     end_datetime = models.DateTimeField()
     addons = models.ManyToManyField("add_on.AddOn", related_name="bookings", blank=True)
     notes = models.TextField(blank=True)
+    series = models.ForeignKey(
+        BookingSeries,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="occurrences",
+    )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
     approved_at = models.DateTimeField(null=True, blank=True)
     approved_by = models.ForeignKey(
@@ -57,6 +120,14 @@ class Booking(models.Model):
         if self.end_datetime <= self.start_datetime:
             raise ValidationError("End datetime must be greater than start datetime")
 
+    def save(self, *args, **kwargs):
+        try:
+            super().save(*args, **kwargs)
+        except IntegrityError as exc:
+            if not is_booking_overlap(exc):
+                raise
+            raise BookingOverlap() from exc
+
     @property
     def duration_hours(self) -> int:
         delta = self.end_datetime - self.start_datetime
@@ -81,16 +152,16 @@ class Booking(models.Model):
     def ensure_payment(self) -> "Payment":
         """Return a payment record for this booking, creating or updating as needed."""
 
-        from uuid import uuid4
+        from .reference_codes import new_reference_code
 
         payment, created = Payment.objects.get_or_create(
             booking=self,
             defaults={
                 "method": "qris",
-                "status": "waiting",
+                "status": Payment.STATUS_WAITING,
                 "total_amount": self.total_cost,
                 "deposit_amount": Decimal("10000"),
-                "reference_code": uuid4().hex[:12].upper(),
+                "reference_code": new_reference_code(),
             },
         )
         if not created and payment.total_amount != self.total_cost:
@@ -105,46 +176,224 @@ class Booking(models.Model):
         self.approved_at = timezone.now()
         self.approved_by = user
         self.save(update_fields=["status", "approved_at", "approved_by", "updated_at"])
-        payment = self.ensure_payment()
-        if payment.status != "waiting":
-            payment.status = "waiting"
-            payment.save(update_fields=["status", "updated_at"])
+        self.ensure_payment().transition(Payment.STATUS_WAITING)
+        publish_booking_status(self)
 
     def cancel(self, save: bool = True) -> None:
-        """Cancel the booking and clear any approval metadata."""
+        """Cancel the booking, clear any approval metadata and release a confirmed payment."""
 
         self.status = self.STATUS_CANCELLED
         self.approved_at = None
         self.approved_by = None
         if save:
-            self.save(update_fields=["status", "approved_at", "approved_by", "updated_at"])
+            with transaction.atomic():
+                self.save(update_fields=["status", "approved_at", "approved_by", "updated_at"])
+                if Payment.objects.filter(booking=self).transition(Payment.STATUS_WAITING):
+                    if Booking.payment.is_cached(self):
+                        self.payment.refresh_from_db(fields=["status", "updated_at"])
+            publish_booking_status(self)
+
+    def confirm_payment(self, payment: "Payment | None" = None) -> None:
+        """Mark the payment as received and the booking as confirmed.
+
+        Both rows change with conditional updates in one transaction. If the
+        booking was closed meanwhile (cancelled, expired, ...) nothing changes
+        and :class:`PaymentTransitionError` is raised.
+        """
+
+        payment = payment or self.ensure_payment()
+        previous = payment.status
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                payment.transition(Payment.STATUS_CONFIRMED, method=payment.method)
+                confirmed = Booking.objects.filter(pk=self.pk, status__in=self.ACTIVE_STATUSES).update(
+                    status=self.STATUS_CONFIRMED, updated_at=now
+                )
+                if not confirmed:
+                    raise PaymentTransitionError("This booking can no longer be paid.")
+        except PaymentTransitionError:
+            payment.status = previous
+            raise
+        self.status = self.STATUS_CONFIRMED
+        self.updated_at = now
+        publish_booking_status(self)
+
+
+class PaymentQuerySet(models.QuerySet):
+    def transition(self, status: str) -> int:
+        """Move every payment here that may reach ``status`` in one conditional UPDATE."""
+
+        return self.filter(status__in=Payment.sources(status)).update(status=status, updated_at=timezone.now())
 
 
 class Payment(models.Model):
-    """Tracks payment status for a booking."""
+    """Tracks payment status for a booking.
+
+    Status changes go through :meth:`transition` (or
+    ``Payment.objects.transition()`` for many rows), which only write when
+    :attr:`TRANSITIONS` allows the move and the row still has the status it
+    was read with, so concurrent requests cannot overwrite each other.
+    """
 
     METHOD_CHOICES = [
         ("qris", "QRIS"),
         ("gopay", "GoPay"),
     ]
 
+    STATUS_WAITING = "waiting"
+    STATUS_CONFIRMED = "confirmed"
+    STATUS_COMPLETED = "completed"
+
     STATUS_CHOICES = [
-        ("waiting", "Waiting for confirmation"),
-        ("confirmed", "Confirmed"),
-        ("completed", "Completed"),
+        (STATUS_WAITING, "Waiting for confirmation"),
+        (STATUS_CONFIRMED, "Confirmed"),
+        (STATUS_COMPLETED, "Completed"),
     ]
 
+    PAID_STATUSES = (STATUS_CONFIRMED, STATUS_COMPLETED)
+
+    # Allowed moves. Cancelling a booking releases its confirmed payment back
+    # to waiting; a completed payment is final.
+    TRANSITIONS = {
+        STATUS_WAITING: (STATUS_CONFIRMED,),
+        STATUS_CONFIRMED: (STATUS_COMPLETED, STATUS_WAITING),
+        STATUS_COMPLETED: (),
+    }
+
     booking = models.OneToOneField(Booking, on_delete=models.CASCADE, related_name="payment")
     method = models.CharField(max_length=20, choices=METHOD_CHOICES)
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="waiting")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_WAITING)
     total_amount = models.DecimalField(max_digits=12, decimal_places=2)
     deposit_amount = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("10000"))
     reference_code = models.CharField(max_length=100, unique=True)
+    # The provider's id for the charge started for this payment, see rent.gateway.
+    gateway_reference = models.CharField(max_length=100, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PaymentQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
 
     def __str__(self) -> str:
         return f"Payment {self.reference_code} ({self.get_status_display()})"
+
+    @classmethod
+    def sources(cls, status: str) -> tuple[str, ...]:
+        """The statuses a payment may move to ``status`` from."""
+
+        return tuple(source for source, targets in cls.TRANSITIONS.items() if status in targets)
+
+    def transition(self, status: str, **fields) -> bool:
+        """Move to ``status`` with ``UPDATE ... WHERE status = <current status>``.
+
+        ``fields`` are written in the same statement. Returns ``False`` when
+        the payment already has ``status``.
+        """
+
+        previous = self.status
+        if status == previous:
+            return False
+        if status not in self.TRANSITIONS.get(previous, ()):
+            raise PaymentTransitionError(f"A payment cannot move from {previous} to {status}.")
+        now = timezone.now()
+        updated = Payment.objects.filter(pk=self.pk, status=previous).update(status=status, updated_at=now, **fields)
+        if not updated:
+            raise PaymentTransitionError("This payment was changed by another request. Please reload and try again.")
+        self.status = status
+        self.updated_at = now
+        for name, value in fields.items():
+            setattr(self, name, value)
+        payment_status_changed.send(sender=Payment, instance=self, previous=previous)
+        return True
+
+
+class Invoice(models.Model):
+    """A rendered receipt for a confirmed payment, stored content-addressed on disk.
+
+    See :mod:`rent.invoices`.
+    """
+
+    payment = models.OneToOneField(Payment, on_delete=models.CASCADE, related_name="invoice")
+    number = models.CharField(max_length=40, unique=True)
+    sha256 = models.CharField(max_length=64)
+    content_type = models.CharField(max_length=100, default="text/html; charset=utf-8")
+    size = models.PositiveIntegerField(default=0)
+    issued_at = models.DateTimeField()
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-issued_at"]
+
+    def __str__(self) -> str:
+        return self.number
+
+
+class IdempotencyKey(models.Model):
+    """The stored outcome of a POST sent with an idempotency key.
+
+    ``status_code`` is empty while the first request is still running. See
+    :mod:`rent.idempotency`.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="idempotency_keys")
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    content = models.BinaryField(default=b"")
+    content_type = models.CharField(max_length=100, blank=True)
+    location = models.CharField(max_length=500, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "key"], name="rent_idempotency_user_key")]
+        indexes = [models.Index(fields=["expires_at"], name="rent_idempotency_expires")]
+
+    def __str__(self) -> str:
+        return self.key
+
+
+class PaymentWebhookEvent(models.Model):
+    """A verified webhook from the payment provider, applied by a background task.
+
+    ``(provider, event_id)`` is unique, so a redelivered event is stored
+    once. See :mod:`rent.webhooks`.
+    """
+
+    STATUS_RECEIVED = "received"
+    STATUS_APPLIED = "applied"
+    STATUS_IGNORED = "ignored"
+    STATUS_REJECTED = "rejected"
+
+    STATUS_CHOICES = [
+        (STATUS_RECEIVED, "Received"),
+        (STATUS_APPLIED, "Applied"),
+        (STATUS_IGNORED, "Ignored"),
+        (STATUS_REJECTED, "Rejected"),
+    ]
+
+    provider = models.CharField(max_length=30)
+    event_id = models.CharField(max_length=100)
+    event_type = models.CharField(max_length=40)
+    payment_reference = models.CharField(max_length=100)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    payload = models.JSONField(default=dict)
+    payment = models.ForeignKey(
+        Payment, on_delete=models.SET_NULL, null=True, blank=True, related_name="webhook_events"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_RECEIVED)
+    error = models.TextField(blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-received_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["provider", "event_id"], name="rent_webhook_provider_event")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.provider} {self.event_type} {self.event_id}"
@@ -0,0 +1,124 @@
+"""Find bookings and payments whose statuses disagree and repair them.
+
+Each rule pairs a query for mismatched rows with a set-based repair:
+
+* ``completed_payments``: the booking completed (see :mod:`rent.lifecycle`)
+  but its payment is still ``confirmed``; the payment becomes ``completed``.
+* ``released_payments``: the booking was cancelled, rejected or expired
+  while its payment stayed ``confirmed``; the payment is released back to
+  ``waiting``, as :meth:`Booking.cancel` does.
+* ``confirmed_bookings``: the payment was confirmed but the booking is still
+  ``active``; the booking becomes ``confirmed``.
+* ``missing_payments``: an open booking has no payment; the
+  ``recalculate_payment`` task is queued for it.
+
+Bookings marked ``confirmed`` or ``completed`` whose payment is still
+``waiting`` are only counted (``unpaid_bookings``): whether the money arrived
+has to be checked with the payment provider.
+
+Rows are read in primary-key order in batches of
+``BOOKING_LIFECYCLE_BATCH_SIZE`` and every repair is one ``UPDATE`` per
+batch that repeats the rule's conditions, through
+``Payment.objects.transition()`` for payments. A row fixed by a request in
+the meantime is left alone, and concurrent runs are harmless.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .models import Booking, Payment
+from .tasks import recalculate_payment
+
+_RELEASED_BOOKING_STATUSES = (Booking.STATUS_CANCELLED, Booking.STATUS_REJECTED, Booking.STATUS_EXPIRED)
+
+
+@dataclass
+class ReconcileResult:
+    completed_payments: int = 0
+    released_payments: int = 0
+    confirmed_bookings: int = 0
+    missing_payments: int = 0
+    unpaid_bookings: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+def _complete_payments(batch: QuerySet) -> int:
+    return batch.transition(Payment.STATUS_COMPLETED)
+
+
+def _release_payments(batch: QuerySet) -> int:
+    return batch.transition(Payment.STATUS_WAITING)
+
+
+def _confirm_bookings(batch: QuerySet) -> int:
+    return batch.update(status=Booking.STATUS_CONFIRMED, updated_at=timezone.now())
+
+
+def _queue_payments(batch: QuerySet) -> int:
+    booking_ids = list(batch.values_list("pk", flat=True))
+    for booking_id in booking_ids:
+        recalculate_payment.delay(booking_id=booking_id, key=f"payment:{booking_id}")
+    return len(booking_ids)
+
+
+def mismatches() -> dict[str, tuple[QuerySet, Callable[[QuerySet], int]]]:
+    """The mismatched rows of each rule and the repair applied to a batch of them."""
+
+    return {
+        "completed_payments": (
+            Payment.objects.filter(status=Payment.STATUS_CONFIRMED, booking__status=Booking.STATUS_COMPLETED),
+            _complete_payments,
+        ),
+        "released_payments": (
+            Payment.objects.filter(status=Payment.STATUS_CONFIRMED, booking__status__in=_RELEASED_BOOKING_STATUSES),
+            _release_payments,
+        ),
+        "confirmed_bookings": (
+            Booking.objects.filter(status=Booking.STATUS_ACTIVE, payment__status=Payment.STATUS_CONFIRMED),
+            _confirm_bookings,
+        ),
+        "missing_payments": (
+            Booking.objects.filter(payment__isnull=True).exclude(status__in=Booking.CLOSED_STATUSES),
+            _queue_payments,
+        ),
+    }
+
+
+def unpaid_bookings() -> QuerySet:
+    return Booking.objects.filter(
+        status__in=(Booking.STATUS_CONFIRMED, Booking.STATUS_COMPLETED), payment__status=Payment.STATUS_WAITING
+    )
+
+
+def _apply(due: QuerySet, repair: Callable[[QuerySet], int], batch_size: int) -> int:
+    fixed = 0
+    last_pk = 0
+    while True:
+        # Walk forward by primary key: queued payments do not leave the query at once.
+        batch = list(due.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            return fixed
+        with transaction.atomic():
+            fixed += repair(due.filter(pk__in=batch))
+        if len(batch) < batch_size:
+            return fixed
+        last_pk = batch[-1]
+
+
+def reconcile(batch_size: int | None = None) -> ReconcileResult:
+    """Repair every mismatch and return how many rows each rule changed."""
+
+    batch_size = batch_size or settings.BOOKING_LIFECYCLE_BATCH_SIZE
+    result = ReconcileResult()
+    for name, (due, repair) in mismatches().items():
+        setattr(result, name, _apply(due, repair, batch_size))
+    result.unpaid_bookings = unpaid_bookings().count()
+    return result
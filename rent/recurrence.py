@@ -0,0 +1,137 @@
+"""A small subset of iCalendar RRULEs for recurring bookings.
+
+Supported parts are ``FREQ`` (``DAILY`` or ``WEEKLY``), ``INTERVAL``,
+``BYDAY`` (weekly rules only), ``COUNT`` and ``UNTIL`` (a date)::
+
+    RecurrenceRule.parse("FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH;COUNT=6")
+    RecurrenceRule.weekly(start.date(), weeks=8)  # every week for 8 weeks
+
+Every rule must end through ``COUNT`` or ``UNTIL`` and may not yield more
+than ``MAX_OCCURRENCES`` occurrences. Occurrences keep the local wall-clock
+time of the first one, so a 19:00 slot stays at 19:00 across DST changes.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from django.utils import timezone
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+FREQUENCIES = ("DAILY", "WEEKLY")
+MAX_OCCURRENCES = 52
+
+
+class RecurrenceError(ValueError):
+    """Raised for rules that cannot be parsed or would never end."""
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    frequency: str
+    interval: int = 1
+    weekdays: tuple[int, ...] = ()
+    count: int | None = None
+    until: date | None = None
+
+    def __post_init__(self) -> None:
+        if self.frequency not in FREQUENCIES:
+            raise RecurrenceError(f"FREQ must be one of {', '.join(FREQUENCIES)}.")
+        if self.interval < 1:
+            raise RecurrenceError("INTERVAL must be a positive number.")
+        if self.weekdays and self.frequency != "WEEKLY":
+            raise RecurrenceError("BYDAY is only supported for weekly rules.")
+        if self.count is None and self.until is None:
+            raise RecurrenceError("The rule needs COUNT or UNTIL so the series ends.")
+        if self.count is not None and not 1 <= self.count <= MAX_OCCURRENCES:
+            raise RecurrenceError(f"COUNT must be between 1 and {MAX_OCCURRENCES}.")
+
+    @classmethod
+    def parse(cls, text: str) -> "RecurrenceRule":
+        parts: dict[str, str] = {}
+        for item in text.strip().removeprefix("RRULE:").split(";"):
+            if not item:
+                continue
+            key, sep, value = item.partition("=")
+            if not sep or not value:
+                raise RecurrenceError(f"Malformed rule part {item!r}.")
+            parts[key.strip().upper()] = value.strip().upper()
+        unknown = set(parts) - {"FREQ", "INTERVAL", "BYDAY", "COUNT", "UNTIL"}
+        if unknown:
+            raise RecurrenceError(f"Unsupported rule parts: {', '.join(sorted(unknown))}.")
+        try:
+            weekdays = tuple(sorted({WEEKDAYS.index(day) for day in parts.get("BYDAY", "").split(",") if day}))
+            return cls(
+                frequency=parts.get("FREQ", ""),
+                interval=int(parts.get("INTERVAL", 1)),
+                weekdays=weekdays,
+                count=int(parts["COUNT"]) if "COUNT" in parts else None,
+                until=datetime.strptime(parts["UNTIL"][:8], "%Y%m%d").date() if "UNTIL" in parts else None,
+            )
+        except ValueError as exc:
+            if isinstance(exc, RecurrenceError):
+                raise
+            raise RecurrenceError(f"Invalid rule {text!r}.") from exc
+
+    @classmethod
+    def weekly(
+        cls, first_day: date, *, weeks: int, weekdays: tuple[int, ...] = (), interval: int = 1
+    ) -> "RecurrenceRule":
+        """Repeat on ``weekdays`` (default: the first day's weekday) for ``weeks`` weeks."""
+
+        return cls(
+            frequency="WEEKLY",
+            interval=interval,
+            weekdays=tuple(sorted(set(weekdays))),
+            until=first_day + timedelta(weeks=weeks, days=-1),
+        )
+
+    def __str__(self) -> str:
+        parts = [f"FREQ={self.frequency}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.weekdays:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[day] for day in self.weekdays))
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until:%Y%m%d}")
+        return ";".join(parts)
+
+    def dates(self, first_day: date) -> list[date]:
+        """Return the occurrence dates, starting with ``first_day`` when it matches."""
+
+        if self.frequency == "DAILY":
+            candidates = (first_day + timedelta(days=step * self.interval) for step in range(MAX_OCCURRENCES + 2))
+        else:
+            weekdays = self.weekdays or (first_day.weekday(),)
+            monday = first_day - timedelta(days=first_day.weekday())
+            candidates = (
+                monday + timedelta(weeks=week * self.interval, days=weekday)
+                for week in range(MAX_OCCURRENCES + 2)
+                for weekday in weekdays
+            )
+        result: list[date] = []
+        for day in candidates:
+            if day < first_day:
+                continue
+            if (self.until is not None and day > self.until) or (self.count is not None and len(result) == self.count):
+                return result
+            if len(result) == MAX_OCCURRENCES:
+                raise RecurrenceError(f"A series can have at most {MAX_OCCURRENCES} occurrences.")
+            result.append(day)
+        return result
+
+    def occurrences(self, start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+        """Repeat the ``[start, end)`` slot on every occurrence date."""
+
+        tz = timezone.get_current_timezone()
+        local_start, local_end = timezone.localtime(start, tz), timezone.localtime(end, tz)
+        span_days = (local_end.date() - local_start.date()).days
+        return [
+            (
+                timezone.make_aware(datetime.combine(day, local_start.time()), tz),
+                timezone.make_aware(datetime.combine(day + timedelta(days=span_days), local_end.time()), tz),
+            )
+            for day in self.dates(local_start.date())
+        ]
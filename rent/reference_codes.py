@@ -0,0 +1,150 @@
+"""Payment reference codes.
+
+A code is 17 Crockford base32 characters::
+
+    01JB4Z3KQ  7XW2  00A  Q
+    ---------  ----  ---  -
+    unix ms    node   seq  check
+
+The first nine characters are the generation time in milliseconds, so codes
+sort by creation time and new rows land at the right-hand end of the unique
+index instead of at random pages. ``node`` is 20 random bits chosen once per
+process (and again in a forked child), and ``seq`` counts codes generated in
+the same millisecond. A process therefore never repeats a code: when the
+counter runs out within a millisecond, or the clock steps back, the
+timestamp is advanced instead. Two processes can only clash by drawing the
+same node, which the ``unique`` column still catches. The last character is
+the Crockford mod-37 check symbol, so a mistyped code is rejected by
+:func:`is_valid` before it reaches the database.
+
+Only the counter and check symbol change between codes of the same
+millisecond; the encoded prefix is cached, which keeps generation to a
+table lookup and a string join.
+"""
+from __future__ import annotations
+
+import os
+import secrets
+import threading
+import time
+from typing import Callable
+
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+CHECK_SYMBOLS = ALPHABET + "*~$=U"
+CODE_LENGTH = 17
+
+_TIME_CHARS, _NODE_CHARS, _SEQ_CHARS = 9, 4, 3
+_NODE_BITS = 5 * _NODE_CHARS
+_SEQ_LIMIT = 32**_SEQ_CHARS
+_SEQ_CODES = tuple(ALPHABET[n >> 10] + ALPHABET[(n >> 5) & 31] + ALPHABET[n & 31] for n in range(_SEQ_LIMIT))
+_DECODE = {symbol: value for value, symbol in enumerate(ALPHABET)}
+_DECODE.update({"O": 0, "I": 1, "L": 1})
+
+
+def encode(value: int, width: int) -> str:
+    symbols = []
+    for _ in range(width):
+        symbols.append(ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(symbols))
+
+
+def checksum(value: int) -> str:
+    return CHECK_SYMBOLS[value % 37]
+
+
+def normalize(code: str) -> str:
+    """Upper-case ``code`` and drop the hyphens people like to type."""
+
+    return code.strip().upper().replace("-", "")
+
+
+def is_valid(code: str) -> bool:
+    """Return whether ``code`` is well formed and its check symbol matches."""
+
+    code = normalize(code)
+    if len(code) != CODE_LENGTH:
+        return False
+    value = 0
+    for symbol in code[:-1]:
+        digit = _DECODE.get(symbol)
+        if digit is None:
+            return False
+        value = value * 32 + digit
+    return checksum(value) == code[-1]
+
+
+class ReferenceCodeGenerator:
+    """Thread-safe source of monotonic reference codes for one process."""
+
+    def __init__(self, *, node: int | None = None, clock: Callable[[], int] = time.time_ns) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reseed(node)
+
+    def reseed(self, node: int | None = None) -> None:
+        """Pick a new node id; called in forked children so they diverge."""
+
+        self._lock = threading.Lock()
+        self.node = secrets.randbits(_NODE_BITS) if node is None else node
+        self._millis = -1
+        self._seq = 0
+        self._prefix = ""
+        self._prefix_mod = 0
+
+    def _advance(self, millis: int) -> None:
+        self._millis = millis
+        self._seq = 0
+        self._prefix = encode(millis, _TIME_CHARS) + encode(self.node, _NODE_CHARS)
+        # Residue of the code's value with seq 0; the check symbol only adds seq.
+        self._prefix_mod = ((millis << _NODE_BITS | self.node) * _SEQ_LIMIT) % 37
+
+    def __call__(self, _seq_codes=_SEQ_CODES, _check=CHECK_SYMBOLS) -> str:
+        with self._lock:
+            millis = self._clock() // 1_000_000
+            if millis > self._millis:
+                self._advance(millis)
+            else:
+                seq = self._seq + 1
+                if seq < _SEQ_LIMIT:
+                    self._seq = seq
+                    return f"{self._prefix}{_seq_codes[seq]}{_check[(self._prefix_mod + seq) % 37]}"
+                self._advance(self._millis + 1)
+            return f"{self._prefix}{_seq_codes[0]}{_check[self._prefix_mod]}"
+
+    def batch(self, count: int) -> list[str]:
+        """Return ``count`` consecutive codes, reading the clock once."""
+
+        codes: list[str] = []
+        with self._lock:
+            millis = self._clock() // 1_000_000
+            if millis > self._millis:
+                self._advance(millis)
+                seq = 0
+            else:
+                seq = self._seq + 1
+            while len(codes) < count:
+                if seq == _SEQ_LIMIT:
+                    self._advance(self._millis + 1)
+                    seq = 0
+                stop = min(_SEQ_LIMIT, seq + count - len(codes))
+                prefix, prefix_mod = self._prefix, self._prefix_mod
+                codes.extend(
+                    prefix + _SEQ_CODES[n] + CHECK_SYMBOLS[(prefix_mod + n) % 37] for n in range(seq, stop)
+                )
+                seq = stop
+            self._seq = seq - 1
+        return codes
+
+
+_default = ReferenceCodeGenerator()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_default.reseed)
+
+
+def new_reference_code() -> str:
+    return _default()
+
+
+def new_reference_codes(count: int) -> list[str]:
+    return _default.batch(count)
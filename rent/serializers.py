@@ -0,0 +1,83 @@
+"""JSON shapes of the booking endpoints (see :mod:`TK_PBP.serialization`)."""
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from django.db.models import QuerySet, Sum
+
+from TK_PBP.serialization import Field, Serializer
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _venue(venue_id: int, name: str) -> dict[str, Any]:
+    return {"id": venue_id, "name": name}
+
+
+_CENTS = Decimal("0.01")
+
+
+def _addons_total(total: Decimal | None) -> str:
+    # SQLite sums decimals without their scale; always answer with cents.
+    return str((total or Decimal("0")).quantize(_CENTS))
+
+
+def _total_cost(start: datetime, end: datetime, price_per_hour: Decimal, addons_total: Decimal | None) -> str:
+    # Booking.total_cost: whole hours at the venue's rate plus the add-ons.
+    hours = int((end - start).total_seconds() // 3600)
+    return str((price_per_hour * Decimal(hours) + (addons_total or Decimal("0"))).quantize(_CENTS))
+
+
+def _payment(*values: Any) -> dict[str, Any] | None:
+    payment_id, method, status, total_amount, deposit_amount, reference_code, created_at, updated_at = values
+    if payment_id is None:
+        return None
+    return {
+        "id": payment_id,
+        "method": method,
+        "status": status,
+        "total_amount": str(total_amount),
+        "deposit_amount": str(deposit_amount),
+        "reference_code": reference_code,
+        "created_at": _isoformat(created_at),
+        "updated_at": _isoformat(updated_at),
+    }
+
+
+class BookingSerializer(Serializer):
+    """A booking with its venue and payment.
+
+    ``addons_total`` is :attr:`Booking.addons_total` on an instance and the
+    ``Sum`` annotation added by :meth:`annotate` on a queryset.
+    """
+
+    __slots__ = ()
+
+    id = Field()
+    venue = Field("venue_id", "venue__name", convert=_venue)
+    start_datetime = Field(convert=_isoformat)
+    end_datetime = Field(convert=_isoformat)
+    status = Field()
+    total_cost = Field(
+        "start_datetime", "end_datetime", "venue__price_per_hour", "addons_total", convert=_total_cost
+    )
+    addons_total = Field(convert=_addons_total)
+    payment = Field(
+        "payment__id",
+        "payment__method",
+        "payment__status",
+        "payment__total_amount",
+        "payment__deposit_amount",
+        "payment__reference_code",
+        "payment__created_at",
+        "payment__updated_at",
+        convert=_payment,
+    )
+
+    @staticmethod
+    def annotate(queryset: QuerySet) -> QuerySet:
+        return queryset.annotate(addons_total=Sum("addons__price"))
@@ -0,0 +1,129 @@
+"""Create recurring bookings in bulk.
+
+:func:`find_conflicts` checks every occurrence of a series with a single
+range query: the active bookings between the first start and the last end
+are merged into disjoint busy intervals and swept together with the sorted
+occurrences, so the cost is one query plus ``O((n + m) log(n + m))`` work
+rather than one ``exists()`` per occurrence.
+
+:func:`create_series` repeats that check inside the transaction, then
+inserts the bookings, their payments and add-on links with one
+``bulk_create`` each. ``bulk_create`` skips model signals, so payments are
+built here and the availability cache is invalidated explicitly. A booking
+committed between the check and the insert is rejected by the database's
+overlap guard and reported as a :class:`SeriesConflict` as well.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils import formats, timezone
+
+from manajemen_lapangan.models import Venue
+
+from .availability import days_between, invalidate_days, merge
+from .models import Booking, BookingSeries, Payment, is_booking_overlap
+from .recurrence import RecurrenceRule
+from .reference_codes import new_reference_codes
+
+Interval = tuple[datetime, datetime]
+
+
+class SeriesConflict(ValidationError):
+    """Raised when occurrences of a series overlap existing bookings or each other."""
+
+    def __init__(self, conflicts: list[Interval]) -> None:
+        self.conflicts = conflicts
+        shown = ", ".join(formats.date_format(timezone.localtime(start), "D d M Y H:i") for start, _ in conflicts[:5])
+        more = f" and {len(conflicts) - 5} more" if len(conflicts) > 5 else ""
+        super().__init__(f"This venue is already booked on {shown}{more}.", code="series_conflict")
+
+
+def find_conflicts(venue: Venue, occurrences: list[Interval]) -> list[Interval]:
+    """Return the occurrences that overlap an active booking or an earlier occurrence."""
+
+    if not occurrences:
+        return []
+    ordered = sorted(occurrences)
+    busy = merge(
+        Booking.objects.filter(
+            venue=venue,
+            status__in=Booking.ACTIVE_STATUSES,
+            start_datetime__lt=max(end for _, end in ordered),
+            end_datetime__gt=ordered[0][0],
+        ).values_list("start_datetime", "end_datetime")
+    )
+    conflicts: list[Interval] = []
+    index = 0
+    previous_end = None
+    for start, end in ordered:
+        while index < len(busy) and busy[index][1] <= start:
+            index += 1
+        overlaps_booking = index < len(busy) and busy[index][0] < end
+        if overlaps_booking or (previous_end is not None and start < previous_end):
+            conflicts.append((start, end))
+        previous_end = end if previous_end is None else max(previous_end, end)
+    return conflicts
+
+
+def create_series(
+    user,
+    venue: Venue,
+    *,
+    start: datetime,
+    end: datetime,
+    rule: RecurrenceRule,
+    notes: str = "",
+    addons: Iterable = (),
+) -> BookingSeries:
+    """Create a pending booking for every occurrence of ``rule``, or none at all."""
+
+    occurrences = rule.occurrences(start, end)
+    addons = list(addons)
+    addons_total = sum((addon.price for addon in addons), Decimal("0"))
+    try:
+        with transaction.atomic():
+            conflicts = find_conflicts(venue, occurrences)
+            if conflicts:
+                raise SeriesConflict(conflicts)
+            series = BookingSeries.objects.create(
+                user=user, venue=venue, rule=str(rule), start_datetime=start, end_datetime=end, notes=notes
+            )
+            bookings = Booking.objects.bulk_create(
+                Booking(
+                    user=user,
+                    venue=venue,
+                    series=series,
+                    start_datetime=occurrence_start,
+                    end_datetime=occurrence_end,
+                    notes=notes,
+                )
+                for occurrence_start, occurrence_end in occurrences
+            )
+            Payment.objects.bulk_create(
+                Payment(
+                    booking=booking,
+                    method="qris",
+                    status="waiting",
+                    total_amount=venue.hourly_total(booking.duration_hours) + addons_total,
+                    reference_code=code,
+                )
+                for booking, code in zip(bookings, new_reference_codes(len(bookings)))
+            )
+            if addons:
+                through = Booking.addons.through
+                through.objects.bulk_create(
+                    through(booking_id=booking.pk, addon_id=addon.pk) for booking in bookings for addon in addons
+                )
+            days = {day for occurrence in occurrences for day in days_between(*occurrence)}
+            transaction.on_commit(lambda: invalidate_days(venue.pk, days))
+    except IntegrityError as exc:
+        # A booking was committed after the check; the database constraint caught it.
+        if not is_booking_overlap(exc):
+            raise
+        raise SeriesConflict(find_conflicts(venue, occurrences) or occurrences) from exc
+    return series
@@ -1,20 +1,30 @@
-"""Signals ensuring booking payments stay in sync."""
+"""Signals keeping booking payments and the availability cache in sync.
+
+Payment totals are recalculated by a background task (``rent.tasks``) queued
+when the booking change commits.
+"""
 from __future__ import annotations
 
-from django.db.models.signals import m2m_changed, post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from .models import Booking
+from manajemen_lapangan.models import Venue, VenueAvailability
+
+from .availability import days_between, invalidate_days, invalidate_venue
+from .events import payment_status_changed
+from .models import Booking, Payment
+from .tasks import recalculate_payment, render_invoice
+
+# Saves limited to these fields cannot move a booking to other days.
+_TIME_FIELDS = {"venue", "start_datetime", "end_datetime"}
 
 
 @receiver(post_save, sender=Booking)
-def ensure_payment_for_booking(sender, instance: Booking, created: bool, **kwargs):
-    """Ensure a payment record exists whenever a booking is created."""
+def ensure_payment_for_booking(sender, instance: Booking, **kwargs):
+    """Create or update the booking's payment in the background once the save commits."""
 
-    payment = instance.ensure_payment()
-    if not created and payment.total_amount != instance.total_cost:
-        payment.total_amount = instance.total_cost
-        payment.save(update_fields=["total_amount", "updated_at"])
+    recalculate_payment.delay(booking_id=instance.pk, key=f"payment:{instance.pk}")
 
 
 @receiver(m2m_changed, sender=Booking.addons.through)
@@ -22,7 +32,41 @@ def update_payment_on_addons(sender, instance: Booking, action: str, **kwargs):
     """Recalculate payment totals when add-ons are modified."""
 
     if action in {"post_add", "post_remove", "post_clear"}:
-        payment = instance.ensure_payment()
-        if payment.total_amount != instance.total_cost:
-            payment.total_amount = instance.total_cost
-            payment.save(update_fields=["total_amount", "updated_at"])
+        recalculate_payment.delay(booking_id=instance.pk, key=f"payment:{instance.pk}")
+
+
+@receiver(post_save, sender=Payment)
+@receiver(payment_status_changed, sender=Payment)
+def render_invoice_for_payment(sender, instance: Payment, **kwargs):
+    """Render the receipt in the background once a payment is confirmed."""
+
+    if instance.status in Payment.PAID_STATUSES:
+        render_invoice.delay(payment_id=instance.pk, key=f"invoice:{instance.pk}")
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def invalidate_booking_availability(sender, instance: Booking, update_fields=None, created=False, **kwargs):
+    """Drop the cached availability of the days a booking occupies once the change commits."""
+
+    venue_id = instance.venue_id
+    if created or kwargs["signal"] is post_delete or (update_fields and not _TIME_FIELDS & set(update_fields)):
+        days = days_between(instance.start_datetime, instance.end_datetime)
+        transaction.on_commit(lambda: invalidate_days(venue_id, days))
+    else:
+        # A full save may have moved the booking; its previous days are unknown.
+        transaction.on_commit(lambda: invalidate_venue(venue_id))
+
+
+@receiver(post_save, sender=Venue)
+@receiver(post_delete, sender=Venue)
+def invalidate_venue_availability(sender, instance: Venue, **kwargs):
+    venue_id = instance.pk
+    transaction.on_commit(lambda: invalidate_venue(venue_id))
+
+
+@receiver(post_save, sender=VenueAvailability)
+@receiver(post_delete, sender=VenueAvailability)
+def invalidate_block_availability(sender, instance: VenueAvailability, **kwargs):
+    venue_id = instance.venue_id
+    transaction.on_commit(lambda: invalidate_venue(venue_id))
@@ -0,0 +1,151 @@
+"""A local stand-in for a QRIS/GoPay payment gateway.
+
+``manage.py run_payment_simulator`` serves ``POST /charges`` for
+:class:`~rent.gateway.SimulatorProvider`. Every charge settles ``delay``
+seconds later: a signed ``payment.succeeded`` webhook (``payment.failed``
+for a ``fail_rate`` share of charges) is posted to the app's webhook URL.
+Like a real gateway, a delivery that does not get a 2xx answer is retried
+with exponential backoff, up to ``max_attempts`` times. Webhooks are signed
+with the app's ``PAYMENT_WEBHOOK_SECRET``.
+
+:meth:`GatewaySimulator.flush` delivers the webhooks that are due; the
+command calls it in a loop, and tests call it directly with a fake
+``deliver`` callable instead of HTTP.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from decimal import Decimal, InvalidOperation
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+from .gateway import EVENT_FAILED, EVENT_SUCCEEDED, SIGNATURE_HEADER, sign
+
+logger = logging.getLogger(__name__)
+
+
+def post_webhook(url: str, body: bytes, signature: str, timeout: float = 5) -> int:
+    request = urllib.request.Request(
+        url,
+        data=body,
+        headers={"Content-Type": "application/json", SIGNATURE_HEADER: signature},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+    except OSError:
+        return 0
+
+
+class GatewaySimulator:
+    """Creates charges and delivers their signed webhooks when they fall due."""
+
+    def __init__(
+        self,
+        webhook_url: str,
+        secret: str,
+        *,
+        delay: float = 2.0,
+        fail_rate: float = 0.0,
+        max_attempts: int = 5,
+        deliver: Callable[[str, bytes, str], int] = post_webhook,
+        clock: Callable[[], float] = time.time,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.webhook_url = webhook_url
+        self.secret = secret
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.max_attempts = max_attempts
+        self.deliver = deliver
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self._pending: list[tuple[float, int, bytes, int]] = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+
+    def _schedule(self, due: float, body: bytes, attempts: int) -> None:
+        with self._lock:
+            heapq.heappush(self._pending, (due, next(self._order), body, attempts))
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def create_charge(self, reference: str, amount: str, method: str = "") -> dict[str, Any]:
+        """Accept a charge and schedule its webhook; return the charge as the API does."""
+
+        charge_id = f"ch_{uuid.uuid4().hex[:20]}"
+        event_type = EVENT_FAILED if self.rng.random() < self.fail_rate else EVENT_SUCCEEDED
+        event = {
+            "id": f"evt_{uuid.uuid4().hex}",
+            "type": event_type,
+            "created": int(self.clock()),
+            "data": {"reference": reference, "amount": amount, "charge": charge_id, "method": method},
+        }
+        self._schedule(self.clock() + self.delay, json.dumps(event).encode(), 0)
+        return {"id": charge_id, "status": "pending", "qr_string": f"SIMULATED-QRIS|{charge_id}|{amount}"}
+
+    def flush(self) -> int:
+        """Deliver every webhook that is due; return how many the app accepted."""
+
+        accepted = 0
+        while True:
+            now = self.clock()
+            with self._lock:
+                if not self._pending or self._pending[0][0] > now:
+                    return accepted
+                _, _, body, attempts = heapq.heappop(self._pending)
+            # Signed at delivery time, so retries carry a fresh timestamp.
+            status = self.deliver(self.webhook_url, body, sign(body, self.secret, int(now)))
+            attempts += 1
+            if 200 <= status < 300:
+                accepted += 1
+            elif attempts < self.max_attempts:
+                logger.warning("Webhook delivery failed with %s, retrying (attempt %s)", status, attempts)
+                self._schedule(now + 2**attempts, body, attempts)
+            else:
+                logger.error("Webhook dropped after %s attempts: %s", attempts, body.decode())
+
+
+def make_server(simulator: GatewaySimulator, host: str, port: int) -> ThreadingHTTPServer:
+    """An HTTP server exposing ``POST /charges`` for ``simulator``."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            if self.path.rstrip("/") != "/charges":
+                self._reply(404, {"error": "Not found."})
+                return
+            try:
+                data = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                reference = str(data["reference"])
+                amount = str(Decimal(str(data["amount"])))
+            except (ValueError, KeyError, TypeError, InvalidOperation):
+                self._reply(400, {"error": "reference and amount are required."})
+                return
+            self._reply(201, simulator.create_charge(reference, amount, str(data.get("method", ""))))
+
+        def _reply(self, status: int, payload: dict[str, Any]) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.info("%s - %s", self.address_string(), format % args)
+
+    return ThreadingHTTPServer((host, port), Handler)
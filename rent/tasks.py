@@ -0,0 +1,37 @@
+"""Background tasks for bookings (see :mod:`tasks.queue`)."""
+from __future__ import annotations
+
+from tasks.queue import task
+
+from .invoices import generate_invoice
+from .models import Booking, Payment
+from .webhooks import apply_event
+
+
+@task
+def recalculate_payment(booking_id: int) -> None:
+    """Create the booking's payment if it is missing and keep its total in sync."""
+
+    booking = Booking.objects.select_related("venue").filter(pk=booking_id).first()
+    if booking is not None:  # Deleted since the task was queued.
+        booking.ensure_payment()
+
+
+@task
+def render_invoice(payment_id: int) -> None:
+    """Render and store the receipt of a confirmed payment."""
+
+    payment = (
+        Payment.objects.select_related("booking__venue", "booking__user")
+        .filter(pk=payment_id, status__in=Payment.PAID_STATUSES)
+        .first()
+    )
+    if payment is not None:
+        generate_invoice(payment)
+
+
+@task
+def apply_payment_webhook(event_id: int) -> None:
+    """Apply a recorded payment provider webhook (see :mod:`rent.webhooks`)."""
+
+    apply_event(event_id)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from manajemen_lapangan.models import Category, Venue
+from rent.models import BOOKING_OVERLAP_MESSAGE, Booking
+
+
+class BookingAdminTests(TestCase):
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.admin = user_model.objects.create_superuser(username="root", email="root@example.com", password="pass")
+        self.member = user_model.objects.create_user(username="member", password="pass")
+        self.venue = Venue.objects.create(
+            category=Category.objects.create(name="Admin Court"),
+            name="Admin Court",
+            description="Court booked through the admin.",
+            location="Jakarta",
+            city="Jakarta",
+            price_per_hour="100000.00",
+            facilities="Parking",
+        )
+        self.start = (timezone.localtime() + timedelta(days=2)).replace(hour=10, minute=0, second=0, microsecond=0)
+        self.booking = Booking.objects.create(
+            user=self.member, venue=self.venue, start_datetime=self.start, end_datetime=self.start + timedelta(hours=2)
+        )
+        self.client.force_login(self.admin)
+
+    def _post(self, start, url=None):
+        end = start + timedelta(hours=2)
+        return self.client.post(
+            url or reverse("admin:rent_booking_add"),
+            {
+                "user": self.member.pk,
+                "venue": self.venue.pk,
+                "start_datetime_0": start.strftime("%Y-%m-%d"),
+                "start_datetime_1": start.strftime("%H:%M:%S"),
+                "end_datetime_0": end.strftime("%Y-%m-%d"),
+                "end_datetime_1": end.strftime("%H:%M:%S"),
+                "notes": "",
+                "status": Booking.STATUS_PENDING,
+                "payment-TOTAL_FORMS": "0",
+                "payment-INITIAL_FORMS": "0",
+                "payment-MIN_NUM_FORMS": "0",
+                "payment-MAX_NUM_FORMS": "1",
+            },
+        )
+
+    def test_overlapping_booking_is_a_form_error(self):
+        response = self._post(self.start + timedelta(hours=1))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, BOOKING_OVERLAP_MESSAGE)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_free_slot_is_saved(self):
+        response = self._post(self.start + timedelta(hours=2))
+
+        self.assertRedirects(response, reverse("admin:rent_booking_changelist"))
+        self.assertEqual(Booking.objects.count(), 2)
+
+    def test_booking_does_not_overlap_itself(self):
+        response = self._post(self.start, reverse("admin:rent_booking_change", args=[self.booking.pk]))
+
+        self.assertRedirects(response, reverse("admin:rent_booking_changelist"))
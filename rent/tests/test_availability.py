@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from manajemen_lapangan.models import Category, Venue, VenueAvailability
+
+from ..availability import merge, subtract
+from ..models import Booking
+
+
+def _at(day, hour: int) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+class IntervalTests(SimpleTestCase):
+    def test_merge_joins_overlapping_and_touching_intervals(self):
+        self.assertEqual(merge([(5, 6), (1, 3), (2, 4), (4, 5)]), [(1, 6)])
+        self.assertEqual(merge([(1, 2), (3, 4)]), [(1, 2), (3, 4)])
+
+    def test_subtract_leaves_the_gaps(self):
+        windows = [(8, 12), (14, 18)]
+        taken = [(7, 9), (10, 11), (15, 19)]
+        self.assertEqual(subtract(windows, taken), [(9, 10), (11, 12), (14, 15)])
+        self.assertEqual(subtract(windows, []), windows)
+
+
+class VenueAvailabilityViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="planner", password="pass")
+        cls.venue = Venue.objects.create(
+            category=Category.objects.get(slug="padel"),
+            name="Slot Court",
+            slug="slot-court",
+            description="Padel court",
+            location="Jakarta",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Locker",
+            available_start_time=time(8),
+            available_end_time=time(12),
+        )
+        cls.day = timezone.localdate() + timedelta(days=3)
+        cls.url = reverse("venue-availability", args=[cls.venue.slug])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def _book(self, start: int, end: int, status: str = Booking.STATUS_PENDING) -> Booking:
+        return Booking.objects.create(
+            user=self.user,
+            venue=self.venue,
+            start_datetime=_at(self.day, start),
+            end_datetime=_at(self.day, end),
+            status=status,
+        )
+
+    def _day(self) -> dict:
+        response = self.client.get(self.url, {"start": self.day.isoformat(), "end": self.day.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        return response.json()["days"][0]
+
+    def test_combines_opening_hours_blocks_and_active_bookings(self):
+        self._book(9, 10)
+        self._book(10, 11, status=Booking.STATUS_CANCELLED)
+        VenueAvailability.objects.create(
+            venue=self.venue, start_datetime=_at(self.day, 20), end_datetime=_at(self.day, 22)
+        )
+
+        day = self._day()
+
+        hours = [(slot["start"][11:13], slot["available"]) for slot in day["slots"]]
+        self.assertEqual(
+            hours, [("08", True), ("09", False), ("10", True), ("11", True), ("20", True), ("21", True)]
+        )
+        self.assertEqual([(entry["start"][11:16], entry["end"][11:16]) for entry in day["taken"]], [("09:00", "10:00")])
+        self.assertEqual(
+            [(entry["start"][11:16], entry["end"][11:16]) for entry in day["free"]],
+            [("08:00", "09:00"), ("10:00", "12:00"), ("20:00", "22:00")],
+        )
+
+    def test_days_are_cached_until_a_booking_changes(self):
+        self._day()
+        with self.assertNumQueries(3):  # session, user and venue
+            self._day()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = self._book(8, 9)
+        self.assertFalse(self._day()["slots"][0]["available"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.cancel()
+        self.assertTrue(self._day()["slots"][0]["available"])
+
+    def test_rejects_invalid_ranges(self):
+        self.assertEqual(self.client.get(self.url, {"start": "tomorrow"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"start": "2025-01-10", "end": "2025-01-09"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"start": "2025-01-01", "end": "2025-03-01"}).status_code, 400)
@@ -83,6 +83,26 @@ class BookingFlowTests(TestCase):
         messages = list(response.context["messages"])
         self.assertTrue(any("Unable to create booking" in str(message) for message in messages))
 
+    def test_overlapping_request_reports_the_booked_range(self) -> None:
+        start = (timezone.now() + timedelta(days=3)).replace(second=0, microsecond=0)
+        Booking.objects.create(
+            user=self.admin, venue_id=self.venue.pk, start_datetime=start, end_datetime=start + timedelta(hours=2)
+        )
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse("venue-detail", kwargs={"slug": self.venue.slug}),
+            {
+                "start_datetime": timezone.localtime(start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+                "end_datetime": timezone.localtime(start + timedelta(hours=3)).strftime("%Y-%m-%dT%H:%M"),
+                "addons": [str(self.addon.pk)],
+            },
+            follow=True,
+        )
+        self.assertRedirects(response, reverse("venue-detail", kwargs={"slug": self.venue.slug}))
+        self.assertEqual(Booking.objects.count(), 1)
+        messages = [str(message) for message in response.context["messages"]]
+        self.assertIn("This venue is already booked for the selected time range.", messages)
+
     def test_user_can_pay_once_booking_is_approved(self) -> None:
         self.client.force_login(self.user)
         start = timezone.now() + timedelta(days=3)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from manajemen_lapangan.models import Category, Venue
+
+from ..events import BookingEventBroker, broker
+from ..models import Booking
+
+
+def _event(broker: BookingEventBroker, user_id: int, status: str = "active"):
+    return broker.publish(
+        user_id=user_id, booking_id=1, venue="Arena", status=status, status_display=status.title()
+    )
+
+
+class BookingEventBrokerTests(SimpleTestCase):
+    async def test_events_reach_only_their_owner(self):
+        events = BookingEventBroker()
+        mine = events.subscribe(1)
+        theirs = events.subscribe(2)
+
+        published = _event(events, 1)
+
+        self.assertEqual(await mine.get(timeout=1), published)
+        self.assertIsNone(await theirs.get(timeout=0.01))
+        events.unsubscribe(mine)
+        events.unsubscribe(theirs)
+        self.assertEqual(events.subscriber_count(1), 0)
+
+    async def test_reconnecting_clients_receive_missed_events(self):
+        events = BookingEventBroker()
+        first = _event(events, 1, "active")
+        _event(events, 2, "active")
+        missed = _event(events, 1, "confirmed")
+
+        subscription = events.subscribe(1, last_event_id=first.id)
+
+        self.assertEqual(await subscription.get(timeout=1), missed)
+        self.assertIsNone(await subscription.get(timeout=0.01))
+
+    async def test_slow_subscribers_drop_the_oldest_events(self):
+        events = BookingEventBroker(queue_size=2)
+        subscription = events.subscribe(1)
+        for status in ("active", "confirmed", "cancelled"):
+            _event(events, 1, status)
+        await asyncio.sleep(0)
+
+        received = [await subscription.get(timeout=1), await subscription.get(timeout=1)]
+        self.assertEqual([event.status for event in received], ["confirmed", "cancelled"])
+
+    def test_events_are_encoded_as_sse_frames(self):
+        event = _event(BookingEventBroker(), 7)
+        frame = event.encode()
+
+        self.assertTrue(frame.startswith(f"id: {event.id}\nevent: booking-status\ndata: "))
+        self.assertTrue(frame.endswith("\n\n"))
+        payload = json.loads(frame.split("data: ", 1)[1])
+        self.assertEqual(payload["status"], "active")
+        self.assertNotIn("user_id", payload)
+
+
+class BookingStatusStreamTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user_model = get_user_model()
+        cls.user = user_model.objects.create_user(username="streamer", password="pass")
+        cls.admin = user_model.objects.create_user(username="approver", password="pass", is_staff=True)
+        venue = Venue.objects.create(
+            category=Category.objects.get(slug="padel"),
+            name="Stream Court",
+            slug="stream-court",
+            description="Padel court",
+            location="Jakarta",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Locker",
+        )
+        start = timezone.now() + timedelta(days=2)
+        cls.booking = Booking.objects.create(
+            user=cls.user, venue=venue, start_datetime=start, end_datetime=start + timedelta(hours=2)
+        )
+
+    def test_status_changes_are_published_after_commit(self):
+        since = broker._history[-1].id if broker._history else 0
+        with self.captureOnCommitCallbacks(execute=True):
+            self.booking.approve(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.booking.confirm_payment()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.booking.cancel()
+
+        published = [event for event in broker._history if event.id > since and event.user_id == self.user.pk]
+        self.assertEqual([event.status for event in published], ["active", "confirmed", "cancelled"])
+        self.assertEqual(published[0].venue, "Stream Court")
+
+    async def test_stream_delivers_approvals(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("booking-events"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = response.streaming_content
+        self.assertTrue((await anext(stream)).startswith(b"retry: "))
+
+        def approve():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.booking.approve(self.admin)
+
+        await sync_to_async(approve)()
+        frame = (await asyncio.wait_for(anext(stream), timeout=1)).decode()
+        self.assertIn("event: booking-status", frame)
+        self.assertEqual(json.loads(frame.split("data: ", 1)[1])["booking_id"], self.booking.pk)
+        await stream.aclose()
+
+    def test_stream_requires_login_and_asgi(self):
+        self.assertEqual(self.client.get(reverse("booking-events")).status_code, 403)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse("booking-events")).status_code, 204)
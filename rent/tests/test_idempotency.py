@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from manajemen_lapangan.models import Category, Venue
+
+from ..idempotency import IDEMPOTENCY_FIELD, REPLAYED_HEADER, purge_expired
+from ..models import Booking, IdempotencyKey
+
+
+class IdempotencyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="retrier", password="pass")
+        cls.venue = Venue.objects.create(
+            category=Category.objects.get(slug="padel"),
+            name="Retry Court",
+            slug="retry-court",
+            description="Padel court",
+            location="Jakarta",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Locker",
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.detail_url = reverse("venue-detail", kwargs={"slug": self.venue.slug})
+
+    def _booking_data(self, key: str, *, days: int = 1) -> dict:
+        start = timezone.now() + timedelta(days=days)
+        return {
+            "start_datetime": start.strftime("%Y-%m-%dT%H:%M"),
+            "end_datetime": (start + timedelta(hours=2)).strftime("%Y-%m-%dT%H:%M"),
+            IDEMPOTENCY_FIELD: key,
+        }
+
+    def _approved_booking(self) -> Booking:
+        start = timezone.now() + timedelta(days=3)
+        booking = Booking.objects.create(
+            user=self.user, venue=self.venue, start_datetime=start, end_datetime=start + timedelta(hours=1)
+        )
+        booking.status = Booking.STATUS_ACTIVE
+        booking.save(update_fields=["status"])
+        return booking
+
+    def _post_json(self, url: str, body: str, key: str):
+        return self.client.post(url, body, content_type="application/json", headers={"Idempotency-Key": key})
+
+    def test_resubmitted_booking_form_creates_one_booking(self):
+        data = self._booking_data("form-1")
+
+        first = self.client.post(self.detail_url, data)
+        second = self.client.post(self.detail_url, data)
+
+        self.assertRedirects(first, reverse("booked-places"), fetch_redirect_response=False)
+        self.assertRedirects(second, reverse("booked-places"), fetch_redirect_response=False)
+        self.assertEqual(second[REPLAYED_HEADER], "true")
+        self.assertEqual(Booking.objects.filter(user=self.user).count(), 1)
+        self.assertIn(
+            "This booking request was already submitted.", [str(m) for m in get_messages(second.wsgi_request)]
+        )
+
+    def test_venue_page_renders_a_fresh_key(self):
+        first = self.client.get(self.detail_url)
+        second = self.client.get(self.detail_url)
+        self.assertContains(first, f'name="{IDEMPOTENCY_FIELD}"')
+        self.assertNotEqual(first.context["idempotency_key"], second.context["idempotency_key"])
+
+    def test_key_reused_for_another_request_is_rejected(self):
+        self.client.post(self.detail_url, self._booking_data("form-2"))
+
+        response = self.client.post(self.detail_url, self._booking_data("form-2", days=5))
+
+        self.assertRedirects(response, reverse("booked-places"), fetch_redirect_response=False)
+        self.assertEqual(Booking.objects.filter(user=self.user).count(), 1)
+        self.assertIn(
+            "This idempotency key was already used for a different request.",
+            [str(m) for m in get_messages(response.wsgi_request)],
+        )
+
+    def test_failed_write_releases_the_key(self):
+        data = self._booking_data("form-3")
+        blocker = get_user_model().objects.create_user(username="first", password="pass")
+        Booking.objects.create(
+            user=blocker,
+            venue=self.venue,
+            start_datetime=timezone.now() + timedelta(hours=12),
+            end_datetime=timezone.now() + timedelta(hours=36),
+        )
+
+        response = self.client.post(self.detail_url, data)
+
+        self.assertRedirects(response, self.detail_url, fetch_redirect_response=False)
+        self.assertFalse(IdempotencyKey.objects.filter(key="form-3").exists())
+
+    def test_payment_confirmation_is_replayed_from_the_header(self):
+        booking = self._approved_booking()
+        url = reverse("booking-payment-json", args=[booking.pk])
+
+        confirm_payment = Booking.confirm_payment
+        with mock.patch.object(Booking, "confirm_payment", autospec=True, side_effect=confirm_payment) as confirm:
+            first = self._post_json(url, "{}", "pay-1")
+            second = self._post_json(url, "{}", "pay-1")
+
+        self.assertEqual(confirm.call_count, 1)
+        self.assertEqual((first.status_code, second.status_code), (200, 200))
+        self.assertJSONEqual(second.content, first.json())
+        self.assertEqual(second["Content-Type"], "application/json")
+        self.assertNotIn(REPLAYED_HEADER, first)
+
+        other = self._post_json(url, '{"method": "gopay"}', "pay-1")
+        self.assertEqual(other.status_code, 422)
+
+    def test_key_held_by_a_running_request_conflicts_until_abandoned(self):
+        booking = self._approved_booking()
+        url = reverse("booking-payment-json", args=[booking.pk])
+        with mock.patch("rent.idempotency._store"):
+            self._post_json(url, "{}", "pay-2")
+
+        response = self._post_json(url, "{}", "pay-2")
+        self.assertEqual(response.status_code, 409)
+
+        IdempotencyKey.objects.filter(key="pay-2").update(created_at=timezone.now() - timedelta(minutes=5))
+        with override_settings(IDEMPOTENCY_LOCK_TIMEOUT=60):
+            response = self._post_json(url, "{}", "pay-2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(IdempotencyKey.objects.get(key="pay-2").status_code, 200)
+
+    def test_expired_keys_are_purged(self):
+        now = timezone.now()
+        IdempotencyKey.objects.create(user=self.user, key="old", fingerprint="x", status_code=200, expires_at=now)
+        IdempotencyKey.objects.create(
+            user=self.user, key="new", fingerprint="x", status_code=200, expires_at=now + timedelta(hours=1)
+        )
+
+        self.assertEqual(purge_expired(now), 1)
+        self.assertEqual(list(IdempotencyKey.objects.values_list("key", flat=True)), ["new"])
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from add_on.models import AddOn
+from manajemen_lapangan.models import Category, Venue
+from tasks.models import Task
+from tasks.queue import Worker
+
+from ..invoices import generate_invoice, invoice_lines, invoice_path
+from ..models import Booking, Invoice
+
+
+class InvoiceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="payer", password="pass", email="payer@example.com")
+        cls.venue = Venue.objects.create(
+            category=Category.objects.get(slug="padel"),
+            name="Receipt Court",
+            slug="receipt-court",
+            description="Padel court",
+            location="Jakarta",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Locker",
+        )
+        cls.addon = AddOn.objects.create(venue=cls.venue, name="Racket rental", description="", price=Decimal("25000.00"))
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        settings_override = override_settings(INVOICE_ROOT=self.root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _booking(self, *, paid: bool = True) -> Booking:
+        day = timezone.localdate() + timedelta(days=2)
+        start = timezone.make_aware(datetime.combine(day, time(18)))
+        booking = Booking.objects.create(
+            user=self.user, venue=self.venue, start_datetime=start, end_datetime=start + timedelta(hours=2)
+        )
+        booking.addons.add(self.addon)
+        if paid:
+            booking.confirm_payment()
+        return booking
+
+    def test_invoice_has_a_line_per_hour_block_and_add_on(self):
+        booking = self._booking(paid=False)
+        lines = invoice_lines(booking)
+        self.assertEqual(
+            [(line.quantity, line.unit_price, line.amount) for line in lines],
+            [(2, Decimal("100000.00"), Decimal("200000.00")), (1, Decimal("25000.00"), Decimal("25000.00"))],
+        )
+        self.assertTrue(lines[0].description.startswith("Receipt Court, "))
+
+    def test_confirming_a_payment_stores_the_invoice_by_content_hash(self):
+        booking = self._booking()
+
+        invoice = Invoice.objects.get(payment=booking.payment)
+        path = invoice_path(invoice.sha256)
+        content = path.read_text()
+        self.assertIn(invoice.number, content)
+        self.assertIn("Racket rental", content)
+        self.assertIn("Rp 225000.00", content)
+        self.assertEqual(invoice.size, len(content.encode()))
+
+        # Rendering the same payment again yields the same file.
+        self.assertEqual(generate_invoice(booking.payment).sha256, invoice.sha256)
+        self.assertEqual(len(list(path.parent.iterdir())), 1)
+
+    def test_download_streams_the_stored_file(self):
+        booking = self._booking()
+        invoice = Invoice.objects.get(payment=booking.payment)
+        self.client.force_login(self.user)
+        url = reverse("booking-invoice", args=[booking.pk])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], f'"{invoice.sha256}"')
+        self.assertIn(invoice.number, b"".join(response.streaming_content).decode())
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=f'"{invoice.sha256}"').status_code, 304)
+
+    def test_only_the_owner_can_download_a_paid_invoice(self):
+        paid = self._booking()
+        other = get_user_model().objects.create_user(username="snoop", password="pass")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(reverse("booking-invoice", args=[paid.pk])).status_code, 404)
+
+        paid.payment.status = "waiting"
+        paid.payment.save()
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse("booking-invoice", args=[paid.pk])).status_code, 404)
+
+    @override_settings(TASKS_EAGER=False)
+    def test_missing_invoice_is_rendered_in_the_background(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = self._booking()
+        self.assertFalse(Invoice.objects.exists())
+        self.client.force_login(self.user)
+        url = reverse("booking-invoice", args=[booking.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(url)
+        self.assertRedirects(response, reverse("booked-places"), fetch_redirect_response=False)
+        self.assertTrue(Task.objects.filter(name="rent.tasks.render_invoice", status=Task.STATUS_QUEUED).exists())
+
+        Worker().run(burst=True)
+        self.assertEqual(self.client.get(url).status_code, 200)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from manajemen_lapangan.models import Category, Venue
+
+from ..lifecycle import LifecycleResult, run_lifecycle
+from ..models import Booking
+
+
+@override_settings(BOOKING_PENDING_TTL_HOURS=48, BOOKING_UNPAID_TTL_HOURS=24)
+class BookingLifecycleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="sleeper", password="pass")
+        cls.venue = Venue.objects.create(
+            category=Category.objects.get(slug="padel"),
+            name="Lifecycle Court",
+            slug="lifecycle-court",
+            description="Padel court",
+            location="Jakarta",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Locker",
+        )
+        cls.now = timezone.now().replace(microsecond=0)
+
+    def _book(self, offset_hours: int, status: str, *, created_hours_ago: int = 0, approved_hours_ago=None) -> Booking:
+        start = self.now + timedelta(hours=offset_hours)
+        booking = Booking.objects.create(
+            user=self.user,
+            venue=self.venue,
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=1),
+            status=status,
+            approved_at=None if approved_hours_ago is None else self.now - timedelta(hours=approved_hours_ago),
+        )
+        Booking.objects.filter(pk=booking.pk).update(created_at=self.now - timedelta(hours=created_hours_ago))
+        return booking
+
+    def _statuses(self, *bookings: Booking) -> list[str]:
+        return [Booking.objects.get(pk=booking.pk).status for booking in bookings]
+
+    def test_transitions(self):
+        finished = self._book(-3, Booking.STATUS_CONFIRMED)
+        upcoming = self._book(10, Booking.STATUS_CONFIRMED)
+        stale_pending = self._book(100, Booking.STATUS_PENDING, created_hours_ago=49)
+        fresh_pending = self._book(102, Booking.STATUS_PENDING, created_hours_ago=1)
+        started_pending = self._book(-1, Booking.STATUS_PENDING, created_hours_ago=1)
+        unpaid = self._book(104, Booking.STATUS_ACTIVE, approved_hours_ago=25)
+        recently_approved = self._book(106, Booking.STATUS_ACTIVE, approved_hours_ago=2)
+        cancelled = self._book(-6, Booking.STATUS_CANCELLED)
+
+        result = run_lifecycle(now=self.now)
+
+        self.assertEqual(result, LifecycleResult(completed=1, expired_pending=2, expired_unpaid=1))
+        self.assertEqual(
+            self._statuses(
+                finished, upcoming, stale_pending, fresh_pending, started_pending, unpaid, recently_approved, cancelled
+            ),
+            ["completed", "confirmed", "expired", "pending", "expired", "expired", "active", "cancelled"],
+        )
+        self.assertEqual(run_lifecycle(now=self.now), LifecycleResult())
+
+    def test_updates_run_in_bounded_batches(self):
+        for day in range(5):
+            self._book(-24 * (day + 1), Booking.STATUS_CONFIRMED)
+
+        # Per batch: select, savepoint, update, release. Three batches, then the
+        # two empty expiry selects and the idempotency key purge.
+        with self.assertNumQueries(3 * 4 + 2 + 1):
+            result = run_lifecycle(now=self.now, batch_size=2)
+
+        self.assertEqual(result.completed, 5)
+
+    def test_expired_slots_can_be_booked_again(self):
+        stale = self._book(100, Booking.STATUS_PENDING, created_hours_ago=72)
+        run_lifecycle(now=self.now)
+
+        rebooked = Booking.objects.create(
+            user=self.user, venue=self.venue, start_datetime=stale.start_datetime, end_datetime=stale.end_datetime
+        )
+        self.assertEqual(rebooked.status, Booking.STATUS_PENDING)
+
+    def test_command_reports_counts(self):
+        self._book(-3, Booking.STATUS_CONFIRMED)
+        output = StringIO()
+
+        call_command("run_booking_lifecycle", "--dry-run", stdout=output)
+        self.assertIn("completed: 1 due -> completed", output.getvalue())
+
+        call_command("run_booking_lifecycle", stdout=output)
+        self.assertIn("completed 1, expired_pending 0, expired_unpaid 0", output.getvalue())
+        self.assertFalse(Booking.objects.filter(status=Booking.STATUS_CONFIRMED).exists())
@@ -4,12 +4,13 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 
 from add_on.models import AddOn
 from manajemen_lapangan.models import Category, Venue
 
-from ..models import Booking, Payment
+from ..models import Booking, BookingOverlap, Payment
 
 
 class BookingModelTests(TestCase):
@@ -111,3 +112,46 @@ class PaymentModelTests(TestCase):
         payment.reference_code = "ABC123"
         payment.save(update_fields=["reference_code"])
         self.assertIn("ABC123", str(payment))
+
+
+class BookingOverlapConstraintTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="overlap", password="pass")
+        cls.venue = Venue.objects.create(
+            category=Category.objects.get(slug="padel"),
+            name="Single Court",
+            slug="single-court",
+            description="Padel court",
+            location="Jakarta",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Locker",
+        )
+        cls.start = datetime(2024, 1, 1, 9, 0)
+
+    def _book(self, start_hour: int, end_hour: int, **kwargs) -> Booking:
+        return Booking.objects.create(
+            user=self.user,
+            venue=self.venue,
+            start_datetime=self.start.replace(hour=start_hour),
+            end_datetime=self.start.replace(hour=end_hour),
+            **kwargs,
+        )
+
+    def test_overlapping_active_booking_is_rejected(self):
+        self._book(9, 11)
+        with transaction.atomic(), self.assertRaises(BookingOverlap):
+            self._book(10, 12)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_adjacent_and_inactive_bookings_are_allowed(self):
+        self._book(9, 11)
+        self._book(11, 12)
+        cancelled = self._book(9, 10, status=Booking.STATUS_CANCELLED)
+        self._book(9, 10, status=Booking.STATUS_COMPLETED)
+        self.assertEqual(Booking.objects.count(), 4)
+
+        # Reactivating a cancelled booking is checked as well, even without save().
+        with transaction.atomic(), self.assertRaises(IntegrityError):
+            Booking.objects.filter(pk=cancelled.pk).update(status=Booking.STATUS_PENDING)
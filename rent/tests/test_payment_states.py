@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from manajemen_lapangan.models import Category, Venue
+
+from ..events import payment_status_changed
+from ..models import Booking, Payment, PaymentTransitionError
+
+
+class PaymentStateMachineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="payer", password="pass")
+        cls.venue = Venue.objects.create(
+            category=Category.objects.get(slug="padel"),
+            name="State Court",
+            slug="state-court",
+            description="Padel court",
+            location="Jakarta",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Locker",
+        )
+
+    def setUp(self):
+        start = timezone.now() + timedelta(days=2)
+        self.booking = Booking.objects.create(
+            user=self.user,
+            venue=self.venue,
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=1),
+            status=Booking.STATUS_ACTIVE,
+        )
+        self.payment = Payment.objects.get(booking=self.booking)
+
+    def test_allowed_transition_writes_status_and_fields(self):
+        changes = []
+
+        def handler(sender, instance, previous, **kwargs):
+            changes.append((previous, instance.status))
+
+        payment_status_changed.connect(handler)
+        self.addCleanup(payment_status_changed.disconnect, handler)
+
+        self.assertTrue(self.payment.transition(Payment.STATUS_CONFIRMED, method="gopay"))
+        self.assertFalse(self.payment.transition(Payment.STATUS_CONFIRMED))
+
+        stored = Payment.objects.get(pk=self.payment.pk)
+        self.assertEqual((stored.status, stored.method), (Payment.STATUS_CONFIRMED, "gopay"))
+        self.assertEqual(changes, [(Payment.STATUS_WAITING, Payment.STATUS_CONFIRMED)])
+
+    def test_disallowed_transition_is_rejected(self):
+        with self.assertRaises(PaymentTransitionError):
+            self.payment.transition(Payment.STATUS_COMPLETED)
+        self.assertEqual(Payment.objects.get(pk=self.payment.pk).status, Payment.STATUS_WAITING)
+
+    def test_stale_copy_does_not_overwrite_a_newer_status(self):
+        stale = Payment.objects.get(pk=self.payment.pk)
+        self.payment.transition(Payment.STATUS_CONFIRMED)
+        self.payment.transition(Payment.STATUS_WAITING)
+        Payment.objects.filter(pk=self.payment.pk).update(status=Payment.STATUS_COMPLETED)
+
+        with self.assertRaises(PaymentTransitionError):
+            stale.transition(Payment.STATUS_CONFIRMED)
+        self.assertEqual(Payment.objects.get(pk=self.payment.pk).status, Payment.STATUS_COMPLETED)
+
+    def test_confirming_a_booking_closed_meanwhile_changes_nothing(self):
+        stale = Booking.objects.get(pk=self.booking.pk)
+        Booking.objects.filter(pk=self.booking.pk).update(status=Booking.STATUS_EXPIRED)
+
+        with self.assertRaisesMessage(PaymentTransitionError, "This booking can no longer be paid."):
+            stale.confirm_payment()
+
+        self.assertEqual(Payment.objects.get(pk=self.payment.pk).status, Payment.STATUS_WAITING)
+        self.assertEqual(Booking.objects.get(pk=self.booking.pk).status, Booking.STATUS_EXPIRED)
+
+    def test_cancel_releases_a_confirmed_payment(self):
+        self.booking.confirm_payment()
+        booking = Booking.objects.select_related("payment").get(pk=self.booking.pk)
+
+        booking.cancel()
+
+        self.assertEqual(booking.payment.status, Payment.STATUS_WAITING)
+        self.assertEqual(Payment.objects.get(pk=self.payment.pk).status, Payment.STATUS_WAITING)
+
+    def test_bulk_transition_only_moves_allowed_rows(self):
+        self.payment.transition(Payment.STATUS_CONFIRMED)
+        start = timezone.now() + timedelta(days=4)
+        other = Booking.objects.create(
+            user=self.user, venue=self.venue, start_datetime=start, end_datetime=start + timedelta(hours=1)
+        )
+
+        self.assertEqual(Payment.objects.transition(Payment.STATUS_COMPLETED), 1)
+        self.assertEqual(other.payment.status, Payment.STATUS_WAITING)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from manajemen_lapangan.models import Category, Venue
+
+from ..models import Booking, Payment
+from ..reconcile import ReconcileResult, reconcile
+
+
+class ReconcilePaymentsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="auditor", password="pass")
+        cls.venue = Venue.objects.create(
+            category=Category.objects.get(slug="padel"),
+            name="Ledger Court",
+            slug="ledger-court",
+            description="Padel court",
+            location="Jakarta",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Locker",
+        )
+        cls.offset = 0
+
+    def _book(self, status: str, payment_status: str | None) -> Booking:
+        type(self).offset += 2
+        start = timezone.now() + timedelta(days=1, hours=self.offset)
+        booking = Booking.objects.create(
+            user=self.user, venue=self.venue, start_datetime=start, end_datetime=start + timedelta(hours=1)
+        )
+        Booking.objects.filter(pk=booking.pk).update(status=status)
+        if payment_status is None:
+            Payment.objects.filter(booking=booking).delete()
+        else:
+            Payment.objects.filter(booking=booking).update(status=payment_status)
+        return booking
+
+    def _state(self, booking: Booking) -> tuple[str, str | None]:
+        booking = Booking.objects.select_related("payment").get(pk=booking.pk)
+        payment = getattr(booking, "payment", None)
+        return booking.status, payment.status if payment else None
+
+    def test_mismatches_are_repaired(self):
+        completed = self._book(Booking.STATUS_COMPLETED, Payment.STATUS_CONFIRMED)
+        cancelled = self._book(Booking.STATUS_CANCELLED, Payment.STATUS_CONFIRMED)
+        expired = self._book(Booking.STATUS_EXPIRED, Payment.STATUS_CONFIRMED)
+        paid = self._book(Booking.STATUS_ACTIVE, Payment.STATUS_CONFIRMED)
+        unpaid_confirmed = self._book(Booking.STATUS_CONFIRMED, Payment.STATUS_WAITING)
+        without_payment = self._book(Booking.STATUS_ACTIVE, None)
+        consistent = self._book(Booking.STATUS_CONFIRMED, Payment.STATUS_CONFIRMED)
+
+        result = reconcile(batch_size=1)
+
+        self.assertEqual(
+            result,
+            ReconcileResult(
+                completed_payments=1, released_payments=2, confirmed_bookings=1, missing_payments=1, unpaid_bookings=1
+            ),
+        )
+        self.assertEqual(self._state(completed), (Booking.STATUS_COMPLETED, Payment.STATUS_COMPLETED))
+        self.assertEqual(self._state(cancelled), (Booking.STATUS_CANCELLED, Payment.STATUS_WAITING))
+        self.assertEqual(self._state(expired), (Booking.STATUS_EXPIRED, Payment.STATUS_WAITING))
+        self.assertEqual(self._state(paid), (Booking.STATUS_CONFIRMED, Payment.STATUS_CONFIRMED))
+        self.assertEqual(self._state(unpaid_confirmed), (Booking.STATUS_CONFIRMED, Payment.STATUS_WAITING))
+        self.assertEqual(self._state(without_payment), (Booking.STATUS_ACTIVE, Payment.STATUS_WAITING))
+        self.assertEqual(self._state(consistent), (Booking.STATUS_CONFIRMED, Payment.STATUS_CONFIRMED))
+
+        self.assertEqual(reconcile(), ReconcileResult(unpaid_bookings=1))
+
+    def test_each_rule_updates_a_batch_in_one_statement(self):
+        for _ in range(3):
+            self._book(Booking.STATUS_COMPLETED, Payment.STATUS_CONFIRMED)
+
+        # Per rule: the batch select; the completed payments add savepoint,
+        # update, release. Then the unpaid count.
+        with self.assertNumQueries(4 + 3 + 1):
+            result = reconcile(batch_size=10)
+
+        self.assertEqual(result.completed_payments, 3)
+
+    def test_command_dry_run_only_counts(self):
+        booking = self._book(Booking.STATUS_COMPLETED, Payment.STATUS_CONFIRMED)
+        output = StringIO()
+
+        call_command("reconcile_payments", "--dry-run", stdout=output)
+
+        self.assertIn("completed_payments: 1 mismatched", output.getvalue())
+        self.assertEqual(self._state(booking), (Booking.STATUS_COMPLETED, Payment.STATUS_CONFIRMED))
+
+        call_command("reconcile_payments", stdout=output)
+        self.assertIn("Payment reconciliation: completed_payments 1", output.getvalue())
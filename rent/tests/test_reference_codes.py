@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from django.test import SimpleTestCase
+
+from ..reference_codes import CODE_LENGTH, ReferenceCodeGenerator, encode, is_valid
+
+
+class FakeClock:
+    def __init__(self, millis: int) -> None:
+        self.millis = millis
+
+    def __call__(self) -> int:
+        return self.millis * 1_000_000
+
+
+class ReferenceCodeTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock(1_700_000_000_000)
+        self.generate = ReferenceCodeGenerator(node=0x1F2E3, clock=self.clock)
+
+    def test_layout_is_time_node_sequence_and_check(self):
+        first, second = self.generate(), self.generate()
+
+        self.assertEqual(len(first), CODE_LENGTH)
+        self.assertEqual(first[:9], encode(self.clock.millis, 9))
+        self.assertEqual(first[9:13], encode(0x1F2E3, 4))
+        self.assertEqual((first[13:16], second[13:16]), ("000", "001"))
+        self.assertTrue(is_valid(first) and is_valid(second))
+
+    def test_codes_increase_even_when_the_clock_steps_back(self):
+        codes = [self.generate()]
+        self.clock.millis += 5
+        codes.append(self.generate())
+        self.clock.millis -= 1000
+        codes.append(self.generate())
+
+        self.assertEqual(codes, sorted(codes))
+        self.assertEqual(len(set(codes)), 3)
+
+    def test_an_exhausted_counter_moves_to_the_next_millisecond(self):
+        codes = self.generate.batch(32**3 + 2)
+
+        self.assertEqual(len(set(codes)), len(codes))
+        self.assertEqual(codes, sorted(codes))
+        self.assertEqual(codes[-1][:9], encode(self.clock.millis + 1, 9))
+        self.assertLess(codes[-1], self.generate())
+
+    def test_batch_continues_the_single_code_sequence(self):
+        codes = [self.generate()] + self.generate.batch(3) + [self.generate()]
+        self.assertEqual([code[13:16] for code in codes], ["000", "001", "002", "003", "004"])
+
+    def test_check_symbol_catches_typos(self):
+        code = self.generate()
+        typo = code[:4] + ("1" if code[4] != "1" else "2") + code[5:]
+
+        self.assertFalse(is_valid(typo))
+        self.assertFalse(is_valid(code[:-1]))
+        self.assertTrue(is_valid(f" {code[:8]}-{code[8:].lower()} "))
+
+    def test_forked_generators_use_another_node(self):
+        generator = ReferenceCodeGenerator()
+        node = generator.node
+        while generator.node == node:
+            generator.reseed()
+        self.assertNotEqual(generator()[9:13], encode(node, 4))
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from add_on.models import AddOn
+from manajemen_lapangan.models import Category, Venue
+
+from ..models import Booking, BookingSeries, Payment
+from ..recurrence import MAX_OCCURRENCES, RecurrenceError, RecurrenceRule
+from ..series import SeriesConflict, create_series, find_conflicts
+
+
+def _at(day: date, hour: int) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+class RecurrenceRuleTests(SimpleTestCase):
+    def test_parse_round_trips(self):
+        rule = RecurrenceRule.parse("RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=TH,MO;COUNT=4")
+        self.assertEqual(rule.weekdays, (0, 3))
+        self.assertEqual(str(rule), "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH;COUNT=4")
+
+    def test_weekly_dates_follow_weekdays_and_interval(self):
+        monday = date(2025, 3, 3)
+        rule = RecurrenceRule.parse("FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH;COUNT=4")
+        self.assertEqual(
+            rule.dates(monday),
+            [monday, date(2025, 3, 6), date(2025, 3, 17), date(2025, 3, 20)],
+        )
+        # Weekdays earlier in the first week than the start are skipped.
+        self.assertEqual(rule.dates(date(2025, 3, 4))[:2], [date(2025, 3, 6), date(2025, 3, 17)])
+
+    def test_weekly_helper_covers_n_weeks(self):
+        rule = RecurrenceRule.weekly(date(2025, 3, 5), weeks=3)
+        self.assertEqual(rule.dates(date(2025, 3, 5)), [date(2025, 3, 5), date(2025, 3, 12), date(2025, 3, 19)])
+
+    def test_invalid_rules_are_rejected(self):
+        for text in ("FREQ=WEEKLY", "FREQ=HOURLY;COUNT=2", "FREQ=DAILY;BYDAY=MO;COUNT=2", "FREQ=WEEKLY;COUNT=x"):
+            with self.subTest(text=text), self.assertRaises(RecurrenceError):
+                RecurrenceRule.parse(text)
+        with self.assertRaises(RecurrenceError):
+            RecurrenceRule.parse("FREQ=DAILY;UNTIL=20991231").dates(date(2025, 1, 1))
+        self.assertEqual(len(RecurrenceRule.parse(f"FREQ=DAILY;COUNT={MAX_OCCURRENCES}").dates(date(2025, 1, 1))), 52)
+
+
+class BookingSeriesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user_model = get_user_model()
+        cls.user = user_model.objects.create_user(username="club", password="pass")
+        cls.venue = Venue.objects.create(
+            category=Category.objects.get(slug="padel"),
+            name="Club Court",
+            slug="club-court",
+            description="Padel court",
+            location="Jakarta",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Locker",
+        )
+        cls.addon = AddOn.objects.create(venue=cls.venue, name="Balls", description="", price=Decimal("20000.00"))
+        cls.first_day = timezone.localdate() + timedelta(days=7)
+
+    def _existing(self, weeks_ahead: int, status: str = Booking.STATUS_ACTIVE) -> Booking:
+        day = self.first_day + timedelta(weeks=weeks_ahead)
+        return Booking.objects.create(
+            user=self.user, venue=self.venue, start_datetime=_at(day, 19), end_datetime=_at(day, 21), status=status
+        )
+
+    def _occurrences(self, weeks: int = 6):
+        rule = RecurrenceRule.weekly(self.first_day, weeks=weeks)
+        return rule, rule.occurrences(_at(self.first_day, 19), _at(self.first_day, 21))
+
+    def test_conflicts_are_found_with_one_query(self):
+        self._existing(2)
+        self._existing(4, status=Booking.STATUS_CANCELLED)
+        _, occurrences = self._occurrences()
+
+        with self.assertNumQueries(1):
+            conflicts = find_conflicts(self.venue, occurrences)
+
+        self.assertEqual(conflicts, [occurrences[2]])
+
+    def test_series_is_created_in_bulk(self):
+        rule, _ = self._occurrences(weeks=5)
+
+        with self.assertNumQueries(7):  # conflicts, savepoint x2, series, bookings, payments, add-ons
+            series = create_series(
+                self.user,
+                self.venue,
+                start=_at(self.first_day, 19),
+                end=_at(self.first_day, 21),
+                rule=rule,
+                addons=[self.addon],
+            )
+
+        bookings = list(series.occurrences.order_by("start_datetime"))
+        self.assertEqual(len(bookings), 5)
+        self.assertEqual({booking.status for booking in bookings}, {Booking.STATUS_PENDING})
+        self.assertEqual(bookings[1].start_datetime - bookings[0].start_datetime, timedelta(weeks=1))
+        payments = Payment.objects.filter(booking__series=series)
+        self.assertEqual({payment.total_amount for payment in payments}, {Decimal("220000.00")})
+        self.assertEqual(bookings[0].addons.get(), self.addon)
+
+    def test_conflicting_series_creates_nothing(self):
+        self._existing(3)
+        rule, _ = self._occurrences()
+
+        with self.assertRaises(SeriesConflict) as caught:
+            create_series(self.user, self.venue, start=_at(self.first_day, 20), end=_at(self.first_day, 22), rule=rule)
+
+        self.assertEqual(len(caught.exception.conflicts), 1)
+        self.assertFalse(BookingSeries.objects.exists())
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_bookings_committed_after_the_check_are_caught_by_the_database(self):
+        self._existing(2)
+        rule, _ = self._occurrences(weeks=4)
+
+        with patch("rent.series.find_conflicts", return_value=[]), self.assertRaises(SeriesConflict):
+            create_series(self.user, self.venue, start=_at(self.first_day, 19), end=_at(self.first_day, 21), rule=rule)
+
+        self.assertFalse(BookingSeries.objects.exists())
+
+    def test_form_view_requests_every_session(self):
+        self.client.force_login(self.user)
+        url = reverse("booking-series-create", args=[self.venue.slug])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        start = _at(self.first_day, 19)
+        response = self.client.post(
+            url,
+            {
+                "start_datetime": timezone.localtime(start).strftime("%Y-%m-%dT%H:%M"),
+                "end_datetime": timezone.localtime(start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+                "weekdays": [str(self.first_day.weekday()), str((self.first_day.weekday() + 2) % 7)],
+                "interval": 1,
+                "weeks": 4,
+            },
+        )
+
+        self.assertRedirects(response, reverse("booked-places"), fetch_redirect_response=False)
+        self.assertEqual(BookingSeries.objects.get().occurrences.count(), 8)
+
+    def test_form_reports_conflicting_dates(self):
+        self._existing(1)
+        self.client.force_login(self.user)
+        start = _at(self.first_day, 19)
+        response = self.client.post(
+            reverse("booking-series-create", args=[self.venue.slug]),
+            {
+                "start_datetime": timezone.localtime(start).strftime("%Y-%m-%dT%H:%M"),
+                "end_datetime": timezone.localtime(start + timedelta(hours=2)).strftime("%Y-%m-%dT%H:%M"),
+                "interval": 1,
+                "weeks": 4,
+            },
+        )
+
+        self.assertContains(response, "already booked on", status_code=400)
+        self.assertFalse(BookingSeries.objects.exists())
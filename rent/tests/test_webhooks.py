@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from manajemen_lapangan.models import Category, Venue
+from tasks.models import Task
+from tasks.queue import Worker
+
+from ..gateway import (
+    EVENT_FAILED,
+    EVENT_SUCCEEDED,
+    SIGNATURE_HEADER,
+    Charge,
+    InvalidWebhook,
+    PaymentProvider,
+    get_provider,
+    sign,
+    verify_signature,
+)
+from ..models import Booking, Payment, PaymentWebhookEvent
+from ..simulator import GatewaySimulator
+
+SECRET = "test-secret"
+
+
+class IncompleteProvider(PaymentProvider):
+    name = "incomplete"
+
+
+@override_settings(PAYMENT_WEBHOOK_SECRET=SECRET)
+class PaymentWebhookTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="qris-payer", password="pass")
+        cls.venue = Venue.objects.create(
+            category=Category.objects.get(slug="padel"),
+            name="Webhook Court",
+            slug="webhook-court",
+            description="Padel court",
+            location="Jakarta",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Locker",
+        )
+
+    def setUp(self):
+        self.url = reverse("payment-webhook")
+
+    def _booking(self) -> Booking:
+        start = timezone.now() + timedelta(days=2)
+        booking = Booking.objects.create(
+            user=self.user, venue=self.venue, start_datetime=start, end_datetime=start + timedelta(hours=1)
+        )
+        booking.approve(None)
+        return booking
+
+    def _body(self, payment: Payment, event_id: str = "evt_1", event_type: str = EVENT_SUCCEEDED, **data) -> bytes:
+        data = {"reference": payment.reference_code, "amount": str(payment.total_amount), **data}
+        return json.dumps({"id": event_id, "type": event_type, "data": data}).encode()
+
+    def _post(self, body: bytes, *, secret: str = SECRET, timestamp: int | None = None):
+        signature = sign(body, secret, int(time.time()) if timestamp is None else timestamp)
+        headers = {SIGNATURE_HEADER: signature}
+        return self.client.post(self.url, body, content_type="application/json", headers=headers)
+
+    @override_settings(PAYMENT_PROVIDER="rent.tests.test_webhooks.IncompleteProvider")
+    def test_provider_without_start_fails_when_built(self):
+        with self.assertRaises(TypeError):
+            get_provider()
+
+    def test_signature_must_match_and_be_fresh(self):
+        body = b'{"id": "evt"}'
+        now = time.time()
+        verify_signature(body, sign(body, SECRET, int(now)), SECRET, tolerance=300, now=now)
+        for header in (sign(body, "other", int(now)), sign(body, SECRET, int(now) - 301), "v1=abc", ""):
+            with self.subTest(header=header), self.assertRaises(InvalidWebhook):
+                verify_signature(body, header, SECRET, tolerance=300, now=now)
+
+    def test_succeeded_webhook_confirms_the_booking(self):
+        booking = self._booking()
+
+        response = self._post(self._body(booking.payment))
+
+        self.assertEqual(response.status_code, 202)
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, Booking.STATUS_CONFIRMED)
+        self.assertEqual(booking.payment.status, Payment.STATUS_CONFIRMED)
+        event = PaymentWebhookEvent.objects.get()
+        self.assertEqual((event.status, event.payment_id), (PaymentWebhookEvent.STATUS_APPLIED, booking.payment.pk))
+
+    def test_invalid_signature_is_rejected(self):
+        booking = self._booking()
+        response = self._post(self._body(booking.payment), secret="forged")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PaymentWebhookEvent.objects.exists())
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    @override_settings(TASKS_EAGER=False)
+    def test_webhooks_are_queued_and_redeliveries_ignored(self):
+        booking = self._booking()
+        body = self._body(booking.payment)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self._post(body)
+            second = self._post(body)
+
+        self.assertEqual((first.status_code, second.status_code), (202, 200))
+        self.assertTrue(second.json()["duplicate"])
+        self.assertEqual(Task.objects.filter(name="rent.tasks.apply_payment_webhook").count(), 1)
+        booking.payment.refresh_from_db()
+        self.assertEqual(booking.payment.status, Payment.STATUS_WAITING)
+
+        Worker().run(burst=True)
+        booking.payment.refresh_from_db()
+        self.assertEqual(booking.payment.status, Payment.STATUS_CONFIRMED)
+
+    def test_events_that_cannot_apply_are_recorded(self):
+        booking = self._booking()
+        payment = booking.payment
+        Payment.objects.filter(pk=payment.pk).update(gateway_reference="ch_current")
+
+        self._post(self._body(payment, "evt_amount", amount="1.00"))
+        self._post(self._body(payment, "evt_charge", charge="ch_old"))
+        self._post(self._body(payment, "evt_failed", EVENT_FAILED, charge="ch_current"))
+        unknown = {"id": "evt_unknown", "type": EVENT_SUCCEEDED, "data": {"reference": "X", "amount": "1"}}
+        self._post(json.dumps(unknown).encode())
+
+        statuses = dict(PaymentWebhookEvent.objects.values_list("event_id", "status"))
+        self.assertEqual(
+            statuses,
+            {
+                "evt_amount": PaymentWebhookEvent.STATUS_REJECTED,
+                "evt_charge": PaymentWebhookEvent.STATUS_REJECTED,
+                "evt_failed": PaymentWebhookEvent.STATUS_APPLIED,
+                "evt_unknown": PaymentWebhookEvent.STATUS_IGNORED,
+            },
+        )
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, Payment.STATUS_WAITING)
+
+    def test_webhook_for_a_cancelled_booking_is_rejected(self):
+        booking = self._booking()
+        booking.cancel()
+        self._post(self._body(booking.payment))
+        event = PaymentWebhookEvent.objects.get()
+        self.assertEqual(event.status, PaymentWebhookEvent.STATUS_REJECTED)
+        self.assertEqual(event.error, "This booking can no longer be paid.")
+
+    @override_settings(PAYMENT_PROVIDER="simulator")
+    def test_asynchronous_provider_leaves_the_payment_waiting(self):
+        booking = self._booking()
+        self.client.force_login(self.user)
+        charge = Charge(reference="ch_sim", confirmed=False, instructions="QR")
+
+        with mock.patch("rent.gateway.SimulatorProvider.start", return_value=charge):
+            response = self.client.post(reverse("payment", args=[booking.pk]), {"method": "gopay"})
+
+        self.assertRedirects(response, reverse("booked-places"), fetch_redirect_response=False)
+        payment = Payment.objects.get(booking=booking)
+        self.assertEqual(
+            (payment.status, payment.method, payment.gateway_reference), (Payment.STATUS_WAITING, "gopay", "ch_sim")
+        )
+
+        self._post(self._body(payment, charge="ch_sim"))
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, Payment.STATUS_CONFIRMED)
+
+    @override_settings(PAYMENT_PROVIDER="simulator", PAYMENT_SIMULATOR_URL="http://127.0.0.1:9")
+    def test_unreachable_gateway_is_reported(self):
+        booking = self._booking()
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse("booking-payment-json", args=[booking.pk]), "{}", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(Payment.objects.get(booking=booking).status, Payment.STATUS_WAITING)
+
+    def test_simulator_delivers_signed_webhooks_when_due(self):
+        booking = self._booking()
+        payment = booking.payment
+        now = [1000.0]
+
+        def deliver(url, body, signature):
+            headers = {SIGNATURE_HEADER: signature}
+            return self.client.post(url, body, content_type="application/json", headers=headers).status_code
+
+        calls = []
+        simulator = GatewaySimulator(
+            self.url, SECRET, delay=5, deliver=lambda *args: calls.append(args) or 500, clock=lambda: now[0]
+        )
+        simulator.create_charge(payment.reference_code, str(payment.total_amount))
+        self.assertEqual(simulator.flush(), 0)
+        now[0] += 5
+        self.assertEqual(simulator.flush(), 0)
+        self.assertEqual((len(calls), simulator.pending), (1, 1))  # Retried after a 5xx.
+
+        now[0] = time.time() + 2
+        simulator.deliver = deliver
+        self.assertEqual(simulator.flush(), 1)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, Payment.STATUS_CONFIRMED)
@@ -7,12 +7,22 @@ from .views import (
     BookedPlacesView,
     BookedPlacesJSONView,
     BookingPaymentJSONView,
+    BookingSeriesCreateView,
+    InvoiceDownloadView,
+    VenueAvailabilityJSONView,
+    booking_events,
+    payment_webhook,
 )
 
 urlpatterns = [
     path("bookings/", BookedPlacesView.as_view(), name="booked-places"),
     path("bookings/<int:pk>/cancel/", BookingCancelView.as_view(), name="booking-cancel"),
     path("bookings/<int:pk>/payment/", BookingPaymentView.as_view(), name="payment"),
+    path("bookings/<int:pk>/invoice/", InvoiceDownloadView.as_view(), name="booking-invoice"),
+    path("venues/<slug:slug>/series/", BookingSeriesCreateView.as_view(), name="booking-series-create"),
+    path("venues/<slug:slug>/availability/", VenueAvailabilityJSONView.as_view(), name="venue-availability"),
+    path("bookings/events/", booking_events, name="booking-events"),
     path("bookings/json/", BookedPlacesJSONView.as_view(), name="booked-places-json"),
     path("bookings/<int:pk>/payment/json/", BookingPaymentJSONView.as_view(), name="booking-payment-json"),
+    path("payments/webhook/", payment_webhook, name="payment-webhook"),
 ]
@@ -1,17 +1,44 @@
 """Views handling booking and payment flows."""
 from __future__ import annotations
 
+import asyncio
+from datetime import date, timedelta
+from functools import partial
+from typing import Any, AsyncIterator
+
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
 from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.views.generic import ListView
-import json
-from typing import Any, Dict
 
-from .forms import PaymentForm
-from .models import Booking, Payment
+from authentication.mixins import QueryBudgetMixin
+from manajemen_lapangan.models import Venue
+from TK_PBP.serialization import CompactJsonResponse
+
+from .availability import MAX_RANGE_DAYS, SLOT_MINUTES, venue_availability
+from .events import broker
+from .forms import BookingSeriesForm, PaymentForm
+from .gateway import GatewayError, InvalidWebhook, get_provider, start_payment
+from .idempotency import IdempotencyConflict, run_idempotent
+from .invoices import invoice_path
+from .models import Booking, Invoice, Payment, PaymentTransitionError
+from .serializers import BookingSerializer
+from .series import SeriesConflict
+from .tasks import apply_payment_webhook, render_invoice
+from .webhooks import record
 
 
 class BookingCancelView(LoginRequiredMixin, View):
@@ -19,25 +46,48 @@ class BookingCancelView(LoginRequiredMixin, View):
 
     def post(self, request: HttpRequest, pk: int) -> HttpResponse:
         booking = get_object_or_404(Booking.objects.select_related("payment"), pk=pk, user=request.user)
-        if booking.status in {Booking.STATUS_COMPLETED, Booking.STATUS_CANCELLED}:
+        if booking.status in Booking.CLOSED_STATUSES:
             messages.error(request, "This booking can no longer be cancelled.")
             return redirect("booked-places")
         booking.cancel()
-
-        payment = None
-        try:
-            payment = booking.payment
-        except Payment.DoesNotExist:
-            # Ensure a payment record exists so the user can book again later.
-            payment = booking.ensure_payment()
-
-        if payment is not None:
-            payment.status = "waiting"
-            payment.save(update_fields=["status", "updated_at"])
         messages.success(request, "Booking cancelled successfully.")
         return redirect("booked-places")
 
 
+class BookingSeriesCreateView(LoginRequiredMixin, View):
+    """Request the same slot at a venue repeatedly in one go."""
+
+    template_name = "rent/booking_series_form.html"
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        self.venue = get_object_or_404(Venue, slug=kwargs["slug"])
+        if request.user.is_authenticated and request.user.is_staff:
+            messages.error(request, "Administrators cannot create bookings. Please use a regular user account.")
+            return redirect("venue-detail", slug=self.venue.slug)
+        return super().dispatch(request, *args, **kwargs)
+
+    def get(self, request: HttpRequest, slug: str) -> HttpResponse:
+        form = BookingSeriesForm(venue=self.venue)
+        return render(request, self.template_name, {"venue": self.venue, "form": form})
+
+    def post(self, request: HttpRequest, slug: str) -> HttpResponse:
+        form = BookingSeriesForm(request.POST, venue=self.venue)
+        if form.is_valid():
+            try:
+                series = form.save(request.user)
+            except SeriesConflict as exc:
+                # Another request took one of the slots after the form was validated.
+                form.add_error(None, exc)
+            else:
+                count = series.occurrences.count()
+                messages.success(
+                    request,
+                    f"{count} booking requests were submitted and are awaiting admin approval.",
+                )
+                return redirect("booked-places")
+        return render(request, self.template_name, {"venue": self.venue, "form": form}, status=400)
+
+
 class BookingPaymentView(LoginRequiredMixin, View):
     template_name = "rent/booking_payment.html"
 
@@ -53,7 +103,7 @@ class BookingPaymentView(LoginRequiredMixin, View):
         if booking.status == Booking.STATUS_PENDING:
             messages.error(request, "This booking still requires admin approval before payment.")
             return redirect("wishlist")
-        if booking.status in {Booking.STATUS_CANCELLED, Booking.STATUS_COMPLETED}:
+        if booking.status in Booking.CLOSED_STATUSES:
             messages.error(request, "This booking can no longer be paid.")
             return redirect("booked-places")
         form = PaymentForm(instance=booking.payment)
@@ -64,27 +114,36 @@ class BookingPaymentView(LoginRequiredMixin, View):
         if booking.status == Booking.STATUS_PENDING:
             messages.error(request, "This booking still requires admin approval before payment.")
             return redirect("wishlist")
-        if booking.status in {Booking.STATUS_CANCELLED, Booking.STATUS_COMPLETED}:
+        if booking.status in Booking.CLOSED_STATUSES:
             messages.error(request, "This booking can no longer be paid.")
             return redirect("booked-places")
         form = PaymentForm(request.POST, instance=booking.payment)
         if form.is_valid():
-            payment: Payment = form.save(commit=False)
-            payment.status = "confirmed"
-            payment.save()
-            booking.status = Booking.STATUS_CONFIRMED
-            booking.save(update_fields=["status", "updated_at"])
-            messages.success(request, "Payment completed! Your booking is confirmed.")
+            try:
+                charge = start_payment(booking, form.save(commit=False))
+            except GatewayError as exc:
+                messages.error(request, str(exc))
+                return redirect("payment", pk=booking.pk)
+            except PaymentTransitionError as exc:
+                messages.error(request, exc.message)
+                return redirect("booked-places")
+            if charge.confirmed:
+                messages.success(request, "Payment completed! Your booking is confirmed.")
+            else:
+                messages.info(
+                    request, "Finish the payment in your payment app. Your booking is confirmed once it arrives."
+                )
             return redirect("booked-places")
         messages.error(request, "Could not process the payment. Please try again.")
         return render(request, self.template_name, {"booking": booking, "form": form})
 
 
-class BookedPlacesView(LoginRequiredMixin, ListView):
+class BookedPlacesView(QueryBudgetMixin, LoginRequiredMixin, ListView):
     """Display all bookings made by the current user."""
 
     template_name = "rent/booked_places.html"
     context_object_name = "bookings"
+    query_budget = 5
 
     def get_queryset(self):
         return (
@@ -102,69 +161,32 @@ class BookedPlacesView(LoginRequiredMixin, ListView):
         )
 
 
-def _serialize_booking(booking: Booking) -> Dict[str, Any]:
-    """Return a JSON-serializable representation of a booking and its payment."""
-
-    def _dt(v):
-        return v.isoformat() if v is not None else None
-
-    venue = booking.venue
-    venue_name = getattr(venue, "name", str(venue))
-
-    payment = None
-    try:
-        p = booking.payment
-        payment = {
-            "id": p.id,
-            "method": p.method,
-            "status": p.status,
-            "total_amount": str(p.total_amount),
-            "deposit_amount": str(p.deposit_amount),
-            "reference_code": p.reference_code,
-            "created_at": _dt(p.created_at),
-            "updated_at": _dt(p.updated_at),
-        }
-    except Payment.DoesNotExist:
-        payment = None
-
-    return {
-        "id": booking.id,
-        "venue": {"id": getattr(venue, "id", None), "name": venue_name},
-        "start_datetime": _dt(booking.start_datetime),
-        "end_datetime": _dt(booking.end_datetime),
-        "status": booking.status,
-        "total_cost": str(booking.total_cost),
-        "addons_total": str(booking.addons_total),
-        "payment": payment,
-    }
-
-
-class BookedPlacesJSONView(LoginRequiredMixin, View):
+class BookedPlacesJSONView(QueryBudgetMixin, LoginRequiredMixin, View):
     """Return the current user's active/confirmed/completed bookings as JSON."""
 
-    def get(self, request: HttpRequest) -> JsonResponse:
-        qs = (
-            Booking.objects.filter(
-                user=request.user,
-                status__in=[
-                    Booking.STATUS_ACTIVE,
-                    Booking.STATUS_CONFIRMED,
-                    Booking.STATUS_COMPLETED,
-                ],
-            )
-            .select_related("venue")
-            .prefetch_related("addons")
-            .order_by("-start_datetime")
-        )
-        data = [_serialize_booking(b) for b in qs]
-        return JsonResponse({"bookings": data})
+    query_budget = 4
+
+    def get(self, request: HttpRequest) -> CompactJsonResponse:
+        qs = Booking.objects.filter(
+            user=request.user,
+            status__in=[
+                Booking.STATUS_ACTIVE,
+                Booking.STATUS_CONFIRMED,
+                Booking.STATUS_COMPLETED,
+            ],
+        ).order_by("-start_datetime")
+        data = BookingSerializer().rows(BookingSerializer.annotate(qs))
+        return CompactJsonResponse({"bookings": data})
 
 
 class BookingPaymentJSONView(LoginRequiredMixin, View):
-    """Provide JSON access to a booking's payment and allow confirming via POST.
+    """Provide JSON access to a booking's payment and start paying it via POST.
 
-    POST will attempt to mark the payment as confirmed and the booking as confirmed.
-    Expects no body or a JSON body; responds with updated booking/payment data.
+    POST starts the payment with the configured provider (see
+    :func:`rent.gateway.start_payment`). A provider that captures the payment
+    at once answers 200 with the confirmed booking; otherwise the answer is
+    202 with the booking and the charge, and the payment is confirmed later
+    by the provider's webhook.
     """
 
     def _get_booking(self, request: HttpRequest, pk: int) -> Booking:
@@ -176,37 +198,175 @@ class BookingPaymentJSONView(LoginRequiredMixin, View):
         booking.ensure_payment()
         return booking
 
-    def get(self, request: HttpRequest, pk: int) -> JsonResponse:
+    def get(self, request: HttpRequest, pk: int) -> CompactJsonResponse:
         booking = self._get_booking(request, pk)
         if booking.status == Booking.STATUS_PENDING:
-            return JsonResponse({"error": "This booking still requires admin approval before payment."}, status=400)
-        if booking.status in {Booking.STATUS_CANCELLED, Booking.STATUS_COMPLETED}:
-            return JsonResponse({"error": "This booking can no longer be paid."}, status=400)
-        return JsonResponse({"booking": _serialize_booking(booking)})
+            return CompactJsonResponse(
+                {"error": "This booking still requires admin approval before payment."}, status=400
+            )
+        if booking.status in Booking.CLOSED_STATUSES:
+            return CompactJsonResponse({"error": "This booking can no longer be paid."}, status=400)
+        return CompactJsonResponse({"booking": BookingSerializer().serialize_instance(booking)})
 
-    def post(self, request: HttpRequest, pk: int) -> JsonResponse:
+    def post(self, request: HttpRequest, pk: int) -> HttpResponse:
         booking = self._get_booking(request, pk)
         if booking.status == Booking.STATUS_PENDING:
-            return JsonResponse({"error": "This booking still requires admin approval before payment."}, status=400)
-        if booking.status in {Booking.STATUS_CANCELLED, Booking.STATUS_COMPLETED}:
-            return JsonResponse({"error": "This booking can no longer be paid."}, status=400)
+            return CompactJsonResponse(
+                {"error": "This booking still requires admin approval before payment."}, status=400
+            )
+        if booking.status in Booking.CLOSED_STATUSES:
+            return CompactJsonResponse({"error": "This booking can no longer be paid."}, status=400)
 
-        # Accept JSON or form data; for now we don't require payment fields for the
-        # simple confirm action — production code should validate method/amount.
+        # A retried confirmation with the same Idempotency-Key gets the first answer back.
         try:
-            # Attempt to parse JSON body if present
-            payload = json.loads(request.body.decode()) if request.body else {}
-        except Exception:
-            payload = {}
-
-        # Confirm the payment and booking
+            return run_idempotent(request, partial(self._confirm, booking))
+        except IdempotencyConflict as exc:
+            return CompactJsonResponse({"error": exc.message}, status=exc.status)
+        except PaymentTransitionError as exc:
+            return CompactJsonResponse({"error": exc.message}, status=409)
+        except GatewayError as exc:
+            return CompactJsonResponse({"error": str(exc)}, status=503)
+
+    def _confirm(self, booking: Booking) -> CompactJsonResponse:
         try:
             payment = booking.payment
         except Payment.DoesNotExist:
             payment = booking.ensure_payment()
 
-        payment.status = "confirmed"
-        payment.save()
-        booking.status = Booking.STATUS_CONFIRMED
-        booking.save(update_fields=["status", "updated_at"]) 
-        return JsonResponse({"booking": _serialize_booking(booking)})
+        charge = start_payment(booking, payment)
+        if charge.confirmed:
+            return CompactJsonResponse({"booking": BookingSerializer().serialize_instance(booking)})
+        # The provider confirms the payment later with a webhook.
+        charge_data = {"reference": charge.reference, "instructions": charge.instructions}
+        return CompactJsonResponse(
+            {"booking": BookingSerializer().serialize_instance(booking), "charge": charge_data}, status=202
+        )
+
+
+class InvoiceDownloadView(LoginRequiredMixin, View):
+    """Serve the stored receipt of a paid booking.
+
+    The file is streamed from ``INVOICE_ROOT`` without rendering; its content
+    hash is the ``ETag``, so revalidations are answered with 304. A receipt
+    that has not been rendered yet is queued and the user is asked to retry.
+    """
+
+    def get(self, request: HttpRequest, pk: int) -> HttpResponse:
+        booking = get_object_or_404(Booking.objects.select_related("payment"), pk=pk, user=request.user)
+        try:
+            payment = booking.payment
+        except Payment.DoesNotExist:
+            raise Http404("This booking has no payment.")
+        if payment.status not in Payment.PAID_STATUSES:
+            raise Http404("This booking has not been paid yet.")
+
+        invoice = Invoice.objects.filter(payment=payment).first()
+        if invoice is None or not invoice_path(invoice.sha256).exists():
+            render_invoice.delay(payment_id=payment.pk, key=f"invoice:{payment.pk}")
+            invoice = Invoice.objects.filter(payment=payment).first()  # Rendered already when tasks run eagerly.
+            if invoice is None or not invoice_path(invoice.sha256).exists():
+                messages.info(request, "Your receipt is being prepared. Please try again in a moment.")
+                return redirect("booked-places")
+
+        etag = f'"{invoice.sha256}"'
+        if request.headers.get("If-None-Match") == etag:
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(
+                invoice_path(invoice.sha256).open("rb"),
+                content_type=invoice.content_type,
+                filename=f"{invoice.number}.html",
+            )
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+class VenueAvailabilityJSONView(QueryBudgetMixin, LoginRequiredMixin, View):
+    """Return a venue's free and taken slots for ``?start=YYYY-MM-DD&end=YYYY-MM-DD``.
+
+    Both bounds are inclusive; the range defaults to the coming week and is
+    capped at ``MAX_RANGE_DAYS`` days.
+    """
+
+    query_budget = 5
+
+    def get(self, request: HttpRequest, slug: str) -> CompactJsonResponse:
+        try:
+            start = date.fromisoformat(request.GET["start"]) if request.GET.get("start") else timezone.localdate()
+            end = date.fromisoformat(request.GET["end"]) if request.GET.get("end") else start + timedelta(days=6)
+        except ValueError:
+            return CompactJsonResponse({"error": "Dates must use the YYYY-MM-DD format."}, status=400)
+        if end < start:
+            return CompactJsonResponse({"error": "The end date must not be before the start date."}, status=400)
+        if (end - start).days >= MAX_RANGE_DAYS:
+            return CompactJsonResponse({"error": f"Request at most {MAX_RANGE_DAYS} days at a time."}, status=400)
+        venue = get_object_or_404(Venue, slug=slug)
+        return CompactJsonResponse(
+            {
+                "venue": venue.slug,
+                "slot_minutes": SLOT_MINUTES,
+                "days": venue_availability(venue, start, end),
+            }
+        )
+
+
+# Comment lines keep proxies from closing an idle stream; after STREAM_SECONDS
+# the stream ends and EventSource reconnects (with Last-Event-ID) after RETRY_MS.
+HEARTBEAT_SECONDS = 15
+STREAM_SECONDS = 300
+RETRY_MS = 2000
+
+
+async def _booking_event_stream(user_id: int, last_event_id: int | None) -> AsyncIterator[str]:
+    subscription = broker.subscribe(user_id, last_event_id=last_event_id)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + STREAM_SECONDS
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        while (remaining := deadline - loop.time()) > 0:
+            event = await subscription.get(timeout=min(HEARTBEAT_SECONDS, remaining))
+            yield event.encode() if event is not None else ": keep-alive\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def booking_events(request: HttpRequest) -> HttpResponse:
+    """Stream status changes of the current user's bookings as server-sent events."""
+
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=403)
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would be held for the whole stream. 204 tells EventSource
+        # to stop reconnecting, leaving the pages to show changes on reload.
+        return HttpResponse(status=204)
+    last_event_id = request.headers.get("Last-Event-ID", "")
+    response = StreamingHttpResponse(
+        _booking_event_stream(user.pk, int(last_event_id) if last_event_id.isdigit() else None),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@csrf_exempt
+@require_POST
+def payment_webhook(request: HttpRequest) -> CompactJsonResponse:
+    """Verify a payment provider webhook and queue it (see :mod:`rent.webhooks`).
+
+    Answers 202 once the event is stored and 200 for a redelivered one, so
+    the provider stops retrying either way.
+    """
+
+    provider = get_provider()
+    try:
+        event = provider.verify(request.body, request.headers)
+    except InvalidWebhook as exc:
+        return CompactJsonResponse({"error": str(exc)}, status=400)
+    stored = record(provider.name, event)
+    if stored is None:
+        return CompactJsonResponse({"received": True, "duplicate": True})
+    apply_payment_webhook.delay(event_id=stored.pk)
+    return CompactJsonResponse({"received": True, "duplicate": False}, status=202)
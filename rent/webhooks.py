@@ -0,0 +1,76 @@
+"""Record payment provider webhooks and apply them in the background.
+
+The webhook view only verifies the signature (see :mod:`rent.gateway`),
+stores the event with :func:`record` and queues the
+``apply_payment_webhook`` task, so a burst of webhooks costs each web
+worker two ``INSERT`` statements rather than the payment and booking
+updates. Providers redeliver events until they get a 2xx answer; the unique
+``(provider, event_id)`` constraint turns a redelivery into a no-op.
+
+:func:`apply_event` runs in the worker. It matches the payment by its
+reference code, checks the amount and the charge, and confirms the booking
+for ``payment.succeeded``. A failed payment stays waiting so the customer
+can try again. The outcome is kept on the event row; an event that cannot
+apply is marked ``rejected`` or ``ignored`` instead of being retried.
+"""
+from __future__ import annotations
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .gateway import EVENT_FAILED, EVENT_SUCCEEDED, WebhookEvent
+from .models import Payment, PaymentTransitionError, PaymentWebhookEvent
+
+
+def record(provider: str, event: WebhookEvent) -> PaymentWebhookEvent | None:
+    """Store ``event``; return ``None`` when it was received before."""
+
+    try:
+        with transaction.atomic():
+            return PaymentWebhookEvent.objects.create(
+                provider=provider,
+                event_id=event.id,
+                event_type=event.type,
+                payment_reference=event.payment_reference,
+                amount=event.amount,
+                payload=event.payload,
+            )
+    except IntegrityError:
+        return None
+
+
+def _outcome(event: PaymentWebhookEvent, payment: Payment | None) -> tuple[str, str]:
+    if payment is None:
+        return PaymentWebhookEvent.STATUS_IGNORED, "Unknown payment reference."
+    if event.amount != payment.total_amount:
+        return PaymentWebhookEvent.STATUS_REJECTED, f"Amount {event.amount} does not match {payment.total_amount}."
+    charge = event.payload.get("data", {}).get("charge", "")
+    if payment.gateway_reference and charge and charge != payment.gateway_reference:
+        return PaymentWebhookEvent.STATUS_REJECTED, "The charge belongs to an earlier payment attempt."
+    if event.event_type == EVENT_FAILED:
+        return PaymentWebhookEvent.STATUS_APPLIED, ""
+    if event.event_type != EVENT_SUCCEEDED:
+        return PaymentWebhookEvent.STATUS_IGNORED, f"Unhandled event type {event.event_type}."
+    if payment.status in Payment.PAID_STATUSES:
+        return PaymentWebhookEvent.STATUS_IGNORED, "The payment is already confirmed."
+    try:
+        payment.booking.confirm_payment(payment)
+    except PaymentTransitionError as exc:
+        return PaymentWebhookEvent.STATUS_REJECTED, exc.message
+    return PaymentWebhookEvent.STATUS_APPLIED, ""
+
+
+def apply_event(event_id: int) -> str | None:
+    """Apply a recorded event once and return its final status."""
+
+    event = PaymentWebhookEvent.objects.filter(pk=event_id, processed_at__isnull=True).first()
+    if event is None:  # Already processed, or deleted since it was queued.
+        return None
+    payment = (
+        Payment.objects.select_related("booking__venue").filter(reference_code=event.payment_reference).first()
+    )
+    status, error = _outcome(event, payment)
+    PaymentWebhookEvent.objects.filter(pk=event.pk, processed_at__isnull=True).update(
+        status=status, error=error, payment=payment, processed_at=timezone.now()
+    )
+    return status
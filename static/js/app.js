@@ -381,6 +381,127 @@ onDocumentReady(() => {
   prepareCancelBookingForms();
 });
 
+const bookingEventToastLevels = {
+  active: 'success',
+  confirmed: 'success',
+  cancelled: 'warning',
+  rejected: 'error',
+};
+
+const subscribeToBookingEvents = () => {
+  const url = document.body && document.body.dataset.bookingEventsUrl;
+  if (!url || typeof window.EventSource !== 'function') {
+    return;
+  }
+  const source = new EventSource(url);
+  source.addEventListener('booking-status', (event) => {
+    let payload;
+    try {
+      payload = JSON.parse(event.data);
+    } catch (error) {
+      return;
+    }
+    showToast(`${payload.venue}: ${payload.status_display}`, {
+      level: bookingEventToastLevels[payload.status] || 'info',
+    });
+    // Pages listing bookings re-render so approved or paid bookings move to the right section.
+    if (document.querySelector('[data-booking-events-refresh]')) {
+      window.setTimeout(() => window.location.reload(), 1200);
+    }
+  });
+  window.addEventListener('pagehide', () => source.close());
+};
+
+onDocumentReady(subscribeToBookingEvents);
+
+const AVAILABILITY_DAYS = 14;
+
+const toLocalInputValue = (isoString) => String(isoString || '').slice(0, 16);
+
+const addDays = (isoDate, days) => {
+  const [year, month, day] = isoDate.split('-').map(Number);
+  const value = new Date(Date.UTC(year, month - 1, day + days));
+  return value.toISOString().slice(0, 10);
+};
+
+const prepareAvailabilityPicker = (root) => {
+  const url = root.dataset.availabilityUrl;
+  const dateInput = root.querySelector('[data-availability-date]');
+  const slotGrid = root.querySelector('[data-availability-slots]');
+  const message = root.querySelector('[data-availability-message]');
+  const form = root.closest('form');
+  const startInput = form ? form.querySelector('[name="start_datetime"]') : null;
+  const endInput = form ? form.querySelector('[name="end_datetime"]') : null;
+  if (!url || !dateInput || !slotGrid || !startInput || !endInput) {
+    return;
+  }
+  const days = new Map();
+
+  const setMessage = (text) => {
+    if (message) {
+      message.textContent = text;
+    }
+  };
+
+  const renderDay = () => {
+    const day = days.get(dateInput.value);
+    slotGrid.innerHTML = '';
+    if (!day) {
+      setMessage('Pick a day within the next two weeks to see free slots.');
+      return;
+    }
+    if (!day.slots.length) {
+      setMessage('The venue is closed on this day.');
+      return;
+    }
+    setMessage(day.slots.some((slot) => slot.available) ? '' : 'Every slot on this day is taken.');
+    day.slots.forEach((slot) => {
+      const button = document.createElement('button');
+      button.type = 'button';
+      button.disabled = !slot.available;
+      button.textContent = `${slot.start.slice(11, 16)}–${slot.end.slice(11, 16)}`;
+      button.className = slot.available
+        ? 'rounded-xl border border-white/30 bg-white/10 px-2 py-2 text-sm text-white transition hover:bg-primary/60'
+        : 'cursor-not-allowed rounded-xl border border-white/10 bg-white/5 px-2 py-2 text-sm text-white/30 line-through';
+      button.addEventListener('click', () => {
+        // Clicking the slot right after the current selection extends it.
+        if (startInput.value && endInput.value === toLocalInputValue(slot.start)) {
+          endInput.value = toLocalInputValue(slot.end);
+        } else {
+          startInput.value = toLocalInputValue(slot.start);
+          endInput.value = toLocalInputValue(slot.end);
+        }
+      });
+      slotGrid.appendChild(button);
+    });
+  };
+
+  const today = new Date();
+  const start = new Date(today.getTime() - today.getTimezoneOffset() * 60000).toISOString().slice(0, 10);
+  const end = addDays(start, AVAILABILITY_DAYS - 1);
+  dateInput.min = start;
+  dateInput.max = end;
+  dateInput.value = start;
+  dateInput.addEventListener('change', renderDay);
+
+  const requestUrl = new URL(url, window.location.origin);
+  requestUrl.search = new URLSearchParams({ start, end }).toString();
+  fetch(requestUrl.toString(), {
+    headers: { 'X-Requested-With': 'XMLHttpRequest', Accept: 'application/json' },
+    credentials: 'same-origin',
+  })
+    .then((response) => (response.ok ? response.json() : Promise.reject(response)))
+    .then((payload) => {
+      (payload.days || []).forEach((day) => days.set(day.date, day));
+      renderDay();
+    })
+    .catch(() => setMessage('Unable to load availability. You can still enter a time manually.'));
+};
+
+onDocumentReady(() => {
+  document.querySelectorAll('[data-availability]').forEach((root) => prepareAvailabilityPicker(root));
+});
+
 const prepareWishlistButton = (button) => {
   if (!(button instanceof HTMLButtonElement)) {
     return;
@@ -0,0 +1,5 @@
+"""A small database-backed queue for work that can run after the response.
+
+Declare tasks with :func:`tasks.queue.task` in an app's ``tasks`` module and
+run ``python manage.py run_task_worker``; see :mod:`tasks.queue`.
+"""
@@ -0,0 +1,44 @@
+"""Run queued background tasks."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tasks.queue import Worker, purge_finished
+
+
+class Command(BaseCommand):
+    help = (
+        "Claim and run due background tasks, retrying failures with backoff. Runs until "
+        "interrupted, or until the queue is empty with --burst."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--burst", action="store_true", help="Exit once no task is due.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--max-tasks", type=int, default=None, help="Exit after running this many tasks.")
+        parser.add_argument("--name", default=None, help="Worker name recorded on claimed tasks.")
+        parser.add_argument(
+            "--purge-days",
+            type=float,
+            default=None,
+            help="First delete finished tasks older than this many days.",
+        )
+
+    def handle(self, *args, **options):
+        if options["poll_interval"] <= 0:
+            raise CommandError("--poll-interval must be positive.")
+        if options["purge_days"] is not None:
+            deleted = purge_finished(timezone.now() - timedelta(days=options["purge_days"]))
+            self.stdout.write(f"Purged {deleted} finished tasks.")
+
+        worker = Worker(options["name"])
+        try:
+            processed = worker.run(
+                burst=options["burst"], poll_interval=options["poll_interval"], max_tasks=options["max_tasks"]
+            )
+        except KeyboardInterrupt:
+            return
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker.name} ran {processed} tasks."))
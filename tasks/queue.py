@@ -0,0 +1,237 @@
+"""Declare, enqueue and run background tasks.
+
+Tasks are plain functions taking JSON-serialisable keyword arguments::
+
+    @task(max_attempts=3)
+    def recalculate_payment(booking_id: int) -> None:
+        ...
+
+    recalculate_payment.delay(booking_id=booking.pk, key=f"payment:{booking.pk}")
+
+``delay`` inserts a :class:`~tasks.models.Task` row once the current
+transaction commits, so a rolled-back request never leaves work behind and
+the request only pays for one ``INSERT``. Passing ``key`` deduplicates:
+while a task with that key is still queued, further inserts are ignored by
+a partial unique index. With ``TASKS_EAGER`` (the default outside
+production) the function runs immediately instead, like a direct call.
+
+:class:`Worker` claims due tasks one at a time. On backends with
+``SELECT ... FOR UPDATE SKIP LOCKED`` (PostgreSQL) concurrent workers skip
+each other's rows; elsewhere (SQLite) a task is claimed with a conditional
+``UPDATE`` and a lost race simply moves on to the next candidate. Each task
+runs in its own transaction. Failures are retried with exponential backoff
+(``TASKS_RETRY_BACKOFF`` seconds, doubled per attempt, capped at
+``TASKS_RETRY_BACKOFF_MAX`` and jittered) until ``max_attempts``; tasks left
+running longer than ``TASKS_LOCK_TIMEOUT`` by a crashed worker are claimed
+again.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import random
+import socket
+import traceback
+from datetime import datetime, timedelta
+from functools import partial
+from time import sleep
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+_registry: dict[str, "TaskFunction"] = {}
+
+
+class UnknownTask(LookupError):
+    """Raised for a task name that no ``tasks`` module registered."""
+
+
+class TaskFunction:
+    """A registered task; calling it runs the function directly."""
+
+    def __init__(self, func: Callable[..., Any], name: str, max_attempts: int | None) -> None:
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.__doc__ = func.__doc__
+
+    def __call__(self, **kwargs: Any) -> Any:
+        return self.func(**kwargs)
+
+    def __repr__(self) -> str:
+        return f"<task {self.name}>"
+
+    def delay(self, *, key: str = "", countdown: float = 0, **kwargs: Any) -> None:
+        enqueue(self.name, kwargs, key=key, countdown=countdown, max_attempts=self.max_attempts)
+
+
+def task(func: Callable[..., Any] | None = None, *, name: str | None = None, max_attempts: int | None = None):
+    """Register ``func`` under ``name`` (default: its dotted path)."""
+
+    def decorator(func: Callable[..., Any]) -> TaskFunction:
+        wrapped = TaskFunction(func, name or f"{func.__module__}.{func.__qualname__}", max_attempts)
+        _registry[wrapped.name] = wrapped
+        return wrapped
+
+    return decorator(func) if func is not None else decorator
+
+
+def get_task(name: str) -> TaskFunction:
+    try:
+        return _registry[name]
+    except KeyError:
+        raise UnknownTask(name) from None
+
+
+def enqueue(
+    name: str,
+    kwargs: dict[str, Any] | None = None,
+    *,
+    key: str = "",
+    countdown: float = 0,
+    max_attempts: int | None = None,
+) -> None:
+    """Queue ``name(**kwargs)`` once the current transaction commits."""
+
+    kwargs = kwargs or {}
+    if settings.TASKS_EAGER:
+        get_task(name)(**kwargs)
+        return
+    transaction.on_commit(partial(_insert, name, kwargs, key, countdown, max_attempts))
+
+
+def _insert(name: str, kwargs: dict[str, Any], key: str, countdown: float, max_attempts: int | None) -> None:
+    Task.objects.bulk_create(
+        [
+            Task(
+                name=name,
+                kwargs=kwargs,
+                key=key,
+                run_after=timezone.now() + timedelta(seconds=countdown),
+                max_attempts=max_attempts or settings.TASKS_MAX_ATTEMPTS,
+            )
+        ],
+        ignore_conflicts=bool(key),
+    )
+
+
+def backoff(attempts: int) -> timedelta:
+    """Delay before retrying a task that has failed ``attempts`` times."""
+
+    delay = min(settings.TASKS_RETRY_BACKOFF * 2 ** (attempts - 1), settings.TASKS_RETRY_BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(0.5, 1))
+
+
+def purge_finished(before: datetime) -> int:
+    """Delete tasks that finished, successfully or not, before ``before``."""
+
+    deleted, _ = Task.objects.filter(
+        status__in=[Task.STATUS_DONE, Task.STATUS_FAILED], updated_at__lt=before
+    ).delete()
+    return deleted
+
+
+class Worker:
+    """Claim and run due tasks from the ``Task`` table."""
+
+    def __init__(self, name: str | None = None) -> None:
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+
+    def _due(self, now: datetime) -> Q:
+        stale = now - timedelta(seconds=settings.TASKS_LOCK_TIMEOUT)
+        return Q(status=Task.STATUS_QUEUED, run_after__lte=now) | Q(status=Task.STATUS_RUNNING, locked_at__lt=stale)
+
+    def claim(self) -> Task | None:
+        now = timezone.now()
+        due = Task.objects.filter(self._due(now)).order_by("run_after", "pk")
+        claimed = {
+            "status": Task.STATUS_RUNNING,
+            "locked_at": now,
+            "locked_by": self.name,
+            "attempts": F("attempts") + 1,
+            "updated_at": now,
+        }
+        if connection.features.has_select_for_update_skip_locked:
+            with transaction.atomic():
+                candidate = due.select_for_update(skip_locked=True).only("pk").first()
+                if candidate is None:
+                    return None
+                Task.objects.filter(pk=candidate.pk).update(**claimed)
+            pk = candidate.pk
+        else:
+            # No row locks: the conditional UPDATE decides which worker wins.
+            for pk in due.values_list("pk", flat=True)[:10]:
+                if Task.objects.filter(self._due(now), pk=pk).update(**claimed):
+                    break
+            else:
+                return None
+        return Task.objects.get(pk=pk)
+
+    def execute(self, task: Task) -> bool:
+        """Run a claimed task and record the outcome; return whether it succeeded."""
+
+        try:
+            function = get_task(task.name)
+            with transaction.atomic():
+                function(**task.kwargs)
+        except Exception as exc:
+            self._failed(task, exc)
+            return False
+        Task.objects.filter(pk=task.pk, locked_by=self.name).update(
+            status=Task.STATUS_DONE, locked_at=None, last_error="", updated_at=timezone.now()
+        )
+        return True
+
+    def _failed(self, task: Task, exc: Exception) -> None:
+        now = timezone.now()
+        error = "".join(traceback.format_exception(exc))
+        mine = Task.objects.filter(pk=task.pk, locked_by=self.name)
+        if isinstance(exc, UnknownTask) or task.attempts >= task.max_attempts:
+            logger.error("Task %s (#%s) failed permanently", task.name, task.pk, exc_info=exc)
+            mine.update(status=Task.STATUS_FAILED, locked_at=None, last_error=error, updated_at=now)
+            return
+        logger.warning("Task %s (#%s) failed, attempt %s", task.name, task.pk, task.attempts, exc_info=exc)
+        try:
+            with transaction.atomic():
+                mine.update(
+                    status=Task.STATUS_QUEUED,
+                    run_after=now + backoff(task.attempts),
+                    locked_at=None,
+                    last_error=error,
+                    updated_at=now,
+                )
+        except IntegrityError:
+            # A new task with the same key was queued meanwhile and will do the work.
+            mine.update(status=Task.STATUS_FAILED, locked_at=None, last_error=error, updated_at=now)
+
+    def run_one(self) -> bool:
+        """Run the next due task, if any; return whether one was claimed."""
+
+        task = self.claim()
+        if task is None:
+            return False
+        self.execute(task)
+        return True
+
+    def run(self, *, burst: bool = False, poll_interval: float = 1.0, max_tasks: int | None = None) -> int:
+        """Process tasks until the queue is empty (``burst``) or ``max_tasks`` ran."""
+
+        processed = 0
+        while max_tasks is None or processed < max_tasks:
+            ran = self.run_one()
+            if not connection.in_atomic_block:
+                close_old_connections()
+            if ran:
+                processed += 1
+            elif burst:
+                break
+            else:
+                sleep(poll_interval)
+        return processed
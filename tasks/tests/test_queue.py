@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from manajemen_lapangan.models import Category, Venue
+from rent.models import Booking, Payment
+
+from ..models import Task
+from ..queue import Worker, backoff, enqueue, task
+
+calls: list[int] = []
+
+
+@task(name="tests.record")
+def record(value: int) -> None:
+    calls.append(value)
+
+
+@task(name="tests.explode", max_attempts=2)
+def explode() -> None:
+    raise RuntimeError("boom")
+
+
+@override_settings(TASKS_EAGER=False, TASKS_RETRY_BACKOFF=10, TASKS_RETRY_BACKOFF_MAX=60)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+        self.worker = Worker("test-worker")
+
+    def test_tasks_are_inserted_when_the_transaction_commits(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record.delay(value=1)
+            self.assertFalse(Task.objects.exists())
+        self.assertEqual(Task.objects.get().kwargs, {"value": 1})
+
+    def test_a_key_keeps_one_queued_task(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record.delay(value=1, key="record")
+            record.delay(value=2, key="record")
+            record.delay(value=3)
+        self.assertEqual(Task.objects.count(), 2)
+
+        self.assertEqual(self.worker.run(burst=True), 2)
+        self.assertEqual(calls, [1, 3])
+        with self.captureOnCommitCallbacks(execute=True):
+            record.delay(value=4, key="record")
+        self.assertEqual(Task.objects.filter(status=Task.STATUS_QUEUED).count(), 1)
+
+    def test_worker_runs_due_tasks_in_order(self):
+        Task.objects.create(name="tests.record", kwargs={"value": 2}, run_after=timezone.now() - timedelta(seconds=5))
+        Task.objects.create(name="tests.record", kwargs={"value": 1}, run_after=timezone.now() - timedelta(seconds=10))
+        Task.objects.create(name="tests.record", kwargs={"value": 3}, run_after=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(self.worker.run(burst=True), 2)
+
+        self.assertEqual(calls, [1, 2])
+        done = Task.objects.filter(status=Task.STATUS_DONE)
+        self.assertEqual(done.count(), 2)
+        self.assertEqual(set(done.values_list("attempts", flat=True)), {1})
+
+    def test_failures_are_retried_with_backoff_then_given_up(self):
+        failing = Task.objects.create(name="tests.explode", max_attempts=2)
+
+        with self.assertLogs("tasks.queue", "WARNING"):
+            self.assertTrue(self.worker.run_one())
+        failing.refresh_from_db()
+        self.assertEqual((failing.status, failing.attempts), (Task.STATUS_QUEUED, 1))
+        self.assertIn("RuntimeError: boom", failing.last_error)
+        self.assertGreater(failing.run_after, timezone.now())
+        self.assertFalse(self.worker.run_one())
+
+        Task.objects.filter(pk=failing.pk).update(run_after=timezone.now())
+        with self.assertLogs("tasks.queue", "ERROR"):
+            self.assertTrue(self.worker.run_one())
+        failing.refresh_from_db()
+        self.assertEqual((failing.status, failing.attempts), (Task.STATUS_FAILED, 2))
+
+    def test_backoff_doubles_up_to_the_cap(self):
+        self.assertTrue(timedelta(seconds=5) <= backoff(1) <= timedelta(seconds=10))
+        self.assertTrue(timedelta(seconds=20) <= backoff(3) <= timedelta(seconds=40))
+        self.assertTrue(backoff(10) <= timedelta(seconds=60))
+
+    def test_unknown_tasks_fail_immediately(self):
+        missing = Task.objects.create(name="tests.missing")
+        with self.assertLogs("tasks.queue", "ERROR"):
+            self.worker.run(burst=True)
+        missing.refresh_from_db()
+        self.assertEqual((missing.status, missing.attempts), (Task.STATUS_FAILED, 1))
+
+    @override_settings(TASKS_LOCK_TIMEOUT=60)
+    def test_tasks_abandoned_by_a_crashed_worker_are_claimed_again(self):
+        Task.objects.create(
+            name="tests.record",
+            kwargs={"value": 7},
+            status=Task.STATUS_RUNNING,
+            attempts=1,
+            locked_by="gone",
+            locked_at=timezone.now() - timedelta(minutes=5),
+        )
+        Task.objects.create(
+            name="tests.record", kwargs={"value": 8}, status=Task.STATUS_RUNNING, locked_at=timezone.now()
+        )
+
+        self.assertEqual(self.worker.run(burst=True), 1)
+        self.assertEqual(calls, [7])
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode_runs_inline(self):
+        enqueue("tests.record", {"value": 5})
+        self.assertEqual(calls, [5])
+        self.assertFalse(Task.objects.exists())
+
+    def test_command_drains_the_queue(self):
+        Task.objects.create(name="tests.record", kwargs={"value": 1})
+        output = StringIO()
+        call_command("run_task_worker", "--burst", "--name", "cli", stdout=output)
+        self.assertIn("Worker cli ran 1 tasks.", output.getvalue())
+
+
+@override_settings(TASKS_EAGER=False)
+class BookingPaymentTaskTests(TestCase):
+    def test_payment_is_created_by_the_worker(self):
+        user = get_user_model().objects.create_user(username="queued", password="pass")
+        venue = Venue.objects.create(
+            category=Category.objects.get(slug="padel"),
+            name="Queued Court",
+            slug="queued-court",
+            description="Padel court",
+            location="Jakarta",
+            city="Jakarta",
+            price_per_hour=Decimal("100000.00"),
+            facilities="Locker",
+        )
+        start = timezone.now() + timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = Booking.objects.create(
+                user=user, venue=venue, start_datetime=start, end_datetime=start + timedelta(hours=2)
+            )
+            booking.status = Booking.STATUS_ACTIVE
+            booking.save(update_fields=["status"])
+        self.assertFalse(Payment.objects.exists())
+        self.assertEqual(Task.objects.get().name, "rent.tasks.recalculate_payment")
+
+        Worker().run(burst=True)
+
+        self.assertEqual(Payment.objects.get(booking=booking).total_amount, Decimal("200000.00"))